@@ -9,6 +9,8 @@ from typing import Dict, Tuple, Optional
 import logging
 from pathlib import Path
 
+from llm_response_cache import get_llm_response_cache
+
 logger = logging.getLogger(__name__)
 
 # Try to import anthropic
@@ -72,6 +74,8 @@ class AIAnalyzer:
             os.getenv('maxmini_apikey')
         )
         self.model = model
+        # Model name actually sent to the Z.AI endpoint (also part of the cache key)
+        self.api_model = "glm-4.7"
         
         # Initialize configuration (no anthropic client needed - using HTTP requests)
         if self.api_key:
@@ -169,52 +173,22 @@ IMPORTANT:
 
 Return ONLY the JSON, no other text."""
 
-            import requests
-            
-            api_key = os.environ.get('ANTHROPIC_API_KEY')
-            base_url = os.environ.get('ANTHROPIC_BASE_URL', 'https://api.minimax.io/anthropic')
-            
-            if not api_key:
-                logger.error("ANTHROPIC_API_KEY not found")
+            ai_response_text, from_cache = self._request_completion(prompt, max_tokens=4096, timeout=60)
+            if ai_response_text is None:
+                logger.error("❌ ATS optimization request failed")
                 return None
             
-            url = f"{base_url}/v1/messages"
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {api_key}',
-                'anthropic-version': '2023-06-01'
-            }
-            
-            payload = {
-                "model": "glm-4.7",
-                "max_tokens": 4096,
-                "messages": [{"role": "user", "content": prompt}]
-            }
-            
-            http_response = requests.post(url, headers=headers, json=payload, timeout=60)
-            
-            if http_response.status_code == 200:
-                result_data = http_response.json()
-                
-                # Extract text from response
-                ai_response_text = ""
-                if 'content' in result_data:
-                    for block in result_data['content']:
-                        if block.get('type') == 'text':
-                            ai_response_text += block.get('text', '')
-                
-                # Parse JSON from response
-                import re
-                json_match = re.search(r'\{.*\}', ai_response_text, re.DOTALL)
-                if json_match:
-                    ats_recommendations = json.loads(json_match.group())
-                    logger.info(f"✅ ATS optimization analysis completed: {ats_recommendations['recommended_template']}")
-                    return ats_recommendations
-                else:
-                    logger.error("Failed to parse JSON from AI response")
-                    return None
+            # Parse JSON from response
+            import re
+            json_match = re.search(r'\{.*\}', ai_response_text, re.DOTALL)
+            if json_match:
+                ats_recommendations = json.loads(json_match.group())
+                if not from_cache:
+                    self._store_completion(prompt, 4096, ai_response_text)
+                logger.info(f"✅ ATS optimization analysis completed: {ats_recommendations['recommended_template']}")
+                return ats_recommendations
             else:
-                logger.error(f"❌ ATS optimization request failed: {http_response.status_code}")
+                logger.error("Failed to parse JSON from AI response")
                 return None
                 
         except Exception as e:
@@ -242,65 +216,26 @@ Return ONLY the JSON, no other text."""
             # Call Minimax API via direct HTTP requests (more reliable than anthropic client)
             logger.info("Calling MiniMax M2.1 via HTTP requests...")
             
-            import requests
-            import os
-            
-            api_key = os.environ.get('ANTHROPIC_API_KEY')
-            base_url = os.environ.get('ANTHROPIC_BASE_URL', 'https://api.minimax.io/anthropic')
-            
-            if not api_key:
-                logger.error("ANTHROPIC_API_KEY not found")
+            ai_response_text, from_cache = self._request_completion(prompt, max_tokens=4096, timeout=60)
+            if ai_response_text is None:
                 return None
             
-            url = f"{base_url}/v1/messages"
-            headers = {
-                'Content-Type': 'application/json',
-                'Authorization': f'Bearer {api_key}',
-                'anthropic-version': '2023-06-01'
-            }
+            # Create a mock response object for compatibility with existing parsing
+            class MockBlock:
+                def __init__(self, text):
+                    self.type = "text"
+                    self.text = text
             
-            payload = {
-                "model": "glm-4.7",  # Z.AI GLM-4.7 model
-                "max_tokens": 4096,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            }
+            class MockResponse:
+                def __init__(self, text):
+                    self.content = [MockBlock(text)]
             
-            http_response = requests.post(url, headers=headers, json=payload, timeout=60)
-            
-            if http_response.status_code == 200:
-                result_data = http_response.json()
-                logger.info("✅ MiniMax M2.1 HTTP request successful!")
-                
-                # Extract text from response
-                ai_response_text = ""
-                if 'content' in result_data:
-                    for block in result_data['content']:
-                        if block.get('type') == 'text':
-                            ai_response_text += block.get('text', '')
-                
-                # Create a mock response object for compatibility with existing parsing
-                class MockBlock:
-                    def __init__(self, text):
-                        self.type = "text"
-                        self.text = text
-                
-                class MockResponse:
-                    def __init__(self, text):
-                        self.content = [MockBlock(text)]
-                
-                response = MockResponse(ai_response_text)
-            else:
-                logger.error(f"❌ MiniMax M2.1 HTTP request failed: {http_response.status_code}")
-                logger.error(f"📝 Response: {http_response.text}")
-                return None
+            response = MockResponse(ai_response_text)
             
             # Parse response
             result = self._parse_ai_response(response)
+            if not from_cache and result != self._default_result():
+                self._store_completion(prompt, 4096, ai_response_text)
             
             logger.info(f"AI analysis completed: {result['role_category']} (confidence: {result['confidence']})")
             return result
@@ -309,6 +244,82 @@ Return ONLY the JSON, no other text."""
             logger.error(f"AI analysis failed: {e}", exc_info=True)
             return None
     
+    def _request_completion(self, prompt: str, max_tokens: int, timeout: int = 60) -> Tuple[Optional[str], bool]:
+        """
+        Send a prompt to the GLM/MiniMax messages endpoint, using the response cache
+        
+        Identical (model, prompt, max_tokens) requests are answered from the
+        persistent LLM response cache instead of a new 30-60s API call.
+        Callers store a fresh (not cached) response with ``_store_completion``
+        once it parsed, so cache hits do not rewrite the entry.
+        
+        Args:
+            prompt: Prompt text
+            max_tokens: Maximum tokens for the completion
+            timeout: HTTP timeout in seconds
+            
+        Returns:
+            (text, from_cache): text content of the response, or None if the
+            request failed, and whether it came from the cache
+        """
+        import requests
+        
+        cache = get_llm_response_cache()
+        if cache:
+            cached_text = cache.get(self.api_model, prompt, max_tokens)
+            if cached_text is not None:
+                return cached_text, True
+        
+        api_key = os.environ.get('ANTHROPIC_API_KEY')
+        base_url = os.environ.get('ANTHROPIC_BASE_URL', 'https://api.minimax.io/anthropic')
+        
+        if not api_key:
+            logger.error("ANTHROPIC_API_KEY not found")
+            return None, False
+        
+        url = f"{base_url}/v1/messages"
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {api_key}',
+            'anthropic-version': '2023-06-01'
+        }
+        
+        payload = {
+            "model": self.api_model,
+            "max_tokens": max_tokens,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+        
+        http_response = requests.post(url, headers=headers, json=payload, timeout=timeout)
+        
+        if http_response.status_code != 200:
+            logger.error(f"❌ MiniMax M2.1 HTTP request failed: {http_response.status_code}")
+            logger.error(f"📝 Response: {http_response.text}")
+            return None, False
+        
+        result_data = http_response.json()
+        logger.info("✅ MiniMax M2.1 HTTP request successful!")
+        
+        # Extract text from response
+        ai_response_text = ""
+        if 'content' in result_data:
+            for block in result_data['content']:
+                if block.get('type') == 'text':
+                    ai_response_text += block.get('text', '')
+        
+        return ai_response_text, False
+    
+    def _store_completion(self, prompt: str, max_tokens: int, response_text: str) -> None:
+        """Cache a completion that was parsed successfully"""
+        cache = get_llm_response_cache()
+        if cache:
+            cache.set(self.api_model, prompt, max_tokens, response_text)
+    
     def extract_role_type(self, job_description: str) -> Tuple[Optional[str], float]:
         """
         Extract role type and confidence from job description
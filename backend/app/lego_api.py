@@ -3,12 +3,11 @@
 Handles job analysis, LEGO bricks assembly, and PDF generation
 """
 
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, Response, request, jsonify, send_file
 from pathlib import Path
 import sys
 import os
 import json
-import subprocess
 import re
 from datetime import datetime
 
@@ -21,6 +20,11 @@ from cv_templates import CVTemplateManager
 from ai_analyzer import AIAnalyzer
 from ai_resume_prompts import AIResumePrompts
 from linkedin_job_extractor import extract_linkedin_job_info_from_content
+from llm_response_cache import get_llm_response_cache
+from generation_jobs import DEFAULT_STREAM_SECONDS, get_generation_job_queue
+from artifact_store import get_artifact_store
+from app.services.latex_compiler import get_latex_compiler
+from app.services.http_client import get_http_client
 
 lego_api = Blueprint('lego_api', __name__)
 
@@ -996,11 +1000,12 @@ def analyze_job_description(job_description: str, job_url: str = None) -> dict:
     
     role_info = template_manager.get_role_info(role_category)
     
-    # Get percentage-based analysis
+    # Get percentage-based analysis (computed once per description and cached)
     try:
-        role_percentages = template_manager.get_role_percentages(job_description)
-        role_breakdown = template_manager.get_role_breakdown(job_description, threshold=5.0)
-        role_scores = template_manager.get_role_scores(job_description)
+        role_analysis = template_manager.analyze(job_description)
+        role_percentages = dict(role_analysis.percentages)
+        role_breakdown = list(role_analysis.breakdown)
+        role_scores = dict(role_analysis.scores)
         
         # Calculate confidence score based on percentage distribution
         if role_breakdown:
@@ -2254,6 +2259,14 @@ Format: {{"overall_score": 85, "ready_to_send": true, "critical_issues": []}}"""
             "messages": [{"role": "user", "content": prompt}]
         }
         
+        # Unchanged documents for the same posting reuse the previous review
+        llm_cache = get_llm_response_cache()
+        cached_review = llm_cache.get(payload['model'], prompt, payload['max_tokens']) if llm_cache else None
+        if cached_review is not None:
+            quality_result = json.loads(cached_review)
+            print(f"✅ AI Quality Check (cached): {quality_result.get('overall_score', 'N/A')}/100")
+            return quality_result
+        
         response = requests.post(url, headers=headers, json=payload, timeout=30)
         
         if response.status_code == 200:
@@ -2270,6 +2283,8 @@ Format: {{"overall_score": 85, "ready_to_send": true, "critical_issues": []}}"""
             json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
             if json_match:
                 quality_result = json.loads(json_match.group())
+                if llm_cache:
+                    llm_cache.set(payload['model'], prompt, payload['max_tokens'], json_match.group())
                 print(f"✅ AI Quality Check completed: {quality_result.get('overall_score', 'N/A')}/100")
                 return quality_result
             else:
@@ -2291,7 +2306,9 @@ def health_check():
         'status': 'healthy',
         'service': 'JobHunter LEGO API',
         'timestamp': datetime.now().isoformat(),
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'latexCompiler': get_latex_compiler().get_metrics(),
+        'httpClient': get_http_client().get_stats()
     }), 200
 
 
@@ -2397,11 +2414,19 @@ def update_job_info():
         return jsonify({'error': str(e)}), 500
 
 
-@lego_api.route('/api/generate-lego-application', methods=['POST'])
-def generate_lego_application():
-    """Generate CV and Cover Letter using LEGO bricks"""
+def run_lego_generation(data: dict, report_stage=None) -> tuple:
+    """
+    Run the LEGO generation pipeline (URL extraction, build, AI review, PDF compile)
+    
+    Args:
+        data: Request body of /api/generate-lego-application
+        report_stage: Optional callback invoked with each pipeline stage name
+        
+    Returns:
+        Tuple of (response dict, HTTP status code)
+    """
+    report_stage = report_stage or (lambda stage: None)
     try:
-        data = request.json
         job_description = data.get('jobDescription', '')
         job_url = data.get('jobUrl', '')
         analysis = data.get('analysis', {})
@@ -2409,6 +2434,7 @@ def generate_lego_application():
 
         # EXTRACT FROM URL IF PROVIDED: Use backend URL extraction for accurate parsing
         if job_url and job_url.strip():
+            report_stage('extracting_url')
             print(f"🔗 Extracting job details from URL: {job_url}")
             try:
                 from app.services.job_url_extractor import JobUrlExtractor
@@ -2469,11 +2495,13 @@ def generate_lego_application():
             role_type = 'DevOps Cloud'
 
         # Build LaTeX documents with AI-powered content customization
+        report_stage('building_documents')
         print(f"[API DEBUG] About to generate documents with - Company: '{company}', Title: '{title}', Role Type: '{role_type}', Role Category: '{role_category}'")
         cv_latex = build_lego_cv(role_type, company, title, role_category, job_description, customization_notes)
         cl_latex = build_lego_cover_letter(role_type, company, title, role_category, job_description, customization_notes)
         
         # AI QUALITY CHECK: Review generated documents against job description
+        report_stage('ai_review')
         print(f"🤖 Running AI quality check on generated documents...")
         quality_check = ai_review_documents(cv_latex, cl_latex, job_description, company, title)
         print(f"📊 AI Quality Check Results: {quality_check.get('overall_score', 'N/A')}/100")
@@ -2486,9 +2514,10 @@ def generate_lego_application():
         else:
             print(f"✅ Documents passed AI quality check")
         
-        # Create output directory
-        output_dir = Path('generated_applications') / datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # Create a unique output folder (concurrent requests never share one)
+        output_dir = get_artifact_store().create_application({
+            'company': company, 'title': title, 'role_category': role_category
+        })
         
         # Generate smart filenames based on company name
         company_safe = sanitize_filename(company)
@@ -2496,65 +2525,38 @@ def generate_lego_application():
         cl_filename = f'cl_harvad_{company_safe}.pdf'
         
         # Save LaTeX files
-        cv_tex_path = output_dir / 'cv.tex'
-        cl_tex_path = output_dir / 'cl.tex'
-        
-        with open(cv_tex_path, 'w', encoding='utf-8') as f:
-            f.write(cv_latex)
+        output_dir.write_text('cv.tex', cv_latex)
+        output_dir.write_text('cl.tex', cl_latex)
         
-        with open(cl_tex_path, 'w', encoding='utf-8') as f:
-            f.write(cl_latex)
-        
-        # Compile to PDF (temporary names)
-        cv_pdf_temp = output_dir / 'cv.pdf'
-        cl_pdf_temp = output_dir / 'cl.pdf'
-        
-        # Compile CV
-        cv_result = subprocess.run(
-            ['pdflatex', '-interaction=nonstopmode', '-output-directory', str(output_dir), str(cv_tex_path)],
-            capture_output=True,
-            timeout=30,
-            text=True
-        )
+        # Compile CV and CL concurrently on the shared LaTeX worker pool
+        report_stage('compiling_pdfs')
+        compile_results = get_latex_compiler().compile_many({'cv': cv_latex, 'cl': cl_latex})
+        cv_result = compile_results['cv']
+        cl_result = compile_results['cl']
         
         if cv_result.returncode != 0:
-            print(f"CV PDF compilation error: {cv_result.stderr}")
+            print(f"CV PDF compilation error: {cv_result.error or cv_result.stderr}")
             print(f"CV PDF compilation output: {cv_result.stdout}")
         
-        # Compile CL
-        cl_result = subprocess.run(
-            ['pdflatex', '-interaction=nonstopmode', '-output-directory', str(output_dir), str(cl_tex_path)],
-            capture_output=True,
-            timeout=30,
-            text=True
-        )
-        
         if cl_result.returncode != 0:
-            print(f"CL PDF compilation error: {cl_result.stderr}")
+            print(f"CL PDF compilation error: {cl_result.error or cl_result.stderr}")
             print(f"CL PDF compilation output: {cl_result.stdout}")
         
         # Check if PDFs were created
-        if not cv_pdf_temp.exists():
-            print(f"ERROR: CV PDF was not created at {cv_pdf_temp}")
-            return jsonify({'error': 'CV PDF compilation failed'}), 500
+        if not cv_result.has_pdf:
+            print(f"ERROR: CV PDF was not created ({cv_result.error})")
+            return {'error': 'CV PDF compilation failed'}, 500
         
-        if not cl_pdf_temp.exists():
-            print(f"ERROR: CL PDF was not created at {cl_pdf_temp}")
-            return jsonify({'error': 'CL PDF compilation failed'}), 500
+        if not cl_result.has_pdf:
+            print(f"ERROR: CL PDF was not created ({cl_result.error})")
+            return {'error': 'CL PDF compilation failed'}, 500
         
-        # Rename PDFs to smart filenames
-        cv_pdf_path = output_dir / cv_filename
-        cl_pdf_path = output_dir / cl_filename
-        cv_pdf_temp.rename(cv_pdf_path)
-        cl_pdf_temp.rename(cl_pdf_path)
+        # Save PDFs under smart filenames
+        output_dir.write_bytes(cv_filename, cv_result.pdf_content)
+        output_dir.write_bytes(cl_filename, cl_result.pdf_content)
         
         print(f"✅ Generated files: {cv_filename}, {cl_filename}")
         
-        # Clean up auxiliary files
-        for ext in ['.aux', '.log', '.out']:
-            for file in output_dir.glob(f'*{ext}'):
-                file.unlink()
-        
         # Include percentage breakdown in response
         response_data = {
             'success': True,
@@ -2567,7 +2569,7 @@ def generate_lego_application():
             'templateInfo': {
                 'selectedRole': role_category,
                 'selectedRoleDisplay': role_type,
-                'templateUsed': str(template_manager.get_template_path(role_category, 'cv')) if template_manager.get_template_path(role_category, 'cv') else 'fallback'
+                'templateUsed': str(template_manager.get_template_path(role_category, 'cv') or 'fallback')
             }
         }
         
@@ -2582,21 +2584,80 @@ def generate_lego_application():
         # Add AI quality check results
         response_data['qualityCheck'] = quality_check
         
-        return jsonify(response_data)
+        return response_data, 200
         
     except Exception as e:
         print(f"Error in generate_lego_application: {e}")
         import traceback
         traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        return {'error': str(e)}, 500
+
+
+@lego_api.route('/api/generate-lego-application', methods=['POST'])
+def generate_lego_application():
+    """
+    Generate CV and Cover Letter using LEGO bricks
+    
+    With ``"async": true`` in the body (or ``?async=1``) the pipeline runs on the
+    background job queue and a job id is returned immediately (202). Clients poll
+    ``statusUrl``; ``eventsUrl`` is an optional, time-boxed SSE stream.
+    """
+    data = request.json or {}
+    
+    if data.get('async') or request.args.get('async', '').lower() in ('1', 'true'):
+        try:
+            job_id = get_generation_job_queue(run_lego_generation).submit(data)
+        except Exception as e:
+            return jsonify({'error': f'Could not queue generation job: {e}'}), 500
+        
+        return jsonify({
+            'success': True,
+            'jobId': job_id,
+            'status': 'queued',
+            'statusUrl': f'/api/generation-jobs/{job_id}',
+            'eventsUrl': f'/api/generation-jobs/{job_id}/events'
+        }), 202
+    
+    response_data, status_code = run_lego_generation(data)
+    return jsonify(response_data), status_code
+
+
+@lego_api.route('/api/generation-jobs/<job_id>', methods=['GET'])
+def get_generation_job(job_id):
+    """Poll the state of a queued generation job"""
+    job = get_generation_job_queue(run_lego_generation).get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+
+@lego_api.route('/api/generation-jobs/<job_id>/events', methods=['GET'])
+def stream_generation_job(job_id):
+    """
+    Stream stage-by-stage progress of a generation job as Server-Sent Events
+    
+    Each connection closes after GENERATION_EVENTS_MAX_SECONDS (default 20s) so
+    it never outlives a sync gunicorn worker's timeout; EventSource reconnects
+    with Last-Event-ID. Polling /api/generation-jobs/<job_id> is the default path.
+    """
+    queue = get_generation_job_queue(run_lego_generation)
+    if queue.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    events = queue.iter_events(
+        job_id,
+        last_event_id=request.headers.get('Last-Event-ID'),
+        max_seconds=float(os.getenv('GENERATION_EVENTS_MAX_SECONDS', DEFAULT_STREAM_SECONDS))
+    )
+    return Response(events, mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @lego_api.route('/api/download/<folder>/<filename>')
 def download_file(folder, filename):
     """Download generated PDF"""
     try:
-        file_path = Path('generated_applications') / folder / filename
-        if file_path.exists():
+        file_path = get_artifact_store().resolve(folder, filename)
+        if file_path:
             # Set proper filename for download
             download_name = filename
             return send_file(file_path, as_attachment=True, download_name=download_name)
@@ -2609,8 +2670,8 @@ def download_file(folder, filename):
 def preview_file(folder, filename):
     """Preview generated PDF"""
     try:
-        file_path = Path('generated_applications') / folder / filename
-        if file_path.exists():
+        file_path = get_artifact_store().resolve(folder, filename)
+        if file_path:
             return send_file(file_path, mimetype='application/pdf', download_name=filename)
         return jsonify({'error': 'File not found'}), 404
     except Exception as e:
@@ -2668,57 +2729,34 @@ def generate_comprehensive_application():
         cv_latex = build_lego_cv(role_type, company, title, role_category, job_description)
         cl_latex = build_lego_cover_letter(role_type, company, title, role_category)
         
-        # Create output directory
-        output_dir = Path('generated_applications') / datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_dir.mkdir(parents=True, exist_ok=True)
+        # Create a unique output folder (concurrent requests never share one)
+        output_dir = get_artifact_store().create_application({
+            'company': company, 'title': title, 'role_category': role_category
+        })
         
         # Save LaTeX files
-        cv_tex_path = output_dir / 'cv.tex'
-        cl_tex_path = output_dir / 'cl.tex'
-        
-        with open(cv_tex_path, 'w', encoding='utf-8') as f:
-            f.write(cv_latex)
-        
-        with open(cl_tex_path, 'w', encoding='utf-8') as f:
-            f.write(cl_latex)
+        output_dir.write_text('cv.tex', cv_latex)
+        output_dir.write_text('cl.tex', cl_latex)
         
-        # Compile to PDF
-        cv_pdf_path = output_dir / 'cv.pdf'
-        cl_pdf_path = output_dir / 'cl.pdf'
-        
-        # Compile CV
-        cv_result = subprocess.run(
-            ['pdflatex', '-interaction=nonstopmode', '-output-directory', str(output_dir), str(cv_tex_path)],
-            capture_output=True,
-            timeout=30,
-            text=True
-        )
+        # Compile CV and CL concurrently on the shared LaTeX worker pool
+        compile_results = get_latex_compiler().compile_many({'cv': cv_latex, 'cl': cl_latex})
+        cv_result = compile_results['cv']
+        cl_result = compile_results['cl']
         
         if cv_result.returncode != 0:
-            print(f"CV PDF compilation error: {cv_result.stderr}")
-        
-        # Compile CL
-        cl_result = subprocess.run(
-            ['pdflatex', '-interaction=nonstopmode', '-output-directory', str(output_dir), str(cl_tex_path)],
-            capture_output=True,
-            timeout=30,
-            text=True
-        )
+            print(f"CV PDF compilation error: {cv_result.error or cv_result.stderr}")
         
         if cl_result.returncode != 0:
-            print(f"CL PDF compilation error: {cl_result.stderr}")
+            print(f"CL PDF compilation error: {cl_result.error or cl_result.stderr}")
         
         # Check if PDFs were created
-        if not cv_pdf_path.exists():
+        if not cv_result.has_pdf:
             return jsonify({'error': 'CV PDF compilation failed'}), 500
+        output_dir.write_bytes('cv.pdf', cv_result.pdf_content)
         
-        if not cl_pdf_path.exists():
+        if not cl_result.has_pdf:
             return jsonify({'error': 'CL PDF compilation failed'}), 500
-        
-        # Clean up auxiliary files
-        for ext in ['.aux', '.log', '.out']:
-            for file in output_dir.glob(f'*{ext}'):
-                file.unlink()
+        output_dir.write_bytes('cl.pdf', cl_result.pdf_content)
         
         # Generate all 5 AI enhancement prompts
         ai_prompts_dict = generate_ai_enhancement_prompts(
@@ -2729,9 +2767,7 @@ def generate_comprehensive_application():
         )
         
         # Save AI prompts to JSON file
-        prompts_path = output_dir / 'ai_enhancement_prompts.json'
-        with open(prompts_path, 'w', encoding='utf-8') as f:
-            json.dump(ai_prompts_dict, f, indent=2, ensure_ascii=False)
+        output_dir.write_json('ai_enhancement_prompts.json', ai_prompts_dict)
         
         return jsonify({
             'success': True,
@@ -2872,27 +2908,20 @@ Format your response as JSON:
             if json_match:
                 result = json.loads(json_match.group())
                 
-                # Create output directory and compile PDFs
-                output_dir = Path('generated_applications') / datetime.now().strftime('%Y%m%d_%H%M%S')
-                output_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Save and compile CV
-                cv_tex_path = output_dir / 'cv.tex'
-                with open(cv_tex_path, 'w', encoding='utf-8') as f:
-                    f.write(result['cvLatex'])
+                # Create a unique output folder and compile PDFs
+                output_dir = get_artifact_store().create_application({
+                    'company': result.get('company'), 'title': result.get('title'), 'model': 'Z.AI GLM-4.7'
+                })
                 
-                # Save and compile CL
-                cl_tex_path = output_dir / 'cl.tex'
-                with open(cl_tex_path, 'w', encoding='utf-8') as f:
-                    f.write(result['clLatex'])
+                # Save LaTeX sources
+                output_dir.write_text('cv.tex', result['cvLatex'])
+                output_dir.write_text('cl.tex', result['clLatex'])
                 
-                # Compile PDFs
-                for tex_file in [cv_tex_path, cl_tex_path]:
-                    subprocess.run(
-                        ['pdflatex', '-interaction=nonstopmode', '-output-directory', str(output_dir), str(tex_file)],
-                        capture_output=True,
-                        timeout=30
-                    )
+                # Compile PDFs concurrently on the shared LaTeX worker pool
+                compile_results = get_latex_compiler().compile_many({'cv': result['cvLatex'], 'cl': result['clLatex']})
+                for name, compile_result in compile_results.items():
+                    if compile_result.has_pdf:
+                        output_dir.write_bytes(f'{name}.pdf', compile_result.pdf_content)
                 
                 return jsonify({
                     'success': True,
@@ -2977,27 +3006,20 @@ Format your response as JSON:
         if json_match:
             result = json.loads(json_match.group())
             
-            # Create output directory and compile PDFs
-            output_dir = Path('generated_applications') / datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Save and compile CV
-            cv_tex_path = output_dir / 'cv.tex'
-            with open(cv_tex_path, 'w', encoding='utf-8') as f:
-                f.write(result['cvLatex'])
+            # Create a unique output folder and compile PDFs
+            output_dir = get_artifact_store().create_application({
+                'company': result.get('company'), 'title': result.get('title'), 'model': 'MiniMax'
+            })
             
-            # Save and compile CL
-            cl_tex_path = output_dir / 'cl.tex'
-            with open(cl_tex_path, 'w', encoding='utf-8') as f:
-                f.write(result['clLatex'])
+            # Save LaTeX sources
+            output_dir.write_text('cv.tex', result['cvLatex'])
+            output_dir.write_text('cl.tex', result['clLatex'])
             
-            # Compile PDFs
-            for tex_file in [cv_tex_path, cl_tex_path]:
-                subprocess.run(
-                    ['pdflatex', '-interaction=nonstopmode', '-output-directory', str(output_dir), str(tex_file)],
-                    capture_output=True,
-                    timeout=30
-                )
+            # Compile PDFs concurrently on the shared LaTeX worker pool
+            compile_results = get_latex_compiler().compile_many({'cv': result['cvLatex'], 'cl': result['clLatex']})
+            for name, compile_result in compile_results.items():
+                if compile_result.has_pdf:
+                    output_dir.write_bytes(f'{name}.pdf', compile_result.pdf_content)
             
             return jsonify({
                 'success': True,
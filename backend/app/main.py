@@ -5,11 +5,13 @@ from contextlib import asynccontextmanager
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.database import connect_to_database, close_database_connection, check_database_health
+from app.services.processed_job_index import warm_processed_job_index
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await connect_to_database()
+    await warm_processed_job_index()
     yield
     # Shutdown
     await close_database_connection()
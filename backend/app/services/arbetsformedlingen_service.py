@@ -1,8 +1,8 @@
-import aiohttp
 import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.services.http_client import get_http_client
 import logging
 import urllib.parse
 
@@ -89,7 +89,7 @@ class ArbetsformedlingenService:
         
         url = f"{self.base_url}/search"
         
-        async with aiohttp.ClientSession() as session:
+        async with get_http_client().session() as session:
             try:
                 async with session.get(url, params=params, timeout=30) as response:
                     if response.status == 200:
@@ -571,7 +571,7 @@ class ArbetsformedlingenService:
         
         url = f"{self.base_url}/ad/{job_id}"
         
-        async with aiohttp.ClientSession() as session:
+        async with get_http_client().session() as session:
             try:
                 async with session.get(url, timeout=10) as response:
                     if response.status == 200:
@@ -597,7 +597,7 @@ class ArbetsformedlingenService:
         
         url = f"{self.base_url}/search"
         
-        async with aiohttp.ClientSession() as session:
+        async with get_http_client().session() as session:
             try:
                 async with session.get(url, params=params, timeout=30) as response:
                     if response.status == 200:
@@ -626,7 +626,7 @@ class ArbetsformedlingenService:
         
         url = f"{self.base_url}/statistics"
         
-        async with aiohttp.ClientSession() as session:
+        async with get_http_client().session() as session:
             try:
                 async with session.get(url, params=params, timeout=10) as response:
                     if response.status == 200:
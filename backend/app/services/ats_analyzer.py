@@ -5,7 +5,7 @@ Comprehensive ATS compatibility checker with detailed scoring and recommendation
 """
 import re
 import logging
-from typing import Dict, List, Optional, Tuple, Set
+from typing import Dict, Iterable, List, Optional, Tuple, Set
 from dataclasses import dataclass
 from collections import Counter, defaultdict
 import math
@@ -13,6 +13,44 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Terms as they appear in keyword lists: 'c#', 'c++', '.net', 'ci/cd', 'objective-c'
+_TOKEN_PATTERN = re.compile(r'\.?[a-z0-9+#]+(?:[./-][a-z0-9+#]+)*')
+_COMPOUND_SEPARATOR_PATTERN = re.compile(r'[./-]+')
+_LATEX_COMMAND_PATTERN = re.compile(r'\\[a-zA-Z]+\{[^}]*\}')
+_LATEX_SYMBOL_PATTERN = re.compile(r'[{}\\]')
+_SENTENCE_END_PATTERN = re.compile(r'[.!?]+')
+_PASSIVE_INDICATORS = frozenset(['was', 'were', 'been', 'being'])
+
+
+def term_frequencies(text: str, phrases: Iterable[str] = ()) -> Counter:
+    """
+    Count every term of a document in one pass
+    
+    Compound tokens also count their parts ('ci/cd' adds 'ci' and 'cd') and
+    the LaTeX escape in 'C\\#' is undone. Multi-word ``phrases`` are
+    counted as whole-token sequences ('load balancer').
+    
+    Args:
+        text: Document text or LaTeX source
+        phrases: Lowercase multi-word terms that will be looked up
+        
+    Returns:
+        Counter of lowercase terms (missing terms count 0)
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower().replace('\\#', '#'))
+    counts = Counter(tokens)
+    for token, count in list(counts.items()):
+        if _COMPOUND_SEPARATOR_PATTERN.search(token, 1):
+            for part in _COMPOUND_SEPARATOR_PATTERN.split(token):
+                if part:
+                    counts[part] += count
+    
+    if phrases:
+        joined = f" {' '.join(tokens)} "
+        for phrase in phrases:
+            counts[phrase] = joined.count(f" {phrase} ")
+    return counts
+
 @dataclass
 class ATSAnalysisResult:
     """Comprehensive ATS analysis result"""
@@ -38,6 +76,74 @@ class KeywordDensity:
 class ATSAnalyzer:
     """Advanced ATS compatibility analyzer with industry-standard scoring"""
     
+    # Vocabulary _extract_job_specific_keywords looks for in job postings (the lists overlap;
+    # JOB_KEYWORD_TERMS is their union, built once)
+    _PRACTICE_TERMS = (
+        'programming', 'coding', 'development', 'software', 'application', 'system', 'platform',
+        'framework', 'library', 'database', 'cloud', 'devops', 'infrastructure', 'deployment', 'monitoring',
+        'testing', 'automation', 'integration', 'architecture', 'design', 'security', 'performance',
+        'optimization', 'scalability', 'reliability', 'maintenance', 'troubleshooting', 'debugging',
+        'documentation', 'collaboration', 'leadership', 'mentoring', 'training', 'project management',
+        'agile', 'scrum', 'kanban', 'ci/cd', 'version control', 'api', 'microservices', 'containerization',
+        'virtualization', 'networking', 'storage', 'backup', 'disaster recovery', 'compliance',
+        'governance', 'best practices', 'standards', 'methodologies', 'tools', 'technologies', 'solutions',
+        'innovations', 'improvements', 'enhancements', 'migrations', 'upgrades', 'implementations',
+        'configurations', 'customizations', 'integrations', 'optimizations', 'automations', 'streamlining',
+        'efficiency', 'productivity', 'quality', 'guidelines', 'procedures', 'processes', 'workflows',
+        'pipelines', 'delivery', 'operations', 'support', 'alerting', 'logging', 'reporting', 'analytics',
+        'metrics', 'dashboards', 'visualizations', 'insights', 'recommendations', 'strategies', 'planning',
+        'roadmaps', 'architectures', 'designs', 'specifications', 'requirements', 'analysis', 'research',
+        'evaluation', 'assessment', 'review', 'audit', 'validation', 'verification', 'quality assurance',
+        'quality control', 'performance testing', 'load testing', 'stress testing', 'security testing',
+        'penetration testing', 'vulnerability assessment', 'risk assessment', 'threat modeling',
+        'incident response', 'business continuity', 'risk management', 'change management',
+        'configuration management', 'release management', 'deployment management', 'environment management',
+        'capacity planning', 'resource management', 'cost optimization', 'budget management',
+        'vendor management', 'contract management', 'procurement', 'sourcing', 'selection',
+        'implementation', 'onboarding', 'improvement', 'innovation', 'transformation', 'modernization',
+        'migration', 'upgrade', 'consolidation', 'standardization', 'availability'
+    )
+    _TECHNOLOGY_TERMS = (
+        'java', 'python', 'javascript', 'typescript', 'c#', '.net', 'php', 'ruby', 'go', 'rust', 'scala',
+        'kotlin', 'swift', 'objective-c', 'c++', 'c', 'perl', 'bash', 'powershell', 'sql', 'nosql', 'html',
+        'css', 'xml', 'json', 'yaml', 'toml', 'markdown', 'latex', 'regex', 'linux', 'unix', 'windows',
+        'macos', 'ios', 'android', 'web', 'mobile', 'desktop', 'server', 'client', 'frontend', 'backend',
+        'fullstack', 'database', 'api', 'rest', 'graphql', 'soap', 'microservices', 'monolith',
+        'containerization', 'virtualization', 'cloud', 'aws', 'azure', 'gcp', 'docker', 'kubernetes',
+        'terraform', 'ansible', 'chef', 'puppet', 'jenkins', 'gitlab', 'github', 'bitbucket', 'git', 'svn',
+        'mercurial', 'bazaar', 'maven', 'gradle', 'npm', 'yarn', 'pip', 'composer', 'bundler', 'cargo',
+        'nuget', 'webpack', 'babel', 'eslint', 'prettier', 'jest', 'mocha', 'junit', 'testng', 'selenium',
+        'cypress', 'postman', 'insomnia', 'swagger', 'openapi', 'jira', 'confluence', 'slack', 'teams',
+        'zoom', 'skype', 'email', 'phone', 'chat', 'video', 'audio', 'text', 'voice', 'data', 'file',
+        'image', 'document', 'spreadsheet', 'presentation', 'pdf', 'word', 'excel', 'powerpoint', 'outlook',
+        'gmail', 'calendar', 'task', 'project', 'issue', 'bug', 'feature', 'enhancement', 'improvement',
+        'fix', 'patch', 'update', 'upgrade', 'migration', 'deployment', 'release', 'rollback', 'hotfix',
+        'maintenance', 'support', 'training', 'documentation', 'wiki', 'knowledge base', 'faq', 'tutorial',
+        'guide', 'manual', 'handbook', 'policy', 'procedure', 'standard', 'guideline', 'best practice',
+        'framework', 'methodology', 'process', 'workflow', 'pipeline', 'automation', 'scripting', 'coding',
+        'programming', 'development', 'design', 'architecture', 'engineering', 'analysis', 'research',
+        'planning', 'strategy', 'roadmap', 'vision', 'mission', 'goal', 'objective', 'target', 'milestone',
+        'deliverable', 'requirement', 'specification', 'acceptance criteria', 'user story', 'epic',
+        'subtask', 'defect', 'incident', 'problem', 'change request', 'optimization', 'refactoring',
+        'cleanup', 'troubleshooting', 'debugging', 'monitoring', 'alerting', 'logging', 'reporting',
+        'analytics', 'metrics', 'dashboard', 'visualization', 'insight', 'recommendation', 'action item',
+        'follow-up', 'next step', 'todo', 'backlog', 'sprint', 'iteration', 'version', 'branch', 'tag',
+        'commit', 'merge', 'pull request', 'code review', 'pair programming', 'mob programming',
+        'test-driven development', 'behavior-driven development', 'domain-driven design',
+        'event-driven architecture', 'service-oriented architecture', 'microservices architecture',
+        'serverless architecture', 'cloud-native architecture', 'distributed systems', 'high availability',
+        'fault tolerance', 'disaster recovery', 'business continuity', 'scalability', 'performance',
+        'security', 'privacy', 'compliance', 'governance', 'risk management', 'change management',
+        'configuration management', 'release management', 'deployment management', 'environment management',
+        'capacity planning', 'resource management', 'cost optimization', 'budget management',
+        'vendor management', 'contract management', 'procurement', 'sourcing', 'evaluation', 'selection',
+        'implementation', 'onboarding', 'operations', 'innovation', 'transformation', 'modernization',
+        'consolidation', 'standardization', 'streamlining', 'efficiency', 'productivity', 'quality',
+        'reliability', 'availability'
+    )
+    JOB_KEYWORD_TERMS = frozenset(_PRACTICE_TERMS + _TECHNOLOGY_TERMS)
+    JOB_KEYWORD_MAX_WORDS = max(len(term.split()) for term in JOB_KEYWORD_TERMS)
+    
     def __init__(self):
         self.industry_keywords = self._load_industry_keywords()
         self.ats_requirements = self._load_ats_requirements()
@@ -134,6 +240,11 @@ class ATSAnalyzer:
     async def analyze_document(self, document_content: str, job_description: str, 
                              job_title: str, document_type: str = 'cv') -> ATSAnalysisResult:
         """Perform comprehensive ATS analysis on document"""
+        return self.analyze_document_sync(document_content, job_description, job_title, document_type)
+    
+    def analyze_document_sync(self, document_content: str, job_description: str,
+                              job_title: str, document_type: str = 'cv') -> ATSAnalysisResult:
+        """Perform comprehensive ATS analysis on document (pure CPU work, safe to run in a worker process)"""
         
         logger.info(f"Starting ATS analysis for {document_type} - {job_title}")
         
@@ -217,7 +328,6 @@ class ATSAnalyzer:
                          job_title: str, industry: str) -> Dict:
         """Comprehensive keyword analysis"""
         
-        doc_lower = document.lower()
         job_lower = f"{job_title} {job_description}".lower()
         
         # Get industry-specific keywords
@@ -226,6 +336,12 @@ class ATSAnalyzer:
         # Extract job-specific keywords
         job_keywords = self._extract_job_specific_keywords(job_lower)
         
+        # Tokenize once; every count below is a lookup
+        term_counts = term_frequencies(
+            document, [keyword for keyword in [*industry_keywords, *job_keywords] if ' ' in keyword]
+        )
+        word_count = len(document.split())
+        
         # Analyze keyword presence and density
         keyword_analysis = {
             'industry_matches': {},
@@ -241,10 +357,10 @@ class ATSAnalyzer:
         total_industry_weight = sum(industry_keywords.values()) if industry_keywords else 1
         
         for keyword, weight in industry_keywords.items():
-            count = doc_lower.count(keyword)
+            count = term_counts[keyword]
             if count > 0:
                 industry_matches += weight
-                density = (count / len(document.split())) * 100
+                density = (count / word_count) * 100
                 keyword_analysis['industry_matches'][keyword] = {
                     'count': count,
                     'weight': weight,
@@ -257,7 +373,7 @@ class ATSAnalyzer:
         # Job-specific keyword analysis
         job_matches = 0
         for keyword in job_keywords:
-            count = doc_lower.count(keyword)
+            count = term_counts[keyword]
             if count > 0:
                 job_matches += 1
                 keyword_analysis['job_specific_matches'][keyword] = count
@@ -284,20 +400,27 @@ class ATSAnalyzer:
         return keyword_analysis
     
     def _extract_job_specific_keywords(self, job_text: str) -> List[str]:
-        """Extract job-specific technical keywords"""
-        
-        # Technical keyword patterns
-        patterns = [
-            r'\b(?:programming|coding|development|software|application|system|platform|framework|library|database|cloud|devops|infrastructure|deployment|monitoring|testing|automation|integration|architecture|design|security|performance|optimization|scalability|reliability|maintenance|troubleshooting|debugging|documentation|collaboration|leadership|mentoring|training|project management|agile|scrum|kanban|ci/cd|version control|api|microservices|containerization|virtualization|networking|storage|backup|disaster recovery|compliance|governance|best practices|standards|methodologies|tools|technologies|solutions|innovations|improvements|enhancements|migrations|upgrades|implementations|configurations|customizations|integrations|optimizations|automations|streamlining|efficiency|productivity|quality|standards|guidelines|procedures|processes|workflows|pipelines|deployment|delivery|operations|maintenance|support|troubleshooting|monitoring|alerting|logging|reporting|analytics|metrics|dashboards|visualizations|insights|recommendations|strategies|planning|roadmaps|architectures|designs|specifications|requirements|analysis|research|evaluation|assessment|review|audit|validation|verification|testing|quality assurance|quality control|performance testing|load testing|stress testing|security testing|penetration testing|vulnerability assessment|risk assessment|threat modeling|incident response|disaster recovery|business continuity|compliance|governance|risk management|change management|configuration management|release management|deployment management|environment management|capacity planning|resource management|cost optimization|budget management|vendor management|contract management|procurement|sourcing|evaluation|selection|implementation|onboarding|training|support|maintenance|operations|monitoring|reporting|analysis|optimization|improvement|innovation|transformation|modernization|migration|upgrade|consolidation|standardization|automation|streamlining|efficiency|productivity|quality|reliability|security|performance|scalability|availability|disaster recovery|business continuity|compliance|governance|risk management|change management|configuration management|release management|deployment management|environment management|capacity planning|resource management|cost optimization|budget management)\b',
-            r'\b(?:java|python|javascript|typescript|c#|\.net|php|ruby|go|rust|scala|kotlin|swift|objective-c|c\+\+|c|perl|bash|powershell|sql|nosql|html|css|xml|json|yaml|toml|markdown|latex|regex|linux|unix|windows|macos|ios|android|web|mobile|desktop|server|client|frontend|backend|fullstack|database|api|rest|graphql|soap|microservices|monolith|containerization|virtualization|cloud|aws|azure|gcp|docker|kubernetes|terraform|ansible|chef|puppet|jenkins|gitlab|github|bitbucket|git|svn|mercurial|bazaar|maven|gradle|npm|yarn|pip|composer|bundler|cargo|nuget|webpack|babel|eslint|prettier|jest|mocha|junit|testng|selenium|cypress|postman|insomnia|swagger|openapi|jira|confluence|slack|teams|zoom|skype|email|phone|chat|video|audio|text|voice|data|file|image|video|audio|document|spreadsheet|presentation|pdf|word|excel|powerpoint|outlook|gmail|calendar|task|project|issue|bug|feature|enhancement|improvement|fix|patch|update|upgrade|migration|deployment|release|rollback|hotfix|maintenance|support|training|documentation|wiki|knowledge base|faq|tutorial|guide|manual|handbook|policy|procedure|standard|guideline|best practice|framework|methodology|process|workflow|pipeline|automation|scripting|coding|programming|development|design|architecture|engineering|analysis|research|planning|strategy|roadmap|vision|mission|goal|objective|target|milestone|deliverable|requirement|specification|acceptance criteria|user story|epic|feature|task|subtask|bug|defect|issue|incident|problem|change request|enhancement|improvement|optimization|refactoring|cleanup|maintenance|support|troubleshooting|debugging|monitoring|alerting|logging|reporting|analytics|metrics|dashboard|visualization|insight|recommendation|action item|follow-up|next step|todo|backlog|sprint|iteration|release|version|branch|tag|commit|merge|pull request|code review|pair programming|mob programming|test-driven development|behavior-driven development|domain-driven design|event-driven architecture|service-oriented architecture|microservices architecture|serverless architecture|cloud-native architecture|distributed systems|high availability|fault tolerance|disaster recovery|business continuity|scalability|performance|security|privacy|compliance|governance|risk management|change management|configuration management|release management|deployment management|environment management|capacity planning|resource management|cost optimization|budget management|vendor management|contract management|procurement|sourcing|evaluation|selection|implementation|onboarding|training|support|maintenance|operations|monitoring|reporting|analysis|optimization|improvement|innovation|transformation|modernization|migration|upgrade|consolidation|standardization|automation|streamlining|efficiency|productivity|quality|reliability|security|performance|scalability|availability)\b'
-        ]
-        
-        keywords = set()
-        for pattern in patterns:
-            matches = re.findall(pattern, job_text, re.IGNORECASE)
-            keywords.update(match.lower() for match in matches)
+        """Extract job-specific technical keywords, most frequent first"""
+        
+        # Leftmost-longest match over the tokens, so 'quality assurance' wins over 'quality'
+        tokens = _TOKEN_PATTERN.findall(job_text.lower())
+        matches = Counter()
+        i = 0
+        while i < len(tokens):
+            for size in range(min(self.JOB_KEYWORD_MAX_WORDS, len(tokens) - i), 0, -1):
+                term = ' '.join(tokens[i:i + size])
+                if term in self.JOB_KEYWORD_TERMS:
+                    matches[term] += 1
+                    i += size
+                    break
+            else:
+                # 'python/java' or 'c++/go': look at the parts
+                matches.update(
+                    part for part in _COMPOUND_SEPARATOR_PATTERN.split(tokens[i]) if part in self.JOB_KEYWORD_TERMS
+                )
+                i += 1
         
-        return list(keywords)[:25]  # Return top 25 most relevant
+        return [keyword for keyword, _ in matches.most_common(25)]  # Return top 25 most relevant
     
     def _analyze_format_compatibility(self, document: str, document_type: str) -> Dict:
         """Analyze format compatibility with ATS systems"""
@@ -436,11 +559,11 @@ class ATSAnalyzer:
         }
         
         # Clean text for analysis
-        clean_text = re.sub(r'\\[a-zA-Z]+\{[^}]*\}', '', document)  # Remove LaTeX commands
-        clean_text = re.sub(r'[{}\\]', '', clean_text)  # Remove LaTeX symbols
+        clean_text = _LATEX_COMMAND_PATTERN.sub('', document)  # Remove LaTeX commands
+        clean_text = _LATEX_SYMBOL_PATTERN.sub('', clean_text)  # Remove LaTeX symbols
         
         words = clean_text.split()
-        sentences = re.split(r'[.!?]+', clean_text)
+        sentences = _SENTENCE_END_PATTERN.split(clean_text)
         sentences = [s.strip() for s in sentences if s.strip()]
         
         if not words or not sentences:
@@ -473,8 +596,7 @@ class ATSAnalyzer:
             analysis['recommendations'].append("Use simpler, more direct language")
         
         # Check for passive voice (simplified detection)
-        passive_indicators = ['was', 'were', 'been', 'being']
-        passive_count = sum(clean_text.lower().count(indicator) for indicator in passive_indicators)
+        passive_count = sum(1 for word in words if word.lower().strip('.,;:!?()') in _PASSIVE_INDICATORS)
         if passive_count > len(words) * 0.1:  # More than 10% passive voice
             score -= 15
             analysis['recommendations'].append("Reduce passive voice usage")
@@ -492,7 +614,7 @@ class ATSAnalyzer:
         }
         
         # Count words (excluding LaTeX commands)
-        clean_text = re.sub(r'\\[a-zA-Z]+\{[^}]*\}', '', document)
+        clean_text = _LATEX_COMMAND_PATTERN.sub('', document)
         words = clean_text.split()
         word_count = len(words)
         
@@ -716,4 +838,27 @@ class ATSAnalyzer:
                     'timeline': '1-2 hours'
                 })
         
-        return sorted(actions, key=lambda x: {'Critical': 0, 'Important': 1, 'Enhancement': 2}[x['priority']])
\ No newline at end of file
+        return sorted(actions, key=lambda x: {'Critical': 0, 'Important': 1, 'Enhancement': 2}[x['priority']])
+
+# One analyzer per worker process, built on first use
+_process_analyzer: Optional[ATSAnalyzer] = None
+
+
+def score_document(document_content: str, job_description: str, job_title: str,
+                   document_type: str = 'cv') -> ATSAnalysisResult:
+    """
+    Analyze a document with this process's analyzer (ProcessPoolExecutor entry point)
+
+    Args:
+        document_content: Document text or LaTeX source
+        job_description: Job posting text
+        job_title: Job posting title
+        document_type: 'cv' or 'cover_letter'
+
+    Returns:
+        ATSAnalysisResult (picklable, so it can be sent back to the parent)
+    """
+    global _process_analyzer
+    if _process_analyzer is None:
+        _process_analyzer = ATSAnalyzer()
+    return _process_analyzer.analyze_document_sync(document_content, job_description, job_title, document_type)
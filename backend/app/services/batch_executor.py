@@ -0,0 +1,204 @@
+"""
+Batch Executor
+Bounded-concurrency job runner with process-pool ATS scoring and per-stage latency stats
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .ats_analyzer import ATSAnalysisResult, ATSAnalyzer, score_document
+
+logger = logging.getLogger(__name__)
+
+
+def default_batch_concurrency() -> int:
+    """Jobs processed at once by a batch (SMART_CV_BATCH_CONCURRENCY)"""
+    return max(1, int(os.getenv('SMART_CV_BATCH_CONCURRENCY', '4')))
+
+
+def default_ats_workers() -> int:
+    """Worker processes for ATS scoring; 0 scores on the event loop (SMART_CV_ATS_WORKERS)"""
+    return max(0, int(os.getenv('SMART_CV_ATS_WORKERS', str(min(4, os.cpu_count() or 1)))))
+
+
+def _percentile(durations: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted durations"""
+    return durations[min(len(durations) - 1, int(len(durations) * fraction))]
+
+
+class StageTimings:
+    """Wall-clock durations per named stage, summarized as count/avg/p50/p95/max"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations: Dict[str, List[float]] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add one duration to a stage"""
+        with self._lock:
+            self._durations.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Latency stats per stage
+
+        Returns:
+            Mapping of stage name to count, avg, p50, p95 and max (seconds)
+        """
+        with self._lock:
+            stages = {stage: sorted(values) for stage, values in self._durations.items()}
+
+        return {
+            stage: {
+                'count': len(values),
+                'avg_seconds': round(sum(values) / len(values), 3),
+                'p50_seconds': round(_percentile(values, 0.5), 3),
+                'p95_seconds': round(_percentile(values, 0.95), 3),
+                'max_seconds': round(values[-1], 3)
+            }
+            for stage, values in stages.items()
+        }
+
+
+class BatchExecutor:
+    """
+    Runs a batch of jobs with at most ``max_concurrency`` in flight
+
+    Results are yielded as each job finishes rather than in input order.
+    Workers time their steps with ``stage()`` / ``timed()`` and score
+    documents with ``analyze_document``, which runs the CPU-bound ATS
+    analysis in a process pool so scoring one job does not stall the
+    event loop for the others. ``summary()`` reports throughput and the
+    p50/p95 latency of every stage, including the whole job ('total').
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, ats_workers: Optional[int] = None):
+        """
+        Initialize the executor (the process pool is started on first use)
+
+        Args:
+            max_concurrency: Jobs processed at once
+            ats_workers: ATS scoring processes; 0 scores in this process
+        """
+        self.max_concurrency = max(1, max_concurrency or default_batch_concurrency())
+        self.ats_workers = default_ats_workers() if ats_workers is None else max(0, ats_workers)
+        self.timings = StageTimings()
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._local_analyzer: Optional[ATSAnalyzer] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self.successful = 0
+        self.failed = 0
+
+    @asynccontextmanager
+    async def stage(self, name: str):
+        """Record the time spent inside the block under ``name``"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.record(name, time.perf_counter() - start)
+
+    async def timed(self, name: str, awaitable: Awaitable) -> Any:
+        """Await ``awaitable`` and record its duration under ``name``"""
+        async with self.stage(name):
+            return await awaitable
+
+    async def analyze_document(self, document_content: str, job_description: str,
+                               job_title: str, document_type: str = 'cv') -> ATSAnalysisResult:
+        """ATS-analyze a document on the process pool (same arguments as ATSAnalyzer.analyze_document)"""
+        if self.ats_workers == 0:
+            if self._local_analyzer is None:
+                self._local_analyzer = ATSAnalyzer()
+            return self._local_analyzer.analyze_document_sync(
+                document_content, job_description, job_title, document_type
+            )
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.ats_workers)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, score_document, document_content, job_description, job_title, document_type
+        )
+
+    async def stream(
+        self,
+        jobs: Iterable[Any],
+        worker: Callable[[Any], Awaitable[Dict]],
+        on_error: Optional[Callable[[Any, Exception], Dict]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Process jobs concurrently and yield each result as soon as it is ready
+
+        A result dict with an 'error' key counts as a failed job.
+
+        Args:
+            jobs: Job inputs
+            worker: Coroutine function processing one job into a result dict
+            on_error: Turns a job and the exception it raised into a result dict
+                      (default: re-raise)
+
+        Yields:
+            Result dicts in completion order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(job):
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    return await worker(job)
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    logger.error(f"❌ Batch job failed: {e}")
+                    return on_error(job, e)
+                finally:
+                    self.timings.record('total', time.perf_counter() - start)
+
+        self._started_at = self._started_at or time.perf_counter()
+        tasks = [asyncio.ensure_future(run(job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result.get('error'):
+                    self.failed += 1
+                else:
+                    self.successful += 1
+                self._finished_at = time.perf_counter()
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def summary(self) -> Dict:
+        """
+        Throughput and latency of the batch so far
+
+        Returns:
+            Dictionary with job counts, wall time, jobs per minute and per-stage latency
+        """
+        processed = self.successful + self.failed
+        elapsed = (self._finished_at - self._started_at) if self._started_at and self._finished_at else 0.0
+        return {
+            'total_processed': processed,
+            'successful': self.successful,
+            'failed': self.failed,
+            'max_concurrency': self.max_concurrency,
+            'ats_workers': self.ats_workers,
+            'wall_seconds': round(elapsed, 3),
+            'jobs_per_minute': round(processed / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            'stages': self.timings.summary()
+        }
+
+    def close(self) -> None:
+        """Shut down the ATS process pool"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -3,10 +3,12 @@ import logging
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import os
 
+from app.services.smtp_mailer import get_smtp_mailer
+
 logger = logging.getLogger(__name__)
 
 class EmailAutomationService:
@@ -20,6 +22,9 @@ class EmailAutomationService:
         self.smtp_password = os.getenv("SMTP_PASSWORD", "")  # App password
         self.from_email = os.getenv("EMAILS_FROM_EMAIL", "hongzhili01@gmail.com")
         self.from_name = os.getenv("EMAILS_FROM_NAME", "Hongzhi Li")
+        
+        # Shared authenticated session, reused by every send of this account
+        self.mailer = get_smtp_mailer(self.smtp_user, self.smtp_password, self.smtp_host, self.smtp_port)
     
     async def send_application_email(
         self,
@@ -45,31 +50,9 @@ class EmailAutomationService:
             True if email sent successfully, False otherwise
         """
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            
-            # Create HTML email body
-            html_body = self._create_html_email_body(body, job_data)
-            msg.attach(MIMEText(html_body, 'html'))
-            
-            # Attach CV
-            if cv_content:
-                cv_attachment = MIMEApplication(cv_content, _subtype='pdf')
-                company_name = job_data.get('company', 'Company').replace(' ', '_')
-                job_title = job_data.get('title', 'Position').replace(' ', '_')
-                cv_filename = f"CV_HongzhiLi_{company_name}_{job_title}.pdf"
-                cv_attachment.add_header('Content-Disposition', 'attachment', filename=cv_filename)
-                msg.attach(cv_attachment)
-            
-            # Attach Cover Letter
-            if cover_letter_content:
-                cl_attachment = MIMEApplication(cover_letter_content, _subtype='pdf')
-                cl_filename = f"CoverLetter_HongzhiLi_{company_name}_{job_title}.pdf"
-                cl_attachment.add_header('Content-Disposition', 'attachment', filename=cl_filename)
-                msg.attach(cl_attachment)
+            msg = self._create_application_message(
+                to_email, subject, body, cv_content, cover_letter_content, job_data
+            )
             
             # Send email
             success = await self._send_email(msg)
@@ -87,6 +70,68 @@ class EmailAutomationService:
             logger.error("Error sending application email: %s", e)
             return False
     
+    async def send_application_emails(self, applications: List[Dict]) -> List[bool]:
+        """
+        Send many application emails over one SMTP session
+        
+        Args:
+            applications: Keyword arguments of send_application_email, one dict per email
+            
+        Returns:
+            Per application, True if the email was sent
+        """
+        messages = []
+        for application in applications:
+            try:
+                messages.append(self._create_application_message(**application))
+            except Exception as e:
+                logger.error("Error creating application email: %s", e)
+                messages.append(None)
+        
+        sent = iter(await self.mailer.send_many([msg for msg in messages if msg is not None]))
+        results = [next(sent) if msg is not None else False for msg in messages]
+        
+        logger.info("Sent %d of %d application emails", sum(results), len(results))
+        return results
+    
+    def _create_application_message(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        cv_content: bytes,
+        cover_letter_content: bytes,
+        job_data: Dict
+    ) -> MIMEMultipart:
+        """Build an application email with CV and cover letter attachments"""
+        msg = MIMEMultipart()
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        
+        # Create HTML email body
+        html_body = self._create_html_email_body(body, job_data)
+        msg.attach(MIMEText(html_body, 'html'))
+        
+        company_name = job_data.get('company', 'Company').replace(' ', '_')
+        job_title = job_data.get('title', 'Position').replace(' ', '_')
+        
+        # Attach CV
+        if cv_content:
+            cv_attachment = MIMEApplication(cv_content, _subtype='pdf')
+            cv_filename = f"CV_HongzhiLi_{company_name}_{job_title}.pdf"
+            cv_attachment.add_header('Content-Disposition', 'attachment', filename=cv_filename)
+            msg.attach(cv_attachment)
+        
+        # Attach Cover Letter
+        if cover_letter_content:
+            cl_attachment = MIMEApplication(cover_letter_content, _subtype='pdf')
+            cl_filename = f"CoverLetter_HongzhiLi_{company_name}_{job_title}.pdf"
+            cl_attachment.add_header('Content-Disposition', 'attachment', filename=cl_filename)
+            msg.attach(cl_attachment)
+        
+        return msg
+    
     def _create_html_email_body(self, text_body: str, job_data: Dict) -> str:
         """Create HTML formatted email body"""
         
@@ -197,19 +242,9 @@ class EmailAutomationService:
         return html_body
     
     async def _send_email(self, msg: MIMEMultipart) -> bool:
-        """Send email using SMTP"""
+        """Send email over the shared SMTP session (off the event loop)"""
         try:
-            # Create SMTP session
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-            server.starttls()  # Enable security
-            
-            # Login to email account
-            server.login(self.smtp_user, self.smtp_password)
-            
-            # Send email
-            server.send_message(msg)
-            server.quit()
-            
+            await self.mailer.send(msg)
             return True
             
         except smtplib.SMTPAuthenticationError:
@@ -350,11 +385,8 @@ class EmailAutomationService:
     async def test_email_connection(self) -> Dict:
         """Test email connection and configuration"""
         try:
-            # Test SMTP connection
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-            server.starttls()
-            server.login(self.smtp_user, self.smtp_password)
-            server.quit()
+            # Test SMTP connection (opens the shared session if needed)
+            await self.mailer.verify()
             
             return {
                 "status": "success",
@@ -1,11 +1,10 @@
-import imaplib
-import email
 import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from email.header import decode_header
 import logging
 from app.core.config import settings
+from app.services.imap_scanner import get_imap_scanner
 
 logger = logging.getLogger(__name__)
 
@@ -18,44 +17,60 @@ class EmailScannerService:
         self.imap_server = "imap.gmail.com"
         self.imap_port = 993
     
-    async def scan_job_emails(self, days_back: int = 1) -> List[Dict]:
+    # Other job boards scanned besides LinkedIn and Indeed
+    OTHER_JOB_DOMAINS = [
+        "glassdoor.com", "monster.com", "ziprecruiter.com",
+        "dice.com", "careerbuilder.com", "simplyhired.com"
+    ]
+    
+    async def scan_job_emails(self, days_back: int = 1, incremental: bool = True) -> List[Dict]:
         """
         Scan Gmail for job-related emails from LinkedIn, Indeed, etc.
         
+        All searches share one IMAP connection and each message is fetched
+        once. With ``incremental`` only mail that arrived since the previous
+        scan is fetched.
+        
         Args:
             days_back: Number of days to look back (default 1 for daily scanning)
+            incremental: Skip messages seen by earlier scans
             
         Returns:
             List of parsed job opportunities
         """
         try:
-            # Connect to Gmail IMAP
-            mail = imaplib.IMAP4_SSL(self.imap_server, self.imap_port)
-            mail.login(self.smtp_user, self.smtp_password)
-            
-            # Select inbox
-            mail.select('inbox')
+            scanner = get_imap_scanner(self.smtp_user, self.smtp_password, self.imap_server, self.imap_port)
             
             # Calculate date filter
             since_date = (datetime.now() - timedelta(days=days_back)).strftime("%d-%b-%Y")
             
-            # Search for job-related emails
-            job_emails = []
-            
-            # Search LinkedIn job emails
-            linkedin_jobs = await self._scan_linkedin_emails(mail, since_date)
-            job_emails.extend(linkedin_jobs)
+            # LinkedIn and Indeed alerts (last 10 each), other job boards (last 5 per domain)
+            alert_criteria = {
+                'linkedin': f'(SINCE {since_date} FROM "linkedin.com" SUBJECT "job")',
+                'indeed': f'(SINCE {since_date} FROM "indeed.com" SUBJECT "job")'
+            }
+            domain_criteria = {
+                domain: f'(SINCE {since_date} FROM "{domain}")' for domain in self.OTHER_JOB_DOMAINS
+            }
+            
+            alert_messages = await scanner.scan(
+                'email_scanner_alerts', alert_criteria, limit=10, incremental=incremental
+            )
+            domain_messages = await scanner.scan(
+                'email_scanner_domains', domain_criteria, limit=5, incremental=incremental
+            )
             
-            # Search Indeed job emails  
-            indeed_jobs = await self._scan_indeed_emails(mail, since_date)
-            job_emails.extend(indeed_jobs)
+            job_emails = []
             
-            # Search other job board emails
-            other_jobs = await self._scan_other_job_emails(mail, since_date)
-            job_emails.extend(other_jobs)
+            for scanned in alert_messages:
+                if 'linkedin' in scanned.labels:
+                    job_emails.extend(await self._parse_linkedin_email(scanned.message))
+                if 'indeed' in scanned.labels:
+                    job_emails.extend(await self._parse_indeed_email(scanned.message))
             
-            mail.close()
-            mail.logout()
+            for scanned in domain_messages:
+                for domain in scanned.labels:
+                    job_emails.extend(await self._parse_general_job_email(scanned.message, domain))
             
             logger.info(f"Found {len(job_emails)} job opportunities in emails")
             return job_emails
@@ -64,105 +79,6 @@ class EmailScannerService:
             logger.error(f"Error scanning emails: {e}")
             return []
     
-    async def _scan_linkedin_emails(self, mail, since_date: str) -> List[Dict]:
-        """Scan for LinkedIn job alert emails"""
-        try:
-            # Search for LinkedIn emails
-            search_criteria = f'(SINCE {since_date} FROM "linkedin.com" SUBJECT "job")'
-            status, messages = mail.search(None, search_criteria)
-            
-            if status != 'OK':
-                return []
-            
-            job_emails = []
-            message_ids = messages[0].split()
-            
-            for msg_id in message_ids[-10:]:  # Process last 10 emails
-                status, msg_data = mail.fetch(msg_id, '(RFC822)')
-                if status != 'OK':
-                    continue
-                    
-                email_body = msg_data[0][1]
-                email_message = email.message_from_bytes(email_body)
-                
-                # Parse LinkedIn job email
-                jobs = await self._parse_linkedin_email(email_message)
-                job_emails.extend(jobs)
-            
-            return job_emails
-            
-        except Exception as e:
-            logger.error(f"Error scanning LinkedIn emails: {e}")
-            return []
-    
-    async def _scan_indeed_emails(self, mail, since_date: str) -> List[Dict]:
-        """Scan for Indeed job alert emails"""
-        try:
-            # Search for Indeed emails
-            search_criteria = f'(SINCE {since_date} FROM "indeed.com" SUBJECT "job")'
-            status, messages = mail.search(None, search_criteria)
-            
-            if status != 'OK':
-                return []
-            
-            job_emails = []
-            message_ids = messages[0].split()
-            
-            for msg_id in message_ids[-10:]:  # Process last 10 emails
-                status, msg_data = mail.fetch(msg_id, '(RFC822)')
-                if status != 'OK':
-                    continue
-                    
-                email_body = msg_data[0][1]
-                email_message = email.message_from_bytes(email_body)
-                
-                # Parse Indeed job email
-                jobs = await self._parse_indeed_email(email_message)
-                job_emails.extend(jobs)
-            
-            return job_emails
-            
-        except Exception as e:
-            logger.error(f"Error scanning Indeed emails: {e}")
-            return []
-    
-    async def _scan_other_job_emails(self, mail, since_date: str) -> List[Dict]:
-        """Scan for other job board emails (Glassdoor, Monster, etc.)"""
-        try:
-            job_domains = [
-                "glassdoor.com", "monster.com", "ziprecruiter.com", 
-                "dice.com", "careerbuilder.com", "simplyhired.com"
-            ]
-            
-            job_emails = []
-            
-            for domain in job_domains:
-                search_criteria = f'(SINCE {since_date} FROM "{domain}")'
-                status, messages = mail.search(None, search_criteria)
-                
-                if status != 'OK':
-                    continue
-                
-                message_ids = messages[0].split()
-                
-                for msg_id in message_ids[-5:]:  # Process last 5 emails per domain
-                    status, msg_data = mail.fetch(msg_id, '(RFC822)')
-                    if status != 'OK':
-                        continue
-                        
-                    email_body = msg_data[0][1]
-                    email_message = email.message_from_bytes(email_body)
-                    
-                    # Parse general job email
-                    jobs = await self._parse_general_job_email(email_message, domain)
-                    job_emails.extend(jobs)
-            
-            return job_emails
-            
-        except Exception as e:
-            logger.error(f"Error scanning other job emails: {e}")
-            return []
-    
     async def _parse_linkedin_email(self, email_message) -> List[Dict]:
         """Parse LinkedIn job alert email"""
         try:
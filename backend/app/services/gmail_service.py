@@ -1,5 +1,9 @@
+import asyncio
 import base64
 import email
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Optional
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -8,17 +12,33 @@ from googleapiclient.errors import HttpError
 import re
 from datetime import datetime, timedelta
 
+# Gmail recommends at most 50 calls per batch request
+GMAIL_BATCH_SIZE = 50
+
+# Parsed messages keyed by (mailbox, message id); Gmail messages are immutable
+MESSAGE_CACHE_SIZE = 2000
+_message_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+_message_cache_lock = threading.Lock()
+
 class GmailService:
     """Service for interacting with Gmail API"""
     
     def __init__(self, credentials: Credentials):
         self.credentials = credentials
         self.service = build('gmail', 'v1', credentials=credentials)
+        
+        # Separates cached messages of different mailboxes
+        identity = getattr(credentials, 'refresh_token', None) or getattr(credentials, 'token', None) or ''
+        self._cache_namespace = hashlib.sha256(str(identity).encode('utf-8')).hexdigest()[:16]
     
     async def search_job_emails(self, keywords: List[str], days_back: int = 7) -> List[Dict]:
         """
         Search for job-related emails in Gmail including LinkedIn and Indeed subscriptions
         
+        The LinkedIn, Indeed and general searches are sent as one batch
+        request, message ids are de-duplicated across them, and message
+        details are fetched in batches (skipping messages already cached).
+        
         Args:
             keywords: List of keywords to search for
             days_back: Number of days to look back
@@ -27,19 +47,38 @@ class GmailService:
             List of job-related emails with metadata
         """
         try:
+            date_filter = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
+            queries = {
+                'linkedin': self._build_alert_query('linkedin.com', keywords, date_filter),
+                'indeed': self._build_alert_query('indeed.com', keywords, date_filter),
+                'general': self._build_general_query(keywords, date_filter)
+            }
+            
+            ids_by_source = await asyncio.to_thread(self._list_message_ids_batch, queries, 25)
+            
+            # Fetch each message once even if several searches returned it
+            unique_ids = list(dict.fromkeys(
+                message_id for message_ids in ids_by_source.values() for message_id in message_ids
+            ))
+            email_details = await self._get_email_details_many(unique_ids)
+            
             all_job_emails = []
             
-            # Search for LinkedIn job alerts
-            linkedin_jobs = await self._search_linkedin_job_emails(keywords, days_back)
-            all_job_emails.extend(linkedin_jobs)
+            # Parse LinkedIn-specific job data
+            for message_id in ids_by_source.get('linkedin', []):
+                if message_id in email_details:
+                    all_job_emails.extend(await self._parse_linkedin_job_email(dict(email_details[message_id])))
             
-            # Search for Indeed job alerts
-            indeed_jobs = await self._search_indeed_job_emails(keywords, days_back)
-            all_job_emails.extend(indeed_jobs)
+            # Parse Indeed-specific job data
+            for message_id in ids_by_source.get('indeed', []):
+                if message_id in email_details:
+                    all_job_emails.extend(await self._parse_indeed_job_email(dict(email_details[message_id])))
             
-            # Search for general job-related emails
-            general_jobs = await self._search_general_job_emails(keywords, days_back)
-            all_job_emails.extend(general_jobs)
+            # General emails are already classified by _extract_job_information
+            for message_id in ids_by_source.get('general', []):
+                email_data = email_details.get(message_id)
+                if email_data and email_data.get('is_job_posting'):
+                    all_job_emails.append(dict(email_data))
             
             # Remove duplicates and sort by date
             unique_jobs = self._remove_duplicate_emails(all_job_emails)
@@ -48,193 +87,181 @@ class GmailService:
         except HttpError as error:
             print(f'An error occurred: {error}')
             return []
-    
-    async def _search_linkedin_job_emails(self, keywords: List[str], days_back: int) -> List[Dict]:
-        """Search specifically for LinkedIn job alert emails"""
-        try:
-            date_filter = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
-            
-            # LinkedIn-specific search query
-            query_parts = [
-                f'after:{date_filter}',
-                'from:linkedin.com OR from:@linkedin.com',
-                '(jobs OR "job alert" OR "new jobs" OR "recommended jobs")',
-                '-unsubscribe'
-            ]
-            
-            # Add user keywords if provided
-            if keywords:
-                keyword_query = ' OR '.join([f'"{keyword}"' for keyword in keywords])
-                query_parts.append(f'({keyword_query})')
-            
-            query = ' '.join(query_parts)
-            
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=25
-            ).execute()
-            
-            messages = results.get('messages', [])
-            linkedin_jobs = []
-            
-            for message in messages:
-                email_data = await self._get_email_details(message['id'])
-                if email_data:
-                    # Parse LinkedIn-specific job data
-                    parsed_jobs = await self._parse_linkedin_job_email(email_data)
-                    linkedin_jobs.extend(parsed_jobs)
-            
-            return linkedin_jobs
-            
-        except Exception as e:
-            print(f'LinkedIn email search error: {e}')
-            return []
-    
-    async def _search_indeed_job_emails(self, keywords: List[str], days_back: int) -> List[Dict]:
-        """Search specifically for Indeed job alert emails"""
-        try:
-            date_filter = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
-            
-            # Indeed-specific search query
-            query_parts = [
-                f'after:{date_filter}',
-                'from:indeed.com OR from:@indeed.com',
-                '(jobs OR "job alert" OR "new jobs" OR "recommended jobs")',
-                '-unsubscribe'
-            ]
-            
-            # Add user keywords if provided
-            if keywords:
-                keyword_query = ' OR '.join([f'"{keyword}"' for keyword in keywords])
-                query_parts.append(f'({keyword_query})')
-            
-            query = ' '.join(query_parts)
-            
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=25
-            ).execute()
-            
-            messages = results.get('messages', [])
-            indeed_jobs = []
-            
-            for message in messages:
-                email_data = await self._get_email_details(message['id'])
-                if email_data:
-                    # Parse Indeed-specific job data
-                    parsed_jobs = await self._parse_indeed_job_email(email_data)
-                    indeed_jobs.extend(parsed_jobs)
-            
-            return indeed_jobs
-            
         except Exception as e:
-            print(f'Indeed email search error: {e}')
+            print(f'Job email search error: {e}')
             return []
     
-    async def _search_general_job_emails(self, keywords: List[str], days_back: int) -> List[Dict]:
-        """Search for general job-related emails"""
-        try:
-            date_filter = (datetime.now() - timedelta(days=days_back)).strftime('%Y/%m/%d')
-            
-            # Create search query for job-related emails
-            job_keywords = ['job', 'position', 'opportunity', 'hiring', 'career', 'application']
-            job_keywords.extend(keywords or [])
-            
-            # Build Gmail search query
-            query_parts = []
-            query_parts.append(f'after:{date_filter}')
-            
-            # Add keyword searches
-            keyword_query = ' OR '.join([f'"{keyword}"' for keyword in job_keywords])
+    def _build_alert_query(self, sender_domain: str, keywords: List[str], date_filter: str) -> str:
+        """Gmail search query for LinkedIn/Indeed job alert emails"""
+        query_parts = [
+            f'after:{date_filter}',
+            f'from:{sender_domain} OR from:@{sender_domain}',
+            '(jobs OR "job alert" OR "new jobs" OR "recommended jobs")',
+            '-unsubscribe'
+        ]
+        
+        # Add user keywords if provided
+        if keywords:
+            keyword_query = ' OR '.join([f'"{keyword}"' for keyword in keywords])
             query_parts.append(f'({keyword_query})')
+        
+        return ' '.join(query_parts)
+    
+    def _build_general_query(self, keywords: List[str], date_filter: str) -> str:
+        """Gmail search query for general job-related emails"""
+        job_keywords = ['job', 'position', 'opportunity', 'hiring', 'career', 'application']
+        job_keywords.extend(keywords or [])
+        
+        query_parts = [f'after:{date_filter}']
+        
+        # Add keyword searches
+        keyword_query = ' OR '.join([f'"{keyword}"' for keyword in job_keywords])
+        query_parts.append(f'({keyword_query})')
+        
+        # Exclude common non-job emails; LinkedIn/Indeed are handled by their own queries
+        query_parts.extend([
+            'unsubscribe', 'newsletter', 'promotion', 'spam',
+            '-from:linkedin.com', '-from:indeed.com'
+        ])
+        
+        return ' '.join(query_parts)
+    
+    def _list_message_ids_batch(self, queries: Dict[str, str], max_results: int) -> Dict[str, List[str]]:
+        """
+        Run several messages.list searches in one batch HTTP request (blocking)
+        
+        Args:
+            queries: Mapping of search name to Gmail query
+            max_results: Maximum messages per search
             
-            # Exclude common non-job emails and already processed emails
-            exclude_terms = [
-                'unsubscribe', 'newsletter', 'promotion', 'spam',
-                '-from:linkedin.com', '-from:indeed.com'  # Exclude LinkedIn/Indeed since we handle them separately
-            ]
-            for term in exclude_terms:
-                query_parts.append(f'{term}')
-            
-            query = ' '.join(query_parts)
-            
-            # Search emails
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=25
-            ).execute()
-            
-            messages = results.get('messages', [])
-            job_emails = []
-            
-            for message in messages:
-                email_data = await self._get_email_details(message['id'])
-                if email_data:
-                    # Extract job information from general emails
-                    job_info = await self._extract_job_information(email_data)
-                    if job_info.get('is_job_posting'):
-                        email_data.update(job_info)
-                        job_emails.append(email_data)
-            
-            return job_emails
+        Returns:
+            Mapping of search name to message ids
+        """
+        ids_by_query: Dict[str, List[str]] = {name: [] for name in queries}
+        
+        def callback(request_id, response, exception):
+            if exception is not None:
+                print(f'{request_id} email search error: {exception}')
+                return
+            ids_by_query[request_id] = [message['id'] for message in response.get('messages', [])]
+        
+        names = list(queries)
+        for start in range(0, len(names), GMAIL_BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for name in names[start:start + GMAIL_BATCH_SIZE]:
+                batch.add(
+                    self.service.users().messages().list(userId='me', q=queries[name], maxResults=max_results),
+                    request_id=name
+                )
+            batch.execute()
+        
+        return ids_by_query
+    
+    def _fetch_messages_batch(self, message_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch full messages with batch HTTP requests of up to GMAIL_BATCH_SIZE calls (blocking)"""
+        messages: Dict[str, Dict] = {}
+        
+        def callback(request_id, response, exception):
+            if exception is not None:
+                print(f'An error occurred getting email details: {exception}')
+                return
+            messages[request_id] = response
+        
+        for start in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for message_id in message_ids[start:start + GMAIL_BATCH_SIZE]:
+                batch.add(
+                    self.service.users().messages().get(userId='me', id=message_id, format='full'),
+                    request_id=message_id
+                )
+            batch.execute()
+        
+        return messages
+    
+    async def _get_email_details_many(self, message_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get parsed details for many messages, fetching only those not cached yet
+        
+        Args:
+            message_ids: Gmail message ids (duplicates are ignored)
             
-        except Exception as e:
-            print(f'General job email search error: {e}')
-            return []
+        Returns:
+            Mapping of message id to email data (shared cache entries - copy before mutating)
+        """
+        details: Dict[str, Dict] = {}
+        missing: List[str] = []
+        
+        with _message_cache_lock:
+            for message_id in dict.fromkeys(message_ids):
+                cached = _message_cache.get((self._cache_namespace, message_id))
+                if cached is not None:
+                    _message_cache.move_to_end((self._cache_namespace, message_id))
+                    details[message_id] = cached
+                else:
+                    missing.append(message_id)
+        
+        if missing:
+            messages = await asyncio.to_thread(self._fetch_messages_batch, missing)
+            for message_id, message in messages.items():
+                email_data = await self._build_email_data(message_id, message)
+                details[message_id] = email_data
+                self._cache_email_data(message_id, email_data)
+        
+        return details
+    
+    def _cache_email_data(self, message_id: str, email_data: Dict) -> None:
+        """Store parsed email data in the bounded message cache"""
+        with _message_cache_lock:
+            _message_cache[(self._cache_namespace, message_id)] = email_data
+            _message_cache.move_to_end((self._cache_namespace, message_id))
+            while len(_message_cache) > MESSAGE_CACHE_SIZE:
+                _message_cache.popitem(last=False)
     
     async def _get_email_details(self, message_id: str) -> Optional[Dict]:
         """Get detailed information about a specific email"""
-        try:
-            message = self.service.users().messages().get(
-                userId='me',
-                id=message_id,
-                format='full'
-            ).execute()
-            
-            headers = message['payload'].get('headers', [])
-            
-            # Extract email metadata
-            email_data = {
-                'id': message_id,
-                'thread_id': message.get('threadId'),
-                'snippet': message.get('snippet', ''),
-                'date': None,
-                'from': None,
-                'to': None,
-                'subject': None,
-                'body': None,
-                'attachments': []
-            }
-            
-            # Parse headers
-            for header in headers:
-                name = header['name'].lower()
-                value = header['value']
-                
-                if name == 'date':
-                    email_data['date'] = value
-                elif name == 'from':
-                    email_data['from'] = value
-                elif name == 'to':
-                    email_data['to'] = value
-                elif name == 'subject':
-                    email_data['subject'] = value
-            
-            # Extract email body
-            email_data['body'] = await self._extract_email_body(message['payload'])
-            
-            # Extract job-related information
-            job_info = await self._extract_job_information(email_data)
-            email_data.update(job_info)
-            
-            return email_data
+        details = await self._get_email_details_many([message_id])
+        email_data = details.get(message_id)
+        return dict(email_data) if email_data else None
+    
+    async def _build_email_data(self, message_id: str, message: Dict) -> Dict:
+        """Extract metadata, body and job information from a full Gmail message"""
+        headers = message['payload'].get('headers', [])
+        
+        # Extract email metadata
+        email_data = {
+            'id': message_id,
+            'thread_id': message.get('threadId'),
+            'snippet': message.get('snippet', ''),
+            'date': None,
+            'from': None,
+            'to': None,
+            'subject': None,
+            'body': None,
+            'attachments': []
+        }
+        
+        # Parse headers
+        for header in headers:
+            name = header['name'].lower()
+            value = header['value']
             
-        except HttpError as error:
-            print(f'An error occurred getting email details: {error}')
-            return None
+            if name == 'date':
+                email_data['date'] = value
+            elif name == 'from':
+                email_data['from'] = value
+            elif name == 'to':
+                email_data['to'] = value
+            elif name == 'subject':
+                email_data['subject'] = value
+        
+        # Extract email body
+        email_data['body'] = await self._extract_email_body(message['payload'])
+        
+        # Extract job-related information
+        job_info = await self._extract_job_information(email_data)
+        email_data.update(job_info)
+        
+        return email_data
     
     async def _extract_email_body(self, payload: Dict) -> str:
         """Extract the body text from email payload"""
@@ -403,21 +430,18 @@ class GmailService:
         try:
             responses = []
             
+            # Search emails from each address in the last 30 days (one batch request)
+            queries = {email_addr: f'from:{email_addr} newer_than:30d' for email_addr in application_emails}
+            ids_by_address = await asyncio.to_thread(self._list_message_ids_batch, queries, 10)
+            
+            email_details = await self._get_email_details_many(
+                [message_id for message_ids in ids_by_address.values() for message_id in message_ids]
+            )
+            
             for email_addr in application_emails:
-                # Search for emails from this address in the last 30 days
-                query = f'from:{email_addr} newer_than:30d'
-                
-                results = self.service.users().messages().list(
-                    userId='me',
-                    q=query,
-                    maxResults=10
-                ).execute()
-                
-                messages = results.get('messages', [])
-                
-                for message in messages:
-                    email_data = await self._get_email_details(message['id'])
-                    if email_data:
+                for message_id in ids_by_address.get(email_addr, []):
+                    if message_id in email_details:
+                        email_data = dict(email_details[message_id])
                         # Classify the response
                         classification = await self._classify_application_response(email_data)
                         email_data['classification'] = classification
@@ -1,9 +1,9 @@
 import asyncio
-import aiohttp
 import re
 from typing import List, Dict, Optional
 from datetime import datetime
 from app.core.config import settings
+from app.services.http_client import get_http_client
 import logging
 
 logger = logging.getLogger(__name__)
@@ -81,7 +81,7 @@ class GoogleJobsService:
             'fields': 'items(title,link,snippet,displayLink,pagemap)'
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with get_http_client().session() as session:
             try:
                 async with session.get(self.base_url, params=params) as response:
                     if response.status == 200:
@@ -391,7 +391,7 @@ class GoogleJobsService:
         """Get detailed job information by scraping the job page"""
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with get_http_client().session() as session:
                 async with session.get(job_url, timeout=10) as response:
                     if response.status == 200:
                         html = await response.text()
@@ -0,0 +1,310 @@
+"""
+HTTP Client
+Application-wide pooled aiohttp session with per-host token-bucket rate limiting and metrics
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class HostLimit:
+    """Request budget for one host"""
+    rate: float
+    burst: int
+    concurrency: int
+
+
+DEFAULT_HOST_LIMIT = HostLimit(rate=5.0, burst=5, concurrency=4)
+
+# Public job boards get a gentler budget than the official APIs
+DEFAULT_HOST_LIMITS: Dict[str, HostLimit] = {
+    'linkedin.com': HostLimit(rate=0.5, burst=2, concurrency=2),
+    'indeed.com': HostLimit(rate=0.5, burst=1, concurrency=1),
+    'se.indeed.com': HostLimit(rate=0.5, burst=1, concurrency=1),
+    'jobsearch.api.jobtechdev.se': HostLimit(rate=5.0, burst=5, concurrency=5),
+    'googleapis.com': HostLimit(rate=5.0, burst=5, concurrency=5)
+}
+
+
+def parse_host_limits(spec: str) -> Dict[str, HostLimit]:
+    """
+    Parse HTTP_HOST_LIMITS, e.g. "linkedin.com=0.5:2:2,indeed.com=1:1:1"
+
+    Args:
+        spec: Comma-separated host=rate:burst:concurrency entries
+
+    Returns:
+        Mapping of host suffix to HostLimit
+    """
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(','))):
+        try:
+            host, values = entry.split('=', 1)
+            rate, burst, concurrency = values.split(':')
+            limits[host.strip().lower()] = HostLimit(float(rate), int(burst), int(concurrency))
+        except ValueError:
+            logger.warning(f"Ignoring invalid HTTP_HOST_LIMITS entry: {entry}")
+    return limits
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per second up to ``burst``
+
+    ``reserve`` always takes a token and returns how long the caller has
+    to wait for it, so waiters are served in arrival order without a lock
+    being held across ``await``.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the seconds until it is available"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class HostStats:
+    """Request, error and latency counters for one host"""
+
+    WINDOW = 200
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.http_errors = 0
+        self.in_flight = 0
+        self.throttled_seconds = 0.0
+        self.latencies = deque(maxlen=self.WINDOW)
+
+    def as_dict(self) -> Dict:
+        latencies = sorted(self.latencies)
+        stats = {
+            'requests': self.requests,
+            'errors': self.errors,
+            'http_errors': self.http_errors,
+            'in_flight': self.in_flight,
+            'throttled_seconds': round(self.throttled_seconds, 3)
+        }
+        if latencies:
+            stats['avg_seconds'] = round(sum(latencies) / len(latencies), 3)
+            stats['p95_seconds'] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3)
+        return stats
+
+
+class PooledSession:
+    """
+    Rate-limited view of the shared aiohttp session
+
+    Supports the ``async with session.get(...) as response`` calls the
+    services already make. Per-session ``headers`` are merged into every
+    request. Leaving ``async with client.session()`` does not close the
+    pooled connections.
+    """
+
+    def __init__(self, client: 'HttpClient', session: aiohttp.ClientSession, headers: Optional[Dict] = None):
+        self._client = client
+        self._session = session
+        self._headers = headers or {}
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send one request within the host's budget"""
+        if self._headers:
+            kwargs['headers'] = {**self._headers, **(kwargs.get('headers') or {})}
+
+        # Plain numbers are seconds of total timeout (as callers passed to aiohttp before)
+        timeout = kwargs.get('timeout')
+        if isinstance(timeout, (int, float)):
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+
+        async with self._client.limit(url) as stats:
+            start = time.perf_counter()
+            try:
+                response_cm = self._session.request(method, url, **kwargs)
+                response = await response_cm.__aenter__()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                stats.errors += 1
+                raise
+            finally:
+                stats.latencies.append(time.perf_counter() - start)
+
+            if response.status >= 400:
+                stats.http_errors += 1
+
+            try:
+                yield response
+            finally:
+                await response_cm.__aexit__(None, None, None)
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+class HttpClient:
+    """
+    One keep-alive connection pool for every outbound job-source request
+
+    Each host has a token bucket (requests per second, burst) and a
+    concurrency cap, so callers can fire requests concurrently and the
+    client paces them. aiohttp sessions are bound to an event loop, so one
+    session is kept per running loop; limits and stats are shared.
+    """
+
+    def __init__(
+        self,
+        host_limits: Optional[Dict[str, HostLimit]] = None,
+        default_limit: HostLimit = DEFAULT_HOST_LIMIT,
+        pool_size: int = 100
+    ):
+        """
+        Initialize the client
+
+        Args:
+            host_limits: Budgets by host suffix (e.g. 'linkedin.com' covers www.linkedin.com)
+            default_limit: Budget for hosts without an entry
+            pool_size: Maximum open connections across all hosts
+        """
+        self.host_limits = {host.lower(): limit for host, limit in (host_limits or {}).items()}
+        self.default_limit = default_limit
+        self.pool_size = pool_size
+
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, HostStats] = {}
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._semaphores: Dict[tuple, asyncio.Semaphore] = {}
+
+    def limit_for(self, host: str) -> HostLimit:
+        """Budget of the most specific configured suffix of ``host``"""
+        parts = host.lower().split('.')
+        for i in range(len(parts)):
+            limit = self.host_limits.get('.'.join(parts[i:]))
+            if limit:
+                return limit
+        return self.default_limit
+
+    def _session(self) -> aiohttp.ClientSession:
+        """Shared session of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Forget sessions of loops that have finished (e.g. earlier asyncio.run calls)
+            for old_loop in [old for old in self._sessions if old.is_closed()]:
+                del self._sessions[old_loop]
+                self._semaphores = {key: sem for key, sem in self._semaphores.items() if key[0] is not old_loop}
+
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300, keepalive_timeout=30)
+                session = aiohttp.ClientSession(connector=connector)
+                self._sessions[loop] = session
+            return session
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[HostStats]:
+        """Wait for the host's rate and concurrency budget, then yield its stats"""
+        host = (urlsplit(url).hostname or '').lower()
+        host_limit = self.limit_for(host)
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(host_limit.rate, host_limit.burst)
+                self._stats[host] = HostStats()
+            stats = self._stats[host]
+            semaphore = self._semaphores.get((loop, host))
+            if semaphore is None:
+                semaphore = self._semaphores[(loop, host)] = asyncio.Semaphore(host_limit.concurrency)
+
+        async with semaphore:
+            delay = bucket.reserve()
+            if delay > 0:
+                stats.throttled_seconds += delay
+                await asyncio.sleep(delay)
+
+            stats.requests += 1
+            stats.in_flight += 1
+            try:
+                yield stats
+            finally:
+                stats.in_flight -= 1
+
+    @asynccontextmanager
+    async def session(self, headers: Optional[Dict] = None) -> AsyncIterator[PooledSession]:
+        """
+        Rate-limited session for a block of requests
+
+        Args:
+            headers: Default headers added to every request
+
+        Yields:
+            PooledSession sharing the application-wide connection pool
+        """
+        yield PooledSession(self, self._session(), headers)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per-host request, error, throttling and latency counters"""
+        with self._lock:
+            return {host: stats.as_dict() for host, stats in self._stats.items()}
+
+    async def close(self) -> None:
+        """Close the session of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session is not None:
+            await session.close()
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Get the process-wide HTTP client
+
+    Environment:
+        HTTP_HOST_LIMITS: per-host budgets, "host=rate:burst:concurrency,..."
+        HTTP_POOL_SIZE: maximum open connections
+
+    Returns:
+        Shared HttpClient
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            host_limits = dict(DEFAULT_HOST_LIMITS)
+            host_limits.update(parse_host_limits(os.getenv('HTTP_HOST_LIMITS', '')))
+            _shared_client = HttpClient(
+                host_limits=host_limits,
+                pool_size=int(os.getenv('HTTP_POOL_SIZE', '100'))
+            )
+        return _shared_client
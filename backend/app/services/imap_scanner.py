@@ -0,0 +1,377 @@
+"""
+IMAP Scanner
+Shared, incremental IMAP mailbox scanning with one connection, UID watermarks and batched fetches
+"""
+import asyncio
+import email
+import imaplib
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from email.message import Message
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = Path(__file__).resolve().parents[2] / '.cache' / 'imap_watermarks.json'
+
+# Headers fetched in the first (cheap) pass
+HEADER_FIELDS = ('SUBJECT', 'FROM', 'DATE', 'MESSAGE-ID')
+
+# UIDs per UID FETCH command (keeps the command line well below server limits)
+FETCH_CHUNK_SIZE = 200
+
+_UID_PATTERN = re.compile(rb'UID (\d+)')
+
+
+@dataclass
+class ScannedMessage:
+    """A new message matched by one or more search criteria"""
+    uid: int
+    headers: Message
+    labels: List[str] = field(default_factory=list)
+    message: Optional[Message] = None
+
+    @property
+    def subject(self) -> str:
+        return self.headers.get('Subject', '') or ''
+
+    @property
+    def sender(self) -> str:
+        return self.headers.get('From', '') or ''
+
+    @property
+    def date(self) -> str:
+        return self.headers.get('Date', '') or ''
+
+
+class ImapScanner:
+    """
+    One long-lived IMAP connection shared by all mailbox scans of an account
+
+    Each consumer (e.g. a scanner service) keeps its own last-seen UID per
+    mailbox, so repeated runs only search and fetch messages that arrived
+    since the previous run. A scan runs every search criterion as a UID
+    SEARCH, de-duplicates the hits, optionally filters them on headers
+    fetched with ``BODY.PEEK[HEADER.FIELDS ...]``, and then fetches the
+    remaining bodies in batched UID FETCH commands. All blocking IMAP I/O
+    and MIME parsing happens on a worker thread.
+    """
+
+    def __init__(
+        self,
+        user: str,
+        password: str,
+        host: str = 'imap.gmail.com',
+        port: int = 993,
+        state_path: Optional[Path] = None,
+        connection_factory: Optional[Callable[[], imaplib.IMAP4]] = None
+    ):
+        """
+        Initialize the scanner
+
+        Args:
+            user: IMAP login
+            password: IMAP (app) password
+            host: IMAP server
+            port: IMAP SSL port
+            state_path: JSON file storing UID watermarks
+            connection_factory: Creates an unauthenticated IMAP4 connection
+        """
+        self.user = user
+        self.password = password
+        self.host = host
+        self.port = port
+        self.state_path = Path(state_path) if state_path else DEFAULT_STATE_PATH
+        self._connection_factory = connection_factory or (lambda: imaplib.IMAP4_SSL(self.host, self.port))
+
+        # imaplib connections are not thread-safe
+        self._lock = threading.Lock()
+        self._conn: Optional[imaplib.IMAP4] = None
+        self._selected: Optional[str] = None
+        self._uidvalidity: Optional[str] = None
+        self._watermarks: Dict[str, Dict] = self._load_watermarks()
+
+        self.connects = 0
+        self.scans = 0
+        self.headers_fetched = 0
+        self.bodies_fetched = 0
+
+    def _load_watermarks(self) -> Dict[str, Dict]:
+        """Read persisted UID watermarks"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable IMAP watermark file {self.state_path}: {e}")
+            return {}
+
+    def _save_watermarks(self) -> None:
+        """Persist UID watermarks atomically"""
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.state_path.with_name(f".{self.state_path.name}.{os.getpid()}.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._watermarks, f, indent=2)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"Could not save IMAP watermarks: {e}")
+
+    def _connection(self) -> imaplib.IMAP4:
+        """Return the open connection, reconnecting if the server dropped it"""
+        if self._conn is not None:
+            try:
+                status, _ = self._conn.noop()
+                if status == 'OK':
+                    return self._conn
+            except (imaplib.IMAP4.error, OSError):
+                pass
+            self._drop_connection()
+
+        conn = self._connection_factory()
+        conn.login(self.user, self.password)
+        self._conn = conn
+        self.connects += 1
+        logger.info(f"📬 Connected to IMAP {self.host} as {self.user}")
+        return conn
+
+    def _drop_connection(self) -> None:
+        """Forget the current connection (after an error or on close)"""
+        conn, self._conn = self._conn, None
+        self._selected = None
+        self._uidvalidity = None
+        if conn is not None:
+            try:
+                conn.logout()
+            except (imaplib.IMAP4.error, OSError):
+                pass
+
+    def _select(self, conn: imaplib.IMAP4, mailbox: str) -> None:
+        """Select a mailbox read-only (so scans never change flags)"""
+        if self._selected == mailbox:
+            return
+
+        status, _ = conn.select(mailbox, readonly=True)
+        if status != 'OK':
+            raise imaplib.IMAP4.error(f"Cannot select mailbox {mailbox}")
+
+        _, data = conn.response('UIDVALIDITY')
+        self._uidvalidity = data[0].decode() if data and data[0] else None
+        self._selected = mailbox
+
+    def _fetch(self, conn: imaplib.IMAP4, uids: List[int], parts: str) -> Dict[int, bytes]:
+        """
+        Fetch message parts for many UIDs in chunked UID FETCH commands
+
+        A failed chunk is logged and skipped; its UIDs are missing from the
+        result, so callers can tell which messages were not fetched.
+        """
+        fetched: Dict[int, bytes] = {}
+        for start in range(0, len(uids), FETCH_CHUNK_SIZE):
+            uid_set = ','.join(str(uid) for uid in uids[start:start + FETCH_CHUNK_SIZE])
+            status, data = conn.uid('FETCH', uid_set, parts)
+            if status != 'OK':
+                logger.warning(f"IMAP UID FETCH {parts} failed: {data}")
+                continue
+
+            for item in data:
+                if isinstance(item, tuple):
+                    match = _UID_PATTERN.search(item[0])
+                    if match:
+                        fetched[int(match.group(1))] = item[1]
+        return fetched
+
+    def scan_blocking(
+        self,
+        consumer: str,
+        criteria: Dict[str, str],
+        mailbox: str = 'INBOX',
+        limit: Optional[int] = None,
+        header_filter: Optional[Callable[[ScannedMessage], bool]] = None,
+        incremental: bool = True
+    ) -> List[ScannedMessage]:
+        """
+        Search, filter and fetch new messages (blocking; see ``scan``)
+
+        Args:
+            consumer: Name whose UID watermark is used and advanced
+            criteria: Mapping of label to IMAP SEARCH criteria
+            mailbox: Mailbox to scan
+            limit: Matches kept per criterion: the oldest N above the watermark
+                for incremental scans (later runs continue from there), else the newest N
+            header_filter: Return False to skip a message before its body is fetched
+            incremental: Only consider UIDs above the consumer's watermark
+
+        Returns:
+            Matched messages in UID order, each with the labels of the criteria it matched
+
+        The watermark only advances past UIDs that were handled: it stops
+        below the first match that was left out by ``limit`` or whose
+        headers or body could not be fetched, so the next run retries it.
+        """
+        with self._lock:
+            try:
+                conn = self._connection()
+                self._select(conn, mailbox)
+                return self._scan_selected(conn, consumer, criteria, mailbox, limit, header_filter, incremental)
+            except (imaplib.IMAP4.abort, OSError):
+                # Connection is unusable; the next scan reconnects
+                self._drop_connection()
+                raise
+
+    def _scan_selected(self, conn, consumer, criteria, mailbox, limit, header_filter, incremental):
+        """Run one scan on the selected mailbox (caller holds the lock)"""
+        self.scans += 1
+        watermark_key = f"{consumer}:{self.user}:{mailbox}"
+        state = self._watermarks.get(watermark_key, {})
+        last_uid = state.get('last_uid', 0) if incremental and state.get('uidvalidity') == self._uidvalidity else 0
+
+        labels_by_uid: Dict[int, List[str]] = {}
+        highest_uid = last_uid
+        all_searches_ok = True
+        truncated = set()
+
+        for label, criterion in criteria.items():
+            query = f'(UID {last_uid + 1}:* {criterion})' if last_uid else criterion
+            try:
+                status, data = conn.uid('SEARCH', None, query)
+            except imaplib.IMAP4.abort:
+                raise
+            except imaplib.IMAP4.error as e:
+                # The server rejected this criterion; the others still run
+                status, data = 'NO', [str(e).encode()]
+            if status != 'OK':
+                logger.warning(f"IMAP search failed for {label}: {criterion}")
+                all_searches_ok = False
+                continue
+
+            # "n:*" always matches the highest UID, even when it is below n
+            uids = sorted(int(uid) for uid in (data[0] or b'').split() if int(uid) > last_uid)
+            if uids:
+                highest_uid = max(highest_uid, uids[-1])
+            if limit and len(uids) > limit:
+                if incremental:
+                    truncated.update(uids[limit:])
+                    uids = uids[:limit]
+                else:
+                    uids = uids[-limit:]
+            for uid in uids:
+                labels_by_uid.setdefault(uid, []).append(label)
+
+        uids = sorted(labels_by_uid)
+        # New matches this scan did not deliver: left out by limit (and not kept
+        # by another criterion) or not fetched
+        unhandled = truncated.difference(labels_by_uid)
+        if header_filter:
+            raw_headers = self._fetch(conn, uids, f"(BODY.PEEK[HEADER.FIELDS ({' '.join(HEADER_FIELDS)})])")
+            self.headers_fetched += len(raw_headers)
+            unhandled.update(uid for uid in uids if uid not in raw_headers)
+            candidates = [
+                ScannedMessage(uid, email.message_from_bytes(raw_headers[uid]), labels_by_uid[uid])
+                for uid in uids if uid in raw_headers
+            ]
+            candidates = [message for message in candidates if header_filter(message)]
+        else:
+            candidates = [ScannedMessage(uid, Message(), labels_by_uid[uid]) for uid in uids]
+
+        raw_bodies = self._fetch(conn, [message.uid for message in candidates], '(BODY.PEEK[])')
+        self.bodies_fetched += len(raw_bodies)
+
+        messages = []
+        for message in candidates:
+            raw = raw_bodies.get(message.uid)
+            if raw is None:
+                unhandled.add(message.uid)
+                continue
+            message.message = email.message_from_bytes(raw)
+            if not header_filter:
+                message.headers = message.message
+            messages.append(message)
+
+        new_watermark = min(unhandled) - 1 if unhandled else highest_uid
+        if unhandled and incremental:
+            logger.warning(
+                f"IMAP scan {consumer}: {len(unhandled)} match(es) not fetched; "
+                f"watermark held at UID {max(new_watermark, last_uid)}"
+            )
+
+        if incremental and all_searches_ok and new_watermark > last_uid:
+            self._watermarks[watermark_key] = {'uidvalidity': self._uidvalidity, 'last_uid': new_watermark}
+            self._save_watermarks()
+
+        logger.info(
+            f"📨 IMAP scan {consumer}: {len(labels_by_uid)} new match(es), "
+            f"{len(messages)} fetched (watermark UID {max(new_watermark, last_uid)})"
+        )
+        return messages
+
+    async def scan(
+        self,
+        consumer: str,
+        criteria: Dict[str, str],
+        mailbox: str = 'INBOX',
+        limit: Optional[int] = None,
+        header_filter: Optional[Callable[[ScannedMessage], bool]] = None,
+        incremental: bool = True
+    ) -> List[ScannedMessage]:
+        """Scan without blocking the event loop (arguments as in ``scan_blocking``)"""
+        return await asyncio.to_thread(
+            self.scan_blocking, consumer, criteria, mailbox, limit, header_filter, incremental
+        )
+
+    def get_stats(self) -> Dict:
+        """Connection and fetch counters"""
+        return {
+            'connected': self._conn is not None,
+            'connects': self.connects,
+            'scans': self.scans,
+            'headers_fetched': self.headers_fetched,
+            'bodies_fetched': self.bodies_fetched,
+            'watermarks': dict(self._watermarks)
+        }
+
+    def close(self) -> None:
+        """Log out and close the connection"""
+        with self._lock:
+            self._drop_connection()
+
+
+_shared_scanners: Dict[tuple, ImapScanner] = {}
+_shared_scanners_lock = threading.Lock()
+
+
+def get_imap_scanner(user: str, password: str, host: str = 'imap.gmail.com', port: int = 993) -> ImapScanner:
+    """
+    Get the process-wide scanner for an IMAP account
+
+    Environment:
+        IMAP_STATE_PATH: JSON file storing UID watermarks
+
+    Args:
+        user: IMAP login
+        password: IMAP (app) password
+        host: IMAP server
+        port: IMAP SSL port
+
+    Returns:
+        Shared ImapScanner for the account
+    """
+    key = (host, port, user)
+    with _shared_scanners_lock:
+        scanner = _shared_scanners.get(key)
+        if scanner is None or scanner.password != password:
+            scanner = ImapScanner(
+                user,
+                password,
+                host=host,
+                port=port,
+                state_path=os.getenv('IMAP_STATE_PATH') or None
+            )
+            _shared_scanners[key] = scanner
+        return scanner
@@ -1,8 +1,8 @@
-import aiohttp
 import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.services.http_client import get_http_client
 import logging
 import urllib.parse
 
@@ -87,7 +87,7 @@ class IndeedService:
         
         url = f"{self.base_url}/jobs/search"
         
-        async with aiohttp.ClientSession() as session:
+        async with get_http_client().session() as session:
             try:
                 async with session.get(url, headers=headers, params=params) as response:
                     if response.status == 200:
@@ -405,7 +405,7 @@ class IndeedService:
         
         url = f"{self.base_url}/job/{job_key}"
         
-        async with aiohttp.ClientSession() as session:
+        async with get_http_client().session() as session:
             try:
                 async with session.get(url, headers=headers) as response:
                     if response.status == 200:
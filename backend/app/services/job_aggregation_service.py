@@ -2,7 +2,7 @@ import asyncio
 from typing import List, Dict, Optional, Set
 from datetime import datetime, timedelta
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 
 from app.services.google_jobs_service import GoogleJobsService
 from app.services.indeed_service import IndeedService
@@ -10,6 +10,7 @@ from app.services.gmail_service import GmailService
 from app.services.arbetsformedlingen_service import ArbetsformedlingenService
 from app.services.linkedin_service import LinkedInService
 from app.core.database import get_async_session
+from app.core.sql_database import database_session
 from app.models.job import JobPosting, JobCreate
 import re
 
@@ -31,9 +32,50 @@ class JobSearchRequest:
     keywords_required: List[str] = None
     keywords_exclude: List[str] = None
 
+@dataclass
+class ScoringContext:
+    """Per-search user data used when scoring jobs, loaded once instead of per job"""
+    user_id: str
+    has_profile: bool = False
+    skills: frozenset = field(default_factory=frozenset)
+    experience_level: str = ""
+    
+    @classmethod
+    def from_user(cls, user_id: str, user: Optional[Dict]) -> "ScoringContext":
+        """Build the context from a users-collection document (None if the user is unknown)"""
+        if not user:
+            return cls(user_id=user_id)
+        
+        profile = user.get("profile") or {}
+        return cls(
+            user_id=user_id,
+            has_profile=True,
+            skills=frozenset(skill.lower() for skill in profile.get("skills", [])),
+            experience_level=(profile.get("experience_level") or "").lower()
+        )
+
+@dataclass(frozen=True)
+class PlannedSearch:
+    """One source search in a fan-out plan"""
+    source: str
+    query: str
+    location: str
+
 class JobAggregationService:
     """Unified service for aggregating jobs from multiple sources"""
     
+    # Concurrent searches per source when fanning out many queries
+    SOURCE_CONCURRENCY = {
+        "google": 2,
+        "indeed": 2,
+        "arbetsformedlingen": 4,
+        "linkedin": 2,
+        "gmail": 1
+    }
+    
+    # Sources whose results do not depend on the requested location
+    LOCATION_INDEPENDENT_SOURCES = {"gmail"}
+    
     def __init__(self):
         self.google_service = GoogleJobsService()
         self.indeed_service = IndeedService()
@@ -101,8 +143,9 @@ class JobAggregationService:
         
         logger.info(f"Found {len(all_jobs)} total jobs before processing")
         
-        # Process and filter jobs
-        processed_jobs = await self._process_jobs(all_jobs, search_request, user_id)
+        # Process and filter jobs (user profile is loaded once for the whole batch)
+        scoring_context = await self._load_scoring_context(user_id)
+        processed_jobs = await self._process_jobs(all_jobs, search_request, user_id, scoring_context)
         
         # Remove duplicates
         unique_jobs = self._remove_duplicates(processed_jobs)
@@ -122,6 +165,130 @@ class JobAggregationService:
         logger.info(f"Returning {len(final_jobs)} jobs after processing")
         return final_jobs
     
+    def plan_searches(self, queries: List[str], locations: List[str], sources: List[str]) -> List[PlannedSearch]:
+        """
+        Build the set of source searches needed to cover queries x locations
+        
+        Location-independent sources (Gmail) are searched once per query.
+        
+        Args:
+            queries: Search queries
+            locations: Search locations
+            sources: Source names to search
+            
+        Returns:
+            Unique planned searches
+        """
+        plan = []
+        seen = set()
+        
+        for source in sources:
+            source_locations = [""] if source in self.LOCATION_INDEPENDENT_SOURCES else locations
+            for query in queries:
+                for location in source_locations:
+                    planned = PlannedSearch(source=source, query=query, location=location)
+                    if planned not in seen:
+                        seen.add(planned)
+                        plan.append(planned)
+        
+        return plan
+    
+    async def search_jobs_fanout(
+        self,
+        template: JobSearchRequest,
+        queries: List[str],
+        locations: List[str],
+        user_id: str,
+        max_results: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Search many queries and locations with one pass of processing
+        
+        Every (source, query, location) search runs once, concurrently
+        within the per-source limits. The merged candidates are then
+        enhanced, de-duplicated, filtered, sorted and saved a single time,
+        so the cost grows with the number of sources rather than with
+        sources x queries x locations.
+        
+        Args:
+            template: Filters and per-source result sizes (query/location are ignored)
+            queries: Search queries
+            locations: Search locations
+            user_id: User ID for personalization and storage
+            max_results: Optional cap on the returned jobs
+            
+        Returns:
+            List of unified job postings sorted by relevance
+        """
+        user = await self._load_user(user_id)
+        scoring_context = ScoringContext.from_user(user_id, user)
+        
+        sources = ["google", "indeed", "arbetsformedlingen", "linkedin"]
+        gmail_creds = user.get("gmail_credentials") if user else None
+        if gmail_creds and gmail_creds.get("token") is not None:
+            sources.append("gmail")
+        
+        plan = self.plan_searches(queries, locations, sources)
+        logger.info(
+            f"Fan-out search for user {user_id}: {len(plan)} source searches "
+            f"for {len(queries)} queries x {len(locations)} locations"
+        )
+        
+        semaphores = {
+            source: asyncio.Semaphore(self.SOURCE_CONCURRENCY.get(source, 2)) for source in sources
+        }
+        
+        async def run(planned: PlannedSearch) -> List[Dict]:
+            async with semaphores[planned.source]:
+                return await self._run_source_search(planned, template, user_id, user)
+        
+        search_results = await asyncio.gather(*(run(planned) for planned in plan), return_exceptions=True)
+        
+        # Enhance each source's results against the request that produced them
+        candidates = []
+        for planned, results in zip(plan, search_results):
+            if isinstance(results, Exception):
+                logger.error(f"{planned.source} search for '{planned.query}' in '{planned.location}' failed: {results}")
+                continue
+            search_request = replace(template, query=planned.query, location=planned.location)
+            candidates.extend(await self._process_jobs(results, search_request, user_id, scoring_context))
+        
+        logger.info(f"Found {len(candidates)} total jobs before de-duplication")
+        
+        # Keep the best-scoring copy of jobs returned by several searches
+        candidates.sort(key=lambda job: job.get("match_score", 0.0), reverse=True)
+        unique_jobs = self._remove_duplicates(candidates)
+        filtered_jobs = self._apply_filters(unique_jobs, template)
+        final_jobs = self._sort_jobs(filtered_jobs, template)
+        if max_results is not None:
+            final_jobs = final_jobs[:max_results]
+        
+        # One search record and one bulk upsert for the whole run
+        summary_request = replace(template, query=", ".join(queries), location=", ".join(locations))
+        await self._save_search_results(final_jobs, summary_request, user_id)
+        
+        logger.info(f"Returning {len(final_jobs)} jobs after fan-out processing")
+        return final_jobs
+    
+    async def _run_source_search(
+        self, planned: PlannedSearch, template: JobSearchRequest, user_id: str, user: Optional[Dict]
+    ) -> List[Dict]:
+        """Run one planned search against its source"""
+        search_request = replace(template, query=planned.query, location=planned.location)
+        
+        if planned.source == "google":
+            return await self._search_google_jobs(search_request)
+        if planned.source == "indeed":
+            return await self._search_indeed_jobs(search_request)
+        if planned.source == "arbetsformedlingen":
+            return await self._search_arbetsformedlingen_jobs(search_request)
+        if planned.source == "linkedin":
+            return await self._search_linkedin_jobs(search_request)
+        if planned.source == "gmail":
+            return await self._search_gmail_jobs(search_request, user_id, user)
+        
+        raise ValueError(f"Unknown job source: {planned.source}")
+    
     async def _search_google_jobs(self, search_request: JobSearchRequest) -> List[Dict]:
         """Search jobs using Google Custom Search"""
         try:
@@ -208,12 +375,14 @@ class JobAggregationService:
             logger.error(f"LinkedIn jobs search failed: {e}")
             return []
     
-    async def _search_gmail_jobs(self, search_request: JobSearchRequest, user_id: str) -> List[Dict]:
-        """Search job-related emails using Gmail API"""
+    async def _search_gmail_jobs(
+        self, search_request: JobSearchRequest, user_id: str, user: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Search job-related emails using Gmail API (pass ``user`` to skip reloading it)"""
         try:
             # Get user's Gmail credentials from database
-            db = await get_database()
-            user = await db.users.find_one({"_id": user_id})
+            if user is None:
+                user = await self._load_user(user_id)
             
             if not user or not user.get("gmail_credentials"):
                 logger.info(f"No Gmail credentials found for user {user_id}")
@@ -282,20 +451,48 @@ class JobAggregationService:
     async def _has_gmail_access(self, user_id: str) -> bool:
         """Check if user has connected Gmail account"""
         try:
-            db = await get_database()
-            user = await db.users.find_one({"_id": user_id})
+            async with database_session() as db:
+                user = await db.users.find_one({"_id": user_id})
             gmail_creds = user.get("gmail_credentials") if user else None
             return gmail_creds and gmail_creds.get("token") is not None
         except Exception:
             return False
     
-    async def _process_jobs(self, jobs: List[Dict], search_request: JobSearchRequest, user_id: str) -> List[Dict]:
+    async def _load_user(self, user_id: str) -> Optional[Dict]:
+        """Load the user document (None if unknown or the database is unavailable)"""
+        try:
+            async with database_session() as db:
+                return await db.users.find_one({"_id": user_id})
+        except Exception as e:
+            logger.error(f"Error loading user {user_id}: {e}")
+            return None
+    
+    async def _load_scoring_context(self, user_id: str) -> ScoringContext:
+        """Load the user profile once per search for match scoring"""
+        try:
+            async with database_session() as db:
+                user = await db.users.find_one({"_id": user_id})
+            return ScoringContext.from_user(user_id, user)
+        except Exception as e:
+            logger.error(f"Error loading user profile for scoring: {e}")
+            return ScoringContext(user_id=user_id)
+    
+    async def _process_jobs(
+        self,
+        jobs: List[Dict],
+        search_request: JobSearchRequest,
+        user_id: str,
+        scoring_context: Optional[ScoringContext] = None
+    ) -> List[Dict]:
         """Process and enhance job data"""
         processed_jobs = []
         
+        if scoring_context is None:
+            scoring_context = await self._load_scoring_context(user_id)
+        
         for job in jobs:
             try:
-                enhanced_job = await self._enhance_job(job, search_request, user_id)
+                enhanced_job = await self._enhance_job(job, search_request, scoring_context)
                 if enhanced_job:
                     processed_jobs.append(enhanced_job)
             except Exception as e:
@@ -304,15 +501,15 @@ class JobAggregationService:
         
         return processed_jobs
     
-    async def _enhance_job(self, job: Dict, search_request: JobSearchRequest, user_id: str) -> Optional[Dict]:
+    async def _enhance_job(self, job: Dict, search_request: JobSearchRequest, scoring_context: ScoringContext) -> Optional[Dict]:
         """Enhance job with additional data and scoring"""
         
         # Standardize job format
         standardized_job = self._standardize_job_format(job)
         
         # Calculate match score
-        standardized_job["match_score"] = await self._calculate_match_score(
-            standardized_job, search_request, user_id
+        standardized_job["match_score"] = self._calculate_match_score(
+            standardized_job, search_request, scoring_context
         )
         
         # Calculate ATS compatibility score
@@ -355,7 +552,7 @@ class JobAggregationService:
             "original_data": job  # Keep original for reference
         }
     
-    async def _calculate_match_score(self, job: Dict, search_request: JobSearchRequest, user_id: str) -> float:
+    def _calculate_match_score(self, job: Dict, search_request: JobSearchRequest, scoring_context: ScoringContext) -> float:
         """Calculate how well job matches search criteria and user profile"""
         
         score = 0.0
@@ -377,7 +574,7 @@ class JobAggregationService:
         score += recency_score * 0.1
         
         # User profile match (15% of score)
-        profile_score = await self._calculate_profile_match(job, user_id)
+        profile_score = self._calculate_profile_match(job, scoring_context)
         score += profile_score * 0.15
         
         return min(score, 1.0)
@@ -490,21 +687,17 @@ class JobAggregationService:
         else:
             return 0.2
     
-    async def _calculate_profile_match(self, job: Dict, user_id: str) -> float:
+    def _calculate_profile_match(self, job: Dict, scoring_context: ScoringContext) -> float:
         """Calculate match with user profile and preferences"""
         
         try:
-            db = await get_database()
-            user = await db.users.find_one({"_id": user_id})
-            
-            if not user:
+            if not scoring_context.has_profile:
                 return 0.5
             
-            profile = user.get("profile", {})
             score = 0.5
             
             # Match skills
-            user_skills = set(skill.lower() for skill in profile.get("skills", []))
+            user_skills = scoring_context.skills
             job_keywords = set(kw.lower() for kw in job.get("keywords", []))
             
             if user_skills and job_keywords:
@@ -512,7 +705,7 @@ class JobAggregationService:
                 score += (skill_overlap / len(user_skills)) * 0.3
             
             # Match experience level
-            user_level = profile.get("experience_level", "").lower()
+            user_level = scoring_context.experience_level
             job_level = job.get("experience_level", "").lower()
             
             if user_level and job_level:
@@ -764,56 +957,50 @@ class JobAggregationService:
         """Save search results to database for analytics and caching"""
         
         try:
-            db = await get_database()
-            
-            # Save search query
-            search_record = {
-                "user_id": user_id,
-                "query": search_request.query,
-                "location": search_request.location,
-                "filters": {
-                    "job_types": search_request.job_types,
-                    "salary_range": [search_request.salary_min, search_request.salary_max],
-                    "experience_levels": search_request.experience_levels,
-                    "date_posted": search_request.date_posted
-                },
-                "results_count": len(jobs),
-                "search_timestamp": datetime.utcnow()
-            }
+            async with database_session() as db:
             
-            await db.job_searches.insert_one(search_record)
-            
-            # Save/update job postings
-            for job in jobs:
-                job_doc = {
+                # Save search query
+                search_record = {
                     "user_id": user_id,
-                    "source": job.get("source"),
-                    "title": job.get("title"),
-                    "company": job.get("company"),
-                    "location": job.get("location"),
-                    "description": job.get("description"),
-                    "url": job.get("url"),
-                    "posting_date": job.get("posting_date"),
-                    "salary": job.get("salary"),
-                    "keywords": job.get("keywords", []),
-                    "match_score": job.get("match_score", 0.0),
-                    "confidence_score": job.get("confidence_score", 0.0),
-                    "ats_score": job.get("ats_score", 0.0),
-                    "category": job.get("category"),
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
+                    "query": search_request.query,
+                    "location": search_request.location,
+                    "filters": {
+                        "job_types": search_request.job_types,
+                        "salary_range": [search_request.salary_min, search_request.salary_max],
+                        "experience_levels": search_request.experience_levels,
+                        "date_posted": search_request.date_posted
+                    },
+                    "results_count": len(jobs),
+                    "search_timestamp": datetime.utcnow()
                 }
-                
-                # Upsert job (update if exists, insert if new)
-                await db.jobs.update_one(
+            
+                await db.job_searches.insert_one(search_record)
+            
+                # Save/update job postings in one set-based upsert
+                now = datetime.utcnow()
+                job_docs = [
                     {
+                        "user_id": user_id,
+                        "source": job.get("source"),
                         "title": job.get("title"),
                         "company": job.get("company"),
-                        "url": job.get("url")
-                    },
-                    {"$set": job_doc},
-                    upsert=True
-                )
+                        "location": job.get("location"),
+                        "description": job.get("description"),
+                        "url": job.get("url"),
+                        "posting_date": job.get("posting_date"),
+                        "salary": job.get("salary"),
+                        "keywords": job.get("keywords", []),
+                        "match_score": job.get("match_score", 0.0),
+                        "confidence_score": job.get("confidence_score", 0.0),
+                        "ats_score": job.get("ats_score", 0.0),
+                        "category": job.get("category"),
+                        "created_at": now,
+                        "updated_at": now
+                    }
+                    for job in jobs
+                ]
+            
+                await db.jobs.upsert_many(job_docs)
             
             logger.info(f"Saved search results for user {user_id}")
             
@@ -824,12 +1011,12 @@ class JobAggregationService:
         """Get user's saved/bookmarked jobs"""
         
         try:
-            db = await get_database()
-            cursor = db.jobs.find(
-                {"user_id": user_id, "is_saved": True}
-            ).sort("updated_at", -1).limit(limit)
+            async with database_session() as db:
+                cursor = db.jobs.find(
+                    {"user_id": user_id, "is_saved": True}
+                ).sort("updated_at", -1).limit(limit)
             
-            return await cursor.to_list(length=limit)
+                return await cursor.to_list(length=limit)
             
         except Exception as e:
             logger.error(f"Error fetching saved jobs: {e}")
@@ -839,12 +1026,12 @@ class JobAggregationService:
         """Get user's search history"""
         
         try:
-            db = await get_database()
-            cursor = db.job_searches.find(
-                {"user_id": user_id}
-            ).sort("search_timestamp", -1).limit(limit)
+            async with database_session() as db:
+                cursor = db.job_searches.find(
+                    {"user_id": user_id}
+                ).sort("search_timestamp", -1).limit(limit)
             
-            return await cursor.to_list(length=limit)
+                return await cursor.to_list(length=limit)
             
         except Exception as e:
             logger.error(f"Error fetching search history: {e}")
@@ -6,12 +6,12 @@ from email.mime.application import MIMEApplication
 from typing import Dict, List, Optional
 import logging
 from datetime import datetime
-import aiohttp
 from bs4 import BeautifulSoup
 import re
 
 from app.core.config import settings
 from app.services.professional_latex_service import ProfessionalLaTeXService
+from app.services.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,7 @@ class JobApplicationProcessor:
     async def process_linkedin_job(self, job_url: str) -> Dict:
         """Extract job details from LinkedIn job URL"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with get_http_client().session() as session:
                 headers = {
                     'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
                 }
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
@@ -8,7 +7,9 @@ import re
 from app.services.job_aggregation_service import JobAggregationService, JobSearchRequest
 from app.services.latex_resume_service import LaTeXResumeService
 from app.services.email_automation_service import EmailAutomationService
+from app.services.processed_job_index import get_processed_job_index, warm_processed_job_index
 from app.core.database import get_async_session
+from app.core.sql_database import database_session
 
 logger = logging.getLogger(__name__)
 
@@ -145,31 +146,21 @@ class JobAutomationService:
             }
     
     async def _fetch_all_jobs(self, user_id: str) -> List[Dict]:
-        """Fetch jobs from all sources with multiple queries"""
-        all_jobs = []
+        """Fetch jobs from all sources with multiple queries (one concurrent fan-out)"""
+        search_template = JobSearchRequest(
+            query="",
+            max_results=20,  # Limit per source search to avoid overwhelming
+            include_remote=True,
+            date_posted="all"  # We'll filter by date separately
+        )
         
-        for query in self.search_queries:
-            for location in self.locations:
-                try:
-                    search_request = JobSearchRequest(
-                        query=query,
-                        location=location,
-                        max_results=20,  # Limit per query to avoid overwhelming
-                        include_remote=True,
-                        date_posted="all"  # We'll filter by date separately
-                    )
-                    
-                    jobs = await self.job_service.search_jobs(search_request, user_id)
-                    all_jobs.extend(jobs)
-                    
-                    # Small delay to respect API limits
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    logger.error("Error fetching jobs for query '%s' in '%s': %s", query, location, e)
-                    continue
-        
-        return all_jobs
+        try:
+            return await self.job_service.search_jobs_fanout(
+                search_template, self.search_queries, self.locations, user_id
+            )
+        except Exception as e:
+            logger.error("Error fetching jobs: %s", e)
+            return []
     
     async def _apply_comprehensive_filters(self, jobs: List[Dict]) -> List[Dict]:
         """Apply all filtering criteria"""
@@ -330,15 +321,18 @@ class JobAutomationService:
     async def _filter_new_jobs(self, jobs: List[Dict], user_id: str) -> List[Dict]:
         """Filter out jobs that have already been processed"""
         try:
-            db = await get_database()
+            urls = list(dict.fromkeys(job.get('url') for job in jobs if job.get('url')))
+            index = get_processed_job_index()
             
-            # Get processed job URLs from database
-            processed_jobs = await db.processed_jobs.find(
-                {"user_id": user_id},
-                {"url": 1}
-            ).to_list(length=None)
+            if index is not None:
+                if not index.is_warm:
+                    await warm_processed_job_index()
+                # Drops definite Bloom misses only when this process is the single writer
+                urls = index.candidates(user_id, urls)
             
-            processed_urls = {job["url"] for job in processed_jobs}
+            async with database_session() as db:
+                # Indexed lookup of this batch only, not the user's whole history
+                processed_urls = await db.processed_jobs.find_processed_urls(user_id, urls)
             
             # Filter out already processed jobs
             new_jobs = [job for job in jobs if job.get('url') not in processed_urls]
@@ -416,8 +410,6 @@ This application was automatically generated and sent on {datetime.utcnow().strf
     async def _mark_job_as_processed(self, job: Dict, user_id: str):
         """Mark job as processed in database"""
         try:
-            db = await get_database()
-            
             processed_job = {
                 "user_id": user_id,
                 "job_title": job.get('title'),
@@ -428,7 +420,12 @@ This application was automatically generated and sent on {datetime.utcnow().strf
                 "job_data": job
             }
             
-            await db.processed_jobs.insert_one(processed_job)
+            async with database_session() as db:
+                await db.processed_jobs.insert_one(processed_job)
+            
+            index = get_processed_job_index()
+            if index is not None:
+                index.add(user_id, job.get('url'))
             
         except Exception as e:
             logger.error("Error marking job as processed: %s", e)
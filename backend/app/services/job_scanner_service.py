@@ -4,14 +4,14 @@ import asyncio
 import re
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-import imaplib
-import email
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
-import smtplib
 import json
 
+from app.services.imap_scanner import get_imap_scanner
+from app.services.smtp_mailer import get_smtp_mailer
+
 logger = logging.getLogger(__name__)
 
 class JobScannerService:
@@ -20,6 +20,11 @@ class JobScannerService:
     Sends personalized emails with CV/CL and direct application links
     """
     
+    SPAM_INDICATORS = [
+        "unsubscribe", "marketing", "newsletter", "promotion",
+        "advertisement", "free", "click here", "limited time"
+    ]
+    
     def __init__(self):
         # Email configuration
         self.gmail_user = "bluehawana@gmail.com"
@@ -51,17 +56,16 @@ class JobScannerService:
             "monster": r"monster\.se/jobb/[^/]+/(\d+)"
         }
         
-    async def scan_gmail_jobs(self, days_back: int = 7) -> List[Dict]:
+    async def scan_gmail_jobs(self, days_back: int = 7, incremental: bool = True) -> List[Dict]:
         """
         Scan Gmail for job-related emails and extract job information
+        
+        With ``incremental`` only mail that arrived since the previous scan is fetched.
         """
         try:
             logger.info(f"Scanning Gmail {self.gmail_user} for job emails from last {days_back} days")
             
-            # Connect to Gmail IMAP
-            mail = imaplib.IMAP4_SSL("imap.gmail.com")
-            mail.login(self.gmail_user, self.gmail_password)
-            mail.select("inbox")
+            scanner = get_imap_scanner(self.gmail_user, self.gmail_password)
             
             # Calculate date range
             since_date = (datetime.now() - timedelta(days=days_back)).strftime("%d-%b-%Y")
@@ -75,28 +79,25 @@ class JobScannerService:
                 f'(SINCE "{since_date}")'
             ]
             
+            # Each message is fetched once even if several criteria match it (up to 20 per criteria and run)
+            messages = await scanner.scan(
+                'job_scanner',
+                {criteria: criteria for criteria in search_criteria},
+                limit=20,
+                header_filter=lambda scanned: not self._is_spam_subject(scanned.subject),
+                incremental=incremental
+            )
+            logger.info(f"Found {len(messages)} new emails matching job search criteria")
+            
             jobs_found = []
             
-            for criteria in search_criteria:
+            for scanned in messages:
                 try:
-                    status, messages = mail.search(None, criteria)
-                    if status == "OK":
-                        message_ids = messages[0].split()
-                        logger.info(f"Found {len(message_ids)} emails matching: {criteria}")
-                        
-                        for msg_id in message_ids[-20:]:  # Process last 20 emails
-                            try:
-                                job_info = await self._extract_job_from_email(mail, msg_id)
-                                if job_info:
-                                    jobs_found.append(job_info)
-                            except Exception as e:
-                                logger.warning(f"Error processing email {msg_id}: {e}")
-                                
+                    job_info = await self._extract_job_from_email(scanned.message)
+                    if job_info:
+                        jobs_found.append(job_info)
                 except Exception as e:
-                    logger.warning(f"Error with search criteria {criteria}: {e}")
-            
-            mail.close()
-            mail.logout()
+                    logger.warning(f"Error processing email {scanned.uid}: {e}")
             
             # Remove duplicates based on application link
             unique_jobs = []
@@ -115,18 +116,11 @@ class JobScannerService:
             logger.error(f"Error scanning Gmail for jobs: {e}")
             return []
     
-    async def _extract_job_from_email(self, mail, msg_id) -> Optional[Dict]:
+    async def _extract_job_from_email(self, email_message) -> Optional[Dict]:
         """
-        Extract job information from an email
+        Extract job information from a parsed email message
         """
         try:
-            status, msg_data = mail.fetch(msg_id, "(RFC822)")
-            if status != "OK":
-                return None
-                
-            email_body = msg_data[0][1]
-            email_message = email.message_from_bytes(email_body)
-            
             subject = email_message["Subject"] or ""
             sender = email_message["From"] or ""
             date = email_message["Date"] or ""
@@ -189,16 +183,18 @@ class JobScannerService:
             "apply now", "job alert", "new job", "job match"
         ]
         
-        spam_indicators = [
-            "unsubscribe", "marketing", "newsletter", "promotion",
-            "advertisement", "free", "click here", "limited time"
-        ]
-        
         job_score = sum(1 for indicator in job_indicators if indicator in text)
-        spam_score = sum(1 for indicator in spam_indicators if indicator in text)
+        spam_score = sum(1 for indicator in self.SPAM_INDICATORS if indicator in text)
         
         return job_score >= 2 and spam_score < 3
     
+    def _is_spam_subject(self, subject: str) -> bool:
+        """
+        Reject from headers alone: a subject this spammy fails _is_job_email whatever the body says
+        """
+        subject = subject.lower()
+        return sum(1 for indicator in self.SPAM_INDICATORS if indicator in subject) >= 3
+    
     def _extract_job_title(self, subject: str, content: str) -> str:
         """
         Extract job title from email
@@ -456,14 +452,9 @@ class JobScannerService:
                 )
                 msg.attach(cl_attachment)
             
-            # Send email
-            server = smtplib.SMTP('smtp.gmail.com', 587)
-            server.starttls()
-            server.login(self.sender_email, self.sender_password)
-            
-            text = msg.as_string()
-            server.sendmail(self.sender_email, self.target_email, text)
-            server.quit()
+            # Send email over the shared SMTP session
+            mailer = get_smtp_mailer(self.sender_email, self.sender_password)
+            await mailer.send(msg, from_addr=self.sender_email, to_addrs=[self.target_email])
             
             logger.info(f"✅ Successfully sent job email for {job['company']}")
             return True
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+LaTeX Compiler
+Shared, pooled pdflatex compilation with isolated temp dirs, timeouts and metrics
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompileResult:
+    """
+    Outcome of a single LaTeX compilation
+
+    ``success`` means the engine exited with code 0 within the timeout
+    and wrote a PDF. nonstopmode runs that fail (or time out) can still
+    leave a PDF behind; ``has_pdf`` reports that for callers that accept
+    such output.
+    """
+    jobname: str
+    success: bool
+    pdf_content: bytes = b""
+    returncode: Optional[int] = None
+    stdout: str = ""
+    stderr: str = ""
+    duration: float = 0.0
+    error: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def has_pdf(self) -> bool:
+        """True if a (possibly partial) PDF was produced"""
+        return bool(self.pdf_content)
+
+    def write_pdf(self, output_path: Path) -> bool:
+        """Write the PDF next to its final name and rename into place atomically"""
+        if not self.success:
+            return False
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(self.pdf_content)
+        os.replace(temp_path, output_path)
+        return True
+
+
+class PdfCache:
+    """
+    Content-addressed on-disk cache of compiled PDFs
+
+    Keys are SHA-256 hashes of the engine version plus the final .tex
+    source, so any change to the document (or a TeX upgrade) is a miss.
+    The directory is capped at ``max_bytes`` and trimmed least recently
+    used first. PDFs written by other workers sharing the directory are
+    picked up on lookup.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 500 * 1024 * 1024):
+        """
+        Initialize the cache and index any PDFs already on disk
+
+        Args:
+            cache_dir: Directory holding <hash>.pdf files
+            max_bytes: Maximum total size of cached PDFs
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        # Oldest modification time first, so restarts keep LRU order
+        existing = sorted(self.cache_dir.glob('*.pdf'), key=lambda path: path.stat().st_mtime)
+        for path in existing:
+            size = path.stat().st_size
+            self._entries[path.stem] = size
+            self._total_bytes += size
+
+    @staticmethod
+    def make_key(latex_source: str, engine_version: str) -> str:
+        """Hash the final LaTeX source together with the engine version"""
+        digest = hashlib.sha256()
+        digest.update(engine_version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(latex_source.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Location of a cached PDF"""
+        return self.cache_dir / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a compiled PDF
+
+        Args:
+            key: Cache key from ``make_key``
+
+        Returns:
+            PDF bytes, or None on miss
+        """
+        path = self._path(key)
+        with self._lock:
+            indexed = key in self._entries
+            if indexed:
+                self._entries.move_to_end(key)
+
+        if not indexed and not self._adopt(key, path):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            pdf_content = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return pdf_content
+
+    def _adopt(self, key: str, path: Path) -> bool:
+        """Index a PDF another process stored after this cache was opened"""
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return False
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = size
+                self._total_bytes += size
+        return True
+
+    def put(self, key: str, pdf_content: bytes) -> None:
+        """
+        Store a compiled PDF and evict least recently used entries over the size cap
+
+        Args:
+            key: Cache key from ``make_key``
+            pdf_content: PDF bytes
+        """
+        if not pdf_content or len(pdf_content) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            temp_path.write_bytes(pdf_content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache compiled PDF: {e}")
+            return
+
+        evicted = []
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(pdf_content)
+            self._total_bytes += len(pdf_content)
+            self.stores += 1
+
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                self.evictions += 1
+                evicted.append(old_key)
+
+        for old_key in evicted:
+            try:
+                self._path(old_key).unlink()
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters, hit ratio and disk usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+class LatexCompiler:
+    """
+    Bounded worker pool around pdflatex
+
+    Every compilation runs in its own temporary directory, so concurrent
+    requests never share .aux/.log/.pdf files and nothing is written into
+    the process working directory. Sync callers use ``compile`` /
+    ``compile_many``; ``async def`` services await ``compile_async``.
+    With a ``PdfCache`` attached, unchanged sources skip pdflatex entirely.
+    """
+
+    # Keep this many recent durations for the latency percentiles
+    METRICS_WINDOW = 500
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: int = 30,
+        engine: str = 'pdflatex',
+        pdf_cache: Optional[PdfCache] = None
+    ):
+        """
+        Initialize the compiler pool
+
+        Args:
+            max_workers: Maximum concurrent pdflatex processes
+            timeout: Seconds before a pdflatex run is killed
+            engine: LaTeX engine executable
+            pdf_cache: Optional cache of compiled PDFs keyed by source hash
+        """
+        self.max_workers = max_workers or int(os.getenv('LATEX_MAX_WORKERS', min(4, os.cpu_count() or 1)))
+        self.timeout = timeout
+        self.engine = engine
+        self.pdf_cache = pdf_cache
+        self._engine_version: Optional[str] = None
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='latex')
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._durations = deque(maxlen=self.METRICS_WINDOW)
+
+    @staticmethod
+    def _safe_jobname(jobname: str) -> str:
+        """Restrict job names to characters pdflatex and the filesystem accept"""
+        return re.sub(r'[^a-zA-Z0-9_-]', '_', jobname or 'document')[:100] or 'document'
+
+    @property
+    def engine_version(self) -> str:
+        """First line of ``<engine> --version`` (part of the PDF cache key), probed once"""
+        if self._engine_version is None:
+            try:
+                output = subprocess.run(
+                    [self.engine, '--version'], capture_output=True, text=True, timeout=10
+                ).stdout
+                self._engine_version = output.splitlines()[0].strip() if output else self.engine
+            except (OSError, subprocess.SubprocessError):
+                self._engine_version = self.engine
+        return self._engine_version
+
+    def _run(self, latex_source: str, jobname: str, cache_key: Optional[str] = None) -> CompileResult:
+        """Compile one document in an isolated temp dir (runs on a pool thread)"""
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+
+        start = time.perf_counter()
+        result = CompileResult(jobname=jobname, success=False)
+
+        try:
+            with tempfile.TemporaryDirectory(prefix='latex_') as temp_dir:
+                tex_path = Path(temp_dir) / f"{jobname}.tex"
+                pdf_path = Path(temp_dir) / f"{jobname}.pdf"
+                tex_path.write_text(latex_source, encoding='utf-8')
+
+                try:
+                    process = subprocess.run(
+                        [self.engine, '-interaction=nonstopmode', '-output-directory', temp_dir, str(tex_path)],
+                        capture_output=True,
+                        timeout=self.timeout,
+                        text=True,
+                        errors='replace'
+                    )
+                    result.returncode = process.returncode
+                    result.stdout = process.stdout
+                    result.stderr = process.stderr
+                except subprocess.TimeoutExpired:
+                    result.error = f"{self.engine} timed out after {self.timeout}s"
+                    with self._lock:
+                        self._timeouts += 1
+
+                # nonstopmode can leave a PDF behind even when the run failed
+                if pdf_path.exists():
+                    result.pdf_content = pdf_path.read_bytes()
+                result.success = result.returncode == 0 and not result.error and result.has_pdf
+                if not result.error and not result.success:
+                    result.error = (
+                        f"{self.engine} exited with code {result.returncode}" if result.has_pdf
+                        else f"PDF not generated (exit code {result.returncode})"
+                    )
+
+        except FileNotFoundError:
+            result.error = f"{self.engine} is not installed"
+        except Exception as e:
+            result.error = str(e)
+
+        result.duration = time.perf_counter() - start
+
+        with self._lock:
+            self._active -= 1
+            self._durations.append(result.duration)
+            if result.success:
+                self._completed += 1
+            else:
+                self._failed += 1
+
+        # Only clean runs are cached; a failed or timed-out PDF would be served forever
+        if result.success and cache_key:
+            self.pdf_cache.put(cache_key, result.pdf_content)
+
+        if result.success:
+            logger.info(f"✅ Compiled {jobname}.pdf in {result.duration:.2f}s ({len(result.pdf_content)} bytes)")
+        elif result.has_pdf:
+            logger.warning(f"⚠️ LaTeX compilation of {jobname} failed but left a PDF: {result.error}")
+        else:
+            logger.error(f"❌ LaTeX compilation failed for {jobname}: {result.error or result.stderr}")
+
+        return result
+
+    def submit(self, latex_source: str, jobname: str = 'document') -> Future:
+        """
+        Queue a compilation on the worker pool
+
+        Args:
+            latex_source: Complete LaTeX document
+            jobname: Base name for the .tex/.pdf files
+
+        Returns:
+            Future resolving to a CompileResult
+        """
+        jobname = self._safe_jobname(jobname)
+
+        cache_key = None
+        if self.pdf_cache:
+            cache_key = self.pdf_cache.make_key(latex_source, self.engine_version)
+            pdf_content = self.pdf_cache.get(cache_key)
+            if pdf_content is not None:
+                logger.info(f"⚡ PDF cache hit for {jobname} ({cache_key[:12]})")
+                future = Future()
+                future.set_result(CompileResult(
+                    jobname=jobname, success=True, pdf_content=pdf_content, returncode=0, cached=True
+                ))
+                return future
+
+        with self._lock:
+            self._queued += 1
+        return self._executor.submit(self._run, latex_source, jobname, cache_key)
+
+    def compile(self, latex_source: str, jobname: str = 'document') -> CompileResult:
+        """Compile one document and wait for the result"""
+        return self.submit(latex_source, jobname).result()
+
+    def compile_many(self, sources: Dict[str, str]) -> Dict[str, CompileResult]:
+        """
+        Compile several documents concurrently (e.g. CV and cover letter)
+
+        Args:
+            sources: Mapping of jobname to LaTeX source
+
+        Returns:
+            Mapping of jobname to CompileResult
+        """
+        futures = {name: self.submit(source, name) for name, source in sources.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    async def compile_async(self, latex_source: str, jobname: str = 'document') -> CompileResult:
+        """Compile one document without blocking the event loop"""
+        # submit() may probe the engine version and read a cached PDF from disk
+        future = await asyncio.to_thread(self.submit, latex_source, jobname)
+        return await asyncio.wrap_future(future)
+
+    async def compile_many_async(self, sources: Dict[str, str]) -> Dict[str, CompileResult]:
+        """Compile several documents concurrently without blocking the event loop"""
+        names = list(sources)
+        results = await asyncio.gather(*(self.compile_async(sources[name], name) for name in names))
+        return dict(zip(names, results))
+
+    def get_metrics(self) -> Dict:
+        """
+        Get queue depth and compile-time metrics
+
+        Returns:
+            Dictionary with queue/active counts, outcome counters and latency stats
+        """
+        with self._lock:
+            durations = sorted(self._durations)
+            metrics = {
+                'max_workers': self.max_workers,
+                'queue_depth': self._queued,
+                'active': self._active,
+                'completed': self._completed,
+                'failed': self._failed,
+                'timeouts': self._timeouts
+            }
+
+        if self.pdf_cache:
+            metrics['pdf_cache'] = self.pdf_cache.get_stats()
+
+        if durations:
+            metrics['avg_seconds'] = round(sum(durations) / len(durations), 3)
+            metrics['p50_seconds'] = round(durations[len(durations) // 2], 3)
+            metrics['p95_seconds'] = round(durations[min(len(durations) - 1, int(len(durations) * 0.95))], 3)
+        return metrics
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and optionally wait for running compilations"""
+        self._executor.shutdown(wait=wait)
+
+
+_shared_compiler: Optional[LatexCompiler] = None
+_shared_compiler_lock = threading.Lock()
+
+
+def get_latex_compiler() -> LatexCompiler:
+    """Get the process-wide LatexCompiler"""
+    global _shared_compiler
+    with _shared_compiler_lock:
+        if _shared_compiler is None:
+            pdf_cache = None
+            if os.getenv('PDF_CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no'):
+                default_cache_dir = Path(__file__).resolve().parents[2] / '.cache' / 'pdf'
+                try:
+                    pdf_cache = PdfCache(
+                        Path(os.getenv('PDF_CACHE_DIR', str(default_cache_dir))),
+                        max_bytes=int(os.getenv('PDF_CACHE_MAX_BYTES', str(500 * 1024 * 1024)))
+                    )
+                except (OSError, ValueError) as e:
+                    logger.warning(f"PDF cache disabled: {e}")
+
+            _shared_compiler = LatexCompiler(
+                timeout=int(os.getenv('LATEX_TIMEOUT_SECONDS', '30')),
+                pdf_cache=pdf_cache
+            )
+        return _shared_compiler
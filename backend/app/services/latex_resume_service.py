@@ -1,10 +1,8 @@
-import os
-import subprocess
-import tempfile
 import logging
 from typing import Dict, Optional
 from datetime import datetime
 import re
+from .latex_compiler import get_latex_compiler
 
 logger = logging.getLogger(__name__)
 
@@ -470,38 +468,13 @@ Harvad (Hongzhi) Li
         return f"{company_name}\\\\Göteborg, Sweden"
     
     async def _compile_latex_to_pdf(self, latex_content: str, filename: str) -> bytes:
-        """Compile LaTeX content to PDF"""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Write LaTeX content to file
-                tex_file = os.path.join(temp_dir, f"{filename}.tex")
-                with open(tex_file, 'w', encoding='utf-8') as f:
-                    f.write(latex_content)
-                
-                # Compile LaTeX to PDF
-                result = subprocess.run([
-                    'pdflatex', 
-                    '-interaction=nonstopmode',
-                    '-output-directory', temp_dir,
-                    tex_file
-                ], capture_output=True, text=True)
-                
-                if result.returncode != 0:
-                    logger.error("LaTeX compilation failed: %s", result.stderr)
-                    raise Exception(f"LaTeX compilation failed: {result.stderr}")
-                
-                # Read PDF content
-                pdf_file = os.path.join(temp_dir, f"{filename}.pdf")
-                if os.path.exists(pdf_file):
-                    with open(pdf_file, 'rb') as f:
-                        return f.read()
-                else:
-                    raise Exception("PDF file not generated")
-                    
-        except Exception as e:
-            logger.error("Error compiling LaTeX: %s", e)
+        """Compile LaTeX content to PDF on the shared LaTeX worker pool"""
+        result = await get_latex_compiler().compile_async(latex_content, filename)
+        if not result.success:
+            logger.error("Error compiling LaTeX: %s", result.error or result.stderr)
             # Return empty bytes if compilation fails
             return b""
+        return result.pdf_content
     
     def _get_default_profile(self) -> str:
         """Get default profile summary"""
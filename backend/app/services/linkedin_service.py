@@ -1,8 +1,8 @@
-import aiohttp
 import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.services.http_client import get_http_client
 import logging
 import urllib.parse
 import os
@@ -103,7 +103,7 @@ class LinkedInService:
             "X-Restli-Protocol-Version": "2.0.0"
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with get_http_client().session() as session:
             try:
                 async with session.get(url, params=params, headers=headers, timeout=30) as response:
                     if response.status == 200:
@@ -594,7 +594,7 @@ class LinkedInService:
             "X-Restli-Protocol-Version": "2.0.0"
         }
         
-        async with aiohttp.ClientSession() as session:
+        async with get_http_client().session() as session:
             try:
                 async with session.get(url, headers=headers, timeout=10) as response:
                     if response.status == 200:
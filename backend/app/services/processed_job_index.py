@@ -0,0 +1,216 @@
+"""
+Processed Job Index
+In-process Bloom filter over processed job URLs so most new jobs skip the database membership check
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.sql_database import database_session
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings
+
+    ``in`` never returns False for an added item; it returns True for an
+    item that was not added with roughly ``error_rate`` probability while
+    no more than ``capacity`` items have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Initialize an empty filter
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false-positive probability at capacity
+        """
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        """Bit positions of an item (double hashing over one 128-bit digest)"""
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class ProcessedJobIndex:
+    """
+    Bloom filter of (user, url) pairs already in processed_jobs
+
+    The index is warmed once per process from the table and then kept
+    current by ``add`` as this process marks jobs processed. It only sees
+    other processes' writes at the next warm, so a negative answer is
+    definite only when this process is the single writer of
+    processed_jobs; otherwise ``candidates`` keeps every URL for the
+    database lookup. When it grows past its capacity it asks to be
+    re-warmed with a larger filter to hold its error rate.
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.01, single_writer: bool = False):
+        """
+        Initialize a cold index
+
+        Args:
+            capacity: Initial number of processed jobs the filter is sized for
+            error_rate: Target false-positive probability
+            single_writer: True if no other process inserts into processed_jobs,
+                so Bloom misses may skip the database
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.single_writer = single_writer
+        self._filter = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        self.is_warm = False
+
+        self.checks = 0
+        self.definite_misses = 0
+
+    @staticmethod
+    def _key(user_id: str, url: str) -> str:
+        return f"{user_id}\x00{url}"
+
+    def warm(self, rows: Iterable[Tuple[str, str]], expected: int = 0) -> int:
+        """
+        Rebuild the filter from (user_id, url) rows
+
+        Args:
+            rows: Every processed job, e.g. ProcessedJobCollection.iter_processed_urls()
+            expected: Number of rows, used to size the filter with room to grow
+
+        Returns:
+            Number of rows loaded
+        """
+        capacity = max(self.capacity, expected * 2)
+        bloom = BloomFilter(capacity, self.error_rate)
+        for user_id, url in rows:
+            bloom.add(self._key(user_id, url))
+
+        with self._lock:
+            self._filter = bloom
+            self.capacity = capacity
+            self.is_warm = True
+
+        logger.info(f"🌸 Processed job index warmed with {len(bloom)} URL(s)")
+        return len(bloom)
+
+    def might_contain(self, user_id: str, url: str) -> bool:
+        """False only if the user has definitely not processed ``url``"""
+        with self._lock:
+            self.checks += 1
+            found = self._key(user_id, url) in self._filter
+            if not found:
+                self.definite_misses += 1
+            return found
+
+    def candidates(self, user_id: str, urls: Iterable[str]) -> List[str]:
+        """
+        URLs that still need the database membership check
+
+        With a single writer, definite Bloom misses are new and dropped here.
+        Otherwise other workers may have processed a URL since the last warm,
+        so every URL is kept and the filter only feeds the hit counters.
+        """
+        urls = list(urls)
+        possible = [url for url in urls if self.might_contain(user_id, url)]
+        return possible if self.single_writer else urls
+
+    def add(self, user_id: str, url: str) -> None:
+        """Record a newly processed job"""
+        with self._lock:
+            self._filter.add(self._key(user_id, url))
+            if len(self._filter) > self.capacity:
+                # Saturated; rebuild from the table on next use
+                self.is_warm = False
+
+    def get_stats(self) -> Dict:
+        """Size and hit counters"""
+        with self._lock:
+            return {
+                'warm': self.is_warm,
+                'items': len(self._filter),
+                'capacity': self.capacity,
+                'single_writer': self.single_writer,
+                'checks': self.checks,
+                'definite_misses': self.definite_misses
+            }
+
+
+_shared_index: Optional[ProcessedJobIndex] = None
+_shared_index_lock = threading.Lock()
+
+
+def get_processed_job_index() -> Optional[ProcessedJobIndex]:
+    """
+    Get the process-wide processed job index, if enabled
+
+    Environment:
+        PROCESSED_JOB_BLOOM_FILTER: "true" to enable the in-process filter
+        PROCESSED_JOB_BLOOM_CAPACITY: initial number of processed jobs to size for
+        PROCESSED_JOB_BLOOM_SINGLE_WRITER: "true" only if this is the one process
+            writing processed_jobs (Bloom misses then skip the database)
+
+    Returns:
+        Shared ProcessedJobIndex, or None when disabled
+    """
+    global _shared_index
+    if os.getenv('PROCESSED_JOB_BLOOM_FILTER', 'false').lower() not in ('1', 'true', 'yes'):
+        return None
+
+    with _shared_index_lock:
+        if _shared_index is None:
+            _shared_index = ProcessedJobIndex(
+                capacity=int(os.getenv('PROCESSED_JOB_BLOOM_CAPACITY', '100000')),
+                single_writer=os.getenv('PROCESSED_JOB_BLOOM_SINGLE_WRITER', 'false').lower() in ('1', 'true', 'yes')
+            )
+        return _shared_index
+
+
+async def warm_processed_job_index() -> int:
+    """
+    Load the shared index from processed_jobs without blocking the event loop
+
+    Called from application startup, and again by the automation service
+    if the index is cold (first use in a scheduler process, or saturated).
+
+    Returns:
+        Number of processed jobs loaded (0 when the index is disabled or warming failed)
+    """
+    index = get_processed_job_index()
+    if index is None:
+        return 0
+
+    try:
+        async with database_session() as db:
+            def load() -> int:
+                return index.warm(db.processed_jobs.iter_processed_urls(), expected=db.processed_jobs.count_processed())
+
+            return await asyncio.to_thread(load)
+    except Exception as e:
+        logger.error(f"Could not warm processed job index: {e}")
+        return 0
@@ -4,13 +4,11 @@ Professional LaTeX Service - Uses Hongzhi Li's actual professional templates
 with Claude API enhancement for job-specific customization
 """
 import os
-import subprocess
-import tempfile
 import logging
 from typing import Dict, Optional
 from datetime import datetime
-import re
 from .claude_api_service import ClaudeAPIService
+from .latex_compiler import get_latex_compiler
 
 logger = logging.getLogger(__name__)
 
@@ -350,77 +348,25 @@ $\\bullet$ AWS Certified Developer - Associate (Nov 2022)
         return customized_template
     
     async def _compile_latex_to_pdf(self, latex_content: str, filename: str) -> bytes:
-        """Compile LaTeX content to PDF using pdflatex"""
+        """Compile LaTeX content to PDF on the shared LaTeX worker pool (isolated temp dir)"""
         try:
-            # Create safe filename
-            safe_filename = re.sub(r'[^a-zA-Z0-9_-]', '_', filename)
-            tex_file = f"{safe_filename}.tex"
-            pdf_file = f"{safe_filename}.pdf"
-            
-            # Write LaTeX source file
-            with open(tex_file, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
-            
-            logger.info(f"📄 Saved LaTeX source: {tex_file}")
-            
-            # Compile LaTeX to PDF using pdflatex
-            try:
-                result = subprocess.run([
-                    'pdflatex', 
-                    '-interaction=nonstopmode',
-                    '-output-directory=.',
-                    tex_file
-                ], 
-                capture_output=True, 
-                text=True, 
-                timeout=30
-                )
-                
-                # Check if compilation succeeded
-                if result.returncode == 0 and os.path.exists(pdf_file):
-                    # Read the generated PDF
-                    with open(pdf_file, 'rb') as f:
-                        pdf_content = f.read()
-                    
-                    # Validate PDF content
-                    if self._validate_pdf(pdf_content):
-                        logger.info(f"✅ Successfully compiled {pdf_file} ({len(pdf_content)} bytes)")
-                        
-                        # Clean up auxiliary files
-                        for ext in ['.aux', '.log', '.out', '.tex']:
-                            aux_file = f"{safe_filename}{ext}"
-                            if os.path.exists(aux_file):
-                                os.remove(aux_file)
-                        
-                        # Remove PDF file after reading
-                        if os.path.exists(pdf_file):
-                            os.remove(pdf_file)
-                        
-                        return pdf_content
-                    else:
-                        logger.error("❌ Generated PDF failed validation")
-                        return b""
-                else:
-                    logger.error(f"❌ LaTeX compilation failed: {result.stderr}")
-                    return b""
-                    
-            except subprocess.TimeoutExpired:
-                logger.error("❌ LaTeX compilation timeout")
+            result = await get_latex_compiler().compile_async(latex_content, filename)
+            
+            if not result.success:
+                logger.error(f"❌ LaTeX compilation failed: {result.error or result.stderr}")
                 return b""
+            
+            # Validate PDF content
+            if self._validate_pdf(result.pdf_content):
+                logger.info(f"✅ Successfully compiled {result.jobname}.pdf ({len(result.pdf_content)} bytes)")
+                return result.pdf_content
+            
+            logger.error("❌ Generated PDF failed validation")
+            return b""
                 
         except Exception as e:
             logger.error(f"❌ Error compiling LaTeX to PDF: {e}")
             return b""
-        
-        finally:
-            # Clean up any remaining files
-            for ext in ['.aux', '.log', '.out', '.tex', '.pdf']:
-                cleanup_file = f"{safe_filename}{ext}"
-                if os.path.exists(cleanup_file):
-                    try:
-                        os.remove(cleanup_file)
-                    except:
-                        pass
     
     def _validate_pdf(self, pdf_content: bytes) -> bool:
         """Validate that the content is a proper PDF"""
@@ -0,0 +1,208 @@
+"""
+R2 Manifest
+Sidecar JSON object that indexes stored documents and keeps usage totals current
+"""
+import copy
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_KEY = "manifests/documents.json"
+MANIFEST_VERSION = 1
+
+# Attempts to write the manifest when other writers keep changing it
+MAX_SAVE_ATTEMPTS = 5
+
+
+def _empty_usage() -> Dict:
+    return {'total_objects': 0, 'total_size_bytes': 0, 'by_type': {}, 'by_month': {}}
+
+
+class R2Manifest:
+    """
+    Per-object metadata and usage totals for a bucket, stored as one object
+
+    Listing documents with their company/type and reporting storage usage
+    then costs one GET instead of a HEAD per object or a full bucket scan.
+    Every entry holds the object's size, storage type (a key of
+    R2StorageService.storage_paths), document type, job title, company and
+    upload time; the usage totals are adjusted as entries are added and
+    removed.
+
+    Writes are conditional on the ETag that was read. When another process
+    changed the manifest in between, it is re-read and the local changes
+    are replayed on top, so concurrent writers do not lose entries.
+    """
+
+    def __init__(self, s3_client, bucket_name: str, key: str = MANIFEST_KEY):
+        """
+        Initialize an unloaded manifest
+
+        Args:
+            s3_client: boto3 S3 client
+            bucket_name: Bucket holding the manifest and the documents
+            key: Object key of the manifest
+        """
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.key = key
+
+        self.objects: Dict[str, Dict] = {}
+        self.usage: Dict = _empty_usage()
+        self.exists = False
+        self._etag: Optional[str] = None
+        self._loaded = False
+        self._pending: List[Tuple[str, str, Optional[Dict]]] = []
+        self._lock = threading.RLock()
+
+    def load(self, force: bool = False) -> bool:
+        """
+        Read the manifest from the bucket (once, unless ``force``)
+
+        Changes not yet saved are applied again on top of what was read.
+
+        Returns:
+            True if a manifest object exists
+        """
+        with self._lock:
+            if self._loaded and not force:
+                return self.exists
+
+            try:
+                response = self.s3_client.get_object(Bucket=self.bucket_name, Key=self.key)
+                data = json.loads(response['Body'].read())
+                self._etag = response.get('ETag')
+                self.exists = True
+            except ClientError as e:
+                if e.response['Error']['Code'] not in ('NoSuchKey', '404'):
+                    raise
+                data = {}
+                self._etag = None
+                self.exists = False
+
+            self.objects = data.get('objects', {})
+            self.usage = data.get('usage') or _empty_usage()
+            for op, key, entry in self._pending:
+                self._apply(op, key, entry)
+            self._loaded = True
+            return self.exists
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Entry for one object, or None if the manifest does not know it"""
+        with self._lock:
+            self.load()
+            return self.objects.get(key)
+
+    def add(self, key: str, entry: Dict) -> None:
+        """Record an uploaded object (call save() to persist)"""
+        with self._lock:
+            self.load()
+            self._pending.append(('add', key, entry))
+            self._apply('add', key, entry)
+
+    def remove(self, key: str) -> None:
+        """Forget a deleted object (call save() to persist)"""
+        with self._lock:
+            self.load()
+            self._pending.append(('remove', key, None))
+            self._apply('remove', key, None)
+
+    def replace_all(self, entries: Iterable[Tuple[str, Dict]]) -> int:
+        """
+        Rebuild from a full listing, e.g. for buckets written before the manifest existed
+
+        Args:
+            entries: (key, entry) for every stored document
+
+        Returns:
+            Number of entries
+        """
+        with self._lock:
+            self.load()
+            self.objects = {}
+            self.usage = _empty_usage()
+            self._pending = [('reset', '', None)]
+            for key, entry in entries:
+                self._pending.append(('add', key, entry))
+                self._apply('add', key, entry)
+            return len(self.objects)
+
+    def get_usage(self) -> Dict:
+        """Usage totals as kept in the manifest"""
+        with self._lock:
+            self.load()
+            usage = copy.deepcopy(self.usage)
+        usage['total_size_mb'] = usage['total_size_bytes'] / (1024 * 1024)
+        return usage
+
+    def save(self) -> bool:
+        """
+        Write pending changes, replaying them over a newer manifest on conflict
+
+        Returns:
+            True once the manifest is written (or nothing was pending)
+        """
+        with self._lock:
+            if not self._pending:
+                return True
+
+            for _ in range(MAX_SAVE_ATTEMPTS):
+                body = json.dumps({
+                    'version': MANIFEST_VERSION,
+                    'updated_at': datetime.now().isoformat(),
+                    'objects': self.objects,
+                    'usage': self.usage
+                }, default=str).encode('utf-8')
+                condition = {'IfMatch': self._etag} if self._etag else {'IfNoneMatch': '*'}
+                try:
+                    response = self.s3_client.put_object(
+                        Bucket=self.bucket_name, Key=self.key, Body=body,
+                        ContentType='application/json', **condition
+                    )
+                except ClientError as e:
+                    if e.response['Error']['Code'] not in ('PreconditionFailed', '412', 'ConditionalRequestConflict'):
+                        raise
+                    logger.info(f"🔁 Manifest changed concurrently, replaying {len(self._pending)} change(s)")
+                    self.load(force=True)
+                    continue
+
+                self._etag = response.get('ETag')
+                self.exists = True
+                self._pending = []
+                return True
+
+            logger.error(f"❌ Could not write manifest after {MAX_SAVE_ATTEMPTS} attempts")
+            return False
+
+    def _apply(self, op: str, key: str, entry: Optional[Dict]) -> None:
+        if op == 'reset':
+            self.objects = {}
+            self.usage = _empty_usage()
+            return
+
+        previous = self.objects.pop(key, None)
+        if previous:
+            self._count(previous, -1)
+        if op == 'add':
+            self.objects[key] = entry
+            self._count(entry, 1)
+
+    def _count(self, entry: Dict, sign: int) -> None:
+        """Adjust the usage totals by one entry"""
+        size = entry.get('size', 0)
+        self.usage['total_objects'] += sign
+        self.usage['total_size_bytes'] += sign * size
+
+        month = (entry.get('uploaded_at') or '')[:7] or 'unknown'
+        for group, name in (('by_type', entry.get('storage_type') or 'other'), ('by_month', month)):
+            bucket = self.usage[group].setdefault(name, {'count': 0, 'size_bytes': 0})
+            bucket['count'] += sign
+            bucket['size_bytes'] += sign * size
+            if bucket['count'] <= 0:
+                del self.usage[group][name]
@@ -0,0 +1,180 @@
+"""
+R2 Package Uploader
+Uploads the objects of a job application package concurrently over one bounded boto3 connection pool
+"""
+import asyncio
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Buckets already confirmed (or created) in this process, by (endpoint, bucket)
+_verified_buckets: Set[Tuple[Optional[str], str]] = set()
+_verified_buckets_lock = threading.Lock()
+
+
+def upload_concurrency() -> int:
+    """Worker threads per uploader, also the size of the boto3 connection pool (R2_UPLOAD_CONCURRENCY)"""
+    return max(1, int(os.getenv("R2_UPLOAD_CONCURRENCY", "8")))
+
+
+def ensure_bucket_once(s3_client, bucket_name: str, endpoint_url: Optional[str] = None) -> bool:
+    """
+    Check that a bucket exists, creating it if missing, at most once per process
+
+    Args:
+        s3_client: boto3 S3 client
+        bucket_name: Bucket to check
+        endpoint_url: Endpoint the client talks to (part of the cache key)
+
+    Returns:
+        True if the bucket is usable
+    """
+    cache_key = (endpoint_url, bucket_name)
+    if cache_key in _verified_buckets:
+        return True
+
+    with _verified_buckets_lock:
+        if cache_key in _verified_buckets:
+            return True
+
+        try:
+            s3_client.head_bucket(Bucket=bucket_name)
+            logger.info(f"✅ Bucket '{bucket_name}' exists")
+        except ClientError as e:
+            if e.response['Error']['Code'] != '404':
+                logger.error(f"❌ Error checking bucket: {e}")
+                return False
+            logger.info(f"📁 Creating bucket '{bucket_name}'")
+            s3_client.create_bucket(Bucket=bucket_name)
+            logger.info(f"✅ Bucket '{bucket_name}' created successfully")
+
+        _verified_buckets.add(cache_key)
+        return True
+
+
+def reset_bucket_cache() -> None:
+    """Forget verified buckets (e.g. after a bucket was deleted)"""
+    with _verified_buckets_lock:
+        _verified_buckets.clear()
+
+
+@dataclass
+class UploadItem:
+    """One object of an upload batch"""
+    name: str  # Key in the returned URL map, e.g. "cv_pdf"
+    key: str
+    body: bytes
+    content_type: str
+    metadata: Dict[str, str] = field(default_factory=dict)
+
+
+class R2PackageUploader:
+    """
+    Concurrent uploader for small batches of objects
+
+    Every object of a batch is uploaded on its own worker thread, so a
+    batch takes about as long as its slowest object. Objects at or above
+    ``multipart_threshold`` go through boto3's managed transfer, which
+    splits them into parts uploaded in parallel; smaller ones are a single
+    PUT. Size the client's ``max_pool_connections`` to ``max_workers`` so
+    the threads never wait for a connection.
+    """
+
+    def __init__(self, s3_client, bucket_name: str, public_url: Callable[[str], str],
+                 max_workers: Optional[int] = None, multipart_threshold: Optional[int] = None,
+                 multipart_chunksize: int = 8 * MB):
+        """
+        Initialize the uploader
+
+        Args:
+            s3_client: boto3 S3 client (thread-safe, shared by all workers)
+            bucket_name: Target bucket
+            public_url: Maps an object key to the URL returned to callers
+            max_workers: Concurrent uploads (default R2_UPLOAD_CONCURRENCY)
+            multipart_threshold: Object size in bytes from which multipart is used
+                (default R2_MULTIPART_THRESHOLD_MB)
+            multipart_chunksize: Part size in bytes for multipart uploads
+        """
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.public_url = public_url
+        self.max_workers = max_workers or upload_concurrency()
+        if multipart_threshold is None:
+            multipart_threshold = int(float(os.getenv("R2_MULTIPART_THRESHOLD_MB", "8")) * MB)
+        self.multipart_threshold = multipart_threshold
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=self.max_workers
+        )
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="r2-upload")
+
+    def upload(self, item: UploadItem) -> str:
+        """
+        Upload one object on the calling thread
+
+        Returns:
+            Public URL of the object
+
+        Raises:
+            botocore.exceptions.ClientError: If R2 rejects the upload
+        """
+        extra_args = {'ContentType': item.content_type, 'Metadata': item.metadata}
+        if len(item.body) >= self.multipart_threshold:
+            self.s3_client.upload_fileobj(
+                io.BytesIO(item.body), self.bucket_name, item.key,
+                ExtraArgs=extra_args, Config=self.transfer_config
+            )
+        else:
+            self.s3_client.put_object(Bucket=self.bucket_name, Key=item.key, Body=item.body, **extra_args)
+        return self.public_url(item.key)
+
+    async def upload_async(self, item: UploadItem) -> str:
+        """Upload one object on the worker pool without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.upload, item)
+
+    async def upload_all(self, items: List[UploadItem]) -> Dict[str, str]:
+        """
+        Upload a batch concurrently and wait for all of it
+
+        A failed object is logged and left out of the result; the others
+        are still uploaded.
+
+        Args:
+            items: Objects to upload
+
+        Returns:
+            Mapping of item name to public URL for every successful upload
+        """
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self.upload_async(item) for item in items), return_exceptions=True)
+
+        urls = {}
+        for item, result in zip(items, results):
+            if isinstance(result, BaseException):
+                logger.error(f"❌ Error uploading {item.name} ({item.key}): {result}")
+            else:
+                logger.info(f"✅ Uploaded {item.name}: {item.key}")
+                urls[item.name] = result
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        total_bytes = sum(len(item.body) for item in items)
+        logger.info(f"📦 Uploaded {len(urls)}/{len(items)} objects ({total_bytes} bytes) in {elapsed_ms:.0f} ms")
+        return urls
+
+    def close(self) -> None:
+        """Stop the worker threads once queued uploads finish"""
+        self._executor.shutdown(wait=True)
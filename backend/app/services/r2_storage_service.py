@@ -6,10 +6,10 @@ Handles document storage and retrieval from Cloudflare R2
 import os
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 import boto3
 from botocore.config import Config
-from botocore.exceptions import ClientError, NoCredentialsError
+from botocore.exceptions import NoCredentialsError
 import hashlib
 import json
 import asyncio
@@ -17,8 +17,14 @@ import aiofiles
 import tempfile
 from pathlib import Path
 
+from app.services.r2_manifest import R2Manifest
+from app.services.r2_package_uploader import R2PackageUploader, UploadItem, ensure_bucket_once, upload_concurrency
+
 logger = logging.getLogger(__name__)
 
+# Keys per DeleteObjects request (the S3 API maximum)
+DELETE_BATCH_SIZE = 1000
+
 class R2StorageService:
     """Service for managing documents in Cloudflare R2 storage"""
     
@@ -30,10 +36,11 @@ class R2StorageService:
         self.bucket_name = os.getenv("R2_BUCKET_NAME", "jobhunter-documents")
         self.region = os.getenv("R2_REGION", "auto")
         
-        # R2 client configuration
+        # R2 client configuration (one pooled connection per upload worker)
         self.config = Config(
             region_name=self.region,
-            s3={'addressing_style': 'path'}
+            s3={'addressing_style': 'path'},
+            max_pool_connections=upload_concurrency()
         )
         
         # Initialize S3 client for R2
@@ -50,6 +57,14 @@ class R2StorageService:
             logger.error(f"❌ Failed to initialize R2 client: {e}")
             self.s3_client = None
         
+        # Uploads run on a bounded thread pool instead of the event loop
+        self.uploader = R2PackageUploader(
+            self.s3_client, self.bucket_name, self.get_public_url
+        ) if self.s3_client else None
+        
+        # Sidecar index of stored documents and usage totals
+        self.manifest = R2Manifest(self.s3_client, self.bucket_name) if self.s3_client else None
+        
         # Storage paths
         self.storage_paths = {
             'cvs': 'documents/cvs/',
@@ -73,27 +88,12 @@ class R2StorageService:
         return True
     
     async def ensure_bucket_exists(self) -> bool:
-        """Ensure the R2 bucket exists"""
+        """Ensure the R2 bucket exists (checked once per process)"""
         try:
             if not self._validate_client():
                 return False
             
-            # Check if bucket exists
-            try:
-                self.s3_client.head_bucket(Bucket=self.bucket_name)
-                logger.info(f"✅ Bucket '{self.bucket_name}' exists")
-                return True
-            except ClientError as e:
-                error_code = e.response['Error']['Code']
-                if error_code == '404':
-                    # Bucket doesn't exist, create it
-                    logger.info(f"📁 Creating bucket '{self.bucket_name}'")
-                    self.s3_client.create_bucket(Bucket=self.bucket_name)
-                    logger.info(f"✅ Bucket '{self.bucket_name}' created successfully")
-                    return True
-                else:
-                    logger.error(f"❌ Error checking bucket: {e}")
-                    return False
+            return await asyncio.to_thread(ensure_bucket_once, self.s3_client, self.bucket_name, self.endpoint_url)
         
         except Exception as e:
             logger.error(f"❌ Error ensuring bucket exists: {e}")
@@ -138,153 +138,135 @@ class R2StorageService:
         
         return slug[:50]  # Limit length
     
-    async def upload_cv(self, cv_content: bytes, job_title: str, company: str, 
-                       content_type: str = 'application/pdf') -> Optional[str]:
-        """Upload CV PDF to R2 storage"""
+    def _document_item(self, name: str, file_type: str, body: bytes, job_title: str, company: str,
+                       file_extension: str, content_type: str, document_type: str) -> UploadItem:
+        """Build an upload with the standard key layout and object metadata"""
+        return UploadItem(
+            name=name,
+            key=self.generate_file_key(file_type, job_title, company, file_extension),
+            body=body,
+            content_type=content_type,
+            metadata={
+                'job_title': job_title,
+                'company': company,
+                'document_type': document_type,
+                'uploaded_at': datetime.now().isoformat()
+            }
+        )
+    
+    def _cv_item(self, cv_content: bytes, job_title: str, company: str,
+                 content_type: str = 'application/pdf') -> UploadItem:
+        return self._document_item('cv_pdf', 'cvs', cv_content, job_title, company, 'pdf', content_type, 'cv')
+    
+    def _cover_letter_item(self, cl_content: bytes, job_title: str, company: str,
+                           content_type: str = 'application/pdf') -> UploadItem:
+        return self._document_item('cover_letter_pdf', 'cover_letters', cl_content, job_title, company,
+                                   'pdf', content_type, 'cover_letter')
+    
+    def _latex_item(self, latex_content: str, job_title: str, company: str, document_type: str) -> UploadItem:
+        name = 'cv_latex' if document_type == 'cv' else 'cover_letter_latex'
+        return self._document_item(name, 'latex_sources', latex_content.encode('utf-8'), job_title, company,
+                                   f"{document_type}.tex", 'text/plain', f'latex_{document_type}')
+    
+    def _job_metadata_item(self, job: Dict) -> UploadItem:
+        metadata = {
+            'job_details': job,
+            'stored_at': datetime.now().isoformat(),
+            'source': job.get('source', 'unknown')
+        }
+        body = json.dumps(metadata, indent=2, default=str).encode('utf-8')
+        return self._document_item('job_metadata', 'job_descriptions', body, job.get('title', 'unknown'),
+                                   job.get('company', 'unknown'), 'json', 'application/json', 'job_metadata')
+    
+    def _storage_type(self, file_key: str) -> str:
+        """Storage path name (cvs, cover_letters, ...) a key was written under"""
+        matches = [name for name, prefix in self.storage_paths.items() if file_key.startswith(prefix)]
+        return max(matches, key=lambda name: len(self.storage_paths[name]), default='other')
+    
+    async def _record_uploads(self, items: List[UploadItem]) -> None:
+        """Add uploaded objects to the manifest and write it once (off the event loop)"""
+        def record() -> None:
+            # The first add() loads the manifest from the bucket
+            for item in items:
+                self.manifest.add(item.key, {
+                    'size': len(item.body),
+                    'storage_type': self._storage_type(item.key),
+                    **item.metadata
+                })
+            self.manifest.save()
+        
+        try:
+            await asyncio.to_thread(record)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not update document manifest: {e}")
+    
+    async def _upload_item(self, item: UploadItem, label: str) -> Optional[str]:
+        """Upload one object off the event loop, returning its public URL or None on error"""
         try:
             if not await self.ensure_bucket_exists():
                 return None
             
-            # Generate file key
-            file_key = self.generate_file_key('cvs', job_title, company, 'pdf')
-            
-            # Upload to R2
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_key,
-                Body=cv_content,
-                ContentType=content_type,
-                Metadata={
-                    'job_title': job_title,
-                    'company': company,
-                    'document_type': 'cv',
-                    'uploaded_at': datetime.now().isoformat()
-                }
-            )
-            
-            # Generate public URL
-            public_url = f"{self.endpoint_url.replace('https://', 'https://pub-')}/{self.bucket_name}/{file_key}"
-            
-            logger.info(f"✅ CV uploaded successfully: {file_key}")
+            public_url = await self.uploader.upload_async(item)
+            await self._record_uploads([item])
+            logger.info(f"✅ {label} uploaded successfully: {item.key}")
             return public_url
             
         except Exception as e:
-            logger.error(f"❌ Error uploading CV: {e}")
+            logger.error(f"❌ Error uploading {label}: {e}")
             return None
     
+    async def upload_cv(self, cv_content: bytes, job_title: str, company: str, 
+                       content_type: str = 'application/pdf') -> Optional[str]:
+        """Upload CV PDF to R2 storage"""
+        return await self._upload_item(self._cv_item(cv_content, job_title, company, content_type), "CV")
+    
     async def upload_cover_letter(self, cl_content: bytes, job_title: str, company: str,
                                 content_type: str = 'application/pdf') -> Optional[str]:
         """Upload cover letter PDF to R2 storage"""
-        try:
-            if not await self.ensure_bucket_exists():
-                return None
-            
-            # Generate file key
-            file_key = self.generate_file_key('cover_letters', job_title, company, 'pdf')
-            
-            # Upload to R2
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_key,
-                Body=cl_content,
-                ContentType=content_type,
-                Metadata={
-                    'job_title': job_title,
-                    'company': company,
-                    'document_type': 'cover_letter',
-                    'uploaded_at': datetime.now().isoformat()
-                }
-            )
-            
-            # Generate public URL
-            public_url = f"{self.endpoint_url.replace('https://', 'https://pub-')}/{self.bucket_name}/{file_key}"
-            
-            logger.info(f"✅ Cover letter uploaded successfully: {file_key}")
-            return public_url
-            
-        except Exception as e:
-            logger.error(f"❌ Error uploading cover letter: {e}")
-            return None
+        return await self._upload_item(
+            self._cover_letter_item(cl_content, job_title, company, content_type), "Cover letter"
+        )
     
     async def upload_latex_source(self, latex_content: str, job_title: str, company: str,
                                  document_type: str) -> Optional[str]:
         """Upload LaTeX source file to R2 storage"""
-        try:
-            if not await self.ensure_bucket_exists():
-                return None
-            
-            # Generate file key
-            file_extension = f"{document_type}.tex"
-            file_key = self.generate_file_key('latex_sources', job_title, company, file_extension)
-            
-            # Upload to R2
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_key,
-                Body=latex_content.encode('utf-8'),
-                ContentType='text/plain',
-                Metadata={
-                    'job_title': job_title,
-                    'company': company,
-                    'document_type': f'latex_{document_type}',
-                    'uploaded_at': datetime.now().isoformat()
-                }
-            )
-            
-            # Generate public URL
-            public_url = f"{self.endpoint_url.replace('https://', 'https://pub-')}/{self.bucket_name}/{file_key}"
-            
-            logger.info(f"✅ LaTeX source uploaded successfully: {file_key}")
-            return public_url
-            
-        except Exception as e:
-            logger.error(f"❌ Error uploading LaTeX source: {e}")
-            return None
+        return await self._upload_item(
+            self._latex_item(latex_content, job_title, company, document_type), "LaTeX source"
+        )
     
     async def upload_job_application_package(self, application_data: Dict) -> Dict[str, str]:
-        """Upload complete job application package"""
+        """
+        Upload complete job application package
+        
+        The bucket is checked once per process and all objects (PDFs, LaTeX
+        sources and job metadata) are uploaded concurrently, so the package
+        takes about as long as its slowest object.
+        
+        Returns:
+            Mapping of cv_pdf, cover_letter_pdf, cv_latex, cover_letter_latex
+            and job_metadata to public URLs, for every object that uploaded
+        """
         try:
+            if not await self.ensure_bucket_exists():
+                return {}
+            
             job = application_data['job']
             job_title = job['title']
             company = job['company']
             
-            urls = {}
-            
-            # Upload CV PDF
+            items = []
             if 'cv_pdf' in application_data:
-                cv_url = await self.upload_cv(
-                    application_data['cv_pdf'], job_title, company
-                )
-                if cv_url:
-                    urls['cv_pdf'] = cv_url
-            
-            # Upload Cover Letter PDF
+                items.append(self._cv_item(application_data['cv_pdf'], job_title, company))
             if 'cl_pdf' in application_data:
-                cl_url = await self.upload_cover_letter(
-                    application_data['cl_pdf'], job_title, company
-                )
-                if cl_url:
-                    urls['cover_letter_pdf'] = cl_url
-            
-            # Upload LaTeX sources
+                items.append(self._cover_letter_item(application_data['cl_pdf'], job_title, company))
             if 'cv_latex' in application_data:
-                cv_latex_url = await self.upload_latex_source(
-                    application_data['cv_latex'], job_title, company, 'cv'
-                )
-                if cv_latex_url:
-                    urls['cv_latex'] = cv_latex_url
-            
+                items.append(self._latex_item(application_data['cv_latex'], job_title, company, 'cv'))
             if 'cl_latex' in application_data:
-                cl_latex_url = await self.upload_latex_source(
-                    application_data['cl_latex'], job_title, company, 'cl'
-                )
-                if cl_latex_url:
-                    urls['cover_letter_latex'] = cl_latex_url
+                items.append(self._latex_item(application_data['cl_latex'], job_title, company, 'cl'))
+            items.append(self._job_metadata_item(job))
             
-            # Store job metadata
-            metadata_url = await self.store_job_metadata(job)
-            if metadata_url:
-                urls['job_metadata'] = metadata_url
+            urls = await self.uploader.upload_all(items)
+            await self._record_uploads([item for item in items if item.name in urls])
             
             logger.info(f"📦 Application package uploaded: {len(urls)} files for {company}")
             return urls
@@ -295,49 +277,33 @@ class R2StorageService:
     
     async def store_job_metadata(self, job: Dict) -> Optional[str]:
         """Store job metadata as JSON"""
-        try:
-            if not await self.ensure_bucket_exists():
-                return None
-            
-            # Generate file key
-            job_title = job.get('title', 'unknown')
-            company = job.get('company', 'unknown')
-            file_key = self.generate_file_key('job_descriptions', job_title, company, 'json')
-            
-            # Prepare metadata
-            metadata = {
-                'job_details': job,
-                'stored_at': datetime.now().isoformat(),
-                'source': job.get('source', 'unknown')
-            }
-            
-            # Upload to R2
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_key,
-                Body=json.dumps(metadata, indent=2),
-                ContentType='application/json',
-                Metadata={
-                    'job_title': job_title,
-                    'company': company,
-                    'document_type': 'job_metadata',
-                    'uploaded_at': datetime.now().isoformat()
-                }
-            )
-            
-            # Generate public URL
-            public_url = f"{self.endpoint_url.replace('https://', 'https://pub-')}/{self.bucket_name}/{file_key}"
-            
-            logger.info(f"✅ Job metadata stored: {file_key}")
-            return public_url
-            
-        except Exception as e:
-            logger.error(f"❌ Error storing job metadata: {e}")
-            return None
+        return await self._upload_item(self._job_metadata_item(job), "Job metadata")
+    
+    def iter_objects(self, prefix: str = "") -> Iterator[Dict]:
+        """
+        Stream every object under a prefix, following continuation tokens
+        
+        The manifest object itself is skipped.
+        
+        Yields:
+            list_objects_v2 entries (Key, Size, LastModified, ...)
+        """
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix, PaginationConfig={'PageSize': 1000}):
+            for obj in page.get('Contents', []):
+                if obj['Key'] != self.manifest.key:
+                    yield obj
     
     async def list_documents(self, document_type: Optional[str] = None, 
                            company: Optional[str] = None) -> List[Dict]:
-        """List documents in R2 storage with filtering"""
+        """
+        List documents in R2 storage with filtering
+        
+        Company, job title and document type come from the manifest, so
+        no per-object HEAD request is needed. Objects the manifest does not
+        know (uploaded before it existed) are listed as 'Unknown' until
+        rebuild_manifest() runs.
+        """
         try:
             if not self._validate_client():
                 return []
@@ -347,22 +313,13 @@ class R2StorageService:
             if document_type and document_type in self.storage_paths:
                 prefix = self.storage_paths[document_type]
             
-            # List objects
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                Prefix=prefix,
-                MaxKeys=1000
-            )
+            def list_objects() -> List[Dict]:
+                self.manifest.load(True)
+                return list(self.iter_objects(prefix))
             
             documents = []
-            for obj in response.get('Contents', []):
-                # Get object metadata
-                metadata_response = self.s3_client.head_object(
-                    Bucket=self.bucket_name,
-                    Key=obj['Key']
-                )
-                
-                metadata = metadata_response.get('Metadata', {})
+            for obj in await asyncio.to_thread(list_objects):
+                metadata = self.manifest.get(obj['Key']) or {}
                 
                 # Filter by company if specified
                 if company and metadata.get('company', '').lower() != company.lower():
@@ -376,7 +333,7 @@ class R2StorageService:
                     'company': metadata.get('company', 'Unknown'),
                     'document_type': metadata.get('document_type', 'Unknown'),
                     'uploaded_at': metadata.get('uploaded_at'),
-                    'public_url': f"{self.endpoint_url.replace('https://', 'https://pub-')}/{self.bucket_name}/{obj['Key']}"
+                    'public_url': self.get_public_url(obj['Key'])
                 }
                 
                 documents.append(document)
@@ -394,13 +351,14 @@ class R2StorageService:
             if not self._validate_client():
                 return None
             
-            # Download object
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=file_key
-            )
+            def download() -> bytes:
+                response = self.s3_client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=file_key
+                )
+                return response['Body'].read()
             
-            content = response['Body'].read()
+            content = await asyncio.to_thread(download)
             
             # Save to local file if path provided
             if local_path:
@@ -417,21 +375,49 @@ class R2StorageService:
     
     async def delete_document(self, file_key: str) -> bool:
         """Delete document from R2 storage"""
+        return await self.delete_documents([file_key]) == 1
+    
+    async def delete_documents(self, file_keys: List[str]) -> int:
+        """
+        Delete documents in batches of up to 1000 keys per request
+        
+        Args:
+            file_keys: Keys to delete
+            
+        Returns:
+            Number of documents deleted
+        """
         try:
             if not self._validate_client():
-                return False
+                return 0
             
-            self.s3_client.delete_object(
-                Bucket=self.bucket_name,
-                Key=file_key
-            )
+            def delete() -> List[str]:
+                deleted = []
+                for start in range(0, len(file_keys), DELETE_BATCH_SIZE):
+                    batch = file_keys[start:start + DELETE_BATCH_SIZE]
+                    response = self.s3_client.delete_objects(
+                        Bucket=self.bucket_name,
+                        Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                    )
+                    failed = {error['Key'] for error in response.get('Errors', [])}
+                    for error in response.get('Errors', []):
+                        logger.error(f"❌ Error deleting {error['Key']}: {error.get('Message')}")
+                    deleted.extend(key for key in batch if key not in failed)
+                
+                if deleted:
+                    for key in deleted:
+                        self.manifest.remove(key)
+                    self.manifest.save()
+                return deleted
             
-            logger.info(f"🗑️ Deleted document: {file_key}")
-            return True
+            deleted = await asyncio.to_thread(delete)
+            
+            logger.info(f"🗑️ Deleted {len(deleted)} document(s)")
+            return len(deleted)
             
         except Exception as e:
-            logger.error(f"❌ Error deleting document: {e}")
-            return False
+            logger.error(f"❌ Error deleting documents: {e}")
+            return 0
     
     async def cleanup_old_documents(self, days_old: int = 30) -> int:
         """Clean up documents older than specified days"""
@@ -441,17 +427,11 @@ class R2StorageService:
             
             cutoff_date = datetime.now() - timedelta(days=days_old)
             
-            # List all documents
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                MaxKeys=1000
-            )
-            
-            deleted_count = 0
-            for obj in response.get('Contents', []):
-                if obj['LastModified'].replace(tzinfo=None) < cutoff_date:
-                    await self.delete_document(obj['Key'])
-                    deleted_count += 1
+            old_keys = await asyncio.to_thread(lambda: [
+                obj['Key'] for obj in self.iter_objects()
+                if obj['LastModified'].replace(tzinfo=None) < cutoff_date
+            ])
+            deleted_count = await self.delete_documents(old_keys)
             
             logger.info(f"🧹 Cleaned up {deleted_count} old documents")
             return deleted_count
@@ -461,48 +441,21 @@ class R2StorageService:
             return 0
     
     async def get_storage_usage(self) -> Dict:
-        """Get storage usage statistics"""
+        """
+        Get storage usage statistics
+        
+        Totals are kept current in the manifest as documents are uploaded
+        and deleted; the bucket is only scanned once, to build a missing
+        manifest.
+        """
         try:
             if not self._validate_client():
                 return {}
             
-            # List all objects
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.bucket_name,
-                MaxKeys=1000
-            )
+            if not await asyncio.to_thread(self.manifest.load, True):
+                await self.rebuild_manifest()
             
-            usage = {
-                'total_objects': 0,
-                'total_size_bytes': 0,
-                'total_size_mb': 0,
-                'by_type': {},
-                'by_month': {}
-            }
-            
-            for obj in response.get('Contents', []):
-                usage['total_objects'] += 1
-                usage['total_size_bytes'] += obj['Size']
-                
-                # Categorize by type (from path)
-                path_parts = obj['Key'].split('/')
-                doc_type = path_parts[1] if len(path_parts) > 1 else 'other'
-                
-                if doc_type not in usage['by_type']:
-                    usage['by_type'][doc_type] = {'count': 0, 'size_bytes': 0}
-                
-                usage['by_type'][doc_type]['count'] += 1
-                usage['by_type'][doc_type]['size_bytes'] += obj['Size']
-                
-                # Categorize by month
-                month_key = obj['LastModified'].strftime('%Y-%m')
-                if month_key not in usage['by_month']:
-                    usage['by_month'][month_key] = {'count': 0, 'size_bytes': 0}
-                
-                usage['by_month'][month_key]['count'] += 1
-                usage['by_month'][month_key]['size_bytes'] += obj['Size']
-            
-            usage['total_size_mb'] = usage['total_size_bytes'] / (1024 * 1024)
+            usage = self.manifest.get_usage()
             
             logger.info(f"📊 Storage usage: {usage['total_objects']} objects, {usage['total_size_mb']:.2f} MB")
             return usage
@@ -511,6 +464,32 @@ class R2StorageService:
             logger.error(f"❌ Error getting storage usage: {e}")
             return {}
     
+    async def rebuild_manifest(self) -> int:
+        """
+        Rebuild the manifest from a full paginated listing
+        
+        Known entries keep their metadata; objects uploaded before the
+        manifest existed get their size, storage type and modification time.
+        
+        Returns:
+            Number of documents in the manifest
+        """
+        def rebuild() -> int:
+            entries = []
+            for obj in self.iter_objects():
+                entry = self.manifest.get(obj['Key']) or {
+                    'storage_type': self._storage_type(obj['Key']),
+                    'uploaded_at': obj['LastModified'].replace(tzinfo=None).isoformat()
+                }
+                entries.append((obj['Key'], {**entry, 'size': obj['Size']}))
+            count = self.manifest.replace_all(entries)
+            self.manifest.save()
+            return count
+        
+        count = await asyncio.to_thread(rebuild)
+        logger.info(f"🗂️ Rebuilt document manifest: {count} documents")
+        return count
+    
     async def create_backup(self, backup_name: Optional[str] = None) -> Optional[str]:
         """Create backup of all documents"""
         try:
@@ -549,7 +528,7 @@ class R2StorageService:
                 
                 # Check bucket access
                 try:
-                    self.s3_client.head_bucket(Bucket=self.bucket_name)
+                    await asyncio.to_thread(self.s3_client.head_bucket, Bucket=self.bucket_name)
                     health['bucket_accessible'] = True
                 except:
                     pass
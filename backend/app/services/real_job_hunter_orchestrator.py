@@ -4,8 +4,6 @@ import asyncio
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import json
-import subprocess
-import tempfile
 
 from .job_scanner_service import JobScannerService
 from .real_job_scrapers import LinkedInJobScraper, IndeedJobScraper, ArbetsformedlingenScraper
@@ -13,6 +11,7 @@ from .job_analysis_service import JobAnalysisService
 from .smart_cv_customization_service import SmartCVCustomizationService
 from .smart_cover_letter_service import SmartCoverLetterService
 from .professional_latex_service import ProfessionalLaTeXService
+from .latex_compiler import get_latex_compiler
 
 logger = logging.getLogger(__name__)
 
@@ -351,35 +350,13 @@ class RealJobHunterOrchestrator:
 
     async def _compile_latex_to_pdf(self, latex_content: str, doc_type: str) -> Optional[bytes]:
         """
-        Compile LaTeX content to PDF
+        Compile LaTeX content to PDF on the shared LaTeX worker pool
         """
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Write LaTeX content to temporary file
-                tex_file = os.path.join(temp_dir, f"{doc_type}.tex")
-                with open(tex_file, 'w', encoding='utf-8') as f:
-                    f.write(latex_content)
-                
-                # Compile to PDF using pdflatex
-                result = subprocess.run(
-                    ['pdflatex', '-output-directory', temp_dir, '-interaction=nonstopmode', tex_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                
-                if result.returncode == 0:
-                    pdf_file = os.path.join(temp_dir, f"{doc_type}.pdf")
-                    if os.path.exists(pdf_file):
-                        with open(pdf_file, 'rb') as f:
-                            return f.read()
-                
-                logger.error(f"LaTeX compilation failed for {doc_type}: {result.stderr}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error compiling {doc_type} to PDF: {e}")
+        result = await get_latex_compiler().compile_async(latex_content, doc_type)
+        if not result.success:
+            logger.error(f"LaTeX compilation failed for {doc_type}: {result.error or result.stderr}")
             return None
+        return result.pdf_content
 
     def _generate_job_id(self, job: Dict) -> str:
         """
@@ -7,12 +7,12 @@ from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 import json
 from bs4 import BeautifulSoup
-import imaplib
-import email
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
-import smtplib
+
+from app.services.imap_scanner import get_imap_scanner
+from app.services.smtp_mailer import get_smtp_mailer
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +21,13 @@ class RealJobScanner:
     Real job scanner that fetches actual job advertisements from multiple sources
     """
     
+    # Spam/newsletter indicators
+    SPAM_INDICATORS = [
+        "unsubscribe", "newsletter", "promotional", "marketing campaign",
+        "limited time offer", "click here for", "free trial", "discount",
+        "viagra", "casino", "lottery", "congratulations you won"
+    ]
+    
     def __init__(self):
         # Email configuration - you need to set the Gmail app password
         self.gmail_user = "bluehawana@gmail.com"
@@ -47,9 +54,11 @@ class RealJobScanner:
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
     
-    async def scan_real_gmail_jobs(self, days_back: int = 3) -> List[Dict]:
+    async def scan_real_gmail_jobs(self, days_back: int = 3, incremental: bool = True) -> List[Dict]:
         """
         Scan actual Gmail inbox for real job notifications
+        
+        With ``incremental`` only mail that arrived since the previous scan is fetched.
         """
         try:
             if not self.gmail_password:
@@ -58,10 +67,7 @@ class RealJobScanner:
             
             logger.info(f"🔍 Scanning real Gmail jobs from {self.gmail_user} (last {days_back} days)")
             
-            # Connect to Gmail
-            mail = imaplib.IMAP4_SSL("imap.gmail.com")
-            mail.login(self.gmail_user, self.gmail_password)
-            mail.select("inbox")
+            scanner = get_imap_scanner(self.gmail_user, self.gmail_password)
             
             # Search for recent job-related emails
             since_date = (datetime.now() - timedelta(days=days_back)).strftime("%d-%b-%Y")
@@ -84,28 +90,21 @@ class RealJobScanner:
                 f'(SINCE "{since_date}" BODY "software")'
             ]
             
-            all_job_emails = []
-            processed_msg_ids = set()
+            # One connection, each message fetched once; obvious spam is skipped on headers alone
+            messages = await scanner.scan(
+                'real_job_scanner',
+                {query: query for query in search_queries},
+                header_filter=lambda scanned: not self._is_spam_headers(scanned.subject, scanned.sender),
+                incremental=incremental
+            )
+            logger.info(f"Found {len(messages)} new emails matching job queries")
             
-            for query in search_queries:
-                try:
-                    status, messages = mail.search(None, query)
-                    if status == "OK" and messages[0]:
-                        message_ids = messages[0].split()
-                        logger.info(f"Found {len(message_ids)} emails for query: {query}")
-                        
-                        for msg_id in message_ids:
-                            if msg_id not in processed_msg_ids:
-                                processed_msg_ids.add(msg_id)
-                                job_info = await self._extract_real_job_from_email(mail, msg_id)
-                                if job_info:
-                                    all_job_emails.append(job_info)
-                                    
-                except Exception as e:
-                    logger.warning(f"Error with query {query}: {e}")
+            all_job_emails = []
             
-            mail.close()
-            mail.logout()
+            for scanned in messages:
+                job_info = await self._extract_real_job_from_email(scanned.message)
+                if job_info:
+                    all_job_emails.append(job_info)
             
             # Remove duplicates and filter quality jobs
             unique_jobs = self._filter_quality_jobs(all_job_emails)
@@ -117,18 +116,11 @@ class RealJobScanner:
             logger.error(f"❌ Error scanning Gmail: {e}")
             return []
     
-    async def _extract_real_job_from_email(self, mail, msg_id) -> Optional[Dict]:
+    async def _extract_real_job_from_email(self, email_message) -> Optional[Dict]:
         """
-        Extract comprehensive job information from real emails
+        Extract comprehensive job information from a parsed email message
         """
         try:
-            status, msg_data = mail.fetch(msg_id, "(RFC822)")
-            if status != "OK":
-                return None
-            
-            email_body = msg_data[0][1]
-            email_message = email.message_from_bytes(email_body)
-            
             subject = email_message.get("Subject", "")
             sender = email_message.get("From", "")
             date = email_message.get("Date", "")
@@ -223,13 +215,6 @@ class RealJobScanner:
             "react", "nodejs", "kubernetes", "aws", "azure"
         ]
         
-        # Spam/newsletter indicators
-        spam_indicators = [
-            "unsubscribe", "newsletter", "promotional", "marketing campaign",
-            "limited time offer", "click here for", "free trial", "discount",
-            "viagra", "casino", "lottery", "congratulations you won"
-        ]
-        
         # Company/recruiter domains (more likely to be real jobs)
         recruiter_domains = [
             "linkedin.com", "indeed.com", "glassdoor.com", "thelocal.se",
@@ -237,7 +222,7 @@ class RealJobScanner:
         ]
         
         strong_score = sum(1 for indicator in strong_indicators if indicator in text)
-        spam_score = sum(1 for indicator in spam_indicators if indicator in text)
+        spam_score = sum(1 for indicator in self.SPAM_INDICATORS if indicator in text)
         recruiter_score = sum(1 for domain in recruiter_domains if domain in sender.lower())
         
         # Enhanced scoring
@@ -245,6 +230,13 @@ class RealJobScanner:
         
         return total_score >= 2 and spam_score < 2
     
+    def _is_spam_headers(self, subject: str, sender: str) -> bool:
+        """
+        Reject from headers alone: this much spam fails _is_real_job_email whatever the body says
+        """
+        text = (subject + " " + sender).lower()
+        return sum(1 for indicator in self.SPAM_INDICATORS if indicator in text) >= 2
+    
     def _extract_job_title_enhanced(self, subject: str, content: str) -> str:
         """
         Enhanced job title extraction
@@ -742,12 +734,9 @@ class RealJobScanner:
                 logger.info(f"✅ [SIMULATED] Email sent for {job['company']} - {job['title']}")
                 return True
             
-            # Send using SMTP
-            with smtplib.SMTP('smtp.gmail.com', 587) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(msg)
-                
+            # Send over the shared SMTP session
+            await get_smtp_mailer(self.sender_email, self.sender_password).send(msg)
+            
             logger.info(f"✅ Successfully sent email for {job['company']} - {job['title']}")
             return True
             
@@ -1,13 +1,14 @@
 import asyncio
-import aiohttp
 import logging
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from bs4 import BeautifulSoup
 import re
 import json
-from urllib.parse import urlencode, quote_plus
+from urllib.parse import urlencode, quote_plus, urlsplit
 import time
 
+from app.services.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 class LinkedInJobScraper:
@@ -55,40 +56,97 @@ class LinkedInJobScraper:
         try:
             logger.info(f"🔍 Scraping LinkedIn for real job postings (max: {max_jobs})")
             
-            all_jobs = []
-            
-            # Search for different keyword combinations
-            for keyword in self.keywords[:3]:  # Limit to avoid being blocked
-                for location in self.locations[:2]:  # Limit locations
-                    try:
-                        jobs = await self._search_linkedin_jobs(keyword, location, limit=5)
-                        all_jobs.extend(jobs)
-                        
-                        # Be respectful - add delay between requests
-                        await asyncio.sleep(2)
-                        
-                        if len(all_jobs) >= max_jobs:
-                            break
-                    except Exception as e:
-                        logger.warning(f"Error searching LinkedIn for {keyword} in {location}: {e}")
-                
-                if len(all_jobs) >= max_jobs:
-                    break
-            
-            # Remove duplicates and return limited results
-            unique_jobs = self._remove_duplicates(all_jobs)
+            unique_jobs = [job async for job in self.stream_linkedin_jobs(max_jobs=max_jobs)]
             logger.info(f"✅ Found {len(unique_jobs)} unique LinkedIn job opportunities")
             
-            return unique_jobs[:max_jobs]
+            return unique_jobs
             
         except Exception as e:
             logger.error(f"❌ Error scraping LinkedIn jobs: {e}")
             return []
     
+    async def stream_linkedin_jobs(self, max_jobs: int = 20) -> AsyncIterator[Dict]:
+        """
+        Yield unique LinkedIn jobs as soon as each one's detail page resolves
+        
+        All keyword/location searches and card detail fetches run
+        concurrently, bounded by the LinkedIn politeness budget of the
+        shared HTTP client. Outstanding requests are cancelled once
+        ``max_jobs`` jobs have been yielded.
+        
+        Args:
+            max_jobs: Maximum number of unique jobs to yield
+            
+        Yields:
+            Job dictionaries in completion order
+        """
+        # Search for different keyword combinations
+        searches = [
+            (keyword, location)
+            for keyword in self.keywords[:3]  # Limit to avoid being blocked
+            for location in self.locations[:2]  # Limit locations
+        ]
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self._max_concurrency())
+        done_marker = object()
+        
+        async def run_search(keyword: str, location: str):
+            try:
+                async for job in self._iter_linkedin_search(keyword, location, 5, semaphore):
+                    await queue.put(job)
+            except Exception as e:
+                logger.warning(f"Error searching LinkedIn for {keyword} in {location}: {e}")
+            finally:
+                await queue.put(done_marker)
+        
+        tasks = [asyncio.create_task(run_search(keyword, location)) for keyword, location in searches]
+        seen = set()
+        yielded = 0
+        pending = len(tasks)
+        
+        try:
+            while pending and yielded < max_jobs:
+                job = await queue.get()
+                if job is done_marker:
+                    pending -= 1
+                    continue
+                
+                # Remove duplicates based on title and company
+                key = self._dedup_key(job)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yielded += 1
+                yield job
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def _max_concurrency(self) -> int:
+        """Concurrent LinkedIn requests allowed by the shared client's host budget"""
+        return get_http_client().limit_for(urlsplit(self.base_url).hostname or 'linkedin.com').concurrency
+    
     async def _search_linkedin_jobs(self, keyword: str, location: str, limit: int = 10) -> List[Dict]:
         """
         Search LinkedIn jobs for specific keyword and location
         """
+        semaphore = asyncio.Semaphore(self._max_concurrency())
+        return [job async for job in self._iter_linkedin_search(keyword, location, limit, semaphore)]
+    
+    async def _iter_linkedin_search(
+        self, keyword: str, location: str, limit: int, semaphore: asyncio.Semaphore
+    ) -> AsyncIterator[Dict]:
+        """
+        Fetch one search page, then fetch its cards' details concurrently and yield jobs as they complete
+        
+        Args:
+            keyword: Search keywords
+            location: Search location
+            limit: Maximum number of cards to process
+            semaphore: Bounds concurrent LinkedIn requests across all searches
+        """
         try:
             # Build search URL
             params = {
@@ -102,32 +160,41 @@ class LinkedInJobScraper:
             
             search_url = f"{self.base_url}?{urlencode(params)}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(search_url, headers=self.headers) as response:
-                    if response.status != 200:
-                        logger.warning(f"LinkedIn search returned status {response.status}")
-                        return []
-                    
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-                    
-                    # Find job cards
-                    job_cards = soup.find_all('div', {'class': re.compile(r'job-search-card|base-search-card')})
-                    
-                    jobs = []
-                    for card in job_cards[:limit]:
+            async with get_http_client().session() as session:
+                # Release the search response before detail requests need the budget
+                async with semaphore:
+                    async with session.get(search_url, headers=self.headers) as response:
+                        if response.status != 200:
+                            logger.warning(f"LinkedIn search returned status {response.status}")
+                            return
+                        
+                        html = await response.text()
+                
+                soup = BeautifulSoup(html, 'html.parser')
+                
+                # Find job cards
+                job_cards = soup.find_all('div', {'class': re.compile(r'job-search-card|base-search-card')})
+                
+                async def extract(card):
+                    async with semaphore:
+                        return await self._extract_job_from_card(card, session)
+                
+                tasks = [asyncio.create_task(extract(card)) for card in job_cards[:limit]]
+                try:
+                    for next_job in asyncio.as_completed(tasks):
                         try:
-                            job_info = await self._extract_job_from_card(card, session)
+                            job_info = await next_job
                             if job_info:
-                                jobs.append(job_info)
+                                yield job_info
                         except Exception as e:
                             logger.warning(f"Error extracting job from card: {e}")
-                    
-                    return jobs
+                finally:
+                    # The consumer may stop early; don't leave detail requests running
+                    for task in tasks:
+                        task.cancel()
             
         except Exception as e:
             logger.error(f"Error searching LinkedIn jobs: {e}")
-            return []
     
     async def _extract_job_from_card(self, card, session) -> Optional[Dict]:
         """
@@ -288,12 +355,17 @@ class LinkedInJobScraper:
         unique_jobs = []
         
         for job in jobs:
-            key = f"{job['company'].lower()}_{job['title'].lower().replace(' ', '_')}"
+            key = self._dedup_key(job)
             if key not in seen:
                 seen.add(key)
                 unique_jobs.append(job)
         
         return unique_jobs
+    
+    @staticmethod
+    def _dedup_key(job: Dict) -> str:
+        """Duplicate detection key based on title and company"""
+        return f"{job['company'].lower()}_{job['title'].lower().replace(' ', '_')}"
 
 
 class IndeedJobScraper:
@@ -331,19 +403,17 @@ class IndeedJobScraper:
             
             all_jobs = []
             
-            for keyword in self.keywords[:3]:  # Limit to avoid being blocked
-                try:
-                    jobs = await self._search_indeed_jobs(keyword, limit=5)
+            # Searches run concurrently; the shared client paces requests to Indeed
+            keywords = self.keywords[:3]  # Limit to avoid being blocked
+            results = await asyncio.gather(
+                *(self._search_indeed_jobs(keyword, limit=5) for keyword in keywords),
+                return_exceptions=True
+            )
+            for keyword, jobs in zip(keywords, results):
+                if isinstance(jobs, Exception):
+                    logger.warning(f"Error searching Indeed for {keyword}: {jobs}")
+                else:
                     all_jobs.extend(jobs)
-                    
-                    # Be respectful - add delay
-                    await asyncio.sleep(3)
-                    
-                    if len(all_jobs) >= max_jobs:
-                        break
-                        
-                except Exception as e:
-                    logger.warning(f"Error searching Indeed for {keyword}: {e}")
             
             unique_jobs = self._remove_duplicates_indeed(all_jobs)
             logger.info(f"✅ Found {len(unique_jobs)} unique Indeed job opportunities")
@@ -369,7 +439,7 @@ class IndeedJobScraper:
             
             search_url = f"{self.base_url}?{urlencode(params)}"
             
-            async with aiohttp.ClientSession() as session:
+            async with get_http_client().session() as session:
                 async with session.get(search_url, headers=self.headers) as response:
                     if response.status != 200:
                         logger.warning(f"Indeed search returned status {response.status}")
@@ -533,20 +603,18 @@ class ArbetsformedlingenScraper:
             
             all_jobs = []
             
-            async with aiohttp.ClientSession() as session:
-                for keyword in self.keywords[:3]:  # Limit API calls
-                    try:
-                        jobs = await self._search_arbetsformedlingen_api(keyword, session, limit=5)
+            async with get_http_client().session() as session:
+                # Searches run concurrently within the API's rate limit
+                keywords = self.keywords[:3]  # Limit API calls
+                results = await asyncio.gather(
+                    *(self._search_arbetsformedlingen_api(keyword, session, limit=5) for keyword in keywords),
+                    return_exceptions=True
+                )
+                for keyword, jobs in zip(keywords, results):
+                    if isinstance(jobs, Exception):
+                        logger.warning(f"Error searching Arbetsförmedlingen API for {keyword}: {jobs}")
+                    else:
                         all_jobs.extend(jobs)
-                        
-                        # Be respectful with API calls
-                        await asyncio.sleep(1)
-                        
-                        if len(all_jobs) >= max_jobs:
-                            break
-                            
-                    except Exception as e:
-                        logger.warning(f"Error searching Arbetsförmedlingen API for {keyword}: {e}")
             
             unique_jobs = self._remove_duplicates_arbetsformedlingen(all_jobs)
             logger.info(f"✅ Found {len(unique_jobs)} unique Arbetsförmedlingen job opportunities")
@@ -828,20 +896,18 @@ class CompanyCareerScraper:
             
             all_jobs = []
             
-            for company_key, company_config in self.company_sites.items():
-                try:
-                    logger.info(f"Scraping {company_config['name']} careers...")
-                    jobs = await self._scrape_company_jobs(company_key, company_config, limit=7)
+            # Each company is a different host, so these run concurrently
+            companies = list(self.company_sites.items())
+            results = await asyncio.gather(
+                *(self._scrape_company_jobs(company_key, company_config, limit=7)
+                  for company_key, company_config in companies),
+                return_exceptions=True
+            )
+            for (company_key, company_config), jobs in zip(companies, results):
+                if isinstance(jobs, Exception):
+                    logger.warning(f"Error scraping {company_config['name']}: {jobs}")
+                else:
                     all_jobs.extend(jobs)
-                    
-                    # Be respectful with requests
-                    await asyncio.sleep(2)
-                    
-                    if len(all_jobs) >= max_jobs:
-                        break
-                        
-                except Exception as e:
-                    logger.warning(f"Error scraping {company_config['name']}: {e}")
             
             unique_jobs = self._remove_duplicates_company(all_jobs)
             logger.info(f"✅ Found {len(unique_jobs)} unique company career opportunities")
@@ -858,7 +924,7 @@ class CompanyCareerScraper:
         Scrape jobs from a specific company career site
         """
         try:
-            async with aiohttp.ClientSession() as session:
+            async with get_http_client().session() as session:
                 # Try to scrape real data from company sites
                 if company_key == 'skf':
                     return await self._scrape_skf_careers(session, limit)
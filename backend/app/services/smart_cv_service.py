@@ -5,7 +5,7 @@ Integrates all optimization components for intelligent document customization
 """
 import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
 import json
 
@@ -13,6 +13,7 @@ from .enhanced_cv_optimizer import EnhancedCVOptimizer, ATSScore
 from .template_manager import TemplateManager
 from .ats_analyzer import ATSAnalyzer, ATSAnalysisResult
 from .latex_resume_service import LaTeXResumeService
+from .batch_executor import BatchExecutor
 
 logger = logging.getLogger(__name__)
 
@@ -51,13 +52,15 @@ class SmartCVService:
             return False
     
     async def process_job_application(self, job_data: Dict, 
-                                    force_regenerate: bool = False) -> Dict:
+                                    force_regenerate: bool = False,
+                                    batch: Optional[BatchExecutor] = None) -> Dict:
         """
         Process job application with intelligent customization
         
         Args:
             job_data: Job posting information
             force_regenerate: Force full regeneration instead of using templates
+            batch: Batch executor to score on and record stage timings with
             
         Returns:
             Dict with optimized documents and analysis
@@ -69,14 +72,19 @@ class SmartCVService:
         
         logger.info(f"Processing application for {job_title} at {company}")
         
+        async def timed(stage: str, awaitable):
+            return await (batch.timed(stage, awaitable) if batch else awaitable)
+        
+        analyze_document = batch.analyze_document if batch else self.ats_analyzer.analyze_document
+        
         try:
             # Step 1: Analyze job requirements
             role_category = self.cv_optimizer.analyze_job_role(job_title, job_description)
             
             # Step 2: Get template recommendations
-            template_recommendations = await self.template_manager.get_template_recommendations(
+            template_recommendations = await timed('template_lookup', self.template_manager.get_template_recommendations(
                 job_title, job_description, role_category
-            )
+            ))
             
             # Step 3: Decide on optimization strategy
             optimization_strategy = self._determine_optimization_strategy(
@@ -84,33 +92,39 @@ class SmartCVService:
             )
             
             # Step 4: Generate/optimize documents
-            result = await self._execute_optimization_strategy(
+            result = await timed('optimization', self._execute_optimization_strategy(
                 job_data, template_recommendations, optimization_strategy
-            )
+            ))
             
-            # Step 5: Analyze final documents with ATS checker
-            cv_analysis = await self.ats_analyzer.analyze_document(
-                result['cv_content'], job_description, job_title, 'cv'
-            )
-            cl_analysis = await self.ats_analyzer.analyze_document(
-                result['cover_letter_content'], job_description, job_title, 'cover_letter'
-            )
+            # Step 5: Analyze final documents with ATS checker (CV and CL side by side)
+            cv_analysis, cl_analysis = await timed('ats_analysis', asyncio.gather(
+                analyze_document(result['cv_content'], job_description, job_title, 'cv'),
+                analyze_document(result['cover_letter_content'], job_description, job_title, 'cover_letter')
+            ))
             
-            # Step 6: Update template performance
-            if result.get('template_used'):
-                await self._update_template_performance(
-                    result['cv_template_id'], job_title, company, cv_analysis
-                )
-                await self._update_template_performance(
-                    result['cl_template_id'], job_title, company, cl_analysis
+            # Steps 6 and 7 are independent: record template performance while both PDFs compile
+            file_suffix = f"{company}_{job_title.replace(' ', '_')}"
+            
+            async def update_templates():
+                if result.get('template_used'):
+                    await asyncio.gather(
+                        self._update_template_performance(
+                            result['cv_template_id'], job_title, company, cv_analysis
+                        ),
+                        self._update_template_performance(
+                            result['cl_template_id'], job_title, company, cl_analysis
+                        )
+                    )
+            
+            async def compile_pdfs():
+                return await asyncio.gather(
+                    self.latex_service._compile_latex_to_pdf(result['cv_content'], f"cv_{file_suffix}"),
+                    self.latex_service._compile_latex_to_pdf(result['cover_letter_content'], f"cl_{file_suffix}")
                 )
             
-            # Step 7: Compile to PDF
-            cv_pdf = await self.latex_service._compile_latex_to_pdf(
-                result['cv_content'], f"cv_{company}_{job_title.replace(' ', '_')}"
-            )
-            cl_pdf = await self.latex_service._compile_latex_to_pdf(
-                result['cover_letter_content'], f"cl_{company}_{job_title.replace(' ', '_')}"
+            _, (cv_pdf, cl_pdf) = await asyncio.gather(
+                timed('template_update', update_templates()),
+                timed('pdf_compile', compile_pdfs())
             )
             
             # Step 8: Generate comprehensive report
@@ -528,46 +542,91 @@ class SmartCVService:
             }
         }
     
-    async def batch_process_applications(self, jobs_list: List[Dict]) -> List[Dict]:
-        """Process multiple job applications efficiently"""
-        
-        logger.info(f"Starting batch processing of {len(jobs_list)} applications")
-        
-        results = []
-        
-        for i, job_data in enumerate(jobs_list):
-            try:
-                logger.info(f"Processing application {i+1}/{len(jobs_list)}")
-                
-                result = await self.process_job_application(job_data)
-                results.append(result)
-                
-                # Add small delay to prevent overwhelming the system
-                await asyncio.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error processing job {i+1}: {e}")
-                results.append({
-                    'error': str(e),
-                    'job_details': job_data,
-                    'success': False
-                })
+    async def stream_batch_applications(self, jobs_list: List[Dict],
+                                        max_concurrency: Optional[int] = None,
+                                        batch: Optional[BatchExecutor] = None) -> AsyncIterator[Dict]:
+        """
+        Process job applications concurrently, yielding each result as it completes
+        
+        Args:
+            jobs_list: Job postings to process
+            max_concurrency: Applications in flight at once (default: SMART_CV_BATCH_CONCURRENCY)
+            batch: Executor to run on; its summary() covers the yielded results
+            
+        Yields:
+            Per-job result dicts in completion order, tagged with 'batch_index'
+        """
+        
+        owns_batch = batch is None
+        batch = batch or BatchExecutor(max_concurrency=max_concurrency)
+        
+        async def process(indexed_job):
+            index, job_data = indexed_job
+            result = await self.process_job_application(job_data, batch=batch)
+            result['batch_index'] = index
+            return result
+        
+        def failed(indexed_job, error):
+            index, job_data = indexed_job
+            return {
+                'error': str(error),
+                'job_details': job_data,
+                'success': False,
+                'batch_index': index
+            }
+        
+        try:
+            async for result in batch.stream(enumerate(jobs_list), process, on_error=failed):
+                yield result
+        finally:
+            if owns_batch:
+                batch.close()
+    
+    async def batch_process_applications(self, jobs_list: List[Dict],
+                                         max_concurrency: Optional[int] = None) -> Dict:
+        """
+        Process multiple job applications concurrently
+        
+        Args:
+            jobs_list: Job postings to process
+            max_concurrency: Applications in flight at once (default: SMART_CV_BATCH_CONCURRENCY)
+            
+        Returns:
+            Dict with 'batch_summary' (counts, jobs/min, p50/p95 per stage) and
+            'individual_results' in input order
+        """
+        
+        batch = BatchExecutor(max_concurrency=max_concurrency)
+        logger.info(
+            f"Starting batch processing of {len(jobs_list)} applications "
+            f"({batch.max_concurrency} at a time, {batch.ats_workers} ATS worker(s))"
+        )
+        
+        results: List[Optional[Dict]] = [None] * len(jobs_list)
+        try:
+            async for result in self.stream_batch_applications(jobs_list, batch=batch):
+                results[result['batch_index']] = result
+                logger.info(f"Finished application {result['batch_index'] + 1}/{len(jobs_list)}")
+        finally:
+            batch.close()
+        
+        successful = [r for r in results if not r.get('error')]
         
         # Generate batch summary
-        batch_summary = {
-            'total_processed': len(results),
-            'successful': len([r for r in results if not r.get('error')]),
-            'failed': len([r for r in results if r.get('error')]),
+        batch_summary = batch.summary()
+        batch_summary.update({
             'avg_ats_score': sum(
-                r.get('ats_analysis', {}).get('overall_score', 0) 
-                for r in results if not r.get('error')
-            ) / max(1, len([r for r in results if not r.get('error')])),
+                r.get('ats_analysis', {}).get('overall_score', 0) for r in successful
+            ) / max(1, len(successful)),
             'batch_completed_at': datetime.now().isoformat()
-        }
+        })
         
-        logger.info(f"Batch processing completed: {batch_summary['successful']}/{batch_summary['total_processed']} successful")
+        logger.info(
+            f"Batch processing completed: {batch_summary['successful']}/{batch_summary['total_processed']} successful, "
+            f"{batch_summary['jobs_per_minute']} jobs/min"
+        )
         
         return {
             'batch_summary': batch_summary,
             'individual_results': results
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,268 @@
+"""
+SMTP Mailer
+Shared outbound mail: one authenticated SMTP session per account, reused across sends
+"""
+import asyncio
+import logging
+import os
+import smtplib
+import threading
+import time
+from email.message import Message
+from typing import Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the session is dropped and the send retried on a new one
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, OSError)
+
+
+class SmtpMailer:
+    """
+    One long-lived SMTP session shared by every sender of an account
+
+    The first send connects, runs STARTTLS (or uses implicit TLS on port
+    465) and logs in; later sends reuse the session, so a batch of
+    messages costs one TLS handshake. A session idle for longer than
+    ``idle_timeout`` is closed and reopened before the next send, since
+    servers drop idle clients. A send that fails because the connection
+    went away is retried once on a fresh session. All blocking SMTP I/O
+    happens on a worker thread.
+    """
+
+    def __init__(
+        self,
+        user: str,
+        password: str,
+        host: str = 'smtp.gmail.com',
+        port: int = 587,
+        idle_timeout: float = 120.0,
+        timeout: float = 30.0,
+        connection_factory: Optional[Callable[[], smtplib.SMTP]] = None
+    ):
+        """
+        Initialize the mailer (no connection is made until the first send)
+
+        Args:
+            user: SMTP login
+            password: SMTP (app) password
+            host: SMTP server
+            port: 587 for STARTTLS, 465 for implicit TLS
+            idle_timeout: Seconds a session may sit unused before it is reopened
+            timeout: Socket timeout in seconds
+            connection_factory: Creates an unauthenticated, not yet encrypted SMTP connection
+        """
+        self.user = user
+        self.password = password
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._connection_factory = connection_factory or self._default_connection
+
+        # smtplib connections are not thread-safe
+        self._lock = threading.Lock()
+        self._conn: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+        self.connects = 0
+        self.reconnects = 0
+        self.sent = 0
+        self.failed = 0
+
+    def _default_connection(self) -> smtplib.SMTP:
+        if self.port == 465:
+            return smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        return smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+
+    def _connection(self) -> smtplib.SMTP:
+        """Return the open session, reconnecting if it has been idle too long (caller holds the lock)"""
+        if self._conn is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self._drop_connection()
+
+        if self._conn is None:
+            conn = self._connection_factory()
+            try:
+                if not isinstance(conn, smtplib.SMTP_SSL):
+                    conn.starttls()
+                conn.login(self.user, self.password)
+            except Exception:
+                self._close_quietly(conn)
+                raise
+            self._conn = conn
+            self._last_used = time.monotonic()
+            self.connects += 1
+            logger.info(f"📮 Connected to SMTP {self.host}:{self.port} as {self.user}")
+
+        return self._conn
+
+    def _drop_connection(self) -> None:
+        """Forget the current session (after an error, when idle or on close)"""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            try:
+                conn.close()
+            except OSError:
+                pass
+
+    def _send_locked(self, msg: Message, from_addr: Optional[str], to_addrs: Optional[Sequence[str]]) -> None:
+        """Send one message, retrying once on a new session if the old one died (caller holds the lock)"""
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.send_message(msg, from_addr=from_addr, to_addrs=to_addrs)
+                self._last_used = time.monotonic()
+                return
+            except smtplib.SMTPRecipientsRefused:
+                # About this message only; the session is still usable
+                self._last_used = time.monotonic()
+                raise
+            except smtplib.SMTPResponseException as e:
+                # 421 means the server is closing the session; other codes reject this message
+                if e.smtp_code != 421:
+                    self._last_used = time.monotonic()
+                    raise
+                error = e
+            except _CONNECTION_ERRORS as e:
+                error = e
+
+            self._drop_connection()
+            if attempt:
+                raise error
+            self.reconnects += 1
+            logger.info(f"🔁 SMTP session lost ({error}), reconnecting")
+
+    def send_blocking(self, msg: Message, from_addr: Optional[str] = None,
+                      to_addrs: Optional[Sequence[str]] = None) -> None:
+        """
+        Send one message on the calling thread
+
+        Args:
+            msg: Message to send
+            from_addr: Envelope sender (default: the From header)
+            to_addrs: Envelope recipients (default: To, Cc and Bcc headers)
+
+        Raises:
+            smtplib.SMTPException: If the server rejects the login or the message
+        """
+        with self._lock:
+            try:
+                self._send_locked(msg, from_addr, to_addrs)
+            except Exception:
+                self.failed += 1
+                raise
+            self.sent += 1
+
+    async def send(self, msg: Message, from_addr: Optional[str] = None,
+                   to_addrs: Optional[Sequence[str]] = None) -> None:
+        """Send one message on a worker thread (see send_blocking)"""
+        await asyncio.to_thread(self.send_blocking, msg, from_addr, to_addrs)
+
+    def send_many_blocking(self, messages: Sequence[Message]) -> List[bool]:
+        """
+        Send a batch over one session, continuing past failed messages
+
+        Args:
+            messages: Messages to send, addressed by their headers
+
+        Returns:
+            Per message, True if it was accepted
+        """
+        results = []
+        with self._lock:
+            for msg in messages:
+                try:
+                    self._send_locked(msg, None, None)
+                    self.sent += 1
+                    results.append(True)
+                except Exception as e:
+                    self.failed += 1
+                    logger.error(f"❌ Failed to send '{msg.get('Subject', '')}' to {msg.get('To')}: {e}")
+                    results.append(False)
+                    if isinstance(e, smtplib.SMTPAuthenticationError):
+                        # Every other message would fail the same way
+                        remaining = len(messages) - len(results)
+                        self.failed += remaining
+                        results.extend([False] * remaining)
+                        break
+
+        logger.info(f"📨 Sent {sum(results)}/{len(messages)} message(s) over SMTP {self.host}")
+        return results
+
+    async def send_many(self, messages: Sequence[Message]) -> List[bool]:
+        """Send a batch on a worker thread (see send_many_blocking)"""
+        return await asyncio.to_thread(self.send_many_blocking, messages)
+
+    def verify_blocking(self) -> None:
+        """
+        Open (or reuse) an authenticated session
+
+        Raises:
+            smtplib.SMTPException: If connecting or logging in fails
+        """
+        with self._lock:
+            self._connection()
+            self._last_used = time.monotonic()
+
+    async def verify(self) -> None:
+        """Check connection and credentials on a worker thread"""
+        await asyncio.to_thread(self.verify_blocking)
+
+    def get_stats(self) -> Dict:
+        """Session and delivery counters"""
+        return {
+            'connected': self._conn is not None,
+            'connects': self.connects,
+            'reconnects': self.reconnects,
+            'sent': self.sent,
+            'failed': self.failed
+        }
+
+    def close(self) -> None:
+        """Quit the session"""
+        with self._lock:
+            self._drop_connection()
+
+
+_shared_mailers: Dict[tuple, SmtpMailer] = {}
+_shared_mailers_lock = threading.Lock()
+
+
+def get_smtp_mailer(user: str, password: str, host: str = 'smtp.gmail.com', port: int = 587) -> SmtpMailer:
+    """
+    Get the process-wide mailer for an SMTP account
+
+    Environment:
+        SMTP_IDLE_TIMEOUT_SECONDS: Seconds a session may sit unused before it is reopened
+
+    Args:
+        user: SMTP login
+        password: SMTP (app) password
+        host: SMTP server
+        port: SMTP port
+
+    Returns:
+        Shared SmtpMailer for the account
+    """
+    key = (host, port, user)
+    with _shared_mailers_lock:
+        mailer = _shared_mailers.get(key)
+        if mailer is None or mailer.password != password:
+            if mailer is not None:
+                mailer.close()
+            mailer = SmtpMailer(
+                user,
+                password,
+                host=host,
+                port=port,
+                idle_timeout=float(os.getenv('SMTP_IDLE_TIMEOUT_SECONDS', '120'))
+            )
+            _shared_mailers[key] = mailer
+        return mailer
@@ -3,6 +3,7 @@
 Intelligent Template Management System
 Manages reusable CV/CL templates with versioning and optimization tracking
 """
+import asyncio
 import json
 import logging
 from typing import Dict, List, Optional, Tuple
@@ -322,7 +323,11 @@ class TemplateManager:
                 'success': success
             }
             
-            self.supabase.table("template_performance").insert(performance_data).execute()
+            # Supabase calls are blocking; run them off the event loop so they
+            # overlap with PDF compilation in SmartCVService
+            await asyncio.to_thread(
+                self.supabase.table("template_performance").insert(performance_data).execute
+            )
             
             # Update template aggregate metrics
             await self._update_template_aggregates(template_id)
@@ -337,9 +342,9 @@ class TemplateManager:
         
         try:
             # Get all performance records for this template
-            perf_result = self.supabase.table("template_performance").select("*").eq(
+            perf_result = await asyncio.to_thread(self.supabase.table("template_performance").select("*").eq(
                 "template_id", template_id
-            ).execute()
+            ).execute)
             
             if not perf_result.data:
                 return
@@ -359,9 +364,9 @@ class TemplateManager:
                 'last_used': datetime.now().isoformat()
             }
             
-            self.supabase.table("document_templates").update(update_data).eq(
+            await asyncio.to_thread(self.supabase.table("document_templates").update(update_data).eq(
                 "template_id", template_id
-            ).execute()
+            ).execute)
             
             # Clear cache
             cache_key = f"template_{template_id}"
@@ -0,0 +1,293 @@
+"""
+Artifact Store
+Collision-free, atomically written output folders for generated applications with retention quotas
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+DEFAULT_ROOT = Path('generated_applications')
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_TOTAL_BYTES = 2 * 1024 * 1024 * 1024
+DEFAULT_MAX_APPLICATIONS = 1000
+
+# Folder and file names accepted from download/preview URLs
+_SAFE_NAME = re.compile(r'^\w[\w.-]*$')
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write to a temp file next to ``path`` and rename it into place"""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+class ApplicationArtifacts:
+    """One application's output folder and its manifest"""
+
+    def __init__(self, application_id: str, path: Path, metadata: Optional[Dict] = None):
+        """
+        Initialize the artifact folder handle
+
+        Args:
+            application_id: Unique folder name (used in download URLs)
+            path: Folder location
+            metadata: Descriptive fields stored in the manifest (company, title, ...)
+        """
+        self.application_id = application_id
+        self.path = path
+        self._lock = threading.Lock()
+        self.manifest = {
+            'application_id': application_id,
+            'created_at': datetime.now().isoformat(),
+            'metadata': metadata or {},
+            'files': {}
+        }
+
+    @property
+    def name(self) -> str:
+        """Folder name used in download/preview URLs"""
+        return self.application_id
+
+    def write_bytes(self, filename: str, data: bytes) -> Path:
+        """
+        Atomically write a file and record its hash and size in the manifest
+
+        Args:
+            filename: File name inside the application folder
+            data: File content
+
+        Returns:
+            Path of the written file
+        """
+        if not _SAFE_NAME.match(filename) or filename == MANIFEST_NAME:
+            raise ValueError(f"Invalid artifact file name: {filename}")
+
+        file_path = self.path / filename
+        _atomic_write(file_path, data)
+
+        with self._lock:
+            self.manifest['files'][filename] = {
+                'sha256': hashlib.sha256(data).hexdigest(),
+                'bytes': len(data)
+            }
+            _atomic_write(self.path / MANIFEST_NAME, json.dumps(self.manifest, indent=2).encode('utf-8'))
+
+        return file_path
+
+    def write_text(self, filename: str, text: str) -> Path:
+        """Atomically write a UTF-8 text file (e.g. a .tex source)"""
+        return self.write_bytes(filename, text.encode('utf-8'))
+
+    def write_json(self, filename: str, payload) -> Path:
+        """Atomically write a JSON file"""
+        return self.write_text(filename, json.dumps(payload, indent=2, ensure_ascii=False))
+
+
+class ArtifactStore:
+    """
+    Root directory of generated application folders
+
+    Every application gets its own ``<timestamp>_<uuid>`` folder, so
+    concurrent requests never share files. Files are written through a
+    temp file and rename, so downloads never see partial PDFs. A
+    retention pass removes old folders and trims the tree to the
+    configured count and size quotas.
+    """
+
+    # Folders younger than this are never removed (they may still be written to)
+    GRACE_SECONDS = 300
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_ROOT,
+        max_age_seconds: int = DEFAULT_MAX_AGE_SECONDS,
+        max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+        max_applications: int = DEFAULT_MAX_APPLICATIONS
+    ):
+        """
+        Initialize the store
+
+        Args:
+            root: Directory holding application folders
+            max_age_seconds: Remove applications older than this (0 disables)
+            max_total_bytes: Trim oldest applications above this total size (0 disables)
+            max_applications: Trim oldest applications above this count (0 disables)
+        """
+        self.root = Path(root)
+        self.max_age_seconds = max_age_seconds
+        self.max_total_bytes = max_total_bytes
+        self.max_applications = max_applications
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self._retention_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def create_application(self, metadata: Optional[Dict] = None) -> ApplicationArtifacts:
+        """
+        Create a new, uniquely named application folder
+
+        Args:
+            metadata: Descriptive fields stored in the manifest
+
+        Returns:
+            ApplicationArtifacts for writing files
+        """
+        application_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:12]}"
+        path = self.root / application_id
+        path.mkdir(parents=True, exist_ok=False)
+        return ApplicationArtifacts(application_id, path, metadata)
+
+    def resolve(self, folder: str, filename: str) -> Optional[Path]:
+        """
+        Resolve a download/preview URL to a file, rejecting path traversal
+
+        Args:
+            folder: Application folder name
+            filename: File name inside the folder
+
+        Returns:
+            Path of the existing file, or None
+        """
+        if not _SAFE_NAME.match(folder or '') or not _SAFE_NAME.match(filename or ''):
+            return None
+
+        file_path = self.root / folder / filename
+        return file_path if file_path.is_file() else None
+
+    def _list_applications(self) -> List[Dict]:
+        """Application folders with their age and size, oldest first"""
+        applications = []
+        for path in self.root.iterdir():
+            if not path.is_dir():
+                continue
+            try:
+                size = sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+                applications.append({'path': path, 'mtime': path.stat().st_mtime, 'bytes': size})
+            except OSError:
+                continue
+        applications.sort(key=lambda app: app['mtime'])
+        return applications
+
+    def enforce_retention(self) -> Dict:
+        """
+        Remove expired applications and trim to the count/size quotas
+
+        Returns:
+            Summary with removed folders, freed bytes and what remains
+        """
+        now = time.time()
+        applications = self._list_applications()
+        total_bytes = sum(app['bytes'] for app in applications)
+        removed = 0
+        freed = 0
+
+        for app in list(applications):
+            age = now - app['mtime']
+            if age < self.GRACE_SECONDS:
+                continue
+
+            # Leftover temp files from crashed writers
+            for temp_file in app['path'].glob('.*.tmp'):
+                try:
+                    temp_file.unlink()
+                except OSError:
+                    pass
+
+            expired = self.max_age_seconds > 0 and age > self.max_age_seconds
+            over_count = self.max_applications > 0 and len(applications) > self.max_applications
+            over_size = self.max_total_bytes > 0 and total_bytes > self.max_total_bytes
+            if not (expired or over_count or over_size):
+                continue
+
+            shutil.rmtree(app['path'], ignore_errors=True)
+            applications.remove(app)
+            total_bytes -= app['bytes']
+            freed += app['bytes']
+            removed += 1
+
+        if removed:
+            logger.info(f"🧹 Artifact retention removed {removed} application(s), freed {freed / 1024 / 1024:.1f} MB")
+
+        return {
+            'removed': removed,
+            'freed_bytes': freed,
+            'applications': len(applications),
+            'total_bytes': total_bytes
+        }
+
+    def start_retention_task(self, interval_seconds: int = 3600) -> None:
+        """Run ``enforce_retention`` periodically on a daemon thread"""
+        if self._retention_thread and self._retention_thread.is_alive():
+            return
+
+        def loop():
+            while not self._stop_event.wait(interval_seconds):
+                try:
+                    self.enforce_retention()
+                except Exception as e:
+                    logger.error(f"Artifact retention failed: {e}")
+
+        self._retention_thread = threading.Thread(target=loop, name='artifact-retention', daemon=True)
+        self._retention_thread.start()
+
+    def stop_retention_task(self) -> None:
+        """Stop the background retention thread"""
+        self._stop_event.set()
+
+
+_shared_store: Optional[ArtifactStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """
+    Get the process-wide artifact store configured from the environment
+
+    Environment:
+        ARTIFACTS_DIR: root folder (default generated_applications)
+        ARTIFACT_RETENTION_DAYS: maximum age of an application
+        ARTIFACT_MAX_TOTAL_MB: total size quota
+        ARTIFACT_MAX_APPLICATIONS: maximum number of application folders
+        ARTIFACT_RETENTION_INTERVAL_SECONDS: how often retention runs
+
+    Returns:
+        Shared ArtifactStore with its retention task running
+    """
+    global _shared_store
+
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = ArtifactStore(
+                root=Path(os.environ.get('ARTIFACTS_DIR', str(DEFAULT_ROOT))),
+                max_age_seconds=int(float(os.environ.get('ARTIFACT_RETENTION_DAYS', 30)) * 24 * 3600),
+                max_total_bytes=int(os.environ.get('ARTIFACT_MAX_TOTAL_MB', 2048)) * 1024 * 1024,
+                max_applications=int(os.environ.get('ARTIFACT_MAX_APPLICATIONS', DEFAULT_MAX_APPLICATIONS))
+            )
+            _shared_store.enforce_retention()
+            _shared_store.start_retention_task(int(os.environ.get('ARTIFACT_RETENTION_INTERVAL_SECONDS', 3600)))
+        return _shared_store
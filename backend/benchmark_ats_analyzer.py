@@ -0,0 +1,119 @@
+"""
+Benchmark for ATSAnalyzer over the generated CV / cover letter corpus
+
+Scores every .tex file under the corpus directory against a few job
+postings and reports analyses per second plus the median time of a full analysis and
+of the keyword and readability passes. With --baseline REF the analyzer from that
+git revision is timed on the same inputs and the speedup is printed.
+
+Run from backend/: python benchmark_ats_analyzer.py [--corpus ../job_applications] [--baseline HEAD~1]
+"""
+
+import argparse
+import statistics
+import subprocess
+import time
+import types
+from pathlib import Path
+
+from app.services import ats_analyzer
+
+ANALYZER_PATH = 'backend/app/services/ats_analyzer.py'
+
+JOB_POSTINGS = [
+    ('Fullstack Developer',
+     "We are looking for a fullstack developer with Java, Spring Boot, React and TypeScript. "
+     "You will build RESTful APIs and microservices, work with PostgreSQL and Docker, take part in "
+     "code review and pair programming in an agile scrum team, and own ci/cd pipelines on Azure."),
+    ('DevOps Engineer',
+     "Join our platform team to run Kubernetes and Terraform on AWS. Experience with Jenkins, GitLab, "
+     "Prometheus, Grafana and infrastructure as code is required, as are Linux, Bash and Python "
+     "scripting, incident response, capacity planning and release management."),
+    ('Cloud Engineer',
+     "Design secure cloud architectures on AWS and GCP: EC2, S3, Lambda, VPC, IAM, load balancer and "
+     "CDN setup, CloudFormation, cost optimization and monitoring with CloudWatch. High availability, "
+     "disaster recovery and compliance experience is a plus."),
+]
+
+
+def load_corpus(corpus_dir: Path):
+    """(name, document_type, LaTeX source) for every .tex file under corpus_dir"""
+    documents = []
+    for path in sorted(corpus_dir.rglob('*.tex')):
+        stem = path.stem.lower()
+        document_type = 'cover_letter' if 'cover' in stem or stem.endswith('_cl') or '_cl_' in stem else 'cv'
+        documents.append((str(path.relative_to(corpus_dir)), document_type, path.read_text(errors='replace')))
+    return documents
+
+
+def load_baseline(ref: str):
+    """Import ats_analyzer as it was at a git revision"""
+    source = subprocess.run(
+        ['git', 'show', f'{ref}:{ANALYZER_PATH}'], capture_output=True, text=True, check=True
+    ).stdout
+    module = types.ModuleType(f'ats_analyzer_{ref}')
+    exec(compile(source, f'{ref}:{ANALYZER_PATH}', 'exec'), module.__dict__)
+    return module
+
+
+def time_pass(analyzer, documents, timings: dict):
+    """Analyze every document against every posting once, appending seconds per stage to timings"""
+    for _name, document_type, source in documents:
+        for job_title, job_description in JOB_POSTINGS:
+            start = time.perf_counter()
+            analyzer.analyze_document_sync(source, job_description, job_title, document_type)
+            timings['analysis'].append(time.perf_counter() - start)
+
+            industry = analyzer._determine_industry(job_title, job_description)
+            start = time.perf_counter()
+            analyzer._analyze_keywords(source, job_description, job_title, industry)
+            timings['keywords'].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            analyzer._analyze_readability(source)
+            timings['readability'].append(time.perf_counter() - start)
+
+
+def report(label: str, stats: dict):
+    print(f"  {label:<9} {1000 / stats['analysis']:8.1f} analyses/s   analysis {stats['analysis']:.3f} ms   "
+          f"keywords {stats['keywords']:.3f} ms   readability {stats['readability']:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--corpus', type=Path, default=Path(__file__).resolve().parent.parent / 'job_applications',
+                        help='directory searched recursively for .tex files')
+    parser.add_argument('--repeats', type=int, default=5, help='passes over the corpus')
+    parser.add_argument('--baseline', metavar='REF', help='git revision to compare against')
+    args = parser.parse_args()
+
+    documents = load_corpus(args.corpus)
+    if not documents:
+        raise SystemExit(f'No .tex files under {args.corpus}')
+    print(f"{len(documents)} documents x {len(JOB_POSTINGS)} postings, {args.repeats} passes")
+
+    analyzers = {'current': ats_analyzer.ATSAnalyzer()}
+    if args.baseline:
+        analyzers[args.baseline] = load_baseline(args.baseline).ATSAnalyzer()
+
+    # Alternate passes so both analyzers see the same machine load
+    timings = {label: {'analysis': [], 'keywords': [], 'readability': []} for label in analyzers}
+    for _ in range(args.repeats):
+        for label, analyzer in analyzers.items():
+            time_pass(analyzer, documents, timings[label])
+
+    medians = {
+        label: {stage: statistics.median(values) * 1000 for stage, values in stages.items()}
+        for label, stages in timings.items()
+    }
+    for label, stats in medians.items():
+        report(label, stats)
+
+    if args.baseline:
+        current, baseline = medians['current'], medians[args.baseline]
+        print('  speedup   ' + '   '.join(
+            f"{stage} {baseline[stage] / current[stage]:.1f}x" for stage in ('analysis', 'keywords', 'readability')
+        ))
+
+if __name__ == '__main__':
+    main()
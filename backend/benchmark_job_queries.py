@@ -0,0 +1,139 @@
+"""
+Benchmark for the job_postings / processed_jobs query patterns
+
+Fills a database with synthetic rows, runs migrate_schema and then times
+the upsert lookup, the saved-jobs dashboard, the best-matches listing and
+the processed-jobs queries. On SQLite it also prints each query plan and
+fails if a query falls back to a full table scan or a temporary sort.
+
+Run from backend/: python benchmark_job_queries.py [--rows 50000] [--url sqlite:///bench.db]
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.sql_database import (
+    Base, JobPosting, ProcessedJob, job_dedup_hash, migrate_schema
+)
+
+USERS = [f'user-{i}' for i in range(20)]
+
+QUERIES = {
+    'upsert lookup': (
+        "SELECT id FROM job_postings WHERE dedup_hash = :dedup_hash"
+    ),
+    'saved jobs': (
+        "SELECT * FROM job_postings WHERE user_id = :user_id AND is_saved = 1 "
+        "ORDER BY updated_at DESC LIMIT 50"
+    ),
+    'best matches': (
+        "SELECT * FROM job_postings WHERE user_id = :user_id "
+        "ORDER BY match_score DESC, posting_date DESC LIMIT 50"
+    ),
+    'recent processed': (
+        "SELECT * FROM processed_jobs WHERE user_id = :user_id AND processed_at >= :since"
+    ),
+    'processed urls': (
+        "SELECT url FROM processed_jobs WHERE user_id = :user_id AND url IN (:url_a, :url_b)"
+    ),
+}
+
+
+def populate(session, rows: int, seed: int = 11):
+    """Synthetic job postings (a tenth saved) and as many processed jobs"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    jobs, processed = [], []
+    for i in range(rows):
+        user_id = USERS[i % len(USERS)]
+        title, company, url = f'Engineer {i}', f'Company {i % 500}', f'https://example.com/jobs/{i}'
+        updated_at = now - timedelta(minutes=rng.randrange(60 * 24 * 90))
+        jobs.append({
+            'user_id': user_id, 'title': title, 'company': company, 'url': url, 'source': 'linkedin',
+            'dedup_hash': job_dedup_hash(title, company, url), 'is_saved': i % 10 == 0,
+            'match_score': rng.random(), 'posting_date': updated_at, 'created_at': updated_at,
+            'updated_at': updated_at,
+        })
+        processed.append({
+            'user_id': user_id, 'job_title': title, 'company': company, 'url': url,
+            'processed_at': updated_at,
+        })
+    session.bulk_insert_mappings(JobPosting, jobs)
+    session.bulk_insert_mappings(ProcessedJob, processed)
+    session.commit()
+
+
+def query_params(rows: int, rng: random.Random) -> dict:
+    i = rng.randrange(rows)
+    return {
+        'dedup_hash': job_dedup_hash(f'Engineer {i}', f'Company {i % 500}', f'https://example.com/jobs/{i}'),
+        'user_id': USERS[i % len(USERS)],
+        'since': datetime.utcnow() - timedelta(days=1),
+        'url_a': f'https://example.com/jobs/{i}',
+        'url_b': f'https://example.com/jobs/{(i + 1) % rows}',
+    }
+
+
+def check_plan(connection, name: str, sql: str, params: dict) -> bool:
+    """Print the SQLite plan; False on a table scan or temp B-tree sort"""
+    plan = [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"), params)]
+    indexed = not any(step.startswith('SCAN') or 'TEMP B-TREE' in step for step in plan)
+    print(f"  {name:<17} {'ok ' if indexed else 'BAD'} {' | '.join(plan)}")
+    return indexed
+
+
+def benchmark(connection, sql: str, rows: int, repeats: int) -> float:
+    """Median milliseconds per query"""
+    rng = random.Random(3)
+    timings = []
+    for _ in range(repeats):
+        params = query_params(rows, rng)
+        start = time.perf_counter()
+        connection.execute(text(sql), params).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000, help='job postings (and processed jobs) to insert')
+    parser.add_argument('--repeats', type=int, default=200, help='runs per query')
+    parser.add_argument('--url', default='sqlite://', help='database URL (default: in-memory SQLite)')
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    if session.query(JobPosting).count() == 0:
+        print(f"Inserting {args.rows} job postings and processed jobs ...")
+        populate(session, args.rows)
+    session.close()
+
+    print(f"Schema upgrade: {migrate_schema(engine) or 'up to date'}")
+
+    all_indexed = True
+    with engine.connect() as connection:
+        if engine.dialect.name == 'sqlite':
+            connection.exec_driver_sql('ANALYZE')
+            print('Query plans:')
+            params = query_params(args.rows, random.Random(1))
+            for name, sql in QUERIES.items():
+                all_indexed &= check_plan(connection, name, sql, params)
+
+        print('Median latency:')
+        for name, sql in QUERIES.items():
+            print(f"  {name:<17} {benchmark(connection, sql, args.rows, args.repeats):.3f} ms")
+
+    engine.dispose()
+    if not all_indexed:
+        raise SystemExit('Some queries are not served by an index')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,17 +3,47 @@
 Manages role-specific CV templates for intelligent matching
 """
 
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+import hashlib
 import re
 import logging
+import threading
 
 from job_analyzer import JobAnalyzer
 from template_matcher import TemplateMatcher
+from template_store import TemplateStore
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class RoleAnalysis:
+    """Keyword-based role analysis of one job description, computed once and reused"""
+    
+    keyword_counts: Dict[str, Dict[str, int]]
+    scores: Dict[str, float]
+    percentages: Dict[str, float]
+    breakdown: List[Tuple[str, float]]
+    selected_role: str
+    is_aligned: bool
+    breakdown_threshold: float = 5.0
+    content_hash: str = ''
+    
+    @property
+    def primary_percentage(self) -> float:
+        """Percentage of the strongest role in the breakdown (0.0 if none)"""
+        return self.breakdown[0][1] if self.breakdown else 0.0
+    
+    @property
+    def is_mixed_role(self) -> bool:
+        """True when no single role accounts for at least half of the description"""
+        return bool(self.breakdown) and self.primary_percentage < 50
+
+
 class CVTemplateManager:
     """Manages CV templates for different roles"""
     
@@ -256,6 +286,9 @@ class CVTemplateManager:
         }
     }
     
+    # Maximum number of job descriptions kept in the role analysis cache
+    ANALYSIS_CACHE_SIZE = 256
+    
     def __init__(self, templates_dir: str = 'templates/cv_templates'):
         # Get absolute path relative to project root
         base_dir = Path(__file__).parent.parent  # Go up to project root
@@ -264,6 +297,52 @@ class CVTemplateManager:
         # Initialize components
         self.job_analyzer = JobAnalyzer()
         self.template_matcher = TemplateMatcher(self.ROLE_CATEGORIES)
+        
+        # LRU cache of RoleAnalysis results keyed by job description content hash
+        self._analysis_cache: "OrderedDict[str, RoleAnalysis]" = OrderedDict()
+        self._analysis_lock = threading.Lock()
+        
+        # Every CV/CL template resolved, read and validated once up front
+        self.template_store = TemplateStore(self.ROLE_CATEGORIES, base_dir, self._validate_latex_structure)
+        self.template_store.preload()
+    
+    def analyze(self, job_description: str) -> RoleAnalysis:
+        """
+        Analyze a job description once and cache the result
+        
+        Scores, percentages, breakdown and the selected role are computed in a
+        single pass and memoized by a content hash of the description, so
+        repeated lookups for the same posting are dictionary hits.
+        
+        Args:
+            job_description: The job description text to analyze
+            
+        Returns:
+            RoleAnalysis for the job description
+        """
+        content_hash = hashlib.sha256((job_description or '').encode('utf-8')).hexdigest()
+        
+        with self._analysis_lock:
+            cached = self._analysis_cache.get(content_hash)
+            if cached is not None:
+                self._analysis_cache.move_to_end(content_hash)
+                logger.debug(f"Role analysis cache hit: {content_hash[:12]}")
+                return cached
+        
+        analysis = self._compute_role_analysis(job_description, content_hash)
+        
+        with self._analysis_lock:
+            self._analysis_cache[content_hash] = analysis
+            self._analysis_cache.move_to_end(content_hash)
+            while len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                self._analysis_cache.popitem(last=False)
+        
+        return analysis
+    
+    def clear_analysis_cache(self) -> None:
+        """Drop all cached role analyses (e.g. after ROLE_CATEGORIES or templates change)"""
+        with self._analysis_lock:
+            self._analysis_cache.clear()
     
     def analyze_job_role(self, job_description: str) -> str:
         """
@@ -272,6 +351,19 @@ class CVTemplateManager:
         Returns:
             Role category key (e.g., 'android_developer', 'devops_cloud')
         """
+        return self.analyze(job_description).selected_role
+    
+    def _compute_role_analysis(self, job_description: str, content_hash: str = '') -> RoleAnalysis:
+        """
+        Run keyword extraction, scoring and role selection for a job description
+        
+        Args:
+            job_description: The job description text to analyze
+            content_hash: Content hash used as the cache key
+            
+        Returns:
+            Freshly computed RoleAnalysis
+        """
         logger.info("Starting job role analysis")
         logger.debug(f"Job description length: {len(job_description)} characters")
         
@@ -309,7 +401,19 @@ class CVTemplateManager:
                 logger.debug(f"  {role_key}: {percentage:.2f}%")
         
         # Select best match with template verification and content alignment
-        return self._select_role_with_content_alignment_check(role_scores, role_percentages, job_description)
+        selected_role = self._select_role_with_content_alignment_check(role_scores, role_percentages, job_description)
+        
+        breakdown = self.template_matcher.get_role_breakdown(role_percentages, 5.0)
+        
+        return RoleAnalysis(
+            keyword_counts=keyword_counts,
+            scores=role_scores,
+            percentages=role_percentages,
+            breakdown=breakdown,
+            selected_role=selected_role,
+            is_aligned=self._validate_template_content_alignment(selected_role, job_description),
+            content_hash=content_hash
+        )
     
     def _select_role_with_template_verification(self, role_scores: Dict[str, float], role_percentages: Dict[str, float]) -> str:
         """
@@ -342,7 +446,7 @@ class CVTemplateManager:
             
             # Verify template file exists
             template_path = self.get_template_path(role_key, 'cv')
-            if template_path and template_path.exists():
+            if template_path:
                 logger.info(f"Selected role category: {role_key}")
                 logger.info(f"Final score: {score:.2f} ({role_percentages.get(role_key, 0):.1f}%)")
                 logger.info(f"Template path used: {template_path}")
@@ -390,11 +494,11 @@ class CVTemplateManager:
             # Verify template content aligns with role category
             if not self._validate_template_content_alignment(role_key, job_description):
                 logger.warning(f"Template content misalignment for role {role_key}, trying alternative")
-                alternative_role = self._select_alternative_template_for_misalignment(role_key, job_description)
+                alternative_role = self._select_alternative_template_for_misalignment(role_key, job_description, role_scores)
                 if alternative_role != role_key:
                     # Use the alternative role
                     template_path = self.get_template_path(alternative_role, 'cv')
-                    if template_path and template_path.exists():
+                    if template_path:
                         logger.info(f"Using alternative role due to content misalignment: {alternative_role}")
                         logger.info(f"Alternative template path: {template_path}")
                         return alternative_role
@@ -403,7 +507,7 @@ class CVTemplateManager:
             
             # Verify template file exists
             template_path = self.get_template_path(role_key, 'cv')
-            if template_path and template_path.exists():
+            if template_path:
                 logger.info(f"Selected role category: {role_key}")
                 logger.info(f"Final score: {score:.2f} ({role_percentages.get(role_key, 0):.1f}%)")
                 logger.info(f"Template path used: {template_path}")
@@ -430,68 +534,13 @@ class CVTemplateManager:
         Returns:
             Path to the template file, or None if not found
         """
-        logger.debug(f"Resolving template path for role: {role_category}, type: {template_type}")
+        entry = self.template_store.get(role_category, template_type)
         
-        if role_category not in self.ROLE_CATEGORIES:
+        if entry is None:
             logger.warning(f"Unknown role category: {role_category}")
             return None
-            
-        # Support both old 'template_path' key and new 'cv_template'/'cl_template' keys
-        role_data = self.ROLE_CATEGORIES[role_category]
-
-        if template_type == 'cl':
-            template_path_str = role_data.get('cl_template', role_data.get('template_path'))
-        else:
-            template_path_str = role_data.get('cv_template', role_data.get('template_path'))
-
-        if not template_path_str:
-            logger.warning(f"No template path configured for role: {role_category}, type: {template_type}")
-            return None
-
-        # Validate path format consistency
-        if not isinstance(template_path_str, str):
-            logger.error(f"Invalid template path format for role {role_category}: {type(template_path_str)}")
-            return None
-
-        # Get absolute path from project root
-        base_dir = Path(__file__).parent.parent  # Go up to project root
         
-        # Handle both absolute and relative paths correctly
-        if Path(template_path_str).is_absolute():
-            full_path = Path(template_path_str)
-            logger.debug(f"Using absolute path: {full_path}")
-        else:
-            full_path = base_dir / template_path_str
-            logger.debug(f"Resolved relative path: {template_path_str} -> {full_path}")
-        
-        # Normalize path to handle any inconsistencies
-        try:
-            full_path = full_path.resolve()
-            logger.debug(f"Normalized template path: {full_path}")
-        except Exception as e:
-            logger.error(f"Error normalizing path {full_path}: {e}")
-            return None
-
-        # Check if file exists
-        if full_path.exists() and full_path.is_file():
-            logger.debug(f"Template file exists: {full_path}")
-            return full_path
-        else:
-            # Try alternative path formats for backward compatibility
-            if template_type == 'cv' and not template_path_str.endswith('.tex'):
-                # Try looking for *_CV.tex pattern in directory
-                if full_path.is_dir():
-                    cv_files = list(full_path.glob('*_CV.tex'))
-                    if cv_files:
-                        cv_file = cv_files[0]  # Take first match
-                        logger.debug(f"Found CV file in directory: {cv_file}")
-                        return cv_file
-                    else:
-                        logger.warning(f"No *_CV.tex files found in directory: {full_path}")
-                        
-            logger.warning(f"Template file does not exist: {full_path}")
-
-        return None
+        return entry.path
     
     def load_template(self, role_category: str, template_type: str = 'cv') -> Optional[str]:
         """
@@ -506,45 +555,21 @@ class CVTemplateManager:
         """
         logger.info(f"Loading template for role: {role_category}, type: {template_type}")
         
-        template_path = self.get_template_path(role_category, template_type)
-
-        if template_path and template_path.exists():
-            try:
-                logger.debug(f"Reading template file: {template_path}")
-                with open(template_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                logger.info(f"Successfully loaded template: {template_path}")
-                logger.debug(f"Template content length: {len(content)} characters")
-                
-                # Validate LaTeX structure after loading
-                if self._validate_latex_structure(content):
-                    logger.debug("Template LaTeX structure validation passed")
-                    return content
-                else:
-                    logger.error(f"Template LaTeX structure validation failed for: {template_path}")
-                    # Try fallback template loading
-                    return self._load_fallback_template(role_category, template_type)
-                
-            except UnicodeDecodeError as e:
-                logger.error(f"UTF-8 encoding error loading template from {template_path}: {e}")
-                logger.error(f"Template encoding failure - Role: {role_category}, Path: {template_path}")
-                return self._load_fallback_template(role_category, template_type)
-                
-            except Exception as e:
-                # Log detailed errors for template load failures with file paths
-                logger.error(f"Error loading {template_type.upper()} template from {template_path}: {e}")
-                logger.error(f"Template load failure details - Role: {role_category}, Path: {template_path}, Error: {type(e).__name__}")
-                return self._load_fallback_template(role_category, template_type)
+        entry = self.template_store.get(role_category, template_type)
+        
+        if entry is not None and entry.is_usable:
+            logger.debug(f"Template served from store: {entry.path} ({len(entry.content)} characters)")
+            return entry.content
+        
+        # Log template load failures with file paths
+        template_path = entry.path if entry else None
+        if entry is None:
+            logger.error(f"No template path found for role: {role_category}, type: {template_type}")
         else:
-            # Log template load failures with file paths
-            if template_path:
-                logger.error(f"Template file does not exist: {template_path}")
-            else:
-                logger.error(f"No template path found for role: {role_category}, type: {template_type}")
-            
-            logger.error(f"Template load failure - Role: {role_category}, Type: {template_type}, Path: {template_path}")
-            return self._load_fallback_template(role_category, template_type)
+            logger.error(f"Template unusable for role {role_category}: {entry.error}")
+        
+        logger.error(f"Template load failure - Role: {role_category}, Type: {template_type}, Path: {template_path}")
+        return self._load_fallback_template(role_category, template_type)
     
     def _validate_latex_structure(self, content: str) -> bool:
         """
@@ -609,23 +634,13 @@ class CVTemplateManager:
             logger.warning(f"Fallback role same as failed role, using default: {fallback_role}")
         
         # Try to load fallback template
-        fallback_path = self.get_template_path(fallback_role, template_type)
+        entry = self.template_store.get(fallback_role, template_type)
         
-        if fallback_path and fallback_path.exists():
-            try:
-                logger.info(f"Loading fallback template: {fallback_path}")
-                with open(fallback_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Validate fallback template structure
-                if self._validate_latex_structure(content):
-                    logger.info(f"Successfully loaded fallback template: {fallback_role}")
-                    return content
-                else:
-                    logger.error(f"Fallback template also has invalid LaTeX structure: {fallback_path}")
-                    
-            except Exception as e:
-                logger.error(f"Error loading fallback template {fallback_path}: {e}")
+        if entry is not None and entry.is_usable:
+            logger.info(f"Successfully loaded fallback template: {fallback_role}")
+            return entry.content
+        elif entry is not None and entry.path:
+            logger.error(f"Fallback template also unusable ({entry.error}): {entry.path}")
         
         # Return detailed error information
         logger.critical(f"Critical error: Unable to load any template for role {failed_role} or fallback {fallback_role}")
@@ -652,16 +667,8 @@ class CVTemplateManager:
             Dictionary mapping role keys to their weighted scores
         """
         try:
-            # Use JobAnalyzer to extract keywords for each role
-            keyword_counts = self.job_analyzer.identify_role_indicators(
-                job_description, 
-                self.ROLE_CATEGORIES
-            )
-            
-            # Use TemplateMatcher to calculate scores
-            role_scores = self.template_matcher.calculate_scores(keyword_counts)
-            
-            return role_scores
+            # Copy so callers can adjust scores without touching the cached analysis
+            return dict(self.analyze(job_description).scores)
             
         except Exception as e:
             logger.error(f"Error calculating role scores: {e}")
@@ -680,13 +687,7 @@ class CVTemplateManager:
             Dictionary mapping role keys to their percentage scores (0-100%)
         """
         try:
-            # Get weighted scores
-            role_scores = self.get_role_scores(job_description)
-            
-            # Calculate percentages
-            role_percentages = self.template_matcher.calculate_percentages(role_scores)
-            
-            return role_percentages
+            return dict(self.analyze(job_description).percentages)
             
         except Exception as e:
             logger.error(f"Error calculating role percentages: {e}")
@@ -713,11 +714,13 @@ class CVTemplateManager:
             Only includes roles with percentage >= threshold
         """
         try:
-            # Get percentages
-            role_percentages = self.get_role_percentages(job_description)
+            analysis = self.analyze(job_description)
             
-            # Get breakdown with threshold filtering
-            breakdown = self.template_matcher.get_role_breakdown(role_percentages, threshold)
+            # Reuse the cached breakdown when the default threshold is requested
+            if threshold == analysis.breakdown_threshold:
+                breakdown = list(analysis.breakdown)
+            else:
+                breakdown = self.template_matcher.get_role_breakdown(analysis.percentages, threshold)
             
             # Check if primary role is below 50% and log warning
             if breakdown and breakdown[0][1] < 50:
@@ -746,8 +749,8 @@ class CVTemplateManager:
                 'display_name': role_key.replace('_', ' ').title(),
                 'keywords': role_data['keywords'],
                 'priority': role_data['priority'],
-                'cv_exists': cv_path is not None and cv_path.exists(),
-                'cl_exists': cl_path is not None and cl_path.exists(),
+                'cv_exists': cv_path is not None,
+                'cl_exists': cl_path is not None,
                 'cv_path': str(cv_path) if cv_path else None,
                 'cl_path': str(cl_path) if cl_path else None
             })
@@ -777,7 +780,7 @@ class CVTemplateManager:
         
         # Verify fallback template exists
         fallback_template_path = self.get_template_path(fallback_role, 'cv')
-        if fallback_template_path and fallback_template_path.exists():
+        if fallback_template_path:
             logger.info(f"Using fallback role: {fallback_role}")
             logger.info(f"Fallback template path: {fallback_template_path}")
             return fallback_role
@@ -792,7 +795,7 @@ class CVTemplateManager:
                     continue
                     
                 test_path = self.get_template_path(role_key, 'cv')
-                if test_path and test_path.exists():
+                if test_path:
                     logger.warning(f"Emergency fallback: Using first available template: {role_key}")
                     logger.warning(f"Emergency template path: {test_path}")
                     return role_key
@@ -851,13 +854,19 @@ class CVTemplateManager:
         
         return is_aligned
     
-    def _select_alternative_template_for_misalignment(self, misaligned_role: str, job_description: str) -> str:
+    def _select_alternative_template_for_misalignment(
+        self, 
+        misaligned_role: str, 
+        job_description: str,
+        role_scores: Optional[Dict[str, float]] = None
+    ) -> str:
         """
         Select an alternative template when content misalignment is detected
         
         Args:
             misaligned_role: The role that was misaligned
             job_description: The job description to analyze
+            role_scores: Already computed role scores (avoids re-scanning the description)
             
         Returns:
             Alternative role category with better alignment
@@ -871,8 +880,11 @@ class CVTemplateManager:
         
         # General case: re-analyze without the misaligned role
         try:
-            # Get all role scores
-            role_scores = self.get_role_scores(job_description)
+            # Get all role scores (copied, the misaligned role is zeroed below)
+            if role_scores is None:
+                role_scores = self.get_role_scores(job_description)
+            else:
+                role_scores = dict(role_scores)
             
             # Remove the misaligned role
             if misaligned_role in role_scores:
@@ -0,0 +1,358 @@
+"""
+Generation Job Queue
+Runs LEGO application generation in background workers with SQLite-persisted job state
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).parent / '.cache' / 'generation_jobs.sqlite3'
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_RETENTION_SECONDS = 7 * 24 * 3600
+
+TERMINAL_STATUSES = ('succeeded', 'failed')
+
+# One SSE connection stays open at most this long (below gunicorn's 30s sync-worker timeout);
+# the browser then reconnects with Last-Event-ID
+DEFAULT_STREAM_SECONDS = 20
+DEFAULT_HEARTBEAT_SECONDS = 5
+STREAM_RETRY_MS = 1000
+
+# Runner signature: runner(payload, report_stage) -> (result dict, HTTP status code)
+JobRunner = Callable[[Dict, Callable[[str], None]], Tuple[Dict, int]]
+
+
+class GenerationJobQueue:
+    """
+    Background executor for long-running generation requests
+
+    Submitting a job stores it in SQLite and returns its id immediately;
+    a small worker pool runs the pipeline and records each stage, so any
+    web worker can report progress. Jobs left queued or interrupted by a
+    restart are picked up again when the queue starts.
+    """
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        db_path: Optional[Path] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        retention_seconds: int = DEFAULT_RETENTION_SECONDS
+    ):
+        """
+        Initialize the queue and resume unfinished jobs
+
+        Args:
+            runner: Function executing one job's pipeline
+            db_path: SQLite file holding job state
+            max_workers: Number of jobs executed concurrently in this process
+            retention_seconds: Finished jobs older than this are purged on startup
+        """
+        self.runner = runner
+        self.db_path = Path(db_path) if db_path else DEFAULT_DB_PATH
+        self.max_workers = max_workers
+        self.retention_seconds = retention_seconds
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS generation_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    stages TEXT NOT NULL DEFAULT '[]',
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    worker_pid INTEGER,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_generation_jobs_status ON generation_jobs (status)"
+            )
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='generation')
+        self._resume_unfinished()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection (safe to use from any thread)"""
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def submit(self, payload: Dict) -> str:
+        """
+        Persist a new job and schedule it on the worker pool
+
+        Args:
+            payload: JSON-serializable request data for the runner
+
+        Returns:
+            Job id
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO generation_jobs (job_id, status, stage, payload, created_at, updated_at) "
+                "VALUES (?, 'queued', 'queued', ?, ?, ?)",
+                (job_id, json.dumps(payload), now, now)
+            )
+
+        self._executor.submit(self._execute, job_id)
+        logger.info(f"📥 Queued generation job {job_id}")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Get the current state of a job
+
+        Args:
+            job_id: Id returned by submit
+
+        Returns:
+            Job state dictionary, or None if unknown
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, status, stage, stages, result, error, created_at, updated_at "
+                "FROM generation_jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {
+            'jobId': row['job_id'],
+            'status': row['status'],
+            'stage': row['stage'],
+            'stages': json.loads(row['stages']),
+            'result': json.loads(row['result']) if row['result'] else None,
+            'error': row['error'],
+            'createdAt': row['created_at'],
+            'updatedAt': row['updated_at']
+        }
+
+    def iter_events(
+        self,
+        job_id: str,
+        last_event_id: Optional[str] = None,
+        max_seconds: float = DEFAULT_STREAM_SECONDS,
+        heartbeat_seconds: float = DEFAULT_HEARTBEAT_SECONDS,
+        poll_interval: float = 0.5
+    ) -> Iterator[str]:
+        """
+        Server-Sent Events for a job's progress, bounded in time
+
+        Each state change is sent once with its ``updatedAt`` as the event
+        id, and comment heartbeats keep proxies from closing an idle stream.
+        The stream ends on a terminal status or after ``max_seconds``, so a
+        sync web worker is only held briefly; EventSource reconnects with
+        Last-Event-ID and continues from the state it already has.
+
+        Args:
+            job_id: Id returned by submit
+            last_event_id: Last-Event-ID header of a reconnecting client
+            max_seconds: Maximum lifetime of this stream
+            heartbeat_seconds: Idle time before a heartbeat comment
+            poll_interval: Seconds between job state reads
+
+        Yields:
+            Encoded SSE messages
+        """
+        deadline = time.monotonic() + max_seconds
+        last_sent = time.monotonic()
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                return
+
+            event_id = str(job['updatedAt'])
+            finished = job['status'] in TERMINAL_STATUSES
+            if finished or event_id != last_event_id:
+                last_event_id = event_id
+                event = 'done' if finished else 'progress'
+                yield f"id: {event_id}\nevent: {event}\ndata: {json.dumps(job)}\n\n"
+                last_sent = time.monotonic()
+            if finished:
+                return
+
+            now = time.monotonic()
+            if now >= deadline:
+                return
+            if now - last_sent >= heartbeat_seconds:
+                yield ": keepalive\n\n"
+                last_sent = now
+            time.sleep(min(poll_interval, deadline - now))
+
+    def get_stats(self) -> Dict:
+        """Job counts by status"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) FROM generation_jobs GROUP BY status"
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and optionally wait for running jobs"""
+        self._executor.shutdown(wait=wait)
+
+    def _claim(self, job_id: str) -> Optional[Dict]:
+        """Atomically move a queued job to running; returns its payload if this worker won"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE generation_jobs SET status = 'running', worker_pid = ?, updated_at = ? "
+                "WHERE job_id = ? AND status = 'queued'",
+                (os.getpid(), time.time(), job_id)
+            )
+            if cursor.rowcount != 1:
+                return None
+            row = conn.execute(
+                "SELECT payload FROM generation_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return json.loads(row['payload'])
+
+    def _report_stage(self, job_id: str, stage: str) -> None:
+        """Record that a job entered a pipeline stage"""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT stages FROM generation_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            stages = json.loads(row['stages']) if row else []
+            stages.append({'stage': stage, 'at': now})
+            conn.execute(
+                "UPDATE generation_jobs SET stage = ?, stages = ?, updated_at = ? WHERE job_id = ?",
+                (stage, json.dumps(stages), now, job_id)
+            )
+
+    def _finish(self, job_id: str, status: str, result: Optional[Dict], error: Optional[str]) -> None:
+        """Store the final outcome of a job"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE generation_jobs SET status = ?, stage = ?, result = ?, error = ?, updated_at = ? "
+                "WHERE job_id = ?",
+                (status, status, json.dumps(result) if result is not None else None, error, time.time(), job_id)
+            )
+
+    def _execute(self, job_id: str) -> None:
+        """Run one job on a pool thread"""
+        payload = self._claim(job_id)
+        if payload is None:
+            return
+
+        logger.info(f"⚙️ Running generation job {job_id}")
+        try:
+            result, status_code = self.runner(payload, lambda stage: self._report_stage(job_id, stage))
+        except Exception as e:
+            logger.error(f"❌ Generation job {job_id} crashed: {e}")
+            self._finish(job_id, 'failed', None, str(e))
+            return
+
+        if status_code >= 400:
+            logger.error(f"❌ Generation job {job_id} failed: {result.get('error')}")
+            self._finish(job_id, 'failed', result, result.get('error', f'HTTP {status_code}'))
+        else:
+            logger.info(f"✅ Generation job {job_id} succeeded")
+            self._finish(job_id, 'succeeded', result, None)
+
+    @staticmethod
+    def _process_alive(pid: Optional[int]) -> bool:
+        """Check whether the process that claimed a job is still running"""
+        if not pid:
+            return False
+        if pid == os.getpid():
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _resume_unfinished(self) -> None:
+        """Purge old finished jobs and reschedule queued or orphaned ones"""
+        now = time.time()
+        with self._connect() as conn:
+            if self.retention_seconds > 0:
+                conn.execute(
+                    "DELETE FROM generation_jobs WHERE status IN ('succeeded', 'failed') AND updated_at < ?",
+                    (now - self.retention_seconds,)
+                )
+
+            running = conn.execute(
+                "SELECT job_id, worker_pid FROM generation_jobs WHERE status = 'running'"
+            ).fetchall()
+            for row in running:
+                if not self._process_alive(row['worker_pid']):
+                    conn.execute(
+                        "UPDATE generation_jobs SET status = 'queued', worker_pid = NULL, updated_at = ? "
+                        "WHERE job_id = ? AND status = 'running'",
+                        (now, row['job_id'])
+                    )
+
+            queued = [row['job_id'] for row in conn.execute(
+                "SELECT job_id FROM generation_jobs WHERE status = 'queued' ORDER BY created_at"
+            ).fetchall()]
+
+        for job_id in queued:
+            self._executor.submit(self._execute, job_id)
+
+        if queued:
+            logger.info(f"🔁 Resumed {len(queued)} unfinished generation job(s)")
+
+
+_shared_queue: Optional[GenerationJobQueue] = None
+_shared_queue_lock = threading.Lock()
+
+
+def get_generation_job_queue(runner: JobRunner) -> GenerationJobQueue:
+    """
+    Get the process-wide generation job queue configured from the environment
+
+    Environment:
+        GENERATION_JOBS_DB: SQLite file location
+        GENERATION_MAX_WORKERS: concurrent jobs per process
+
+    Args:
+        runner: Pipeline function used when the queue is first created
+
+    Returns:
+        Shared GenerationJobQueue
+    """
+    global _shared_queue
+
+    with _shared_queue_lock:
+        if _shared_queue is None:
+            _shared_queue = GenerationJobQueue(
+                runner,
+                db_path=os.environ.get('GENERATION_JOBS_DB') or None,
+                max_workers=int(os.environ.get('GENERATION_MAX_WORKERS', DEFAULT_MAX_WORKERS))
+            )
+        return _shared_queue
@@ -5,12 +5,173 @@ Extracts keywords and analyzes job descriptions for template matching
 
 import re
 import logging
-from typing import Dict, List
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 
+def _is_word_char(char: str) -> bool:
+    """Mirror the regex word character class used by the old word-boundary patterns"""
+    return char.isalnum() or char == '_'
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over every keyword of every role category
+
+    Built once from a role category mapping and reused for every job
+    description, so classification scans the normalized text a single time
+    instead of compiling and running one regex per keyword per role.
+    Counting semantics are identical to ``count_keyword_occurrences``:
+    whole-word (word boundary) matches, non-overlapping per keyword.
+    """
+
+    def __init__(self, role_keywords: Tuple[Tuple[str, Tuple[str, ...]], ...]):
+        """
+        Build the automaton
+
+        Args:
+            role_keywords: Tuple of (role_key, keywords) pairs, in role order
+        """
+        self.role_keys = [role_key for role_key, _ in role_keywords]
+
+        # Normalized pattern -> [(role_key, original keyword), ...]
+        self._pattern_owners: Dict[str, List[Tuple[str, str]]] = {}
+        for role_key, keywords in role_keywords:
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                pattern = re.sub(r'\s+', ' ', keyword.lower()).strip()
+                if not pattern:
+                    continue
+                owners = self._pattern_owners.setdefault(pattern, [])
+                if (role_key, keyword) not in owners:
+                    owners.append((role_key, keyword))
+
+        self.patterns = list(self._pattern_owners)
+        self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        """Build goto, failure and output tables for all patterns"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        for pattern_index, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                next_node = goto[node].get(char)
+                if next_node is None:
+                    next_node = len(goto)
+                    goto[node][char] = next_node
+                    goto.append({})
+                    outputs.append([])
+                node = next_node
+            outputs[node].append(pattern_index)
+
+        # Breadth-first so every failure target is resolved before its children
+        failure = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in goto[node].items():
+                queue.append(child)
+                fallback = failure[node]
+                while fallback and char not in goto[fallback]:
+                    fallback = failure[fallback]
+                failure[child] = goto[fallback].get(char, 0)
+                outputs[child].extend(outputs[failure[child]])
+
+        self._goto = goto
+        self._failure = failure
+        self._outputs = outputs
+
+    def count_patterns(self, normalized_text: str) -> Dict[str, int]:
+        """
+        Count whole-word, non-overlapping occurrences of every pattern
+
+        Args:
+            normalized_text: Text already passed through ``normalize_text``
+
+        Returns:
+            Dictionary mapping normalized patterns to counts (found patterns only)
+        """
+        goto = self._goto
+        failure = self._failure
+        outputs = self._outputs
+        patterns = self.patterns
+        text_length = len(normalized_text)
+
+        counts: Dict[str, int] = {}
+        # Per-pattern end of the last accepted match, to keep matches non-overlapping
+        last_end: Dict[int, int] = {}
+
+        node = 0
+        for position, char in enumerate(normalized_text):
+            while node and char not in goto[node]:
+                node = failure[node]
+            node = goto[node].get(char, 0)
+
+            if not outputs[node]:
+                continue
+
+            end = position + 1
+            after_is_word = end < text_length and _is_word_char(normalized_text[end])
+            for pattern_index in outputs[node]:
+                pattern = patterns[pattern_index]
+                start = end - len(pattern)
+
+                if start < last_end.get(pattern_index, 0):
+                    continue
+
+                before_is_word = start > 0 and _is_word_char(normalized_text[start - 1])
+                if before_is_word == _is_word_char(pattern[0]):
+                    continue
+                if after_is_word == _is_word_char(pattern[-1]):
+                    continue
+
+                last_end[pattern_index] = end
+                counts[pattern] = counts.get(pattern, 0) + 1
+
+        return counts
+
+    def match(self, normalized_text: str) -> Dict[str, Dict[str, int]]:
+        """
+        Scan text once and group keyword counts by role
+
+        Args:
+            normalized_text: Text already passed through ``normalize_text``
+
+        Returns:
+            Dictionary mapping role keys to their keyword match counts
+            Format: {role_key: {keyword: count, ...}}
+        """
+        role_indicators: Dict[str, Dict[str, int]] = {role_key: {} for role_key in self.role_keys}
+
+        for pattern, count in self.count_patterns(normalized_text).items():
+            for role_key, keyword in self._pattern_owners[pattern]:
+                role_indicators[role_key][keyword] = count
+
+        return role_indicators
+
+
+@lru_cache(maxsize=16)
+def get_keyword_matcher(role_keywords: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> KeywordMatcher:
+    """
+    Get a shared KeywordMatcher for a role keyword signature
+
+    Args:
+        role_keywords: Tuple of (role_key, keywords) pairs
+
+    Returns:
+        Cached KeywordMatcher instance
+    """
+    logger.debug(f"Building keyword matcher for {len(role_keywords)} role categories")
+    return KeywordMatcher(role_keywords)
+
+
 class JobAnalyzer:
     """Analyzes job descriptions to extract keywords and role indicators"""
     
@@ -148,6 +309,42 @@ class JobAnalyzer:
         
         logger.debug(f"Analyzing job description for {len(role_categories)} role categories")
         
+        # Roles without keywords are skipped, as with per-role extraction
+        role_keywords = tuple(
+            (role_key, tuple(role_data.get('keywords', [])))
+            for role_key, role_data in role_categories.items()
+            if role_data.get('keywords')
+        )
+        
+        try:
+            matcher = get_keyword_matcher(role_keywords)
+        except TypeError:
+            # Unhashable keyword entries - fall back to per-role extraction
+            return self._identify_role_indicators_per_role(job_description, role_categories)
+        
+        # Normalize once and scan once for every role
+        role_indicators = matcher.match(self.normalize_text(job_description))
+        
+        # Log keyword matches when debugging enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            for role_key, keyword_counts in role_indicators.items():
+                if keyword_counts:
+                    total_matches = sum(keyword_counts.values())
+                    logger.debug(f"Role {role_key}: {total_matches} keyword matches - {keyword_counts}")
+        
+        return role_indicators
+    
+    def _identify_role_indicators_per_role(self, job_description: str, role_categories: Dict) -> Dict[str, Dict[str, int]]:
+        """
+        Identify role indicators by running keyword extraction once per role
+        
+        Args:
+            job_description: The job description text to analyze
+            role_categories: Dictionary of role categories with their keywords
+            
+        Returns:
+            Dictionary mapping role keys to their keyword match counts
+        """
         role_indicators = {}
         
         for role_key, role_data in role_categories.items():
@@ -162,11 +359,6 @@ class JobAnalyzer:
             
             # Store the results
             role_indicators[role_key] = keyword_counts
-            
-            # Log keyword matches when debugging enabled
-            if logger.isEnabledFor(logging.DEBUG) and keyword_counts:
-                total_matches = sum(keyword_counts.values())
-                logger.debug(f"Role {role_key}: {total_matches} keyword matches - {keyword_counts}")
         
         return role_indicators
 
@@ -0,0 +1,263 @@
+"""
+LLM Response Cache
+Persistent, content-addressed cache for GLM/MiniMax completions
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).parent / '.cache' / 'llm_responses.sqlite3'
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 2000
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed cache of LLM response text keyed by (model, prompt hash, max_tokens)
+
+    Entries expire after ``ttl_seconds`` and the table is trimmed to
+    ``max_entries`` by evicting the least recently used rows. Only
+    successful responses should be stored.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            db_path: SQLite file to store responses in
+            ttl_seconds: Seconds before an entry expires (0 disables expiry)
+            max_entries: Maximum number of cached responses kept on disk
+        """
+        self.db_path = Path(db_path) if db_path else DEFAULT_CACHE_PATH
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    max_tokens INTEGER NOT NULL,
+                    response_text TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL,
+                    hit_count INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_accessed "
+                "ON llm_responses (last_accessed)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection (safe to use from any Flask worker thread)"""
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, max_tokens: int) -> str:
+        """
+        Build the content-addressed cache key
+
+        Args:
+            model: Model name sent in the request payload
+            prompt: Full prompt text
+            max_tokens: max_tokens sent in the request payload
+
+        Returns:
+            Hex digest identifying the request
+        """
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return hashlib.sha256(f"{model}\n{max_tokens}\n{prompt_hash}".encode('utf-8')).hexdigest()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        """Check whether an entry created at ``created_at`` has outlived the TTL"""
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def get(self, model: str, prompt: str, max_tokens: int) -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            model: Model name sent in the request payload
+            prompt: Full prompt text
+            max_tokens: max_tokens sent in the request payload
+
+        Returns:
+            Cached response text, or None on miss/expiry/error
+        """
+        cache_key = self.make_key(model, prompt, max_tokens)
+        now = time.time()
+
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response_text, created_at FROM llm_responses WHERE cache_key = ?",
+                    (cache_key,)
+                ).fetchone()
+
+                if row is None or self._is_expired(row[1], now):
+                    if row is not None:
+                        conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (cache_key,))
+                        self._evictions += 1
+                    self._misses += 1
+                    return None
+
+                conn.execute(
+                    "UPDATE llm_responses SET last_accessed = ?, hit_count = hit_count + 1 "
+                    "WHERE cache_key = ?",
+                    (now, cache_key)
+                )
+                self._hits += 1
+
+            logger.info(f"LLM cache hit for {model} ({cache_key[:12]})")
+            return row[0]
+
+        except sqlite3.Error as e:
+            logger.error(f"LLM cache read failed: {e}")
+            return None
+
+    def set(self, model: str, prompt: str, max_tokens: int, response_text: str) -> None:
+        """
+        Store a response and evict expired / least recently used entries
+
+        Args:
+            model: Model name sent in the request payload
+            prompt: Full prompt text
+            max_tokens: max_tokens sent in the request payload
+            response_text: Text extracted from the successful response
+        """
+        if not response_text:
+            return
+
+        cache_key = self.make_key(model, prompt, max_tokens)
+        now = time.time()
+
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses "
+                    "(cache_key, model, max_tokens, response_text, created_at, last_accessed, hit_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (cache_key, model, max_tokens, response_text, now, now)
+                )
+                self._stores += 1
+
+                if self.ttl_seconds > 0:
+                    cursor = conn.execute(
+                        "DELETE FROM llm_responses WHERE created_at < ?",
+                        (now - self.ttl_seconds,)
+                    )
+                    self._evictions += cursor.rowcount
+
+                overflow = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    cursor = conn.execute(
+                        "DELETE FROM llm_responses WHERE cache_key IN ("
+                        "SELECT cache_key FROM llm_responses ORDER BY last_accessed ASC LIMIT ?)",
+                        (overflow,)
+                    )
+                    self._evictions += cursor.rowcount
+
+        except sqlite3.Error as e:
+            logger.error(f"LLM cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM llm_responses")
+        except sqlite3.Error as e:
+            logger.error(f"LLM cache clear failed: {e}")
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics for monitoring
+
+        Returns:
+            Dictionary with hit/miss counters, hit ratio and entry count
+        """
+        try:
+            with self._connect() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        except sqlite3.Error:
+            entries = None
+
+        lookups = self._hits + self._misses
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'stores': self._stores,
+            'evictions': self._evictions,
+            'hit_ratio': self._hits / lookups if lookups else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds
+        }
+
+
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache configured from the environment
+
+    Environment:
+        LLM_CACHE_ENABLED: set to 'false' to disable caching
+        LLM_CACHE_PATH: SQLite file location
+        LLM_CACHE_TTL_SECONDS: entry lifetime in seconds
+        LLM_CACHE_MAX_ENTRIES: maximum number of stored responses
+
+    Returns:
+        Shared LLMResponseCache, or None if disabled or unavailable
+    """
+    global _shared_cache
+
+    if os.environ.get('LLM_CACHE_ENABLED', 'true').lower() in ('0', 'false', 'no'):
+        return None
+
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = LLMResponseCache(
+                    db_path=os.environ.get('LLM_CACHE_PATH') or None,
+                    ttl_seconds=int(os.environ.get('LLM_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS)),
+                    max_entries=int(os.environ.get('LLM_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES))
+                )
+            except (sqlite3.Error, OSError, ValueError) as e:
+                logger.error(f"LLM response cache unavailable: {e}")
+                return None
+
+        return _shared_cache
@@ -0,0 +1,43 @@
+"""
+Apply pending job database migrations (app.core.sql_database.MIGRATIONS)
+
+Run once per deploy, before the web workers start (on Heroku, as a
+`release:` process). Workers only check the recorded schema version, so
+they never race each other on ALTER TABLE / CREATE INDEX.
+
+Use --dry-run first on an existing database: it lists the columns and
+indexes that would be added and every group of duplicate job postings
+that would be merged (a saved posting is always the one kept).
+
+Run from backend/: python migrate_schema.py [--dry-run] [--url mysql+pymysql://...]
+"""
+
+import argparse
+import logging
+
+from sqlalchemy import create_engine
+
+from app.core.sql_database import DATABASE_URL, SCHEMA_VERSION, migrate_schema, schema_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dry-run', action='store_true', help='report the changes without applying them')
+    parser.add_argument('--url', default=DATABASE_URL, help='database URL (default: DATABASE_URL)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    engine = create_engine(args.url)
+    try:
+        print(f"Schema version {schema_version(engine)}, code expects {SCHEMA_VERSION}")
+        changes = migrate_schema(engine, dry_run=args.dry_run)
+        if not changes:
+            print('Schema is up to date')
+        elif args.dry_run:
+            print(f"{len(changes)} change(s) would be applied; rerun without --dry-run to apply them")
+    finally:
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark for ResultRanker.rank
+
+Run from backend/: python -m minimax_search.benchmark_ranker
+"""
+
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from .indexer import DocumentIndexer
+from .models import Document, SearchResult
+from .ranker import NUMPY_AVAILABLE, ResultRanker
+
+VOCABULARY = (
+    'java python kubernetes azure aws terraform docker react spring backend frontend platform '
+    'engineer developer cloud devops microservices api sql postgresql kafka ci/cd agile team '
+    'volvo gothenburg experience design build deliver scalable systems monitoring grafana'
+).split()
+
+QUERIES = ['kubernetes platform engineer', 'java spring backend', 'react frontend developer', 'azure devops']
+
+
+def make_results(count: int, words_per_document: int = 400, seed: int = 7):
+    """Synthetic results with CV-sized documents"""
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        content = ' '.join(rng.choice(VOCABULARY) for _ in range(words_per_document))
+        document = Document(file_path=Path(f'archive/{i}/cv.tex'), document_type='cv', content=content)
+        results.append(SearchResult(document=document, relevance_score=rng.random()))
+    return results
+
+
+def index_results(results, root: Path) -> DocumentIndexer:
+    """Write the results' documents under ``root`` and index them, as the archive would be"""
+    for result in results:
+        path = root / result.document.file_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(result.document.content, encoding='utf-8')
+        result.document.file_path = path
+    indexer = DocumentIndexer([root], index_path=None)
+    indexer.build_index()
+    return indexer
+
+
+def benchmark(count: int, repeats: int = 200) -> float:
+    """Median milliseconds to rank ``count`` indexed results"""
+    results = make_results(count)
+    with tempfile.TemporaryDirectory() as root:
+        ranker = ResultRanker(indexer=index_results(results, Path(root)))
+        return _time_rank(ranker, results, repeats)
+
+
+def _time_rank(ranker: ResultRanker, results, repeats: int) -> float:
+    """Median milliseconds per rank call over the benchmark queries"""
+    for query in QUERIES:
+        ranker.rank(results, query)
+
+    timings = []
+    for i in range(repeats):
+        query = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        ranker.rank(results, query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    print(f"NumPy available: {NUMPY_AVAILABLE}")
+    for count in (100, 300, 1000):
+        print(f"rank {count:>5} results: {benchmark(count):.3f} ms (median)")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,30 +3,62 @@ Search result cache with LRU eviction.
 """
 
 from collections import OrderedDict
+from dataclasses import replace
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 import hashlib
+import json
 import logging
+import sqlite3
+import threading
 
-from .models import SearchResponse, CacheEntry
+from .models import CacheEntry, Document, SearchResponse, SearchResult
 
 logger = logging.getLogger(__name__)
 
 
 class SearchCache:
-    """LRU cache for search results"""
+    """
+    LRU cache for search results
     
-    def __init__(self, max_size: int = 100, ttl_seconds: int = 300):
+    With ``persist_path`` every entry is also a row in a SQLite file, so a
+    ``set`` writes one row and evictions/invalidations delete only the
+    affected rows. Disk writes happen after the in-memory update, outside
+    the lock that ``get`` uses.
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 100,
+        ttl_seconds: int = 300,
+        persist_path: Optional[Union[str, Path]] = None
+    ):
         """
         Initialize search cache.
         
         Args:
             max_size: Maximum number of entries to cache
             ttl_seconds: Time-to-live for cache entries in seconds
+            persist_path: Optional SQLite file the cache is saved to and reloaded from
         """
         self.max_size = max_size
         self.ttl = ttl_seconds
         self.cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self.persist_path = Path(persist_path) if persist_path else None
+        
+        self._lock = threading.Lock()
+        # Serializes disk writes in the order the in-memory changes were made
+        self._io_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._seq = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        if self.persist_path:
+            self._load()
         
         logger.info(f"Initialized SearchCache: max_size={max_size}, ttl={ttl_seconds}s")
     
@@ -36,12 +68,26 @@ class SearchCache:
         
         Args:
             query_hash: Hash of the query
-            
+        
         Returns:
             Cached SearchResponse if found and not expired, None otherwise
         """
-        # TODO: Implement cache retrieval
-        raise NotImplementedError("Cache retrieval will be implemented in task 6.2")
+        with self._lock:
+            entry = self.cache.get(query_hash)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            if entry.is_expired(self.ttl):
+                del self.cache[query_hash]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self.cache.move_to_end(query_hash)
+            entry.increment_access()
+            self.hits += 1
+            return replace(entry.result, from_cache=True)
     
     def set(self, query_hash: str, result: SearchResponse) -> None:
         """
@@ -51,8 +97,28 @@ class SearchCache:
             query_hash: Hash of the query
             result: SearchResponse to cache
         """
-        # TODO: Implement cache storage
-        raise NotImplementedError("Cache storage will be implemented in task 6.2")
+        if self.max_size <= 0:
+            return
+        
+        with self._lock:
+            entry = CacheEntry(result=replace(result, from_cache=False), cached_at=datetime.now())
+            self.cache[query_hash] = entry
+            self.cache.move_to_end(query_hash)
+            self._seq += 1
+            seq = self._seq
+            
+            removed = []
+            if len(self.cache) > self.max_size:
+                removed = self._purge_expired()
+            while len(self.cache) > self.max_size:
+                removed.append(self.cache.popitem(last=False)[0])
+                self.evictions += 1
+            
+            self._io_lock.acquire()
+        try:
+            self._write(upsert=(query_hash, seq, entry), deleted=removed)
+        finally:
+            self._io_lock.release()
     
     def invalidate(self, pattern: Optional[str] = None) -> None:
         """
@@ -60,10 +126,147 @@ class SearchCache:
         
         Args:
             pattern: Optional pattern to match for selective invalidation.
-                    If None, clears entire cache.
+                    Entries whose query contains it (case-insensitive) or whose
+                    hash starts with it are removed. If None, clears entire cache.
+        """
+        with self._lock:
+            if pattern is None:
+                stale = list(self.cache)
+                self.cache.clear()
+            else:
+                needle = pattern.lower()
+                stale = [
+                    key for key, entry in self.cache.items()
+                    if key.startswith(pattern) or needle in entry.result.query.lower()
+                ]
+                for key in stale:
+                    del self.cache[key]
+            
+            self._io_lock.acquire()
+        try:
+            self._write(deleted=stale, clear=pattern is None)
+        finally:
+            self._io_lock.release()
+        
+        logger.info(f"Invalidated {len(stale)} cache entries (pattern={pattern!r})")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics for monitoring.
+        
+        Returns:
+            Dictionary with size, hit ratio, eviction and expiry counts
         """
-        # TODO: Implement cache invalidation
-        raise NotImplementedError("Cache invalidation will be implemented in task 6.3")
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.cache),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'persistent': self.persist_path is not None,
+            }
+    
+    def _purge_expired(self) -> List[str]:
+        """Drop expired entries and return their keys (caller holds the lock)"""
+        expired = [key for key, entry in self.cache.items() if entry.is_expired(self.ttl)]
+        for key in expired:
+            del self.cache[key]
+        self.expirations += len(expired)
+        return expired
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open the persistence file, replacing it if it is not a readable cache"""
+        self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+        for attempt in range(2):
+            db = sqlite3.connect(str(self.persist_path), timeout=10, check_same_thread=False)
+            try:
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS search_cache ("
+                    "key TEXT PRIMARY KEY, seq INTEGER NOT NULL, cached_at TEXT NOT NULL, "
+                    "access_count INTEGER NOT NULL DEFAULT 0, payload TEXT NOT NULL)"
+                )
+                db.commit()
+                return db
+            except sqlite3.DatabaseError as e:
+                db.close()
+                if attempt:
+                    raise
+                logger.warning(f"Replacing unreadable search cache {self.persist_path}: {e}")
+                self.persist_path.unlink()
+    
+    def _load(self) -> None:
+        """Restore unexpired entries from the persistence file in LRU order"""
+        try:
+            self._db = self._open()
+            rows = self._db.execute(
+                "SELECT key, seq, cached_at, access_count, payload FROM search_cache ORDER BY seq"
+            ).fetchall()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Search cache persistence disabled ({self.persist_path}): {e}")
+            self._db = None
+            return
+        
+        dropped = []
+        for key, seq, cached_at, access_count, payload in rows:
+            self._seq = max(self._seq, seq)
+            try:
+                entry = CacheEntry(
+                    result=_response_from_dict(json.loads(payload)),
+                    cached_at=datetime.fromisoformat(cached_at),
+                    access_count=access_count,
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Dropping unreadable cached search {key}: {e}")
+                dropped.append(key)
+                continue
+            if entry.is_expired(self.ttl):
+                dropped.append(key)
+            else:
+                self.cache[key] = entry
+        
+        while len(self.cache) > self.max_size:
+            dropped.append(self.cache.popitem(last=False)[0])
+        self._write(deleted=dropped)
+        logger.info(f"Loaded {len(self.cache)} cached searches from {self.persist_path}")
+    
+    def _write(
+        self,
+        upsert: Optional[Tuple[str, int, CacheEntry]] = None,
+        deleted: Iterable[str] = (),
+        clear: bool = False
+    ) -> None:
+        """Apply one change to the persistence file (caller holds the I/O lock, not the cache lock)"""
+        if self._db is None:
+            return
+        
+        try:
+            with self._db:
+                if clear:
+                    self._db.execute("DELETE FROM search_cache")
+                else:
+                    self._db.executemany("DELETE FROM search_cache WHERE key = ?", [(key,) for key in deleted])
+                if upsert:
+                    key, seq, entry = upsert
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO search_cache (key, seq, cached_at, access_count, payload) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (key, seq, entry.cached_at.isoformat(), entry.access_count,
+                         json.dumps(_response_to_dict(entry.result)))
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not save search cache: {e}")
+    
+    def close(self) -> None:
+        """Close the persistence file"""
+        with self._io_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
     
     @staticmethod
     def generate_query_hash(query: str, filters: Optional[dict] = None) -> str:
@@ -73,7 +276,7 @@ class SearchCache:
         Args:
             query: Search query
             filters: Optional search filters
-            
+        
         Returns:
             SHA-256 hash of query and filters
         """
@@ -81,3 +284,70 @@ class SearchCache:
         if filters:
             content += str(sorted(filters.items()))
         return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _datetime_or_none(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _response_to_dict(response: SearchResponse) -> Dict[str, Any]:
+    """Lossless JSON form of a SearchResponse (to_dict() truncates content)"""
+    return {
+        'query': response.query,
+        'total_count': response.total_count,
+        'search_time_ms': response.search_time_ms,
+        'suggested_queries': response.suggested_queries,
+        'results': [
+            {
+                'relevance_score': result.relevance_score,
+                'semantic_score': result.semantic_score,
+                'matched_excerpts': result.matched_excerpts,
+                'highlighted_text': result.highlighted_text,
+                'match_type': result.match_type,
+                'document': {
+                    'file_path': str(result.document.file_path),
+                    'document_type': result.document.document_type,
+                    'content': result.document.content,
+                    'metadata': result.document.metadata,
+                    'company_name': result.document.company_name,
+                    'role_title': result.document.role_title,
+                    'created_at': result.document.created_at.isoformat() if result.document.created_at else None,
+                    'modified_at': result.document.modified_at.isoformat() if result.document.modified_at else None,
+                },
+            }
+            for result in response.results
+        ],
+    }
+
+
+def _response_from_dict(data: Dict[str, Any]) -> SearchResponse:
+    """Inverse of _response_to_dict"""
+    results = []
+    for item in data['results']:
+        doc = item['document']
+        document = Document(
+            file_path=Path(doc['file_path']),
+            document_type=doc['document_type'],
+            content=doc['content'],
+            metadata=doc.get('metadata') or {},
+            company_name=doc.get('company_name'),
+            role_title=doc.get('role_title'),
+            created_at=_datetime_or_none(doc.get('created_at')),
+            modified_at=_datetime_or_none(doc.get('modified_at')),
+        )
+        results.append(SearchResult(
+            document=document,
+            relevance_score=item['relevance_score'],
+            matched_excerpts=item.get('matched_excerpts', []),
+            highlighted_text=item.get('highlighted_text', ''),
+            match_type=item.get('match_type', 'semantic'),
+            semantic_score=item.get('semantic_score'),
+        ))
+    
+    return SearchResponse(
+        query=data['query'],
+        results=results,
+        total_count=data['total_count'],
+        search_time_ms=data['search_time_ms'],
+        suggested_queries=data.get('suggested_queries', []),
+    )
@@ -2,34 +2,323 @@
 Document indexer for searching job applications, CVs, and cover letters.
 """
 
+from collections import Counter
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import json
 import logging
+import math
+import os
+import re
+import sqlite3
+import threading
 
 from .models import Document
 
 logger = logging.getLogger(__name__)
 
+# Optional term matrix for vectorized ranking
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Optional PDF text extraction
+try:
+    from pypdf import PdfReader
+    PDF_AVAILABLE = True
+except ImportError:
+    PdfReader = None
+    PDF_AVAILABLE = False
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_BASE_PATHS = [
+    REPO_ROOT / 'job_applications',
+    Path(os.getenv('ARTIFACTS_DIR', 'generated_applications')),
+]
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent.parent / '.cache' / 'document_index.sqlite3'
+INDEXED_EXTENSIONS = ('.tex', '.pdf')
+
+# Index file layout and extraction version (SQLite user_version); older files are rebuilt
+INDEX_VERSION = 4
+
+# BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+TOKEN_PATTERN = re.compile(r"[a-zåäöéü0-9][a-zåäöéü0-9+#]*")
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'i', 'in', 'is',
+    'it', 'my', 'of', 'on', 'or', 'our', 'that', 'the', 'this', 'to', 'was', 'we', 'with', 'you', 'your',
+})
+
+# LaTeX commands whose arguments are layout, not content
+LATEX_DROP_COMMANDS = (
+    'documentclass', 'usepackage', 'newcommand', 'renewcommand', 'setlength', 'addtolength',
+    'vspace', 'hspace', 'label', 'ref', 'cite', 'includegraphics', 'color', 'definecolor',
+    'pagestyle', 'thispagestyle', 'geometry', 'hypersetup', 'titleformat', 'titlespacing',
+    'setlist', 'fontsize', 'input', 'include',
+)
+_LATEX_COMMENT = re.compile(r'(?<!\\)%.*')
+_LATEX_DROP = re.compile(
+    r'\\(?:' + '|'.join(LATEX_DROP_COMMANDS) + r')(?![a-zA-Z])\*?(?:\[[^\]]*\])*(?:\{[^{}]*\})*'
+)
+_LATEX_ENVIRONMENT = re.compile(r'\\(?:begin|end)\{[^}]*\}(?:\[[^\]]*\])?(?:\{[^{}]*\})*')
+_LATEX_HREF = re.compile(r'\\href\{[^{}]*\}\{([^{}]*)\}')
+_LATEX_TEXTCOLOR = re.compile(r'\\textcolor\{[^{}]*\}')
+_LATEX_LINE_BREAK = re.compile(r'\\\\\*?(?:\[[^\]]*\])?')
+_LATEX_COMMAND = re.compile(r'\\[a-zA-Z]+\*?(?:\[[^\]]*\])?')
+_LATEX_ESCAPES = {r'\&': '&', r'\%': '%', r'\$': '$', r'\#': '#', r'\_': '_', r'\{': '{', r'\}': '}'}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    Keeps technology names like "c#" and "c++" intact and drops stop words.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms in document order
+    """
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def term_frequencies(text: str) -> Dict[str, int]:
+    """
+    Count the terms and adjacent term pairs of a text.
+
+    Pairs are keyed "first second" and let rankers detect phrase matches
+    without scanning the text again.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Mapping of term (or term pair) to occurrences
+    """
+    tokens = tokenize(text)
+    counts = Counter(tokens)
+    counts.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    return dict(counts)
+
+
+def latex_to_text(source: str) -> str:
+    """
+    Extract readable text from LaTeX source.
+
+    Args:
+        source: LaTeX document
+
+    Returns:
+        Plain text of the document body
+    """
+    text = _LATEX_COMMENT.sub('', source)
+    body = re.search(r'\\begin\{document\}(.*?)(?:\\end\{document\}|$)', text, re.DOTALL)
+    if body:
+        text = body.group(1)
+
+    text = _LATEX_HREF.sub(r'\1', text)
+    text = _LATEX_TEXTCOLOR.sub('', text)
+    text = _LATEX_LINE_BREAK.sub('\n', text)
+    text = _LATEX_DROP.sub(' ', text)
+    text = _LATEX_ENVIRONMENT.sub(' ', text)
+    for escaped, plain in _LATEX_ESCAPES.items():
+        text = text.replace(escaped, plain)
+    text = text.replace('~', ' ').replace('---', '-').replace('--', '-')
+    text = _LATEX_COMMAND.sub(' ', text)
+    text = text.replace('{', ' ').replace('}', ' ')
+
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+class TermMatrix:
+    """
+    Sparse document x term count matrix, stored column-major (CSC).
+    
+    Every term and term pair gets a column id and every document a row
+    id. Entries are kept in one array of ``column << ROW_BITS | row``
+    keys sorted by column, so the counts of a query's few columns for
+    any set of documents are gathered with a single np.searchsorted
+    call that only touches those columns' entries. Re-indexed documents
+    get a new row; dead rows are dropped once they outnumber the live
+    ones.
+    """
+    
+    ROW_BITS = 32
+    ROW_MASK = (1 << ROW_BITS) - 1
+    
+    def __init__(self):
+        """Initialize an empty matrix"""
+        self.rows: Dict[str, int] = {}
+        self.columns: Dict[str, int] = {}
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._data = np.zeros(0, dtype=np.int64)
+        self._pending_keys: List[int] = []
+        self._pending_data: List[int] = []
+        self._next_row = 0
+    
+    def add(self, key: str, counts: Dict[str, int]) -> None:
+        """
+        Add a document's counts as a new row.
+        
+        Args:
+            key: Document key (replaces any earlier row for it)
+            counts: Term and term-pair counts
+        """
+        row = self._next_row
+        self._next_row += 1
+        self.rows[key] = row
+        
+        columns = self.columns
+        self._pending_keys.extend(
+            columns.setdefault(term, len(columns)) << self.ROW_BITS | row for term in counts
+        )
+        self._pending_data.extend(counts.values())
+    
+    def remove(self, key: str) -> None:
+        """Forget a document's row"""
+        if self.rows.pop(key, None) is not None and self._next_row > 2 * len(self.rows) + 64:
+            self._compact()
+    
+    def gather(self, keys: Sequence[str], columns: Sequence[str]) -> Tuple['np.ndarray', 'np.ndarray']:
+        """
+        Counts of the given columns for the given documents.
+        
+        Args:
+            keys: Document keys, one per output column
+            columns: Terms or term pairs, one per output row
+            
+        Returns:
+            (counts, indexed): a len(columns) x len(keys) count array and a
+            mask of the keys that have a row (others are all zero)
+        """
+        self._flush()
+        rows = np.fromiter(map(self.rows.get, keys, [-1] * len(keys)), dtype=np.int64, count=len(keys))
+        column_ids = np.array([self.columns.get(column, -1) for column in columns], dtype=np.int64)
+        indexed = rows >= 0
+        counts = np.zeros((len(columns), len(keys)), dtype=np.int64)
+        if not len(self._keys):
+            return counts, indexed
+        
+        wanted = (column_ids[:, None] << self.ROW_BITS) | rows[None, :]
+        positions = np.minimum(np.searchsorted(self._keys, wanted), len(self._keys) - 1)
+        found = (self._keys[positions] == wanted) & indexed[None, :] & (column_ids >= 0)[:, None]
+        np.copyto(counts, self._data[positions], where=found)
+        return counts, indexed
+    
+    def _flush(self) -> None:
+        """Merge added entries into the sorted arrays"""
+        if not self._pending_keys:
+            return
+        keys = np.array(self._pending_keys, dtype=np.int64)
+        data = np.array(self._pending_data, dtype=np.int64)
+        self._pending_keys, self._pending_data = [], []
+        
+        order = np.argsort(keys, kind='stable')
+        keys, data = keys[order], data[order]
+        positions = np.searchsorted(self._keys, keys)
+        self._keys = np.insert(self._keys, positions, keys)
+        self._data = np.insert(self._data, positions, data)
+    
+    def _compact(self) -> None:
+        """Drop the entries of dead rows and renumber the live ones"""
+        self._flush()
+        live = np.array(sorted(self.rows.values()), dtype=np.int64)
+        entry_rows = self._keys & self.ROW_MASK
+        positions = np.minimum(np.searchsorted(live, entry_rows), max(len(live) - 1, 0))
+        keep = live[positions] == entry_rows if len(live) else np.zeros(len(entry_rows), dtype=bool)
+        # Renumbering keeps the row order, so the keys stay sorted
+        self._keys = (self._keys[keep] & ~self.ROW_MASK) | positions[keep]
+        self._data = self._data[keep]
+        renumbered = {row: new_row for new_row, row in enumerate(live.tolist())}
+        self.rows = {key: renumbered[row] for key, row in self.rows.items()}
+        self._next_row = len(live)
+
 
 class DocumentIndexer:
     """Indexes and retrieves documents for search"""
     
-    def __init__(self, base_paths: List[Path]):
+    def __init__(
+        self,
+        base_paths: Optional[List[Path]] = None,
+        index_path: Optional[Path] = DEFAULT_INDEX_PATH
+    ):
         """
         Initialize document indexer.
         
+        The index is an inverted index of term frequencies scored with
+        BM25. Each document is a row in the SQLite file ``index_path``
+        and the index is refreshed incrementally: build_index only
+        re-extracts files whose mtime or size changed and drops files that
+        disappeared, and only those rows are rewritten.
+        
         Args:
-            base_paths: List of base paths to index
+            base_paths: List of base paths to index (defaults to the application archives)
+            index_path: SQLite file the index is persisted to (None disables persistence)
         """
-        self.base_paths = [Path(p) for p in base_paths]
+        self.base_paths = [Path(p) for p in (base_paths if base_paths is not None else DEFAULT_BASE_PATHS)]
+        self.index_path = Path(index_path) if index_path else None
         self.index: Dict[str, Document] = {}
         
-        logger.info(f"Initialized DocumentIndexer with {len(base_paths)} base paths")
+        self._lock = threading.Lock()
+        # Serializes index file writes in the order the in-memory changes were made
+        self._io_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._term_counts: Dict[str, Dict[str, int]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._signatures: Dict[str, Tuple[float, int]] = {}
+        self._matrix = TermMatrix() if NUMPY_AVAILABLE else None
+        
+        if self.index_path:
+            self._load()
+        
+        logger.info(f"Initialized DocumentIndexer with {len(self.base_paths)} base paths")
     
     def build_index(self) -> None:
         """Build or rebuild document index"""
-        # TODO: Implement index building
-        raise NotImplementedError("Index building will be implemented in task 5.2")
+        seen = set()
+        changed = []
+        added = updated = 0
+        
+        for file_path in self._iter_files():
+            key = str(file_path)
+            seen.add(key)
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            if self._signatures.get(key) == (stat.st_mtime, stat.st_size):
+                continue
+            
+            was_indexed = key in self.index
+            changed.append(key)
+            if self._index_file(file_path, stat):
+                if was_indexed:
+                    updated += 1
+                else:
+                    added += 1
+        
+        with self._lock:
+            removed = [key for key in self._signatures if key not in seen]
+            for key in removed:
+                self._remove(key)
+        
+        if changed or removed:
+            self._save(changed + removed)
+        
+        logger.info(
+            f"Indexed {len(self.index)} documents "
+            f"({added} added, {updated} updated, {len(removed)} removed)"
+        )
     
     def get_documents(self, document_types: Optional[List[str]] = None) -> List[Document]:
         """
@@ -37,12 +326,15 @@ class DocumentIndexer:
         
         Args:
             document_types: Optional list of document types to filter by
-            
+        
         Returns:
             List of documents matching the filter
         """
-        # TODO: Implement document retrieval
-        raise NotImplementedError("Document retrieval will be implemented in task 5.2")
+        with self._lock:
+            documents = list(self.index.values())
+        if document_types:
+            documents = [doc for doc in documents if doc.is_valid_type(document_types)]
+        return documents
     
     def update_document(self, file_path: Path) -> None:
         """
@@ -51,8 +343,17 @@ class DocumentIndexer:
         Args:
             file_path: Path to document to update
         """
-        # TODO: Implement document update
-        raise NotImplementedError("Document update will be implemented in task 5.5")
+        file_path = Path(file_path)
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._remove(str(file_path))
+            self._save([str(file_path)])
+            return
+        
+        self._index_file(file_path, stat)
+        self._save([str(file_path)])
     
     def extract_text(self, file_path: Path) -> str:
         """
@@ -60,9 +361,345 @@ class DocumentIndexer:
         
         Args:
             file_path: Path to file
-            
+        
         Returns:
             Extracted text content
         """
-        # TODO: Implement text extraction
-        raise NotImplementedError("Text extraction will be implemented in task 5.3")
+        file_path = Path(file_path)
+        suffix = file_path.suffix.lower()
+        
+        if suffix == '.pdf':
+            if not PDF_AVAILABLE:
+                logger.debug(f"Skipping {file_path}: pypdf not installed")
+                return ''
+            try:
+                reader = PdfReader(str(file_path))
+                return '\n'.join(page.extract_text() or '' for page in reader.pages).strip()
+            except Exception as e:
+                logger.warning(f"Could not read PDF {file_path}: {e}")
+                return ''
+        
+        try:
+            source = file_path.read_text(encoding='utf-8', errors='replace')
+        except OSError as e:
+            logger.warning(f"Could not read {file_path}: {e}")
+            return ''
+        
+        return latex_to_text(source) if suffix == '.tex' else source
+    
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        document_types: Optional[List[str]] = None
+    ) -> List[Tuple[Document, float]]:
+        """
+        Score documents against a query with BM25.
+        
+        Only documents containing at least one query term are scored.
+        
+        Args:
+            query: Search query
+            top_k: Maximum number of documents to return
+            document_types: Optional list of document types to filter by
+        
+        Returns:
+            (document, score) pairs, best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self.index)
+            if not terms or not doc_count:
+                return []
+            avg_length = self._total_length / doc_count
+            
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, tf in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[key] / avg_length)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+            
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            results = []
+            for key, score in ranked:
+                document = self.index[key]
+                if document_types and not document.is_valid_type(document_types):
+                    continue
+                results.append((document, score))
+                if len(results) >= top_k:
+                    break
+            return results
+    
+    def get_term_counts(self, file_path) -> Optional[Dict[str, int]]:
+        """
+        Term frequencies computed when a document was indexed.
+        
+        Args:
+            file_path: Path of an indexed document
+            
+        Returns:
+            Mapping of term to count, or None if the document is not indexed
+        """
+        with self._lock:
+            return self._term_counts.get(str(file_path))
+    
+    def gather_term_counts(self, file_paths: Sequence, columns: Sequence[str]):
+        """
+        Counts of terms (or term pairs) for many indexed documents at once.
+        
+        Args:
+            file_paths: Paths of the documents, one per output column
+            columns: Terms or term pairs, one per output row
+            
+        Returns:
+            (counts, indexed) from TermMatrix.gather, or None without NumPy
+        """
+        if self._matrix is None:
+            return None
+        with self._lock:
+            return self._matrix.gather([str(path) for path in file_paths], columns)
+    
+    @staticmethod
+    def best_snippet(document: Document, query: str, max_chars: int = 400) -> str:
+        """
+        Pick the passage of a document that mentions the most query terms.
+        
+        Args:
+            document: Indexed document
+            query: Search query
+            max_chars: Snippet length limit
+        
+        Returns:
+            Snippet text
+        """
+        terms = set(tokenize(query))
+        lines = [line for line in document.content.splitlines() if line.strip()]
+        if not lines:
+            return ''
+        
+        best_start, best_hits = 0, -1
+        for start in range(len(lines)):
+            window = ' '.join(lines[start:start + 3])
+            hits = len(terms & set(tokenize(window)))
+            if hits > best_hits:
+                best_start, best_hits = start, hits
+        
+        snippet = ' '.join(lines[best_start:best_start + 3])
+        return snippet if len(snippet) <= max_chars else snippet[:max_chars].rsplit(' ', 1)[0] + '...'
+    
+    def get_stats(self) -> Dict:
+        """Index size and vocabulary statistics"""
+        with self._lock:
+            return {
+                'documents': len(self.index),
+                'terms': len(self._postings),
+                'tokens': self._total_length,
+                'pdf_support': PDF_AVAILABLE,
+                'persistent': self._db is not None,
+            }
+    
+    def _iter_files(self) -> Iterator[Path]:
+        """Indexable files under the base paths (PDFs with a .tex source are skipped)"""
+        for base_path in self.base_paths:
+            if not base_path.exists():
+                continue
+            for file_path in sorted(base_path.rglob('*')):
+                suffix = file_path.suffix.lower()
+                if suffix not in INDEXED_EXTENSIONS or not file_path.is_file():
+                    continue
+                if suffix == '.pdf' and file_path.with_suffix('.tex').exists():
+                    # Compiled output of a source that is indexed already
+                    continue
+                yield file_path
+    
+    def _index_file(self, file_path: Path, stat: os.stat_result) -> bool:
+        """Extract, classify and (re)index one file; False if it has no text"""
+        key = str(file_path)
+        content = self.extract_text(file_path)
+        
+        with self._lock:
+            self._remove(key)
+            self._signatures[key] = (stat.st_mtime, stat.st_size)
+            if not content.strip():
+                return False
+            
+            self.index[key] = Document(
+                file_path=file_path,
+                document_type=self._classify(file_path, content),
+                content=content,
+                metadata={'size': stat.st_size},
+                company_name=self._company_name(file_path),
+                modified_at=datetime.fromtimestamp(stat.st_mtime),
+            )
+            self._add_terms(key, term_frequencies(content))
+            return True
+    
+    def _add_terms(self, key: str, counts: Dict[str, int]) -> None:
+        """Add a document's term counts to the postings (caller holds the lock)"""
+        self._term_counts[key] = counts
+        self.index[key].term_counts = counts
+        if self._matrix is not None:
+            self._matrix.add(key, counts)
+        length = 0
+        for term, count in counts.items():
+            if ' ' in term:
+                # Term pairs are for phrase matching, not BM25
+                continue
+            self._postings.setdefault(term, {})[key] = count
+            length += count
+        self._doc_lengths[key] = length
+        self._total_length += length
+    
+    def _remove(self, key: str) -> None:
+        """Drop a document from the index (caller holds the lock)"""
+        self.index.pop(key, None)
+        self._signatures.pop(key, None)
+        if self._matrix is not None:
+            self._matrix.remove(key)
+        for term in self._term_counts.pop(key, {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(key, 0)
+    
+    @staticmethod
+    def _classify(file_path: Path, content: str) -> str:
+        """Guess the document type from the file name and text"""
+        name = file_path.stem.lower()
+        text = content[:2000].lower()
+        if name.endswith('_cl') or 'cover' in name or 'letter' in name or 'dear ' in text:
+            return 'cover_letter'
+        if 'job_description' in name or name.startswith('jd_'):
+            return 'job_description'
+        if 'cv' in name.split('_') or 'resume' in name or 'experience' in text:
+            return 'cv'
+        return 'other'
+    
+    def _company_name(self, file_path: Path) -> Optional[str]:
+        """Company folder directly under a base path, if the file is in one"""
+        for base_path in self.base_paths:
+            try:
+                parts = file_path.relative_to(base_path).parts
+            except ValueError:
+                continue
+            return parts[0] if len(parts) > 1 else None
+        return None
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open the index file, replacing it if it is not a readable index"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        for attempt in range(2):
+            db = sqlite3.connect(str(self.index_path), timeout=10, check_same_thread=False)
+            try:
+                version = db.execute("PRAGMA user_version").fetchone()[0]
+                if version != INDEX_VERSION:
+                    # Older layout: start empty and let build_index re-extract
+                    db.execute("DROP TABLE IF EXISTS documents")
+                    db.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS documents ("
+                    "key TEXT PRIMARY KEY, document_type TEXT NOT NULL, content TEXT NOT NULL, "
+                    "metadata TEXT NOT NULL, company_name TEXT, mtime REAL NOT NULL, "
+                    "size INTEGER NOT NULL, terms TEXT NOT NULL)"
+                )
+                db.commit()
+                return db
+            except sqlite3.DatabaseError as e:
+                db.close()
+                if attempt:
+                    raise
+                logger.warning(f"Replacing unreadable document index {self.index_path}: {e}")
+                self.index_path.unlink()
+    
+    def _load(self) -> None:
+        """Restore the persisted index"""
+        try:
+            self._db = self._open()
+            rows = self._db.execute(
+                "SELECT key, document_type, content, metadata, company_name, mtime, size, terms FROM documents"
+            ).fetchall()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Document index persistence disabled ({self.index_path}): {e}")
+            self._db = None
+            return
+        
+        dropped = []
+        for key, document_type, content, metadata, company_name, mtime, size, terms in rows:
+            try:
+                counts = json.loads(terms)
+                self.index[key] = Document(
+                    file_path=Path(key),
+                    document_type=document_type,
+                    content=content,
+                    metadata=json.loads(metadata) or {},
+                    company_name=company_name,
+                    modified_at=datetime.fromtimestamp(mtime),
+                )
+                self._signatures[key] = (mtime, size)
+                self._add_terms(key, counts)
+            except (TypeError, ValueError, AttributeError) as e:
+                logger.warning(f"Dropping unreadable indexed document {key}: {e}")
+                self._remove(key)
+                dropped.append(key)
+        
+        if dropped:
+            self._write([], dropped)
+        logger.info(f"Loaded document index with {len(self.index)} documents from {self.index_path}")
+    
+    def _save(self, keys: Iterable[str]) -> None:
+        """
+        Persist the current state of the given documents in one transaction.
+        
+        Indexed keys are upserted and the rest are deleted, so an update
+        writes only the rows of the files that changed.
+        
+        Args:
+            keys: Keys of the documents that were added, updated or removed
+        """
+        if self._db is None:
+            return
+        
+        with self._lock:
+            upserts, deleted = [], []
+            for key in keys:
+                doc = self.index.get(key)
+                if doc is None:
+                    deleted.append(key)
+                    continue
+                mtime, size = self._signatures[key]
+                upserts.append((
+                    key, doc.document_type, doc.content, json.dumps(doc.metadata), doc.company_name,
+                    mtime, size, json.dumps(self._term_counts[key]),
+                ))
+            self._io_lock.acquire()
+        try:
+            self._write(upserts, deleted)
+        finally:
+            self._io_lock.release()
+    
+    def _write(self, upserts: List[Tuple], deleted: List[str]) -> None:
+        """Apply row changes to the index file (caller holds the I/O lock, not the index lock)"""
+        try:
+            with self._db:
+                self._db.executemany("DELETE FROM documents WHERE key = ?", [(key,) for key in deleted])
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO documents "
+                    "(key, document_type, content, metadata, company_name, mtime, size, terms) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    upserts
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not save document index: {e}")
+    
+    def close(self) -> None:
+        """Close the index file"""
+        with self._io_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
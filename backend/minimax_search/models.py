@@ -20,6 +20,8 @@ class Document:
     role_title: Optional[str] = None
     created_at: Optional[datetime] = None
     modified_at: Optional[datetime] = None
+    # Term and term-pair counts, filled once by the indexer (see indexer.term_frequencies)
+    term_counts: Optional[Dict[str, int]] = field(default=None, repr=False, compare=False)
     
     def __post_init__(self):
         """Validate document after initialization"""
@@ -87,6 +89,8 @@ class SearchResult:
     matched_excerpts: List[str] = field(default_factory=list)
     highlighted_text: str = ""
     match_type: str = "semantic"  # 'exact', 'partial', 'semantic'
+    # Relevance MiniMax returned; relevance_score becomes the ranked score (defaults to relevance_score)
+    semantic_score: Optional[float] = None
     
     def __post_init__(self):
         """Validate search result after initialization"""
@@ -95,6 +99,9 @@ class SearchResult:
         
         if not 0.0 <= self.relevance_score <= 1.0:
             raise ValueError(f"relevance_score must be between 0 and 1, got {self.relevance_score}")
+        
+        if self.semantic_score is None:
+            self.semantic_score = self.relevance_score
     
     def validate(self) -> bool:
         """
@@ -2,29 +2,65 @@
 Result ranker for search results.
 """
 
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
 import logging
+import re
 
-from .models import SearchResult
+from .indexer import DocumentIndexer, term_frequencies, tokenize
+from .models import Document, SearchResult
 
 logger = logging.getLogger(__name__)
 
+# Optional vectorized scoring
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Match type by code: 0 no query term, 1 some terms, 2 all adjacent pairs
+MATCH_TYPES = ('semantic', 'partial', 'exact')
+
+# Term frequency saturation: one occurrence scores 0.5, three score 0.75
+TF_SATURATION = 1.0
+
+
+@lru_cache(maxsize=256)
+def _highlight_pattern(terms: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """One case-insensitive alternation of all terms, longest first"""
+    if not terms:
+        return None
+    alternation = '|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf'(?<![\w+#])(?:{alternation})(?![\w+#])', re.IGNORECASE)
+
 
 class ResultRanker:
     """Ranks search results by relevance"""
     
-    def __init__(self, scoring_config: dict = None):
+    def __init__(self, scoring_config: dict = None, indexer: Optional[DocumentIndexer] = None):
         """
         Initialize result ranker.
         
+        The score of a result is the weighted mean of an exact phrase
+        match (0 or 1), a partial score from saturated term frequencies
+        of the query terms, and the semantic relevance MiniMax returned
+        (SearchResult.semantic_score). Term frequencies are computed once
+        per document by the indexer at index time; with NumPy the query
+        columns are gathered from the indexer's TermMatrix in one call.
+        Documents outside the index fall back to Document.term_counts.
+        
         Args:
             scoring_config: Optional configuration for scoring weights
+            indexer: Optional document indexer providing precomputed term frequencies
         """
         self.scoring_config = scoring_config or {
             'exact_match_weight': 1.0,
             'partial_match_weight': 0.5,
             'semantic_weight': 0.3
         }
+        self.indexer = indexer
         
         logger.info("Initialized ResultRanker")
     
@@ -32,15 +68,32 @@ class ResultRanker:
         """
         Rank results by relevance.
         
+        Every result's relevance_score and match_type are updated in place.
+        Scores are computed from semantic_score, which ranking leaves
+        alone, so ranking the same results again gives the same scores.
+        
         Args:
             results: List of search results
             query: Original search query
-            
+        
         Returns:
             Sorted list of search results
         """
-        # TODO: Implement result ranking
-        raise NotImplementedError("Result ranking will be implemented in task 7.3")
+        if not results:
+            return []
+        
+        scores, match_types = self.score_batch(results, query)
+        if NUMPY_AVAILABLE:
+            order = np.argsort(-scores, kind='stable').tolist()
+            scores = scores.tolist()
+        else:
+            order = sorted(range(len(results)), key=lambda i: -scores[i])
+        
+        for result, score, match_type in zip(results, scores, match_types):
+            result.relevance_score = score
+            result.match_type = match_type
+        
+        return [results[i] for i in order]
     
     def calculate_score(self, result: SearchResult, query: str) -> float:
         """
@@ -49,12 +102,65 @@ class ResultRanker:
         Args:
             result: Search result to score
             query: Original search query
-            
+        
         Returns:
             Relevance score between 0 and 1
         """
-        # TODO: Implement score calculation
-        raise NotImplementedError("Score calculation will be implemented in task 7.2")
+        scores, _ = self.score_batch([result], query)
+        return float(scores[0])
+    
+    def score_batch(self, results: Sequence[SearchResult], query: str):
+        """
+        Score many results against one query in a single pass.
+        
+        A result is an exact match when its document contains every
+        adjacent pair of query terms (or the term, for one-term queries).
+        
+        Args:
+            results: Search results to score
+            query: Original search query
+            
+        Returns:
+            (scores, match_types): scores in [0, 1] (a NumPy array when
+            available, else a list) and 'exact'/'partial'/'semantic' per result
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        pairs = [f"{first} {second}" for first, second in zip(terms, terms[1:])] or terms
+        columns = terms + pairs
+        
+        weights = self.scoring_config
+        exact_weight = weights.get('exact_match_weight', 1.0)
+        partial_weight = weights.get('partial_match_weight', 0.5)
+        semantic_weight = weights.get('semantic_weight', 0.3)
+        total_weight = (exact_weight + partial_weight + semantic_weight) or 1.0
+        
+        if not terms:
+            semantic = [result.semantic_score * semantic_weight / total_weight for result in results]
+            return (np.asarray(semantic) if NUMPY_AVAILABLE else semantic), ['semantic'] * len(results)
+        
+        if NUMPY_AVAILABLE:
+            # One row per column (term or pair), one entry per result
+            tf = self._gather_term_counts(results, columns)
+            term_tf = tf[:len(terms)]
+            partial = (term_tf / (term_tf + TF_SATURATION)).mean(axis=0)
+            exact = (tf[len(terms):] > 0).all(axis=0)
+            semantic = np.array([result.semantic_score for result in results], dtype=np.float64)
+            scores = (exact_weight * exact + partial_weight * partial + semantic_weight * semantic) / total_weight
+            scores = np.clip(scores, 0.0, 1.0)
+            kinds = np.where(exact, 2, term_tf.any(axis=0).astype(np.int8))
+            match_types = [MATCH_TYPES[kind] for kind in kinds.tolist()]
+            return scores, match_types
+        
+        scores, match_types = [], []
+        for result in results:
+            doc = result.document.term_counts or self._term_counts(result.document)
+            tfs = [doc.get(term, 0) for term in terms]
+            partial = sum(tf / (tf + TF_SATURATION) for tf in tfs) / len(terms)
+            is_exact = all(doc.get(pair, 0) for pair in pairs)
+            score = (exact_weight * is_exact + partial_weight * partial + semantic_weight * result.semantic_score)
+            scores.append(min(1.0, max(0.0, score / total_weight)))
+            match_types.append('exact' if is_exact else ('partial' if any(tfs) else 'semantic'))
+        return scores, match_types
     
     def highlight_matches(self, text: str, query: str) -> str:
         """
@@ -63,9 +169,36 @@ class ResultRanker:
         Args:
             text: Text to highlight
             query: Search query
-            
+        
         Returns:
             Text with highlighted matches
         """
-        # TODO: Implement highlighting
-        raise NotImplementedError("Highlighting will be implemented in task 7.6")
+        pattern = _highlight_pattern(tuple(sorted(set(tokenize(query)))))
+        if pattern is None:
+            return text
+        return pattern.sub(lambda match: f"**{match.group(0)}**", text)
+    
+    def _term_counts(self, document: Document) -> Dict[str, int]:
+        """Term and term-pair counts of a document, computed at most once"""
+        if document.term_counts is None:
+            counts = self.indexer.get_term_counts(document.file_path) if self.indexer else None
+            document.term_counts = counts if counts is not None else term_frequencies(document.content)
+        return document.term_counts
+    
+    def _gather_term_counts(self, results: Sequence[SearchResult], columns: List[str]):
+        """Column x result count array, from the index matrix where the documents are indexed"""
+        gathered = self.indexer.gather_term_counts(
+            [str(result.document.file_path) for result in results], columns
+        ) if self.indexer else None
+        if gathered is None:
+            tf = np.zeros((len(columns), len(results)), dtype=np.int64)
+            missing = range(len(results))
+        else:
+            tf, indexed = gathered
+            missing = np.flatnonzero(~indexed).tolist()
+        
+        for i in missing:
+            document = results[i].document
+            counts = document.term_counts or self._term_counts(document)
+            tf[:, i] = [counts.get(column, 0) for column in columns]
+        return tf
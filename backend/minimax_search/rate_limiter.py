@@ -2,13 +2,24 @@
 Rate limiter for MiniMax M2 API requests.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+import asyncio
+import json
 import logging
+import os
+import threading
 import time
 
+from .exceptions import RateLimitError
+
 logger = logging.getLogger(__name__)
 
+MINUTE_SECONDS = 60
+DAY_SECONDS = 24 * 60 * 60
+
 
 class RateLimiter:
     """Manages API rate limits for MiniMax M2 free tier"""
@@ -16,24 +27,41 @@ class RateLimiter:
     def __init__(
         self,
         requests_per_minute: int = 60,
-        requests_per_day: int = 1000
+        requests_per_day: int = 1000,
+        state_path: Optional[Union[str, Path]] = None
     ):
         """
         Initialize rate limiter.
         
+        Both limits are sliding windows: a request counts against the
+        per-minute limit for 60 seconds and against the daily limit for
+        24 hours after it was made.
+        
         Args:
             requests_per_minute: Maximum requests per minute
             requests_per_day: Maximum requests per day
+            state_path: Optional JSON file so the daily quota survives restarts
         """
         self.rpm_limit = requests_per_minute
         self.daily_limit = requests_per_day
+        self.state_path = Path(state_path) if state_path else None
         
         self.request_count = 0
         self.daily_count = 0
         self.last_reset = datetime.now()
         self.daily_reset = datetime.now()
         
-        self.request_times: list = []
+        # Wall-clock timestamps of requests in the last 24 hours, oldest first
+        self.request_times: deque = deque()
+        
+        self._lock = threading.Lock()
+        self.total_requests = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.waited_seconds = 0.0
+        
+        if self.state_path:
+            self._load()
         
         logger.info(f"Initialized RateLimiter: {requests_per_minute} RPM, {requests_per_day} daily")
     
@@ -44,13 +72,13 @@ class RateLimiter:
         Returns:
             True if request can be made, False otherwise
         """
-        # TODO: Implement limit checking
-        raise NotImplementedError("Limit checking will be implemented in task 2.1")
+        with self._lock:
+            return self._delay(time.time()) == 0
     
     def record_request(self) -> None:
         """Record a request"""
-        # TODO: Implement request recording
-        raise NotImplementedError("Request recording will be implemented in task 2.1")
+        with self._lock:
+            self._record(time.time())
     
     def get_remaining_quota(self) -> Dict[str, int]:
         """
@@ -59,10 +87,175 @@ class RateLimiter:
         Returns:
             Dictionary with remaining requests per minute and per day
         """
-        # TODO: Implement quota tracking
-        raise NotImplementedError("Quota tracking will be implemented in task 2.1")
+        with self._lock:
+            self._prune(time.time())
+            return {
+                'per_minute': max(0, self.rpm_limit - self.request_count),
+                'per_day': max(0, self.daily_limit - self.daily_count),
+            }
+    
+    def time_until_available(self) -> float:
+        """
+        Seconds until the next request fits in both windows.
+        
+        Returns:
+            0.0 if a request can be made now
+        """
+        with self._lock:
+            return self._delay(time.time())
+    
+    def wait_if_needed(self, max_wait: float = MINUTE_SECONDS) -> None:
+        """
+        Wait if rate limit reached.
+        
+        Args:
+            max_wait: Longest acceptable wait in seconds
+        
+        Raises:
+            RateLimitError: If the wait would exceed max_wait (e.g. daily quota spent)
+        """
+        delay = self._check_wait(max_wait)
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def wait_if_needed_async(self, max_wait: float = MINUTE_SECONDS) -> None:
+        """Like wait_if_needed, but sleeps without blocking the event loop"""
+        delay = self._check_wait(max_wait)
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def acquire(self, max_wait: float = MINUTE_SECONDS) -> None:
+        """
+        Wait for a free slot and record the request in one step.
+        
+        Concurrent callers never both take the last slot, which a separate
+        check_limit/record_request pair cannot guarantee.
+        
+        Args:
+            max_wait: Longest acceptable wait in seconds
+        
+        Raises:
+            RateLimitError: If the wait would exceed max_wait
+        """
+        while not self._try_acquire():
+            self.wait_if_needed(max_wait)
+    
+    async def acquire_async(self, max_wait: float = MINUTE_SECONDS) -> None:
+        """Like acquire, but sleeps without blocking the event loop"""
+        while not self._try_acquire():
+            await self.wait_if_needed_async(max_wait)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter statistics for monitoring.
+        
+        Returns:
+            Dictionary with limits, usage, remaining quota and throttling counters
+        """
+        remaining = self.get_remaining_quota()
+        with self._lock:
+            return {
+                'requests_per_minute_limit': self.rpm_limit,
+                'requests_per_day_limit': self.daily_limit,
+                'requests_last_minute': self.request_count,
+                'requests_last_day': self.daily_count,
+                'remaining_per_minute': remaining['per_minute'],
+                'remaining_per_day': remaining['per_day'],
+                'total_requests': self.total_requests,
+                'throttled': self.throttled,
+                'rejected': self.rejected,
+                'waited_seconds': round(self.waited_seconds, 3),
+            }
     
-    def wait_if_needed(self) -> None:
-        """Wait if rate limit reached"""
-        # TODO: Implement wait logic
-        raise NotImplementedError("Wait logic will be implemented in task 2.2")
+    def _prune(self, now: float) -> None:
+        """Drop requests older than a day and refresh the window counts (caller holds the lock)"""
+        while self.request_times and self.request_times[0] <= now - DAY_SECONDS:
+            self.request_times.popleft()
+        
+        minute_start = now - MINUTE_SECONDS
+        # The minute window is the newest tail of the deque
+        in_minute = 0
+        for stamp in reversed(self.request_times):
+            if stamp <= minute_start:
+                break
+            in_minute += 1
+        
+        self.request_count = in_minute
+        self.daily_count = len(self.request_times)
+        self.last_reset = datetime.fromtimestamp(minute_start)
+        self.daily_reset = datetime.fromtimestamp(now - DAY_SECONDS)
+    
+    def _delay(self, now: float) -> float:
+        """Seconds until a slot frees up in both windows (caller holds the lock)"""
+        self._prune(now)
+        delay = 0.0
+        # A slot frees up when the request that would be limit-th newest leaves the window
+        if self.request_count >= self.rpm_limit:
+            stamp = self.request_times[len(self.request_times) - self.rpm_limit]
+            delay = max(delay, stamp + MINUTE_SECONDS - now)
+        if self.daily_count >= self.daily_limit:
+            stamp = self.request_times[self.daily_count - self.daily_limit]
+            delay = max(delay, stamp + DAY_SECONDS - now)
+        return max(0.0, delay)
+    
+    def _record(self, now: float) -> None:
+        """Append a request timestamp (caller holds the lock)"""
+        self.request_times.append(now)
+        self.total_requests += 1
+        self._prune(now)
+        self._save()
+    
+    def _try_acquire(self) -> bool:
+        """Record a request if one fits right now"""
+        with self._lock:
+            now = time.time()
+            if self._delay(now) > 0:
+                return False
+            self._record(now)
+            return True
+    
+    def _check_wait(self, max_wait: float) -> float:
+        """Return the wait before the next request, or raise if it is too long"""
+        with self._lock:
+            delay = self._delay(time.time())
+            if delay > max_wait:
+                self.rejected += 1
+                quota = 'daily' if self.daily_count >= self.daily_limit else 'per-minute'
+                raise RateLimitError(
+                    f"MiniMax {quota} rate limit reached",
+                    retry_after=int(delay) + 1,
+                    details={'per_minute': self.request_count, 'per_day': self.daily_count},
+                )
+            if delay > 0:
+                self.throttled += 1
+                self.waited_seconds += delay
+                logger.info(f"Rate limit reached, waiting {delay:.1f}s")
+            return delay
+    
+    def _load(self) -> None:
+        """Restore request timestamps of the last day from the state file"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                stamps = json.load(f).get('request_times', [])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable rate limiter state {self.state_path}: {e}")
+            return
+        
+        self.request_times.extend(sorted(float(stamp) for stamp in stamps))
+        self._prune(time.time())
+    
+    def _save(self) -> None:
+        """Write request timestamps to the state file atomically (caller holds the lock)"""
+        if not self.state_path:
+            return
+        
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.state_path.with_name(f".{self.state_path.name}.{os.getpid()}.tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'request_times': list(self.request_times)}, f)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"Could not save rate limiter state: {e}")
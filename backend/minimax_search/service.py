@@ -2,6 +2,7 @@
 Main search service coordinating all components.
 """
 
+from dataclasses import replace
 from typing import List, Optional
 import logging
 
@@ -9,11 +10,14 @@ from .client import MiniMaxSearchClient
 from .indexer import DocumentIndexer
 from .cache import SearchCache
 from .ranker import ResultRanker
-from .models import SearchFilters, SearchResponse
+from .models import Document, SearchFilters, SearchResponse
 from .exceptions import ValidationError
 
 logger = logging.getLogger(__name__)
 
+# Candidates prefiltered locally per requested result
+PREFILTER_FACTOR = 3
+
 
 class SearchService:
     """Main search service coordinating all components"""
@@ -32,12 +36,12 @@ class SearchService:
             client: MiniMax M2 API client
             indexer: Document indexer
             cache: Search cache
-            ranker: Optional result ranker (creates default if None)
+            ranker: Optional result ranker (creates one using the indexer's term counts if None)
         """
         self.client = client
         self.indexer = indexer
         self.cache = cache
-        self.result_ranker = ranker or ResultRanker()
+        self.result_ranker = ranker or ResultRanker(indexer=indexer)
         
         logger.info("Initialized SearchService")
     
@@ -55,6 +59,50 @@ class SearchService:
         # TODO: Implement main search logic
         raise NotImplementedError("Search logic will be implemented in task 8.3")
     
+    def prefilter_documents(
+        self,
+        query: str,
+        filters: Optional[SearchFilters] = None,
+        snippet_chars: int = 400
+    ) -> List[Document]:
+        """
+        Select the candidates worth sending to MiniMax.
+        
+        Scores the local index with BM25 and returns the best documents
+        with their content cut down to the passage that matches the
+        query, so the prompt carries a few snippets instead of the archive.
+        
+        Args:
+            query: Search query string
+            filters: Optional search filters
+            snippet_chars: Maximum snippet length per document
+            
+        Returns:
+            Up to PREFILTER_FACTOR * max_results documents holding snippets
+        """
+        filters = filters or SearchFilters()
+        top_k = filters.max_results * PREFILTER_FACTOR
+        
+        companies = {name.lower() for name in filters.company_names or []}
+        # Company and date filters are applied after scoring, so score everything then
+        search_k = len(self.indexer.index) if companies or filters.date_range else top_k
+        
+        candidates = []
+        for document, _score in self.indexer.search(query, top_k=search_k, document_types=filters.document_types):
+            if companies and (document.company_name or '').lower() not in companies:
+                continue
+            if filters.date_range and document.modified_at:
+                start, end = filters.date_range
+                if not start <= document.modified_at <= end:
+                    continue
+            
+            snippet = self.indexer.best_snippet(document, query, snippet_chars)
+            candidates.append(replace(document, content=snippet))
+            if len(candidates) >= top_k:
+                break
+        
+        return candidates
+    
     def validate_query(self, query: str) -> bool:
         """
         Validate search query.
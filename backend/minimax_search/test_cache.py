@@ -0,0 +1,145 @@
+"""
+Tests for the LRU + TTL search cache and its on-disk persistence
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from hypothesis import given, strategies as st, settings
+from minimax_search.cache import SearchCache
+from minimax_search.models import Document, SearchResponse, SearchResult
+
+
+def make_response(query, content='Senior Java developer at Volvo'):
+    """SearchResponse with one result"""
+    document = Document(
+        file_path=Path('applications/volvo/cv.tex'),
+        document_type='cv',
+        content=content,
+        company_name='Volvo',
+        created_at=datetime(2024, 1, 1, 6, 0),
+    )
+    return SearchResponse(
+        query=query,
+        results=[SearchResult(document=document, relevance_score=0.8, matched_excerpts=['Java'])],
+        total_count=1,
+        search_time_ms=120,
+    )
+
+
+class TestSearchCache:
+    """Tests for hits, LRU eviction, expiry and invalidation"""
+
+    def test_hit_returns_copy_marked_from_cache(self):
+        """A cached response is served with from_cache set and counted as a hit"""
+        cache = SearchCache(max_size=10)
+        cache.set('q1', make_response('java'))
+
+        cached = cache.get('q1')
+
+        assert cached.from_cache is True
+        assert cached.results[0].document.company_name == 'Volvo'
+        assert cache.get('missing') is None
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['hit_ratio']) == (1, 1, 0.5)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Reading an entry protects it from the next eviction"""
+        cache = SearchCache(max_size=2)
+        cache.set('a', make_response('a'))
+        cache.set('b', make_response('b'))
+        cache.get('a')
+
+        cache.set('c', make_response('c'))
+
+        assert list(cache.cache) == ['a', 'c']
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_expired_entries_are_misses(self):
+        """Entries older than the TTL are dropped on read"""
+        cache = SearchCache(max_size=10, ttl_seconds=60)
+        cache.set('old', make_response('old'))
+        cache.cache['old'].cached_at = datetime.now() - timedelta(seconds=61)
+
+        assert cache.get('old') is None
+        assert 'old' not in cache.cache
+        assert cache.get_stats()['expirations'] == 1
+
+    def test_invalidate_by_query_text_or_everything(self):
+        """A pattern removes matching queries only; no pattern clears the cache"""
+        cache = SearchCache(max_size=10)
+        cache.set('h1', make_response('Volvo java'))
+        cache.set('h2', make_response('python'))
+
+        cache.invalidate('volvo')
+        assert list(cache.cache) == ['h2']
+
+        cache.invalidate()
+        assert len(cache.cache) == 0
+
+    def test_persisted_cache_survives_restart(self, tmp_path):
+        """Entries, full document content and LRU order are reloaded from disk"""
+        path = tmp_path / 'search_cache.sqlite3'
+        content = 'x' * 500
+        cache = SearchCache(max_size=10, persist_path=path)
+        cache.set('a', make_response('a', content=content))
+        cache.set('b', make_response('b'))
+
+        restarted = SearchCache(max_size=10, persist_path=path)
+
+        assert list(restarted.cache) == ['a', 'b']
+        reloaded = restarted.get('a')
+        assert reloaded.results[0].document.content == content
+        assert reloaded.results[0].document.created_at == datetime(2024, 1, 1, 6, 0)
+
+    def test_set_writes_only_the_changed_rows(self, tmp_path):
+        """Adding an entry inserts one row and deletes only what was evicted"""
+        cache = SearchCache(max_size=3, persist_path=tmp_path / 'search_cache.sqlite3')
+        for key in 'abc':
+            cache.set(key, make_response(key))
+        statements = []
+        cache._db.set_trace_callback(statements.append)
+
+        cache.set('d', make_response('d'))
+
+        writes = [sql for sql in statements if sql.startswith(('INSERT', 'DELETE', 'UPDATE'))]
+        assert len(writes) == 2
+        assert writes[0].startswith('DELETE') and "'a'" in writes[0]
+        assert writes[1].startswith('INSERT') and "'d'" in writes[1]
+
+    def test_evictions_and_invalidations_persist(self, tmp_path):
+        """Removed entries stay removed after a restart"""
+        path = tmp_path / 'search_cache.sqlite3'
+        cache = SearchCache(max_size=2, persist_path=path)
+        for key in ('java', 'python', 'golang'):
+            cache.set(key, make_response(key))
+        cache.invalidate('python')
+        cache.close()
+
+        assert list(SearchCache(max_size=2, persist_path=path).cache) == ['golang']
+
+    def test_unreadable_persistence_file_starts_empty(self, tmp_path):
+        """A corrupt cache file is ignored"""
+        path = tmp_path / 'search_cache.sqlite3'
+        path.write_text('{not json')
+
+        assert len(SearchCache(persist_path=path).cache) == 0
+
+
+@given(st.integers(min_value=1, max_value=20), st.lists(st.integers(min_value=0, max_value=50), max_size=100))
+@settings(max_examples=50)
+def test_property_cache_never_exceeds_max_size(max_size, keys):
+    """
+    Property: For any sequence of writes, the cache holds at most max_size
+    entries and the most recently written key is always present.
+    """
+    cache = SearchCache(max_size=max_size)
+    response = make_response('q')
+    for key in keys:
+        cache.set(str(key), response)
+        assert len(cache.cache) <= max_size
+        assert str(key) in cache.cache
@@ -0,0 +1,191 @@
+"""
+Tests for the BM25 document index over the application archive
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from minimax_search.indexer import DocumentIndexer, latex_to_text, tokenize
+from minimax_search.models import SearchFilters
+from minimax_search.service import SearchService
+
+CV_TEX = r"""
+\documentclass[11pt]{article}
+\usepackage{geometry}
+\begin{document}
+% private note: do not index
+{\Large Hongzhi Li}\\[10pt]
+\textcolor{darkblue}{\href{mailto:a@b.c}{a@b.c}}
+\section{Experience}
+\textbf{Platform Engineer} -- Kubernetes, Azure AKS \& Terraform.
+\begin{itemize}
+\item Built CI/CD pipelines in C\# and Java
+\end{itemize}
+\end{document}
+"""
+
+COVER_LETTER_TEX = r"""
+\begin{document}
+Dear Hiring Manager,
+I want to build Java backend services with Spring Boot at Volvo.
+\end{document}
+"""
+
+
+def write(path, text):
+    """Create a file and its parent folders"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+class TestLatexExtraction:
+    """Tests for LaTeX-aware text extraction"""
+
+    def test_keeps_content_and_drops_markup(self):
+        """Body text, link labels and escapes survive; preamble, comments and colors do not"""
+        text = latex_to_text(CV_TEX)
+
+        assert 'Platform Engineer - Kubernetes, Azure AKS & Terraform.' in text
+        assert 'Built CI/CD pipelines in C# and Java' in text
+        assert 'a@b.c' in text
+        for markup in ('geometry', 'private note', 'darkblue', '[10pt]', '\\', '{'):
+            assert markup not in text
+
+    def test_drop_commands_match_whole_names(self):
+        """Commands that merely start with a dropped name keep their content"""
+        text = latex_to_text(r'\reflectbox{ab} \colorbox{red}{Hello} \ref{sec}')
+
+        assert text.split() == ['ab', 'red', 'Hello']
+
+    def test_tokenize_keeps_technology_names(self):
+        """Terms like c# and c++ are single tokens and stop words are dropped"""
+        assert tokenize('The C# and C++ developer') == ['c#', 'c++', 'developer']
+
+
+class TestDocumentIndexer:
+    """Tests for BM25 search and incremental, persisted updates"""
+
+    def test_bm25_ranks_matching_documents(self, tmp_path):
+        """Documents with more (and rarer) query terms score higher"""
+        write(tmp_path / 'volvo' / 'Volvo_Platform.tex', CV_TEX)
+        write(tmp_path / 'volvo' / 'Volvo_Platform_cl.tex', COVER_LETTER_TEX)
+        indexer = DocumentIndexer([tmp_path], index_path=None)
+        indexer.build_index()
+
+        results = indexer.search('kubernetes terraform java')
+
+        assert [doc.file_path.name for doc, _ in results] == ['Volvo_Platform.tex', 'Volvo_Platform_cl.tex']
+        assert results[0][1] > results[1][1]
+        assert results[0][0].document_type == 'cv'
+        assert results[1][0].document_type == 'cover_letter'
+        assert results[0][0].company_name == 'volvo'
+        assert indexer.search('kubernetes', document_types=['cover_letter']) == []
+
+    def test_only_changed_files_are_reextracted(self, tmp_path, monkeypatch):
+        """build_index skips unchanged files, reindexes modified ones and drops deleted ones"""
+        cv = write(tmp_path / 'cv.tex', CV_TEX)
+        letter = write(tmp_path / 'letter_cl.tex', COVER_LETTER_TEX)
+        indexer = DocumentIndexer([tmp_path], index_path=None)
+        indexer.build_index()
+
+        extracted = []
+        original = indexer.extract_text
+        monkeypatch.setattr(indexer, 'extract_text', lambda path: extracted.append(Path(path).name) or original(path))
+
+        indexer.build_index()
+        assert extracted == []
+
+        cv.write_text(CV_TEX.replace('Kubernetes', 'OpenShift'))
+        os.utime(cv, (cv.stat().st_atime, cv.stat().st_mtime + 5))
+        letter.unlink()
+        indexer.build_index()
+
+        assert extracted == ['cv.tex']
+        assert indexer.search('kubernetes') == []
+        assert [doc.file_path.name for doc, _ in indexer.search('openshift')] == ['cv.tex']
+        assert indexer.get_stats()['documents'] == 1
+
+    def test_pdf_with_tex_source_is_skipped(self, tmp_path):
+        """Compiled PDFs are not indexed twice next to their LaTeX source"""
+        write(tmp_path / 'cv.tex', CV_TEX)
+        (tmp_path / 'cv.pdf').write_bytes(b'%PDF-1.4')
+        indexer = DocumentIndexer([tmp_path], index_path=None)
+
+        assert [path.name for path in indexer._iter_files()] == ['cv.tex']
+
+    def test_persisted_index_is_reused_after_restart(self, tmp_path):
+        """A restarted indexer loads the index and does not re-extract unchanged files"""
+        archive = tmp_path / 'archive'
+        write(archive / 'cv.tex', CV_TEX)
+        index_path = tmp_path / 'index.sqlite3'
+        DocumentIndexer([archive], index_path=index_path).build_index()
+
+        restarted = DocumentIndexer([archive], index_path=index_path)
+        restarted.extract_text = lambda path: (_ for _ in ()).throw(AssertionError('re-extracted'))
+        restarted.build_index()
+
+        assert [doc.file_path.name for doc, _ in restarted.search('terraform')] == ['cv.tex']
+
+    def test_update_writes_only_the_changed_document(self, tmp_path):
+        """update_document rewrites one row, not the whole persisted index"""
+        archive = tmp_path / 'archive'
+        write(archive / 'volvo' / 'cv.tex', CV_TEX)
+        write(archive / 'skf' / 'letter_cl.tex', COVER_LETTER_TEX)
+        index_path = tmp_path / 'index.sqlite3'
+        indexer = DocumentIndexer([archive], index_path=index_path)
+        indexer.build_index()
+
+        statements = []
+        indexer._db.set_trace_callback(statements.append)
+        write(archive / 'volvo' / 'cv.tex', CV_TEX.replace('Terraform', 'OpenShift'))
+        indexer.update_document(archive / 'volvo' / 'cv.tex')
+        indexer._db.set_trace_callback(None)
+
+        inserts = [sql for sql in statements if sql.startswith('INSERT')]
+        assert len(inserts) == 1 and 'volvo' in inserts[0] and 'skf' not in inserts[0]
+
+        (archive / 'skf' / 'letter_cl.tex').unlink()
+        indexer.update_document(archive / 'skf' / 'letter_cl.tex')
+        indexer.close()
+
+        restarted = DocumentIndexer([archive], index_path=index_path)
+        assert restarted.get_stats()['documents'] == 1
+        assert [doc.file_path.name for doc, _ in restarted.search('openshift')] == ['cv.tex']
+        assert restarted.search('terraform') == []
+
+    def test_old_index_file_is_replaced(self, tmp_path):
+        """A JSON index from an older version is discarded and rebuilt"""
+        write(tmp_path / 'archive' / 'cv.tex', CV_TEX)
+        index_path = tmp_path / 'index.sqlite3'
+        index_path.write_text('{"version": 2, "documents": {}}')
+
+        indexer = DocumentIndexer([tmp_path / 'archive'], index_path=index_path)
+        indexer.build_index()
+
+        assert indexer.get_stats()['persistent']
+        assert DocumentIndexer([tmp_path / 'archive'], index_path=index_path).get_stats()['documents'] == 1
+
+
+class TestSearchServicePrefilter:
+    """Tests for local candidate selection before calling MiniMax"""
+
+    def test_prefilter_returns_top_snippets(self, tmp_path):
+        """Only the best matching documents are returned, each cut to a snippet"""
+        write(tmp_path / 'volvo' / 'cv.tex', CV_TEX + '\n'.join(f'Filler line {i}' for i in range(200)))
+        write(tmp_path / 'skf' / 'letter_cl.tex', COVER_LETTER_TEX)
+        indexer = DocumentIndexer([tmp_path], index_path=None)
+        indexer.build_index()
+        service = SearchService(client=None, indexer=indexer, cache=None)
+
+        candidates = service.prefilter_documents('terraform', SearchFilters(max_results=1), snippet_chars=120)
+        assert [doc.company_name for doc in candidates] == ['volvo']
+        assert 'Terraform' in candidates[0].content
+        assert len(candidates[0].content) <= 123
+
+        by_company = service.prefilter_documents('java', SearchFilters(company_names=['SKF']))
+        assert [doc.company_name for doc in by_company] == ['skf']
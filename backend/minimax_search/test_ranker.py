@@ -0,0 +1,148 @@
+"""
+Tests for batched result ranking and highlighting
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from minimax_search import ranker as ranker_module
+from minimax_search.benchmark_ranker import benchmark
+from minimax_search.indexer import DocumentIndexer, TermMatrix
+from minimax_search.models import Document, SearchResult
+from minimax_search.ranker import ResultRanker
+
+
+def make_result(name, content, relevance_score=0.5):
+    """SearchResult for a CV with the given text"""
+    document = Document(file_path=Path(f'{name}.tex'), document_type='cv', content=content)
+    return SearchResult(document=document, relevance_score=relevance_score)
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'python'])
+def ranker(request, monkeypatch):
+    """Ranker exercised with and without NumPy"""
+    if not request.param:
+        monkeypatch.setattr(ranker_module, 'NUMPY_AVAILABLE', False)
+    return ResultRanker()
+
+
+class TestResultRanker:
+    """Tests for scoring, ordering and match types"""
+
+    def test_exact_phrase_beats_scattered_terms(self, ranker):
+        """All query terms in order rank above the same terms apart, which rank above none"""
+        results = [
+            make_result('none', 'Frontend React developer', relevance_score=0.9),
+            make_result('scattered', 'Engineer working on a platform for data'),
+            make_result('exact', 'Senior platform engineer at Volvo'),
+        ]
+
+        ranked = ranker.rank(results, 'Platform Engineer')
+
+        assert [result.document.file_path.stem for result in ranked] == ['exact', 'scattered', 'none']
+        assert [result.match_type for result in ranked] == ['exact', 'partial', 'semantic']
+        assert all(0.0 <= result.relevance_score <= 1.0 for result in ranked)
+
+    def test_semantic_score_breaks_ties(self, ranker):
+        """With equal term matches the MiniMax relevance decides"""
+        results = [make_result('low', 'java developer', 0.2), make_result('high', 'java developer', 0.8)]
+
+        assert [result.document.file_path.stem for result in ranker.rank(results, 'java')] == ['high', 'low']
+
+    def test_calculate_score_matches_rank(self, ranker):
+        """Single-result scoring agrees with the batched score"""
+        result = make_result('cv', 'kubernetes kubernetes azure')
+        score = ranker.calculate_score(result, 'kubernetes azure')
+
+        assert ranker.rank([result], 'kubernetes azure')[0].relevance_score == pytest.approx(score)
+
+    def test_uses_term_counts_from_the_index(self, tmp_path):
+        """Snippet results are scored on the full indexed document's precomputed counts"""
+        (tmp_path / 'cv.tex').write_text('Terraform engineer\n' + 'Filler text\n' * 50 + 'Kubernetes operator')
+        indexer = DocumentIndexer([tmp_path], index_path=None)
+        indexer.build_index()
+        indexed = indexer.index[str(tmp_path / 'cv.tex')]
+        snippet = Document(file_path=indexed.file_path, document_type='cv', content='Terraform engineer')
+
+        ranked = ResultRanker(indexer=indexer).rank([SearchResult(document=snippet, relevance_score=0.5)], 'kubernetes')
+
+        assert ranked[0].match_type == 'exact'
+        assert ranked[0].relevance_score == pytest.approx(ResultRanker().calculate_score(
+            SearchResult(document=indexed, relevance_score=0.5), 'kubernetes'
+        ))
+
+    def test_reranking_does_not_drift(self, ranker):
+        """The MiniMax score is kept in semantic_score, so ranking twice gives the same scores"""
+        results = [make_result('cv', 'kubernetes platform', 0.8), make_result('cl', 'java developer', 0.6)]
+
+        first = [result.relevance_score for result in ranker.rank(results, 'kubernetes')]
+        second = [result.relevance_score for result in ranker.rank(results, 'kubernetes')]
+
+        assert second == first
+        assert [result.semantic_score for result in results] == [0.8, 0.6]
+
+    def test_indexed_and_unindexed_documents_score_alike(self, tmp_path):
+        """Counts gathered from the index matrix match counts computed from the text"""
+        for name, text in [('a', 'Terraform engineer on Azure'), ('b', 'Azure Azure platform engineer')]:
+            (tmp_path / f'{name}.tex').write_text(text)
+        indexer = DocumentIndexer([tmp_path], index_path=None)
+        indexer.build_index()
+        indexed = [SearchResult(document=document, relevance_score=0.5) for document in indexer.index.values()]
+        plain = [make_result(result.document.file_path.stem, result.document.content) for result in indexed]
+
+        with_index, _ = ResultRanker(indexer=indexer).score_batch(indexed, 'azure platform engineer')
+        without_index, _ = ResultRanker().score_batch(plain, 'azure platform engineer')
+
+        assert list(with_index) == pytest.approx(list(without_index))
+
+
+@pytest.mark.skipif(not ranker_module.NUMPY_AVAILABLE, reason='NumPy not installed')
+class TestTermMatrix:
+    """Tests for the indexer's sparse term matrix"""
+
+    def test_gather_returns_counts_per_column_and_document(self):
+        matrix = TermMatrix()
+        matrix.add('a', {'java': 2, 'spring': 1})
+        matrix.add('b', {'java': 1, 'kafka': 3})
+
+        counts, indexed = matrix.gather(['b', 'missing', 'a'], ['java', 'kafka', 'unknown'])
+
+        assert counts.tolist() == [[1, 0, 2], [3, 0, 0], [0, 0, 0]]
+        assert indexed.tolist() == [True, False, True]
+
+    def test_reindexed_rows_replace_old_ones_and_compact(self):
+        """Re-adding a document hides its old row, and dead rows are eventually dropped"""
+        matrix = TermMatrix()
+        matrix.add('a', {'java': 1})
+        for count in range(2, 200):
+            matrix.remove('a')
+            matrix.add('a', {'java': count})
+        matrix.add('b', {'java': 5})
+
+        counts, _ = matrix.gather(['a', 'b'], ['java'])
+
+        assert counts.tolist() == [[199, 5]]
+        assert matrix._next_row < 100
+
+
+class TestHighlightMatches:
+    """Tests for single-pattern highlighting"""
+
+    def test_highlights_whole_terms_case_insensitively(self):
+        """Every query term is wrapped once, including symbols like C#"""
+        text = ResultRanker().highlight_matches('Java and C# developer, not JavaScript', 'c# java')
+
+        assert text == '**Java** and **C#** developer, not JavaScript'
+
+    def test_query_without_terms_leaves_text_unchanged(self):
+        assert ResultRanker().highlight_matches('Some text', 'the and') == 'Some text'
+
+
+def test_ranking_hundreds_of_results_is_fast():
+    """Ranking 300 indexed results takes well under a millisecond (2 ms leaves room for slow CI)"""
+    assert benchmark(300, repeats=50) < 2.0
@@ -0,0 +1,109 @@
+"""
+Tests for the sliding-window MiniMax rate limiter
+Uses a fake clock so no test actually sleeps
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from minimax_search import rate_limiter
+from minimax_search.exceptions import RateLimitError
+from minimax_search.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Stand-in for the time module whose sleeps advance the clock"""
+
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Patch the limiter's clock and asyncio.sleep"""
+    fake = FakeClock()
+
+    async def fake_async_sleep(seconds):
+        fake.sleep(seconds)
+
+    monkeypatch.setattr(rate_limiter, 'time', fake)
+    monkeypatch.setattr(rate_limiter.asyncio, 'sleep', fake_async_sleep)
+    return fake
+
+
+class TestRateLimiter:
+    """Tests for the per-minute and daily windows"""
+
+    def test_minute_window_slides(self, clock):
+        """Requests become available again as old ones leave the 60 s window"""
+        limiter = RateLimiter(requests_per_minute=2, requests_per_day=100)
+        limiter.record_request()
+        clock.now += 30
+        limiter.record_request()
+
+        assert limiter.check_limit() is False
+        assert limiter.time_until_available() == pytest.approx(30)
+
+        clock.now += 30.5
+        assert limiter.check_limit() is True
+        assert limiter.get_remaining_quota() == {'per_minute': 1, 'per_day': 98}
+
+    def test_acquire_waits_for_free_slot(self, clock):
+        """acquire sleeps until the window frees a slot and then records the request"""
+        limiter = RateLimiter(requests_per_minute=1, requests_per_day=100)
+        limiter.acquire()
+        limiter.acquire()
+
+        assert clock.slept == [pytest.approx(60)]
+        stats = limiter.get_stats()
+        assert stats['total_requests'] == 2
+        assert stats['throttled'] == 1
+
+    def test_async_acquire_uses_asyncio_sleep(self, clock):
+        """The async variant waits through asyncio.sleep"""
+        limiter = RateLimiter(requests_per_minute=1, requests_per_day=100)
+
+        async def run():
+            await limiter.acquire_async()
+            await limiter.acquire_async()
+
+        asyncio.run(run())
+
+        assert clock.slept == [pytest.approx(60)]
+        assert limiter.get_remaining_quota()['per_minute'] == 0
+
+    def test_daily_quota_raises_instead_of_waiting_hours(self, clock):
+        """An exhausted daily quota raises RateLimitError with retry_after"""
+        limiter = RateLimiter(requests_per_minute=10, requests_per_day=2)
+        limiter.acquire()
+        limiter.acquire()
+
+        with pytest.raises(RateLimitError) as error:
+            limiter.wait_if_needed()
+
+        assert error.value.retry_after > 23 * 3600
+        assert limiter.get_stats()['rejected'] == 1
+
+    def test_daily_usage_survives_restart(self, clock, tmp_path):
+        """Request times are persisted so a restart keeps the daily count"""
+        path = tmp_path / 'minimax_quota.json'
+        RateLimiter(requests_per_day=5, state_path=path).record_request()
+        clock.now += 3600
+
+        restarted = RateLimiter(requests_per_day=5, state_path=path)
+
+        assert restarted.get_remaining_quota() == {'per_minute': 60, 'per_day': 4}
@@ -0,0 +1,243 @@
+"""
+Template Store Component
+Preloads, validates and caches CV/CL templates so request-time access is a dict lookup
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+TEMPLATE_TYPES = ('cv', 'cl')
+
+
+@dataclass
+class TemplateEntry:
+    """A resolved template file and its validated content"""
+
+    role_category: str
+    template_type: str
+    configured_path: Optional[str]
+    path: Optional[Path] = None
+    content: Optional[str] = None
+    is_valid: bool = False
+    mtime: Optional[float] = None
+    error: Optional[str] = None
+    checked_at: float = 0.0
+
+    @property
+    def is_usable(self) -> bool:
+        """True when the template exists and passed LaTeX structure validation"""
+        return self.content is not None and self.is_valid
+
+
+class TemplateStore:
+    """
+    In-memory registry of every role's CV and cover letter template
+
+    All templates are resolved, read and validated once. Lookups return the
+    cached entry; at most every ``recheck_interval`` seconds a lookup also
+    stats the file and reloads it if its mtime (or configured path) changed,
+    so template edits are picked up without a restart.
+    """
+
+    def __init__(
+        self,
+        role_categories: Dict,
+        base_dir: Path,
+        validator: Callable[[str], bool],
+        recheck_interval: float = 2.0
+    ):
+        """
+        Initialize the store
+
+        Args:
+            role_categories: Role configuration with 'cv_template'/'cl_template' paths
+            base_dir: Project root that relative template paths are resolved against
+            validator: Function returning True for structurally valid LaTeX
+            recheck_interval: Minimum seconds between mtime checks of one template
+        """
+        self.role_categories = role_categories
+        self.base_dir = Path(base_dir)
+        self.validator = validator
+        self.recheck_interval = recheck_interval
+
+        self._entries: Dict[Tuple[str, str], TemplateEntry] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.reloads = 0
+
+    def preload(self) -> Dict[str, int]:
+        """
+        Resolve, read and validate every configured template
+
+        Returns:
+            Counts of loaded, invalid and missing templates
+        """
+        summary = {'loaded': 0, 'invalid': 0, 'missing': 0}
+
+        for role_category in list(self.role_categories):
+            for template_type in TEMPLATE_TYPES:
+                entry = self._load(role_category, template_type)
+                if entry.is_usable:
+                    summary['loaded'] += 1
+                elif entry.path:
+                    summary['invalid'] += 1
+                else:
+                    summary['missing'] += 1
+
+        logger.info(
+            f"📚 Template store preloaded: {summary['loaded']} valid, "
+            f"{summary['invalid']} invalid, {summary['missing']} missing"
+        )
+        return summary
+
+    def get(self, role_category: str, template_type: str = 'cv') -> Optional[TemplateEntry]:
+        """
+        Look up a template entry, reloading it if the file changed
+
+        Args:
+            role_category: The role category key
+            template_type: 'cv' or 'cl'
+
+        Returns:
+            TemplateEntry, or None for unknown role categories
+        """
+        if role_category not in self.role_categories:
+            return None
+
+        entry = self._entries.get((role_category, template_type))
+        if entry is None:
+            return self._load(role_category, template_type)
+
+        now = time.monotonic()
+        if now - entry.checked_at < self.recheck_interval:
+            return entry
+
+        if self._is_stale(entry):
+            logger.info(f"🔄 Template changed on disk, reloading: {role_category} ({template_type})")
+            self.reloads += 1
+            return self._load(role_category, template_type)
+
+        entry.checked_at = now
+        return entry
+
+    def get_stats(self) -> Dict:
+        """Number of cached templates and load/reload counters"""
+        entries = list(self._entries.values())
+        return {
+            'templates': len(entries),
+            'valid': sum(1 for entry in entries if entry.is_usable),
+            'loads': self.loads,
+            'reloads': self.reloads
+        }
+
+    def _configured_path(self, role_category: str, template_type: str) -> Optional[str]:
+        """Path string configured for a role (supports the legacy 'template_path' key)"""
+        role_data = self.role_categories.get(role_category, {})
+        if template_type == 'cl':
+            return role_data.get('cl_template', role_data.get('template_path'))
+        return role_data.get('cv_template', role_data.get('template_path'))
+
+    def _is_stale(self, entry: TemplateEntry) -> bool:
+        """Check whether the configuration or the file on disk changed since loading"""
+        if self._configured_path(entry.role_category, entry.template_type) != entry.configured_path:
+            return True
+
+        if entry.path is None:
+            # A missing template may have been added since
+            return self._resolve_path(entry.role_category, entry.template_type, entry.configured_path) is not None
+
+        try:
+            return os.stat(entry.path).st_mtime != entry.mtime
+        except OSError:
+            return True
+
+    def _resolve_path(self, role_category: str, template_type: str, template_path_str) -> Optional[Path]:
+        """
+        Resolve a configured template path to an existing file
+
+        Args:
+            role_category: The role category key
+            template_type: 'cv' or 'cl'
+            template_path_str: Configured path (absolute or relative to the project root)
+
+        Returns:
+            Absolute path to the template file, or None if not found
+        """
+        if not template_path_str:
+            logger.warning(f"No template path configured for role: {role_category}, type: {template_type}")
+            return None
+
+        # Validate path format consistency
+        if not isinstance(template_path_str, str):
+            logger.error(f"Invalid template path format for role {role_category}: {type(template_path_str)}")
+            return None
+
+        # Handle both absolute and relative paths correctly
+        if Path(template_path_str).is_absolute():
+            full_path = Path(template_path_str)
+        else:
+            full_path = self.base_dir / template_path_str
+
+        # Normalize path to handle any inconsistencies
+        try:
+            full_path = full_path.resolve()
+        except Exception as e:
+            logger.error(f"Error normalizing path {full_path}: {e}")
+            return None
+
+        if full_path.is_file():
+            return full_path
+
+        # Try alternative path formats for backward compatibility
+        if template_type == 'cv' and not template_path_str.endswith('.tex') and full_path.is_dir():
+            cv_files = sorted(full_path.glob('*_CV.tex'))
+            if cv_files:
+                logger.debug(f"Found CV file in directory: {cv_files[0]}")
+                return cv_files[0]
+            logger.warning(f"No *_CV.tex files found in directory: {full_path}")
+
+        logger.warning(f"Template file does not exist: {full_path}")
+        return None
+
+    def _load(self, role_category: str, template_type: str) -> TemplateEntry:
+        """Resolve, read and validate one template and store the entry"""
+        configured_path = self._configured_path(role_category, template_type)
+        entry = TemplateEntry(
+            role_category=role_category,
+            template_type=template_type,
+            configured_path=configured_path,
+            path=self._resolve_path(role_category, template_type, configured_path),
+            checked_at=time.monotonic()
+        )
+
+        if entry.path:
+            try:
+                entry.mtime = os.stat(entry.path).st_mtime
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    entry.content = f.read()
+                entry.is_valid = self.validator(entry.content)
+                if not entry.is_valid:
+                    entry.error = 'LaTeX structure validation failed'
+                    logger.error(f"Template LaTeX structure validation failed for: {entry.path}")
+            except UnicodeDecodeError as e:
+                entry.error = f"UTF-8 encoding error: {e}"
+                logger.error(f"UTF-8 encoding error loading template from {entry.path}: {e}")
+            except OSError as e:
+                entry.error = str(e)
+                logger.error(f"Error loading {template_type.upper()} template from {entry.path}: {e}")
+        else:
+            entry.error = 'Template file not found'
+
+        with self._lock:
+            self._entries[(role_category, template_type)] = entry
+            self.loads += 1
+
+        return entry
@@ -0,0 +1,91 @@
+"""
+Tests for the generated application artifact store
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from artifact_store import ArtifactStore
+
+
+def age_folder(path, seconds):
+    """Backdate a folder's modification time"""
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+class TestArtifactStore:
+    """Tests for unique folders, atomic writes, manifests and retention"""
+
+    def test_concurrent_applications_never_share_a_folder(self, tmp_path):
+        """Applications created in the same second get distinct folders"""
+        store = ArtifactStore(root=tmp_path)
+
+        def create(index):
+            artifacts = store.create_application({'index': index})
+            artifacts.write_bytes('cv.pdf', f'pdf {index}'.encode())
+            return artifacts
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            applications = list(pool.map(create, range(32)))
+
+        assert len({app.name for app in applications}) == 32
+        for index, app in enumerate(applications):
+            assert store.resolve(app.name, 'cv.pdf').read_bytes() == f'pdf {index}'.encode()
+
+    def test_manifest_records_every_file(self, tmp_path):
+        """The manifest lists each written file with its hash and size"""
+        store = ArtifactStore(root=tmp_path)
+        artifacts = store.create_application({'company': 'Volvo'})
+        artifacts.write_text('cv.tex', 'latex')
+        artifacts.write_json('prompts.json', {'a': 1})
+
+        manifest = json.loads((artifacts.path / 'manifest.json').read_text())
+        assert manifest['metadata'] == {'company': 'Volvo'}
+        assert manifest['files']['cv.tex']['bytes'] == 5
+        assert set(manifest['files']) == {'cv.tex', 'prompts.json'}
+        assert not list(artifacts.path.glob('.*.tmp'))
+
+    def test_resolve_rejects_traversal(self, tmp_path):
+        """Download lookups cannot escape the artifact root"""
+        store = ArtifactStore(root=tmp_path / 'apps')
+        (tmp_path / 'secret.txt').write_text('secret')
+
+        assert store.resolve('..', 'secret.txt') is None
+        assert store.resolve('app', '../secret.txt') is None
+        assert store.resolve('missing', 'cv.pdf') is None
+        with pytest.raises(ValueError):
+            store.create_application().write_bytes('../cv.pdf', b'x')
+
+    def test_retention_removes_expired_and_enforces_quotas(self, tmp_path):
+        """Old folders expire and the oldest are trimmed to the count quota"""
+        store = ArtifactStore(root=tmp_path, max_age_seconds=3600, max_total_bytes=0, max_applications=2)
+        folders = []
+        for age in (7200, 1800, 1200, 900, 10):
+            artifacts = store.create_application()
+            artifacts.write_bytes('cv.pdf', b'x' * 10)
+            age_folder(artifacts.path, age)
+            folders.append(artifacts.path)
+
+        summary = store.enforce_retention()
+
+        # Expired (7200s) plus the two oldest over quota; the 10s-old folder is within the grace period
+        assert summary['removed'] == 3
+        assert [path.exists() for path in folders] == [False, False, False, True, True]
+
+    def test_retention_enforces_size_quota(self, tmp_path):
+        """The oldest folders are removed until the total size fits"""
+        store = ArtifactStore(root=tmp_path, max_age_seconds=0, max_total_bytes=25000, max_applications=0)
+        folders = []
+        for age in (3000, 2000, 1000):
+            artifacts = store.create_application()
+            artifacts.write_bytes('cv.pdf', b'x' * 10000)
+            age_folder(artifacts.path, age)
+            folders.append(artifacts.path)
+
+        store.enforce_retention()
+
+        assert [path.exists() for path in folders] == [False, True, True]
@@ -0,0 +1,74 @@
+"""
+Tests for ATSAnalyzer keyword extraction and term counting
+"""
+
+from app.services.ats_analyzer import ATSAnalyzer, term_frequencies
+
+
+class TestTermFrequencies:
+    """Tests for term_frequencies"""
+
+    def test_counts_whole_terms_only(self):
+        """'go' inside 'google' or 'java' inside 'javascript' is not a match"""
+        counts = term_frequencies("Go developer at Google using JavaScript and Java, go!")
+
+        assert counts['go'] == 2
+        assert counts['java'] == 1
+        assert counts['javascript'] == 1
+
+    def test_symbols_compounds_and_latex_escapes(self):
+        """Keyword spellings with symbols survive tokenizing; compounds also count their parts"""
+        counts = term_frequencies(r"\item \textbf{Languages:} C\#/.NET, C++, Node.js and CI/CD.")
+
+        assert counts['c#'] == 1
+        assert counts['.net'] == 1
+        assert counts['c++'] == 1
+        assert counts['ci/cd'] == 1
+        assert (counts['ci'], counts['cd'], counts['node']) == (1, 1, 1)
+
+    def test_phrases_are_counted_on_request(self):
+        """Multi-word terms match across whitespace and LaTeX markup"""
+        text = "Configured a \\textbf{load balancer}; every load\n balancer has health checks"
+
+        counts = term_frequencies(text, ['load balancer', 'health check'])
+
+        assert counts['load balancer'] == 2
+        assert counts['health check'] == 0
+
+
+class TestATSAnalyzerKeywords:
+    """Tests for the keyword pass"""
+
+    def test_job_keywords_prefer_longest_match(self):
+        """'quality assurance' is one keyword, and symbol-bearing terms are found"""
+        keywords = ATSAnalyzer()._extract_job_specific_keywords(
+            "quality  assurance for c++ and .net services; python/java; quality first"
+        )
+
+        assert set(keywords) == {'quality assurance', 'c++', '.net', 'python', 'java', 'quality'}
+        assert 'assurance' not in keywords
+
+    def test_job_keywords_are_ordered_by_frequency(self):
+        """The most frequent terms come first and duplicates collapse"""
+        keywords = ATSAnalyzer()._extract_job_specific_keywords("docker, kubernetes, docker and more docker")
+
+        assert keywords == ['docker', 'kubernetes']
+
+    def test_keyword_density_uses_document_word_count(self):
+        """Counts and densities come from one tokenization of the document"""
+        document = "Python Python AWS terraform " + "filler " * 96
+        analysis = ATSAnalyzer()._analyze_keywords(document, "Python developer on AWS", "Developer", 'devops')
+
+        assert analysis['industry_matches']['python'] == {'count': 2, 'weight': 8, 'density': 2.0}
+        assert analysis['industry_matches']['terraform']['count'] == 1
+        assert 'kubernetes' in analysis['missing_critical_keywords']
+        assert analysis['job_specific_matches'] == {'python': 2, 'aws': 1}
+
+    def test_passive_indicators_are_whole_words(self):
+        """'was' inside 'Washington' does not count as passive voice"""
+        analyzer = ATSAnalyzer()
+        active = analyzer._analyze_readability("Moved to Washington. Built APIs. Led a team. Shipped it.")
+        passive = analyzer._analyze_readability("It was built. They were moved. It was shipped.")
+
+        assert 'Reduce passive voice usage' not in active['recommendations']
+        assert 'Reduce passive voice usage' in passive['recommendations']
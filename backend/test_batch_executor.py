@@ -0,0 +1,130 @@
+"""
+Tests for the bounded-concurrency batch executor
+Jobs are simulated with asyncio.sleep; ATS scoring uses the real analyzer
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.ats_analyzer import ATSAnalyzer
+from app.services.batch_executor import BatchExecutor, StageTimings
+
+
+CV = """\\section{Experience}
+\\begin{itemize}
+\\item Built Python and Java microservices on AWS with Docker and Kubernetes, cutting deploy time by 40\\%
+\\item Led an agile team of 5 developers delivering REST APIs
+\\end{itemize}
+\\section{Skills} Python, Java, React, PostgreSQL, Terraform
+\\section{Education} MSc Computer Science
+"""
+JOB = "Senior Python developer with AWS, Docker, Kubernetes and React experience"
+
+
+def collect(executor, jobs, worker, on_error=None):
+    async def run():
+        return [result async for result in executor.stream(jobs, worker, on_error=on_error)]
+    return asyncio.run(run())
+
+
+class TestBatchExecutor:
+    """Tests for BatchExecutor.stream and summary"""
+
+    def test_concurrency_is_bounded(self):
+        """No more jobs run at once than max_concurrency"""
+        executor = BatchExecutor(max_concurrency=3, ats_workers=0)
+        active = peak = 0
+
+        async def worker(job):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {'job': job}
+
+        results = collect(executor, range(10), worker)
+
+        assert peak == 3
+        assert sorted(r['job'] for r in results) == list(range(10))
+
+    def test_results_stream_in_completion_order(self):
+        """A fast job is yielded before a slow one submitted earlier"""
+        executor = BatchExecutor(max_concurrency=2, ats_workers=0)
+
+        async def worker(delay):
+            await asyncio.sleep(delay)
+            return {'delay': delay}
+
+        results = collect(executor, [0.1, 0.01], worker)
+
+        assert [r['delay'] for r in results] == [0.01, 0.1]
+
+    def test_failed_jobs_are_reported_not_raised(self):
+        """on_error turns an exception into a failed result and the batch continues"""
+        executor = BatchExecutor(max_concurrency=2, ats_workers=0)
+
+        async def worker(job):
+            if job == 1:
+                raise ValueError('boom')
+            return {'job': job}
+
+        results = collect(executor, range(3), worker, on_error=lambda job, e: {'job': job, 'error': str(e)})
+
+        assert {r['job']: r.get('error') for r in results} == {0: None, 1: 'boom', 2: None}
+        summary = executor.summary()
+        assert (summary['successful'], summary['failed'], summary['total_processed']) == (2, 1, 3)
+
+    def test_summary_reports_throughput_and_stage_latency(self):
+        """Stages timed by workers show up next to the per-job total"""
+        executor = BatchExecutor(max_concurrency=4, ats_workers=0)
+
+        async def worker(job):
+            await executor.timed('pdf_compile', asyncio.sleep(0.02))
+            return {'job': job}
+
+        collect(executor, range(8), worker)
+        summary = executor.summary()
+
+        assert summary['jobs_per_minute'] > 0
+        assert set(summary['stages']) == {'pdf_compile', 'total'}
+        assert summary['stages']['pdf_compile']['count'] == 8
+        assert summary['stages']['total']['p95_seconds'] >= summary['stages']['total']['p50_seconds'] >= 0.02
+
+    def test_process_pool_scoring_matches_in_process(self):
+        """Scoring on a worker process gives the same result as ATSAnalyzer"""
+        executor = BatchExecutor(max_concurrency=2, ats_workers=1)
+
+        async def run():
+            return await asyncio.gather(
+                executor.analyze_document(CV, JOB, 'Python Developer', 'cv'),
+                executor.analyze_document(CV, JOB, 'Python Developer', 'cover_letter')
+            )
+
+        try:
+            cv_result, cl_result = asyncio.run(run())
+        finally:
+            executor.close()
+
+        expected = asyncio.run(ATSAnalyzer().analyze_document(CV, JOB, 'Python Developer', 'cv'))
+        assert cv_result.overall_score == expected.overall_score
+        assert cv_result.detailed_scores == expected.detailed_scores
+        assert cl_result.overall_score > 0
+
+
+class TestStageTimings:
+    """Tests for StageTimings.summary"""
+
+    def test_percentiles(self):
+        """p50/p95 use the nearest rank of the sorted durations"""
+        timings = StageTimings()
+        for i in range(1, 101):
+            timings.record('ats_analysis', i / 100)
+
+        stats = timings.summary()['ats_analysis']
+
+        assert stats['count'] == 100
+        assert stats['p50_seconds'] == pytest.approx(0.51)
+        assert stats['p95_seconds'] == pytest.approx(0.96)
+        assert stats['max_seconds'] == pytest.approx(1.0)
@@ -860,5 +860,59 @@ class TestCVTemplateManagerPercentageProperties:
             f"All percentages: {role_percentages}"
 
 
+
+class TestRoleAnalysisCacheProperties:
+    """Property-based tests for memoized role analysis"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.manager = CVTemplateManager()
+    
+    @settings(max_examples=50)
+    @given(diverse_job_descriptions_generator())
+    def test_cached_analysis_matches_individual_getters(self, job_data):
+        """
+        Property: The cached RoleAnalysis agrees with every public scoring getter
+        Feature: intelligent-cv-template-selection, Property 22: Template Selection by Highest Percentage
+        Validates: Requirements 10.7
+        """
+        job_description, _ = job_data
+        
+        analysis = self.manager.analyze(job_description)
+        
+        assert self.manager.analyze(job_description) is analysis, \
+            "Repeated analysis of the same description should be served from cache"
+        assert self.manager.analyze_job_role(job_description) == analysis.selected_role
+        assert self.manager.get_role_scores(job_description) == analysis.scores
+        assert self.manager.get_role_percentages(job_description) == analysis.percentages
+        assert self.manager.get_role_breakdown(job_description) == analysis.breakdown
+    
+    def test_getter_results_do_not_mutate_cache(self):
+        """
+        Property: Mutating returned scores must not change the cached analysis
+        Feature: intelligent-cv-template-selection, Property 22: Template Selection by Highest Percentage
+        Validates: Requirements 10.7
+        """
+        job_description = "DevOps Engineer with Kubernetes, Terraform, AWS and CI/CD experience."
+        
+        scores = self.manager.get_role_scores(job_description)
+        scores['devops_cloud'] = -1.0
+        
+        assert self.manager.analyze(job_description).scores.get('devops_cloud') != -1.0
+    
+    def test_analysis_cache_is_bounded(self):
+        """
+        Property: The analysis cache never grows beyond its configured size
+        Feature: intelligent-cv-template-selection, Property 22: Template Selection by Highest Percentage
+        Validates: Requirements 10.7
+        """
+        self.manager.ANALYSIS_CACHE_SIZE = 3
+        
+        for i in range(10):
+            self.manager.analyze(f"Android developer with Kotlin experience, posting {i}")
+        
+        assert len(self.manager._analysis_cache) == 3
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
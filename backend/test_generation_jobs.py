@@ -0,0 +1,161 @@
+"""
+Tests for the background generation job queue
+"""
+
+import threading
+import time
+
+from generation_jobs import GenerationJobQueue
+
+
+def wait_for(queue, job_id, timeout=5.0):
+    """Poll until the job reaches a terminal status"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job and job['status'] in ('succeeded', 'failed'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def staged_runner(payload, report_stage):
+    """Runner reporting two stages and echoing the payload"""
+    report_stage('building_documents')
+    report_stage('compiling_pdfs')
+    if payload.get('fail'):
+        return {'error': 'CV PDF compilation failed'}, 500
+    return {'success': True, 'company': payload['company']}, 200
+
+
+class TestGenerationJobQueue:
+    """Tests for job submission, progress and persistence"""
+
+    def test_submit_returns_immediately_and_records_stages(self, tmp_path):
+        """Jobs run in the background and expose each stage and the result"""
+        release = threading.Event()
+
+        def slow_runner(payload, report_stage):
+            release.wait(5)
+            return staged_runner(payload, report_stage)
+
+        queue = GenerationJobQueue(slow_runner, db_path=tmp_path / 'jobs.sqlite3')
+        job_id = queue.submit({'company': 'Volvo'})
+
+        assert queue.get(job_id)['status'] in ('queued', 'running')
+        release.set()
+
+        job = wait_for(queue, job_id)
+        assert job['status'] == 'succeeded'
+        assert job['result'] == {'success': True, 'company': 'Volvo'}
+        assert [entry['stage'] for entry in job['stages']] == ['building_documents', 'compiling_pdfs']
+        queue.shutdown()
+
+    def test_error_status_marks_job_failed(self, tmp_path):
+        """A runner returning an HTTP error status fails the job with its message"""
+        queue = GenerationJobQueue(staged_runner, db_path=tmp_path / 'jobs.sqlite3')
+        job = wait_for(queue, queue.submit({'fail': True}))
+
+        assert job['status'] == 'failed'
+        assert job['error'] == 'CV PDF compilation failed'
+        queue.shutdown()
+
+    def test_runner_exception_marks_job_failed(self, tmp_path):
+        """Exceptions inside the pipeline are recorded instead of lost"""
+        def broken_runner(payload, report_stage):
+            raise RuntimeError('boom')
+
+        queue = GenerationJobQueue(broken_runner, db_path=tmp_path / 'jobs.sqlite3')
+        job = wait_for(queue, queue.submit({}))
+
+        assert job['status'] == 'failed'
+        assert job['error'] == 'boom'
+        queue.shutdown()
+
+    def test_unfinished_jobs_resume_after_restart(self, tmp_path):
+        """Queued jobs and jobs orphaned by a dead worker run when a new queue starts"""
+        db_path = tmp_path / 'jobs.sqlite3'
+        blocked = GenerationJobQueue(staged_runner, db_path=db_path, max_workers=1)
+        blocked._executor.shutdown()
+
+        queued_id = 'a' * 32
+        orphaned_id = 'b' * 32
+        with blocked._connect() as conn:
+            for job_id, status, pid in ((queued_id, 'queued', None), (orphaned_id, 'running', 2 ** 22 + 1)):
+                conn.execute(
+                    "INSERT INTO generation_jobs (job_id, status, payload, worker_pid, created_at, updated_at) "
+                    "VALUES (?, ?, '{\"company\": \"Saab\"}', ?, ?, ?)",
+                    (job_id, status, pid, time.time(), time.time())
+                )
+
+        restarted = GenerationJobQueue(staged_runner, db_path=db_path)
+        assert wait_for(restarted, queued_id)['status'] == 'succeeded'
+        assert wait_for(restarted, orphaned_id)['result']['company'] == 'Saab'
+        assert restarted.get_stats() == {'succeeded': 2}
+        restarted.shutdown()
+
+    def test_unknown_job_returns_none(self, tmp_path):
+        """Polling an unknown id returns None"""
+        queue = GenerationJobQueue(staged_runner, db_path=tmp_path / 'jobs.sqlite3')
+
+        assert queue.get('missing') is None
+        queue.shutdown()
+
+
+class TestGenerationJobEvents:
+    """Tests for the time-boxed SSE progress stream"""
+
+    def test_stream_ends_with_done_event(self, tmp_path):
+        """A finished job yields its final state as a 'done' event carrying an id"""
+        queue = GenerationJobQueue(staged_runner, db_path=tmp_path / 'jobs.sqlite3')
+        job_id = queue.submit({'company': 'Volvo'})
+        job = wait_for(queue, job_id)
+
+        messages = list(queue.iter_events(job_id, poll_interval=0.01))
+
+        assert messages[0].startswith('retry: ')
+        assert messages[-1].startswith(f"id: {job['updatedAt']}\nevent: done\n")
+        queue.shutdown()
+
+    def test_stream_is_capped_with_heartbeats(self, tmp_path):
+        """A long-running job's stream sends heartbeats and closes at max_seconds"""
+        release = threading.Event()
+
+        def slow_runner(payload, report_stage):
+            release.wait(5)
+            return staged_runner(payload, report_stage)
+
+        queue = GenerationJobQueue(slow_runner, db_path=tmp_path / 'jobs.sqlite3')
+        job_id = queue.submit({'company': 'Volvo'})
+
+        start = time.monotonic()
+        messages = list(queue.iter_events(job_id, max_seconds=0.3, heartbeat_seconds=0.1, poll_interval=0.02))
+
+        assert time.monotonic() - start < 1.0
+        assert ': keepalive\n\n' in messages
+        assert not any('event: done' in message for message in messages)
+        release.set()
+        wait_for(queue, job_id)
+        queue.shutdown()
+
+    def test_reconnect_skips_state_already_sent(self, tmp_path):
+        """A client reconnecting with Last-Event-ID only gets newer states"""
+        release = threading.Event()
+
+        def slow_runner(payload, report_stage):
+            report_stage('building_documents')
+            release.wait(5)
+            return staged_runner(payload, report_stage)
+
+        queue = GenerationJobQueue(slow_runner, db_path=tmp_path / 'jobs.sqlite3')
+        job_id = queue.submit({})
+        while queue.get(job_id)['stage'] != 'building_documents':
+            time.sleep(0.01)
+        seen = str(queue.get(job_id)['updatedAt'])
+
+        messages = list(queue.iter_events(job_id, last_event_id=seen, max_seconds=0.1, poll_interval=0.02))
+
+        assert not any(message.startswith('id:') for message in messages)
+        release.set()
+        wait_for(queue, job_id)
+        queue.shutdown()
@@ -0,0 +1,191 @@
+"""
+Tests for GmailService batched searches, batched message fetches and the message cache
+Uses an in-memory stand-in for the Gmail API client, so no credentials are needed
+"""
+
+import asyncio
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import gmail_service
+from app.services.gmail_service import GMAIL_BATCH_SIZE, GmailService
+
+
+def make_message(message_id, subject='Weekly update', body='Nothing to see here'):
+    """Full-format Gmail message with a plain-text body"""
+    return {
+        'id': message_id,
+        'threadId': f'thread-{message_id}',
+        'snippet': body[:20],
+        'payload': {
+            'headers': [
+                {'name': 'Subject', 'value': subject},
+                {'name': 'From', 'value': 'jobs@volvo.com'},
+                {'name': 'Date', 'value': 'Mon, 6 Jan 2025 08:00:00 +0000'}
+            ],
+            'mimeType': 'text/plain',
+            'body': {'data': base64.urlsafe_b64encode(body.encode()).decode()}
+        }
+    }
+
+
+class FakeBatch:
+    """Records add() calls and answers each request through the batch callback"""
+
+    def __init__(self, api, callback):
+        self.api = api
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.api.batches.append([request_id for request_id, _ in self.requests])
+        for request_id, (method, kwargs) in self.requests:
+            if request_id in self.api.failing:
+                self.callback(request_id, None, RuntimeError(f'{request_id} failed'))
+            elif method == 'list':
+                ids = self.api.search_results.get(kwargs['q'], [])
+                self.callback(request_id, {'messages': [{'id': message_id} for message_id in ids]}, None)
+            else:
+                self.api.fetched.append(kwargs['id'])
+                self.callback(request_id, make_message(kwargs['id']), None)
+
+
+class FakeGmailApi:
+    """Minimal users().messages() surface of the Gmail client"""
+
+    def __init__(self):
+        self.batches = []
+        self.fetched = []
+        self.failing = set()
+        self.search_results = {}
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def list(self, **kwargs):
+        return ('list', kwargs)
+
+    def get(self, **kwargs):
+        return ('get', kwargs)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+@pytest.fixture(autouse=True)
+def empty_message_cache():
+    """Each test starts with an empty module-level message cache"""
+    gmail_service._message_cache.clear()
+    yield
+    gmail_service._message_cache.clear()
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Fake Gmail client returned by googleapiclient's build()"""
+    fake = FakeGmailApi()
+    monkeypatch.setattr(gmail_service, 'build', lambda *args, **kwargs: fake)
+    return fake
+
+
+def make_service(refresh_token='token-a'):
+    return GmailService(SimpleNamespace(refresh_token=refresh_token, token=None))
+
+
+class TestBatchedSearches:
+    """Tests for _list_message_ids_batch"""
+
+    def test_searches_share_one_batch(self, api):
+        """All searches are added to a single batch request"""
+        api.search_results = {'q-linkedin': ['m1', 'm2'], 'q-general': ['m2', 'm3']}
+
+        ids = make_service()._list_message_ids_batch(
+            {'linkedin': 'q-linkedin', 'indeed': 'q-indeed', 'general': 'q-general'}, 25
+        )
+
+        assert api.batches == [['linkedin', 'indeed', 'general']]
+        assert ids == {'linkedin': ['m1', 'm2'], 'indeed': [], 'general': ['m2', 'm3']}
+
+    def test_failed_search_does_not_drop_the_others(self, api):
+        """A per-request error leaves only that search empty"""
+        api.search_results = {'q-linkedin': ['m1'], 'q-general': ['m3']}
+        api.failing = {'indeed'}
+
+        ids = make_service()._list_message_ids_batch(
+            {'linkedin': 'q-linkedin', 'indeed': 'q-indeed', 'general': 'q-general'}, 25
+        )
+
+        assert ids == {'linkedin': ['m1'], 'indeed': [], 'general': ['m3']}
+
+
+class TestBatchedMessageFetch:
+    """Tests for _fetch_messages_batch and _get_email_details_many"""
+
+    def test_fetches_are_split_into_gmail_sized_batches(self, api):
+        """Message gets are grouped in batches of at most GMAIL_BATCH_SIZE"""
+        ids = [f'm{i}' for i in range(2 * GMAIL_BATCH_SIZE + 20)]
+
+        messages = make_service()._fetch_messages_batch(ids)
+
+        assert [len(batch) for batch in api.batches] == [GMAIL_BATCH_SIZE, GMAIL_BATCH_SIZE, 20]
+        assert set(messages) == set(ids)
+
+    def test_failed_message_is_skipped_and_not_cached(self, api):
+        """A message whose get fails is left out and fetched again next time"""
+        service = make_service()
+        api.failing = {'m2'}
+
+        details = asyncio.run(service._get_email_details_many(['m1', 'm2']))
+        assert set(details) == {'m1'}
+
+        api.failing = set()
+        details = asyncio.run(service._get_email_details_many(['m1', 'm2']))
+        assert set(details) == {'m1', 'm2'}
+        assert api.fetched == ['m1', 'm2']
+
+    def test_duplicate_ids_are_fetched_once(self, api):
+        """Repeated ids in one call cost a single get"""
+        details = asyncio.run(make_service()._get_email_details_many(['m1', 'm1', 'm2', 'm1']))
+
+        assert api.fetched == ['m1', 'm2']
+        assert details['m1']['subject'] == 'Weekly update'
+
+    def test_cache_hits_skip_the_api(self, api):
+        """Messages parsed once are served from the cache, per mailbox"""
+        asyncio.run(make_service()._get_email_details_many(['m1', 'm2']))
+        api.batches.clear()
+
+        asyncio.run(make_service()._get_email_details_many(['m1', 'm2']))
+        assert api.batches == []
+
+        asyncio.run(make_service('token-b')._get_email_details_many(['m1']))
+        assert api.batches == [['m1']]
+
+
+class TestSearchJobEmails:
+    """Tests for the batched search_job_emails pipeline"""
+
+    def test_messages_found_by_several_searches_are_fetched_once(self, api, monkeypatch):
+        """Ids shared by searches are fetched once, in a single batch"""
+        service = make_service()
+        monkeypatch.setattr(service, '_list_message_ids_batch', lambda queries, max_results: {
+            'linkedin': ['m1'], 'indeed': [], 'general': ['m1', 'm2']
+        })
+
+        async def no_alert_jobs(email_data):
+            return []
+
+        monkeypatch.setattr(service, '_parse_linkedin_job_email', no_alert_jobs)
+
+        asyncio.run(service.search_job_emails(['engineer']))
+
+        assert api.fetched == ['m1', 'm2']
+        assert api.batches == [['m1', 'm2']]
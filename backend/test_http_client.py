@@ -0,0 +1,119 @@
+"""
+Tests for the shared pooled HTTP client
+Runs against a local aiohttp server
+"""
+
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services.http_client import HostLimit, HttpClient, TokenBucket, parse_host_limits
+
+
+async def serve(handler_state):
+    """Start a local server that tracks concurrent requests"""
+    async def handler(request):
+        handler_state['active'] += 1
+        handler_state['peak'] = max(handler_state['peak'], handler_state['active'])
+        await asyncio.sleep(0.05)
+        handler_state['active'] -= 1
+        if request.path == '/missing':
+            return web.Response(status=404)
+        return web.json_response({'ok': True})
+
+    app = web.Application()
+    app.router.add_get('/{tail:.*}', handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+class TestTokenBucket:
+    """Tests for the rate limiter arithmetic"""
+
+    def test_burst_is_free_then_requests_are_spaced(self):
+        """The first ``burst`` reservations are immediate, later ones wait 1/rate each"""
+        bucket = TokenBucket(rate=10.0, burst=2)
+
+        delays = [bucket.reserve() for _ in range(4)]
+
+        assert delays[:2] == [0.0, 0.0]
+        assert 0.09 < delays[2] < 0.11
+        assert 0.19 < delays[3] < 0.21
+
+
+class TestHttpClient:
+    """Tests for pooling, per-host limits and metrics"""
+
+    def test_limit_lookup_uses_most_specific_suffix(self):
+        """Subdomains inherit the budget of their configured parent domain"""
+        client = HttpClient(host_limits={
+            'linkedin.com': HostLimit(0.5, 2, 2),
+            'api.linkedin.com': HostLimit(5, 5, 5)
+        })
+
+        assert client.limit_for('www.linkedin.com').rate == 0.5
+        assert client.limit_for('api.linkedin.com').rate == 5
+        assert client.limit_for('example.org') == client.default_limit
+
+    def test_parse_host_limits_skips_invalid_entries(self):
+        """HTTP_HOST_LIMITS entries are host=rate:burst:concurrency"""
+        limits = parse_host_limits('indeed.com=1:2:3, broken, linkedin.com=0.5:1:1')
+
+        assert limits == {'indeed.com': HostLimit(1.0, 2, 3), 'linkedin.com': HostLimit(0.5, 1, 1)}
+
+    def test_concurrency_cap_and_stats(self):
+        """Concurrent requests stay within the host's cap and are counted per host"""
+        state = {'active': 0, 'peak': 0}
+
+        async def run():
+            server = await serve(state)
+            client = HttpClient(default_limit=HostLimit(rate=1000, burst=1000, concurrency=2))
+            try:
+                async with client.session(headers={'User-Agent': 'test'}) as session:
+                    async def fetch(path):
+                        async with session.get(str(server.make_url(path)), timeout=5) as response:
+                            return response.status
+
+                    statuses = await asyncio.gather(*(fetch('/ok') for _ in range(6)), fetch('/missing'))
+            finally:
+                await client.close()
+                await server.close()
+            return statuses, client.get_stats()
+
+        statuses, stats = asyncio.run(run())
+
+        assert statuses == [200] * 6 + [404]
+        assert state['peak'] == 2
+        host_stats = stats['127.0.0.1']
+        assert host_stats['requests'] == 7
+        assert host_stats['http_errors'] == 1
+        assert host_stats['errors'] == 0
+        assert host_stats['in_flight'] == 0
+
+    def test_rate_limit_paces_requests(self):
+        """Requests beyond the burst wait for tokens instead of a fixed sleep"""
+        state = {'active': 0, 'peak': 0}
+
+        async def run():
+            server = await serve(state)
+            client = HttpClient(default_limit=HostLimit(rate=20, burst=1, concurrency=10))
+            try:
+                async with client.session() as session:
+                    async def fetch():
+                        async with session.get(str(server.make_url('/ok'))) as response:
+                            return await response.json()
+
+                    start = time.perf_counter()
+                    await asyncio.gather(*(fetch() for _ in range(5)))
+                    return time.perf_counter() - start
+            finally:
+                await client.close()
+                await server.close()
+
+        elapsed = asyncio.run(run())
+
+        # Four waits of 1/20 s after the first free token
+        assert elapsed >= 0.19
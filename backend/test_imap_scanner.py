@@ -0,0 +1,199 @@
+"""
+Tests for the shared incremental IMAP scanner
+Uses an in-memory stand-in for imaplib so no mail server is needed
+"""
+
+import asyncio
+import re
+
+from app.services.imap_scanner import ImapScanner
+
+
+def make_message(subject, sender='alerts@example.com', body='Apply now'):
+    """Raw RFC 822 bytes for a simple message"""
+    return (f"Subject: {subject}\r\nFrom: {sender}\r\nDate: Mon, 1 Jan 2024 06:00:00 +0000\r\n\r\n{body}\r\n").encode()
+
+
+class FakeImap:
+    """Minimal imaplib.IMAP4 stand-in recording the commands it receives"""
+
+    def __init__(self, mailbox, uidvalidity=b'1'):
+        self.mailbox = mailbox
+        self.uidvalidity = uidvalidity
+        self.commands = []
+        self.logged_in = False
+        self.failing_fetches = set()
+        self.missing_bodies = set()
+
+    def login(self, user, password):
+        self.logged_in = True
+        return 'OK', [b'Logged in']
+
+    def noop(self):
+        return 'OK', [b'']
+
+    def logout(self):
+        return 'BYE', [b'']
+
+    def select(self, mailbox, readonly=False):
+        self.commands.append(('SELECT', mailbox, readonly))
+        return 'OK', [str(len(self.mailbox)).encode()]
+
+    def response(self, code):
+        return code, [self.uidvalidity]
+
+    def uid(self, command, *args):
+        self.commands.append((command,) + args)
+        if command == 'SEARCH':
+            query = args[1]
+            lowest = 1
+            match = re.match(r'\(UID (\d+):\* (.*)\)$', query)
+            if match:
+                lowest, query = int(match.group(1)), match.group(2)
+            keyword = re.search(r'"([^"]+)"', query).group(1).lower()
+            uids = [uid for uid, raw in sorted(self.mailbox.items()) if uid >= lowest and keyword in raw.lower().decode()]
+            if match and not uids and self.mailbox:
+                # "n:*" always includes the highest UID
+                uids = [max(self.mailbox)]
+            return 'OK', [' '.join(str(uid) for uid in uids).encode()]
+
+        if command == 'FETCH':
+            uid_set, parts = args
+            uids = [int(value) for value in uid_set.split(',')]
+            if self.failing_fetches & set(uids):
+                return 'NO', [b'FETCH failed']
+            data = []
+            for uid in uids:
+                if uid in self.missing_bodies and 'HEADER.FIELDS' not in parts:
+                    continue
+                raw = self.mailbox[uid]
+                if 'HEADER.FIELDS' in parts:
+                    raw = raw.split(b'\r\n\r\n')[0] + b'\r\n\r\n'
+                data.append((f'{uid} (UID {uid} {parts} {{{len(raw)}}}'.encode(), raw))
+                data.append(b')')
+            return 'OK', data
+
+        raise AssertionError(f"Unexpected command {command}")
+
+
+def build_scanner(tmp_path, mailbox):
+    """Scanner wired to one FakeImap connection"""
+    connections = []
+
+    def factory():
+        conn = FakeImap(mailbox)
+        connections.append(conn)
+        return conn
+
+    scanner = ImapScanner('user', 'secret', state_path=tmp_path / 'watermarks.json', connection_factory=factory)
+    return scanner, connections
+
+
+class TestImapScanner:
+    """Tests for de-duplication, batching and UID watermarks"""
+
+    def test_overlapping_criteria_fetch_each_message_once(self, tmp_path):
+        """Messages matched by several criteria are fetched in one batched FETCH"""
+        mailbox = {
+            1: make_message('Job alert: developer'),
+            2: make_message('Newsletter'),
+            3: make_message('Developer job in Gothenburg')
+        }
+        scanner, connections = build_scanner(tmp_path, mailbox)
+
+        messages = scanner.scan_blocking('test', {'job': '(SUBJECT "job")', 'dev': '(SUBJECT "developer")'})
+
+        assert [message.uid for message in messages] == [1, 3]
+        assert messages[0].labels == ['job', 'dev']
+        assert messages[1].message.get_payload().strip() == 'Apply now'
+        fetches = [command for command in connections[0].commands if command[0] == 'FETCH']
+        assert fetches == [('FETCH', '1,3', '(BODY.PEEK[])')]
+        assert ('SELECT', 'INBOX', True) in connections[0].commands
+
+    def test_header_filter_skips_body_fetch(self, tmp_path):
+        """Messages rejected on headers never have their bodies fetched"""
+        mailbox = {1: make_message('Job alert'), 2: make_message('Job spam casino')}
+        scanner, connections = build_scanner(tmp_path, mailbox)
+
+        messages = scanner.scan_blocking(
+            'test', {'job': '(SUBJECT "job")'}, header_filter=lambda message: 'casino' not in message.subject
+        )
+
+        assert [message.uid for message in messages] == [1]
+        assert messages[0].subject == 'Job alert'
+        fetches = [command[1:] for command in connections[0].commands if command[0] == 'FETCH']
+        assert fetches[0][0] == '1,2' and 'HEADER.FIELDS' in fetches[0][1]
+        assert fetches[1] == ('1', '(BODY.PEEK[])')
+        assert scanner.get_stats()['bodies_fetched'] == 1
+
+    def test_watermark_limits_next_scan_to_new_messages(self, tmp_path):
+        """A second scan reuses the connection and only returns newer UIDs"""
+        mailbox = {1: make_message('Job one'), 2: make_message('Job two')}
+        scanner, connections = build_scanner(tmp_path, mailbox)
+        criteria = {'job': '(SUBJECT "job")'}
+
+        assert len(scanner.scan_blocking('test', criteria)) == 2
+        assert scanner.scan_blocking('test', criteria) == []
+
+        mailbox[3] = make_message('Job three')
+        assert [message.uid for message in scanner.scan_blocking('test', criteria)] == [3]
+        assert len(connections) == 1
+
+        # Watermarks survive a restart and are kept per consumer
+        restarted, _ = build_scanner(tmp_path, mailbox)
+        assert restarted.scan_blocking('test', criteria) == []
+        assert len(restarted.scan_blocking('other', criteria)) == 3
+
+    def test_limit_keeps_newest_matches_per_criterion(self, tmp_path):
+        """limit keeps the newest N new matches of every criterion"""
+        mailbox = {uid: make_message(f'Job {uid}') for uid in range(1, 6)}
+        scanner, _ = build_scanner(tmp_path, mailbox)
+
+        messages = asyncio.run(scanner.scan('test', {'job': '(SUBJECT "job")'}, limit=2, incremental=False))
+
+        assert [message.uid for message in messages] == [4, 5]
+        assert scanner.get_stats()['watermarks'] == {}
+
+    def test_incremental_limit_pages_forward(self, tmp_path):
+        """An incremental scan with a limit takes the oldest new matches and continues next run"""
+        mailbox = {uid: make_message(f'Job {uid}') for uid in range(1, 6)}
+        scanner, _ = build_scanner(tmp_path, mailbox)
+        criteria = {'job': '(SUBJECT "job")'}
+
+        runs = [[message.uid for message in scanner.scan_blocking('test', criteria, limit=2)] for _ in range(4)]
+
+        assert runs == [[1, 2], [3, 4], [5], []]
+
+    def test_failed_fetch_holds_the_watermark(self, tmp_path):
+        """Messages whose FETCH failed are retried by the next incremental scan"""
+        mailbox = {uid: make_message(f'Job {uid}') for uid in range(1, 5)}
+        scanner, connections = build_scanner(tmp_path, mailbox)
+        criteria = {'job': '(SUBJECT "job")'}
+
+        scanner.scan_blocking('test', criteria)
+        assert scanner.get_stats()['watermarks']['test:user:INBOX']['last_uid'] == 4
+
+        for uid in range(5, 9):
+            mailbox[uid] = make_message(f'Job {uid}')
+        connections[0].missing_bodies = {6}
+        assert [message.uid for message in scanner.scan_blocking('test', criteria)] == [5, 7, 8]
+        assert scanner.get_stats()['watermarks']['test:user:INBOX']['last_uid'] == 5
+
+        connections[0].missing_bodies = set()
+        assert [message.uid for message in scanner.scan_blocking('test', criteria)] == [6, 7, 8]
+        assert scanner.get_stats()['watermarks']['test:user:INBOX']['last_uid'] == 8
+
+    def test_failed_header_chunk_holds_the_watermark(self, tmp_path):
+        """A rejected header FETCH leaves its messages for the next scan"""
+        mailbox = {1: make_message('Job one'), 2: make_message('Job two')}
+        scanner, connections = build_scanner(tmp_path, mailbox)
+        criteria = {'job': '(SUBJECT "job")'}
+        keep_all = lambda message: True
+
+        assert scanner.scan_blocking('other', {'none': '(SUBJECT "nothing")'}) == []
+        connections[0].failing_fetches = {1}
+        assert scanner.scan_blocking('test', criteria, header_filter=keep_all) == []
+        assert 'test:user:INBOX' not in scanner.get_stats()['watermarks']
+
+        connections[0].failing_fetches = set()
+        assert [message.uid for message in scanner.scan_blocking('test', criteria, header_filter=keep_all)] == [1, 2]
@@ -0,0 +1,147 @@
+"""
+Tests for JobAggregationService's per-source query planner and fan-out search
+Source searches, user loading and saving are stubbed, so no network or database is used
+"""
+
+import asyncio
+from collections import Counter, defaultdict
+
+import pytest
+
+from app.services.job_aggregation_service import JobAggregationService, JobSearchRequest, PlannedSearch
+
+SOURCES = ["google", "indeed", "arbetsformedlingen", "linkedin", "gmail"]
+
+
+class FanoutHarness:
+    """Stubs the service's I/O and records what the fan-out does"""
+
+    def __init__(self, service, results=None, delay=0.01):
+        self.service = service
+        self.results = results or {}
+        self.delay = delay
+        self.searches = []
+        self.saves = []
+        self.active = defaultdict(int)
+        self.peak = defaultdict(int)
+
+        service._load_user = self.load_user
+        service._run_source_search = self.run_source_search
+        service._process_jobs = self.process_jobs
+        service._save_search_results = self.save_search_results
+
+    async def load_user(self, user_id):
+        return {"_id": user_id, "gmail_credentials": {"token": "gmail-token"}}
+
+    async def run_source_search(self, planned, template, user_id, user):
+        self.searches.append(planned)
+        self.active[planned.source] += 1
+        self.peak[planned.source] = max(self.peak[planned.source], self.active[planned.source])
+        await asyncio.sleep(self.delay)
+        self.active[planned.source] -= 1
+        return [dict(job) for job in self.results.get(planned, [])]
+
+    async def process_jobs(self, jobs, search_request, user_id, scoring_context=None):
+        return jobs
+
+    async def save_search_results(self, jobs, search_request, user_id):
+        self.saves.append((list(jobs), search_request))
+
+
+@pytest.fixture
+def service():
+    return JobAggregationService()
+
+
+def job(title, score, source="google"):
+    return {"title": title, "company": "Volvo", "location": "Göteborg", "source": source, "match_score": score}
+
+
+class TestPlanSearches:
+    """Tests for plan_searches"""
+
+    def test_location_sources_cover_every_query_and_location(self, service):
+        """Location-aware sources get one search per query x location"""
+        plan = service.plan_searches(["python", "devops"], ["Göteborg", "Stockholm"], ["google", "linkedin"])
+
+        assert len(plan) == 8
+        assert PlannedSearch("linkedin", "devops", "Stockholm") in plan
+
+    def test_gmail_is_searched_once_per_query(self, service):
+        """Gmail ignores the location, so it is planned once per query"""
+        plan = service.plan_searches(["python", "devops"], ["Göteborg", "Stockholm", "Malmö"], ["gmail"])
+
+        assert plan == [PlannedSearch("gmail", "python", ""), PlannedSearch("gmail", "devops", "")]
+
+    def test_duplicate_queries_and_locations_are_planned_once(self, service):
+        """Repeated inputs do not produce repeated searches"""
+        plan = service.plan_searches(["python", "python"], ["Göteborg", "Göteborg"], ["indeed", "gmail"])
+
+        assert plan == [PlannedSearch("indeed", "python", "Göteborg"), PlannedSearch("gmail", "python", "")]
+
+
+class TestSearchJobsFanout:
+    """Tests for search_jobs_fanout"""
+
+    def test_runs_each_planned_search_once(self, service):
+        """Every source is searched per the plan, with Gmail once per query"""
+        harness = FanoutHarness(service)
+        queries, locations = ["python", "devops"], ["Göteborg", "Stockholm", "Malmö"]
+
+        asyncio.run(service.search_jobs_fanout(JobSearchRequest(query=""), queries, locations, "user-1"))
+
+        counts = Counter(planned.source for planned in harness.searches)
+        assert counts == {"google": 6, "indeed": 6, "arbetsformedlingen": 6, "linkedin": 6, "gmail": 2}
+        assert len(set(harness.searches)) == len(harness.searches)
+
+    def test_per_source_concurrency_limits_hold(self, service):
+        """No source runs more searches at once than SOURCE_CONCURRENCY allows"""
+        harness = FanoutHarness(service, delay=0.02)
+        queries, locations = [f"query {i}" for i in range(4)], ["Göteborg", "Stockholm"]
+
+        asyncio.run(service.search_jobs_fanout(JobSearchRequest(query=""), queries, locations, "user-1"))
+
+        for source in SOURCES:
+            assert 1 <= harness.peak[source] <= service.SOURCE_CONCURRENCY[source]
+        assert harness.peak["arbetsformedlingen"] > 1
+
+    def test_duplicates_keep_the_best_score_and_save_once(self, service):
+        """A job found by several searches keeps its best-scoring copy and the run is saved once"""
+        results = {
+            PlannedSearch("google", "python", "Göteborg"): [job("Backend Engineer", 0.4), job("Data Engineer", 0.5)],
+            PlannedSearch("indeed", "devops", "Göteborg"): [job("Backend Engineer", 0.9, source="indeed")],
+            PlannedSearch("linkedin", "python", "Göteborg"): [job("backend engineer ", 0.6, source="linkedin")],
+        }
+        harness = FanoutHarness(service, results)
+
+        jobs = asyncio.run(service.search_jobs_fanout(
+            JobSearchRequest(query=""), ["python", "devops"], ["Göteborg"], "user-1"
+        ))
+
+        assert [(found["title"], found["match_score"]) for found in jobs] == [
+            ("Backend Engineer", 0.9), ("Data Engineer", 0.5)
+        ]
+        assert jobs[0]["source"] == "indeed"
+        assert len(harness.saves) == 1
+        saved_jobs, summary_request = harness.saves[0]
+        assert saved_jobs == jobs
+        assert summary_request.query == "python, devops"
+
+    def test_failed_search_does_not_abort_the_run(self, service):
+        """An exception from one source search is logged and the others still count"""
+        harness = FanoutHarness(service, {
+            PlannedSearch("google", "python", "Göteborg"): [job("Backend Engineer", 0.4)]
+        })
+        run_source_search = harness.run_source_search
+
+        async def flaky(planned, template, user_id, user):
+            if planned.source == "indeed":
+                raise RuntimeError("indeed is down")
+            return await run_source_search(planned, template, user_id, user)
+
+        service._run_source_search = flaky
+
+        jobs = asyncio.run(service.search_jobs_fanout(JobSearchRequest(query=""), ["python"], ["Göteborg"], "user-1"))
+
+        assert [found["title"] for found in jobs] == ["Backend Engineer"]
+        assert len(harness.saves) == 1
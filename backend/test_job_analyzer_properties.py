@@ -431,5 +431,58 @@ class TestMultiWordKeywordProperties:
             f"Keyword with special characters '{keyword}' should be found correctly"
 
 
+
+class TestKeywordMatcherProperties:
+    """Property-based tests for the single-pass keyword matcher"""
+    
+    ROLE_CATEGORIES = {
+        'dotnet_developer': {'keywords': ['.net', 'asp.net', '.net core', 'c#', 'backend .net'], 'priority': 1},
+        'fullstack_developer': {'keywords': ['full stack', 'full-stack', 'react', 'next.js'], 'priority': 2},
+        'devops_cloud': {'keywords': ['ci/cd', 'kubernetes', 'azure kubernetes', 'devops'], 'priority': 3},
+        'empty_role': {'keywords': [], 'priority': 4}
+    }
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.analyzer = JobAnalyzer()
+    
+    @settings(max_examples=200)
+    @given(tokens=st.lists(
+        st.sampled_from([
+            '.net', 'asp.net', '.NET Core', 'c#', 'backend', 'full', 'stack', 'full-stack',
+            'React', 'next.js', 'ci/cd', 'azure', 'kubernetes', 'devops', 'net', 'c',
+            '#', '.', '/', '-', '_', 'x1', ',', '\n'
+        ]),
+        min_size=1, max_size=60
+    ), separator=st.sampled_from([' ', '', '.', '_']))
+    def test_single_pass_matches_per_role_extraction(self, tokens, separator):
+        """
+        Property: The single-pass matcher returns exactly the per-role regex extraction results
+        Feature: intelligent-cv-template-selection, Property 1: Keyword Extraction Completeness
+        Validates: Requirements 1.1, 1.4, 1.5
+        """
+        text = separator.join(tokens)
+        
+        single_pass = self.analyzer.identify_role_indicators(text, self.ROLE_CATEGORIES)
+        per_role = self.analyzer._identify_role_indicators_per_role(text, self.ROLE_CATEGORIES)
+        
+        assert single_pass == per_role, \
+            f"Single-pass matcher disagrees with per-role extraction for '{text}'"
+    
+    def test_overlapping_keywords_counted_independently(self):
+        """
+        Property: Keywords nested inside longer keywords are still counted on their own
+        Feature: intelligent-cv-template-selection, Property 6: Multi-word Keyword Support
+        Validates: Requirements 4.5
+        """
+        text = "Azure Kubernetes and kubernetes for our full-stack React and full stack teams"
+        
+        result = self.analyzer.identify_role_indicators(text, self.ROLE_CATEGORIES)
+        
+        assert 'empty_role' not in result
+        assert result['devops_cloud'] == {'azure kubernetes': 1, 'kubernetes': 2}
+        assert result['fullstack_developer'] == {'full stack': 1, 'full-stack': 1, 'react': 1}
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,214 @@
+"""
+Tests for the shared LatexCompiler pool
+Uses a stand-in engine script so the tests run without a TeX installation
+"""
+
+import asyncio
+import stat
+import sys
+import textwrap
+import threading
+
+import pytest
+from app.services.latex_compiler import LatexCompiler, PdfCache
+
+
+FAKE_ENGINE = textwrap.dedent('''\
+    #!{python}
+    import os, sys, time
+    if sys.argv[1:] == ['--version']:
+        print(os.environ.get('FAKE_TEX_VERSION', 'FakeTeX 1.0'))
+        sys.exit(0)
+    output_dir = sys.argv[sys.argv.index('-output-directory') + 1]
+    tex_path = sys.argv[-1]
+    source = open(tex_path).read()
+    if 'BROKEN' in source:
+        sys.exit(1)
+    name = os.path.splitext(os.path.basename(tex_path))[0]
+    with open(os.path.join(output_dir, name + '.pdf'), 'wb') as f:
+        f.write(b'%PDF-1.5 ' + source.encode())
+    if 'SLEEP' in source:
+        time.sleep(5)
+    if 'PARTIAL' in source:
+        sys.exit(1)
+''')
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Path to a fake pdflatex executable"""
+    engine_path = tmp_path / 'fake_pdflatex'
+    engine_path.write_text(FAKE_ENGINE.format(python=sys.executable))
+    engine_path.chmod(engine_path.stat().st_mode | stat.S_IEXEC)
+    return str(engine_path)
+
+
+@pytest.fixture
+def compiler(engine):
+    """LatexCompiler running a fake pdflatex"""
+    latex_compiler = LatexCompiler(max_workers=2, timeout=1, engine=engine)
+    yield latex_compiler
+    latex_compiler.shutdown()
+
+
+@pytest.fixture
+def cached_compiler(engine, tmp_path):
+    """LatexCompiler with a PdfCache in front of the fake pdflatex"""
+    latex_compiler = LatexCompiler(
+        max_workers=2, timeout=1, engine=engine, pdf_cache=PdfCache(tmp_path / 'pdf_cache')
+    )
+    yield latex_compiler
+    latex_compiler.shutdown()
+
+
+class TestLatexCompiler:
+    """Tests for pooled LaTeX compilation"""
+    
+    def test_compile_many_returns_each_pdf(self, compiler):
+        """CV and CL compile independently and keep their own output"""
+        results = compiler.compile_many({'cv': 'cv source', 'cl': 'cl source'})
+        
+        assert results['cv'].success and results['cl'].success
+        assert results['cv'].pdf_content == b'%PDF-1.5 cv source'
+        assert results['cl'].pdf_content == b'%PDF-1.5 cl source'
+    
+    def test_failed_compilation_is_reported(self, compiler):
+        """A run that produces no PDF is a failure with an error message"""
+        result = compiler.compile('BROKEN', 'cv')
+        
+        assert not result.success
+        assert result.returncode == 1
+        assert result.error
+    
+    def test_timeout_is_enforced(self, compiler):
+        """Runs exceeding the timeout are killed and counted, even if a PDF was written"""
+        result = compiler.compile('SLEEP', 'cv')
+        
+        assert not result.success
+        assert result.has_pdf
+        assert 'timed out' in result.error
+        assert compiler.get_metrics()['timeouts'] == 1
+    
+    def test_nonzero_exit_with_pdf_is_a_failure(self, compiler):
+        """A PDF left by a failed nonstopmode run is reported via has_pdf, not success"""
+        result = compiler.compile('PARTIAL', 'cv')
+        
+        assert not result.success
+        assert result.has_pdf
+        assert result.returncode == 1
+        assert 'exited with code 1' in result.error
+        assert compiler.get_metrics()['failed'] == 1
+    
+    def test_async_api_and_metrics(self, compiler):
+        """compile_many_async awaits pool results and updates metrics"""
+        results = asyncio.run(compiler.compile_many_async({'cv': 'a', 'cl': 'b'}))
+        
+        assert all(result.success for result in results.values())
+        metrics = compiler.get_metrics()
+        assert metrics['completed'] == 2
+        assert metrics['queue_depth'] == 0
+        assert metrics['active'] == 0
+        assert 'p95_seconds' in metrics
+    
+    def test_write_pdf_is_atomic(self, compiler, tmp_path):
+        """write_pdf leaves only the final file behind"""
+        result = compiler.compile('cv source', '../../etc/cv')
+        
+        assert result.jobname == '______etc_cv'
+        assert result.write_pdf(tmp_path / 'out' / 'cv.pdf')
+        assert [p.name for p in (tmp_path / 'out').iterdir()] == ['cv.pdf']
+
+
+class TestPdfCache:
+    """Tests for the compiled-PDF cache"""
+    
+    def test_unchanged_source_skips_compilation(self, cached_compiler):
+        """A second compile of the same source is served from the cache"""
+        first = cached_compiler.compile('cv source', 'cv')
+        second = cached_compiler.compile('cv source', 'cv_again')
+        
+        assert not first.cached
+        assert second.cached and second.success
+        assert second.pdf_content == first.pdf_content
+        
+        metrics = cached_compiler.get_metrics()
+        assert metrics['completed'] == 1
+        assert metrics['pdf_cache']['hits'] == 1
+        assert metrics['pdf_cache']['misses'] == 1
+    
+    def test_changed_source_or_engine_is_a_miss(self, cached_compiler, monkeypatch):
+        """Keys cover both the LaTeX source and the engine version"""
+        cached_compiler.compile('cv source', 'cv')
+        assert not cached_compiler.compile('cv source edited', 'cv').cached
+        
+        monkeypatch.setenv('FAKE_TEX_VERSION', 'FakeTeX 2.0')
+        cached_compiler._engine_version = None
+        assert cached_compiler.engine_version == 'FakeTeX 2.0'
+        assert not cached_compiler.compile('cv source', 'cv').cached
+    
+    def test_async_cache_lookup_runs_off_the_event_loop(self, cached_compiler, monkeypatch):
+        """compile_async probes the engine and reads cached PDFs on a worker thread"""
+        cached_compiler.compile('cv source', 'cv')
+        loop_threads, lookup_threads = [], []
+        original_get = cached_compiler.pdf_cache.get
+        
+        def recording_get(key):
+            lookup_threads.append(threading.get_ident())
+            return original_get(key)
+        
+        monkeypatch.setattr(cached_compiler.pdf_cache, 'get', recording_get)
+        
+        async def compile_cached():
+            loop_threads.append(threading.get_ident())
+            return await cached_compiler.compile_async('cv source', 'cv')
+        
+        assert asyncio.run(compile_cached()).cached
+        assert lookup_threads and loop_threads[0] not in lookup_threads
+    
+    def test_failed_compilations_are_not_cached(self, cached_compiler):
+        """Only successful PDFs are stored"""
+        cached_compiler.compile('BROKEN', 'cv')
+        
+        assert not cached_compiler.compile('BROKEN', 'cv').cached
+        assert cached_compiler.pdf_cache.get_stats()['entries'] == 0
+    
+    def test_partial_pdfs_are_not_cached(self, cached_compiler):
+        """PDFs left by nonzero exits or timeouts are never served from the cache"""
+        for source in ('PARTIAL', 'SLEEP'):
+            assert cached_compiler.compile(source, 'cv').has_pdf
+            assert not cached_compiler.compile(source, 'cv').cached
+        
+        assert cached_compiler.pdf_cache.get_stats()['stores'] == 0
+    
+    def test_pdfs_stored_by_another_process_are_hit(self, tmp_path):
+        """A miss in the in-memory index falls back to the shared directory"""
+        cache = PdfCache(tmp_path / 'pdf_cache')
+        PdfCache(tmp_path / 'pdf_cache').put('a', b'%PDF')
+        
+        assert cache.get('a') == b'%PDF'
+        assert cache.get('missing') is None
+        stats = cache.get_stats()
+        assert (stats['hits'], stats['misses'], stats['entries'], stats['bytes']) == (1, 1, 1, 4)
+    
+    def test_size_cap_evicts_least_recently_used(self, tmp_path):
+        """Entries over max_bytes are evicted oldest-access first"""
+        cache = PdfCache(tmp_path / 'pdf_cache', max_bytes=25)
+        cache.put('a', b'x' * 10)
+        cache.put('b', b'y' * 10)
+        assert cache.get('a') == b'x' * 10
+        cache.put('c', b'z' * 10)
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == b'x' * 10
+        stats = cache.get_stats()
+        assert stats['evictions'] == 1
+        assert stats['bytes'] == 20
+        assert not (tmp_path / 'pdf_cache' / 'b.pdf').exists()
+    
+    def test_index_survives_restart(self, tmp_path):
+        """A new PdfCache picks up PDFs already on disk"""
+        PdfCache(tmp_path / 'pdf_cache').put('a', b'%PDF')
+        
+        reopened = PdfCache(tmp_path / 'pdf_cache')
+        assert reopened.get('a') == b'%PDF'
+        assert reopened.get_stats()['entries'] == 1
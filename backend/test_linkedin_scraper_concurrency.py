@@ -0,0 +1,119 @@
+"""
+Tests for concurrent, streaming LinkedIn scraping
+Serves search pages from a local aiohttp server and stubs the detail fetch
+"""
+
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.services.http_client import get_http_client
+from app.services.real_job_scrapers import LinkedInJobScraper
+
+
+def search_page(prefix, count):
+    """LinkedIn-like search result HTML with ``count`` job cards"""
+    cards = ''.join(
+        f'<div class="base-search-card">'
+        f'<h3 class="base-search-card__title">{prefix} Developer {i}</h3>'
+        f'<h4 class="base-search-card__subtitle">Company {i}</h4>'
+        f'<a href="/jobs/view/{i}">view</a>'
+        f'</div>'
+        for i in range(count)
+    )
+    return f'<html><body>{cards}</body></html>'
+
+
+async def start_search_server():
+    """Serve a page of five cards for every search"""
+    async def handler(request):
+        return web.Response(text=search_page(request.query.get('keywords', ''), 5), content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/jobs/search', handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+def build_scraper(server, detail_delays, state):
+    """Scraper pointed at the local server with a detail fetch that tracks concurrency"""
+    scraper = LinkedInJobScraper()
+    scraper.base_url = str(server.make_url('/jobs/search'))
+    scraper.keywords = ['python']
+    scraper.locations = ['Gothenburg, Sweden']
+
+    async def fake_details(job_id, session):
+        state['active'] += 1
+        state['peak'] = max(state['peak'], state['active'])
+        try:
+            await asyncio.sleep(detail_delays.get(job_id, 0.01))
+            state['started'].append(job_id)
+            return {'description': f'Python role {job_id}'}
+        finally:
+            state['active'] -= 1
+
+    scraper._get_job_details = fake_details
+    scraper._max_concurrency = lambda: 2
+    return scraper
+
+
+class TestLinkedInScraperConcurrency:
+    """Tests for bounded parallel detail fetching and streaming"""
+
+    def test_details_fetched_concurrently_within_budget(self):
+        """Card detail pages are fetched in parallel but never above the budget"""
+        state = {'active': 0, 'peak': 0, 'started': []}
+
+        async def run():
+            server = await start_search_server()
+            try:
+                scraper = build_scraper(server, {}, state)
+                return await scraper._search_linkedin_jobs('python', 'Gothenburg, Sweden', limit=5)
+            finally:
+                await get_http_client().close()
+                await server.close()
+
+        jobs = asyncio.run(run())
+
+        assert len(jobs) == 5
+        assert state['peak'] == 2
+
+    def test_stream_yields_in_completion_order(self):
+        """Fast detail pages are yielded before slow ones"""
+        state = {'active': 0, 'peak': 0, 'started': []}
+
+        async def run():
+            server = await start_search_server()
+            try:
+                scraper = build_scraper(server, {'0': 0.3}, state)
+                return [job['job_id'] async for job in scraper.stream_linkedin_jobs(max_jobs=5)]
+            finally:
+                await get_http_client().close()
+                await server.close()
+
+        job_ids = asyncio.run(run())
+
+        assert sorted(job_ids) == ['0', '1', '2', '3', '4']
+        assert job_ids[-1] == '0'
+
+    def test_stream_stops_and_cancels_at_max_jobs(self):
+        """Once max_jobs are yielded the remaining detail requests are cancelled"""
+        state = {'active': 0, 'peak': 0, 'started': []}
+
+        async def run():
+            server = await start_search_server()
+            try:
+                scraper = build_scraper(server, {'3': 5, '4': 5}, state)
+                jobs = await asyncio.wait_for(scraper.scrape_linkedin_jobs(max_jobs=2), timeout=3)
+                await asyncio.sleep(0)
+                return jobs
+            finally:
+                await get_http_client().close()
+                await server.close()
+
+        jobs = asyncio.run(run())
+
+        assert len(jobs) == 2
+        assert state['active'] == 0
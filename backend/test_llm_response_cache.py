@@ -0,0 +1,102 @@
+"""
+Tests for LLMResponseCache
+Tests keying, TTL expiry, LRU eviction and hit/miss accounting
+"""
+
+import time
+
+import pytest
+from llm_response_cache import LLMResponseCache
+
+
+class TestLLMResponseCache:
+    """Tests for the persistent LLM response cache"""
+    
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache backed by a temporary SQLite file"""
+        return LLMResponseCache(db_path=tmp_path / 'llm.sqlite3', ttl_seconds=3600, max_entries=3)
+    
+    def test_round_trip_and_counters(self, cache):
+        """A stored response is returned for the same (model, prompt, max_tokens)"""
+        assert cache.get('glm-4.7', 'prompt', 4096) is None
+        
+        cache.set('glm-4.7', 'prompt', 4096, '{"role_category": "devops_cloud"}')
+        
+        assert cache.get('glm-4.7', 'prompt', 4096) == '{"role_category": "devops_cloud"}'
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+    
+    def test_key_includes_model_and_max_tokens(self, cache):
+        """Different models or token budgets never share an entry"""
+        cache.set('glm-4.7', 'prompt', 4096, 'answer')
+        
+        assert cache.get('glm-4.7', 'prompt', 1000) is None
+        assert cache.get('MiniMax-M2', 'prompt', 4096) is None
+    
+    def test_persists_across_instances(self, cache):
+        """Entries survive a restart (new instance on the same file)"""
+        cache.set('glm-4.7', 'prompt', 4096, 'answer')
+        
+        reopened = LLMResponseCache(db_path=cache.db_path)
+        
+        assert reopened.get('glm-4.7', 'prompt', 4096) == 'answer'
+    
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Entries older than the TTL are not served"""
+        cache = LLMResponseCache(db_path=tmp_path / 'llm.sqlite3', ttl_seconds=1)
+        cache.set('glm-4.7', 'prompt', 4096, 'answer')
+        
+        time.sleep(1.1)
+        
+        assert cache.get('glm-4.7', 'prompt', 4096) is None
+        assert cache.get_stats()['entries'] == 0
+    
+    def test_least_recently_used_entries_are_evicted(self, cache):
+        """The cache never holds more than max_entries and keeps recently read entries"""
+        for i in range(3):
+            cache.set('glm-4.7', f'prompt {i}', 4096, f'answer {i}')
+            time.sleep(0.01)
+        
+        cache.get('glm-4.7', 'prompt 0', 4096)
+        cache.set('glm-4.7', 'prompt 3', 4096, 'answer 3')
+        
+        assert cache.get_stats()['entries'] == 3
+        assert cache.get('glm-4.7', 'prompt 0', 4096) == 'answer 0'
+        assert cache.get('glm-4.7', 'prompt 1', 4096) is None
+
+
+class TestAIAnalyzerCaching:
+    """Tests for how AIAnalyzer uses the response cache"""
+    
+    def test_cache_hits_are_not_stored_again(self, tmp_path, monkeypatch):
+        """Only a fresh API response is written; a hit keeps its entry and counters"""
+        import ai_analyzer
+        import requests
+        
+        cache = LLMResponseCache(db_path=tmp_path / 'llm.sqlite3', ttl_seconds=3600)
+        monkeypatch.setattr(ai_analyzer, 'get_llm_response_cache', lambda: cache)
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-key')
+        posts = []
+        
+        class FakeResponse:
+            status_code = 200
+            
+            def json(self):
+                return {'content': [{'type': 'text', 'text': '{"recommended_template": "devops_cloud"}'}]}
+        
+        monkeypatch.setattr(requests, 'post', lambda *args, **kwargs: posts.append(kwargs) or FakeResponse())
+        stores = []
+        original_set = cache.set
+        monkeypatch.setattr(cache, 'set', lambda *args: stores.append(args) or original_set(*args))
+        analyzer = ai_analyzer.AIAnalyzer(api_key='test-key')
+        
+        first = analyzer.analyze_job_for_ats_optimization('Kubernetes platform engineer')
+        second = analyzer.analyze_job_for_ats_optimization('Kubernetes platform engineer')
+        
+        assert first == second == {'recommended_template': 'devops_cloud'}
+        assert len(posts) == 1
+        assert len(stores) == 1
+        assert cache.get_stats()['hits'] == 1
@@ -0,0 +1,137 @@
+"""
+Tests for the in-process processed job Bloom filter
+"""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import sql_database
+from app.core.sql_database import Base, ProcessedJob
+from app.services import processed_job_index
+from app.services.processed_job_index import BloomFilter, ProcessedJobIndex
+
+
+class TestBloomFilter:
+    """Tests for the Bloom filter guarantees"""
+
+    def test_added_items_are_always_found(self):
+        """There are no false negatives"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        urls = [f'https://example.com/jobs/{i}' for i in range(1000)]
+        for url in urls:
+            bloom.add(url)
+
+        assert all(url in bloom for url in urls)
+        assert len(bloom) == 1000
+
+    def test_false_positive_rate_is_near_target(self):
+        """Unseen items are rarely reported at capacity"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'https://example.com/jobs/{i}')
+
+        false_positives = sum(f'https://example.com/new/{i}' in bloom for i in range(10000))
+
+        assert false_positives < 300
+
+
+class TestProcessedJobIndex:
+    """Tests for warming, per-user keys and saturation"""
+
+    def test_warm_then_lookup_per_user(self):
+        """Warmed URLs are candidates only for the user who processed them"""
+        index = ProcessedJobIndex(capacity=100)
+
+        assert index.warm([('user-1', 'https://example.com/a')], expected=1) == 1
+        index.add('user-1', 'https://example.com/b')
+
+        assert index.is_warm
+        assert index.might_contain('user-1', 'https://example.com/a')
+        assert index.might_contain('user-1', 'https://example.com/b')
+        assert not index.might_contain('user-2', 'https://example.com/a')
+        assert index.get_stats()['definite_misses'] == 1
+
+    def test_saturated_index_asks_to_be_rewarmed(self):
+        """Growing past capacity marks the index cold so it is rebuilt larger"""
+        index = ProcessedJobIndex(capacity=2)
+        index.warm([])
+
+        for i in range(3):
+            index.add('user-1', f'https://example.com/{i}')
+        assert not index.is_warm
+
+        index.warm((('user-1', f'https://example.com/{i}') for i in range(3)), expected=3)
+        assert index.is_warm and index.capacity == 6
+
+    def test_misses_skip_the_database_only_for_a_single_writer(self):
+        """Other writers' inserts are invisible to the filter, so it is only a hint by default"""
+        urls = ['https://example.com/a', 'https://example.com/new']
+        shared = ProcessedJobIndex(capacity=100)
+        solo = ProcessedJobIndex(capacity=100, single_writer=True)
+        for index in (shared, solo):
+            index.warm([('user-1', 'https://example.com/a')])
+
+        assert shared.candidates('user-1', urls) == urls
+        assert solo.candidates('user-1', urls) == ['https://example.com/a']
+        assert shared.get_stats()['definite_misses'] == 1
+
+
+class TestProcessedJobFiltering:
+    """Tests for warming the shared index and JobAutomationService._filter_new_jobs"""
+
+    @pytest.fixture
+    def engine(self, monkeypatch):
+        """In-memory database behind database_session() and a fresh shared index"""
+        sqlite_engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+        Base.metadata.create_all(sqlite_engine)
+        monkeypatch.setattr(sql_database, 'SessionLocal', sessionmaker(bind=sqlite_engine))
+        monkeypatch.setattr(processed_job_index, '_shared_index', None)
+        monkeypatch.setenv('PROCESSED_JOB_BLOOM_FILTER', 'true')
+        yield sqlite_engine
+        sqlite_engine.dispose()
+
+    @staticmethod
+    def insert_processed(engine, url):
+        """Simulates another worker marking a job processed"""
+        with engine.begin() as conn:
+            conn.execute(ProcessedJob.__table__.insert().values(
+                user_id='user-1', job_title='Engineer', company='Volvo', url=url
+            ))
+
+    def test_warm_reads_the_table_off_the_event_loop(self, engine, monkeypatch):
+        """warm_processed_job_index loads every processed job on a worker thread"""
+        self.insert_processed(engine, 'https://example.com/a')
+        index = processed_job_index.get_processed_job_index()
+        warm_threads = []
+        original_warm = index.warm
+
+        def recording_warm(rows, expected=0):
+            warm_threads.append(threading.get_ident())
+            return original_warm(rows, expected)
+
+        monkeypatch.setattr(index, 'warm', recording_warm)
+
+        async def warm():
+            return threading.get_ident(), await processed_job_index.warm_processed_job_index()
+
+        loop_thread, loaded = asyncio.run(warm())
+
+        assert loaded == 1
+        assert index.is_warm and warm_threads and loop_thread not in warm_threads
+
+    def test_jobs_processed_by_another_worker_after_warm_are_filtered(self, engine):
+        """A Bloom miss does not make a job new when another worker processed it"""
+        from app.services.job_automation_service import JobAutomationService
+
+        asyncio.run(processed_job_index.warm_processed_job_index())
+        self.insert_processed(engine, 'https://example.com/b')
+        jobs = [{'url': 'https://example.com/b'}, {'url': 'https://example.com/c'}]
+
+        new_jobs = asyncio.run(JobAutomationService()._filter_new_jobs(jobs, 'user-1'))
+
+        assert new_jobs == [{'url': 'https://example.com/c'}]
@@ -0,0 +1,124 @@
+"""
+Tests for the R2 document manifest
+Uses an in-memory stand-in for the boto3 S3 client that honours conditional writes
+"""
+
+import io
+import json
+
+from botocore.exceptions import ClientError
+
+from app.services.r2_manifest import MANIFEST_KEY, R2Manifest
+
+
+class FakeBucket:
+    """get_object / put_object with ETags and If-Match / If-None-Match"""
+
+    def __init__(self):
+        self.objects = {}
+        self.versions = 0
+        self.puts = 0
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey'}}, 'GetObject')
+        body, etag = self.objects[Key]
+        return {'Body': io.BytesIO(body), 'ETag': etag}
+
+    def put_object(self, Bucket, Key, Body, ContentType, IfMatch=None, IfNoneMatch=None):
+        current = self.objects.get(Key)
+        if (IfNoneMatch == '*' and current) or (IfMatch and (not current or current[1] != IfMatch)):
+            raise ClientError({'Error': {'Code': 'PreconditionFailed'}}, 'PutObject')
+        self.versions += 1
+        self.puts += 1
+        self.objects[Key] = (Body, f'"v{self.versions}"')
+        return {'ETag': f'"v{self.versions}"'}
+
+
+def entry(size, storage_type='cvs', company='Volvo', uploaded_at='2025-03-01T10:00:00'):
+    return {'size': size, 'storage_type': storage_type, 'company': company, 'document_type': 'cv',
+            'job_title': 'Engineer', 'uploaded_at': uploaded_at}
+
+
+class TestR2Manifest:
+    """Tests for R2Manifest"""
+
+    def test_usage_is_updated_incrementally(self):
+        """Adding, replacing and removing entries adjusts totals without a scan"""
+        manifest = R2Manifest(FakeBucket(), 'docs')
+        manifest.add('documents/cvs/a.pdf', entry(100))
+        manifest.add('documents/cvs/b.pdf', entry(50, uploaded_at='2025-04-02T00:00:00'))
+        manifest.add('jobs/a.json', entry(10, storage_type='job_descriptions'))
+        manifest.add('documents/cvs/a.pdf', entry(120))
+        manifest.remove('documents/cvs/b.pdf')
+
+        usage = manifest.get_usage()
+
+        assert usage['total_objects'] == 2
+        assert usage['total_size_bytes'] == 130
+        assert usage['by_type'] == {
+            'cvs': {'count': 1, 'size_bytes': 120}, 'job_descriptions': {'count': 1, 'size_bytes': 10}
+        }
+        assert usage['by_month'] == {'2025-03': {'count': 2, 'size_bytes': 130}}
+
+    def test_round_trips_through_the_bucket(self):
+        """A second instance reads what the first saved"""
+        bucket = FakeBucket()
+        writer = R2Manifest(bucket, 'docs')
+        writer.add('documents/cvs/a.pdf', entry(100))
+        assert writer.save()
+
+        reader = R2Manifest(bucket, 'docs')
+
+        assert reader.load()
+        assert reader.get('documents/cvs/a.pdf')['company'] == 'Volvo'
+        assert reader.get_usage()['total_size_bytes'] == 100
+        assert json.loads(bucket.objects[MANIFEST_KEY][0])['version'] == 1
+
+    def test_concurrent_writers_do_not_lose_entries(self):
+        """A stale writer re-reads the manifest and replays its changes"""
+        bucket = FakeBucket()
+        first, second = R2Manifest(bucket, 'docs'), R2Manifest(bucket, 'docs')
+        first.load()
+        second.load()
+
+        first.add('documents/cvs/a.pdf', entry(100))
+        assert first.save()
+        second.add('documents/cvs/b.pdf', entry(50))
+        assert second.save()
+
+        merged = R2Manifest(bucket, 'docs')
+        assert merged.load()
+        assert set(merged.objects) == {'documents/cvs/a.pdf', 'documents/cvs/b.pdf'}
+        assert merged.get_usage()['total_size_bytes'] == 150
+
+    def test_save_without_changes_writes_nothing(self):
+        """Nothing pending means no PUT"""
+        bucket = FakeBucket()
+        manifest = R2Manifest(bucket, 'docs')
+
+        assert manifest.save()
+        assert bucket.puts == 0
+
+    def test_replace_all_rebuilds_totals(self):
+        """A rebuild replaces stale entries and totals"""
+        manifest = R2Manifest(FakeBucket(), 'docs')
+        manifest.add('gone.pdf', entry(999))
+
+        count = manifest.replace_all([('documents/cvs/a.pdf', entry(10)), ('documents/cvs/b.pdf', entry(20))])
+
+        assert count == 2
+        assert manifest.get('gone.pdf') is None
+        assert manifest.get_usage()['total_size_bytes'] == 30
+        assert manifest.save()
+
+    def test_reload_keeps_unsaved_changes(self):
+        """A forced reload applies changes that were not saved yet"""
+        bucket = FakeBucket()
+        manifest = R2Manifest(bucket, 'docs')
+        manifest.add('documents/cvs/a.pdf', entry(100))
+
+        manifest.load(force=True)
+
+        assert manifest.get('documents/cvs/a.pdf') is not None
+        assert manifest.get_usage()['total_objects'] == 1
@@ -0,0 +1,141 @@
+"""
+Tests for the concurrent R2 package uploader
+Uses an in-memory stand-in for the boto3 S3 client
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.services import r2_package_uploader
+from app.services.r2_package_uploader import R2PackageUploader, UploadItem, ensure_bucket_once
+
+
+class FakeS3Client:
+    """Records calls; every upload takes ``delay`` seconds"""
+
+    def __init__(self, delay=0.0, bucket_exists=True, fail_keys=()):
+        self.delay = delay
+        self.bucket_exists = bucket_exists
+        self.fail_keys = set(fail_keys)
+        self.objects = {}
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def head_bucket(self, Bucket):
+        self.calls.append(('head_bucket', Bucket))
+        if not self.bucket_exists:
+            raise ClientError({'Error': {'Code': '404'}}, 'HeadBucket')
+
+    def create_bucket(self, Bucket):
+        self.calls.append(('create_bucket', Bucket))
+        self.bucket_exists = True
+
+    def _store(self, method, key, body):
+        with self._lock:
+            self.calls.append((method, key))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if key in self.fail_keys:
+            raise ClientError({'Error': {'Code': '500'}}, 'PutObject')
+        self.objects[key] = body
+
+    def put_object(self, Bucket, Key, Body, ContentType, Metadata):
+        self._store('put_object', Key, Body)
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Config=None):
+        self._store('upload_fileobj', Key, Fileobj.read())
+
+
+def make_items(count, size=10):
+    return [
+        UploadItem(name=f'object_{i}', key=f'documents/{i}.pdf', body=b'x' * size, content_type='application/pdf')
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def fresh_bucket_cache():
+    r2_package_uploader.reset_bucket_cache()
+    yield
+    r2_package_uploader.reset_bucket_cache()
+
+
+class TestEnsureBucketOnce:
+    """Tests for the per-process bucket check"""
+
+    def test_bucket_is_checked_once(self):
+        """Only the first call sends a HEAD request"""
+        client = FakeS3Client()
+
+        assert all(ensure_bucket_once(client, 'docs', 'https://r2') for _ in range(5))
+        assert client.calls == [('head_bucket', 'docs')]
+
+    def test_missing_bucket_is_created(self):
+        """A 404 creates the bucket"""
+        client = FakeS3Client(bucket_exists=False)
+
+        assert ensure_bucket_once(client, 'docs')
+        assert client.calls == [('head_bucket', 'docs'), ('create_bucket', 'docs')]
+
+
+class TestR2PackageUploader:
+    """Tests for R2PackageUploader.upload_all"""
+
+    def test_uploads_run_concurrently(self):
+        """A batch takes about as long as one upload, not the sum"""
+        client = FakeS3Client(delay=0.1)
+        uploader = R2PackageUploader(client, 'docs', lambda key: f'https://pub/{key}', max_workers=5)
+
+        start = time.perf_counter()
+        urls = asyncio.run(uploader.upload_all(make_items(5)))
+        elapsed = time.perf_counter() - start
+        uploader.close()
+
+        assert urls == {f'object_{i}': f'https://pub/documents/{i}.pdf' for i in range(5)}
+        assert client.peak == 5
+        assert elapsed < 0.3
+
+    def test_concurrency_is_bounded_by_workers(self):
+        """No more uploads run at once than there are workers"""
+        client = FakeS3Client(delay=0.02)
+        uploader = R2PackageUploader(client, 'docs', str, max_workers=2)
+
+        asyncio.run(uploader.upload_all(make_items(6)))
+        uploader.close()
+
+        assert client.peak == 2
+        assert len(client.objects) == 6
+
+    def test_large_objects_use_multipart_transfer(self):
+        """Objects at the threshold go through upload_fileobj, smaller ones are a single PUT"""
+        client = FakeS3Client()
+        uploader = R2PackageUploader(client, 'docs', str, max_workers=2, multipart_threshold=100)
+        items = [
+            UploadItem(name='small', key='small.tex', body=b'x' * 99, content_type='text/plain'),
+            UploadItem(name='large', key='large.pdf', body=b'x' * 100, content_type='application/pdf')
+        ]
+
+        asyncio.run(uploader.upload_all(items))
+        uploader.close()
+
+        assert sorted(client.calls) == [('put_object', 'small.tex'), ('upload_fileobj', 'large.pdf')]
+        assert client.objects['large.pdf'] == b'x' * 100
+
+    def test_failed_object_is_left_out(self):
+        """One failing upload does not stop the rest of the package"""
+        client = FakeS3Client(fail_keys={'documents/1.pdf'})
+        uploader = R2PackageUploader(client, 'docs', str, max_workers=3)
+
+        urls = asyncio.run(uploader.upload_all(make_items(3)))
+        uploader.close()
+
+        assert set(urls) == {'object_0', 'object_2'}
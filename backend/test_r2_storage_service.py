@@ -0,0 +1,133 @@
+"""
+Tests for R2StorageService listing, deletion and manifest updates
+Uses an in-memory stand-in for the boto3 S3 client that records which thread made each call
+"""
+
+import asyncio
+import io
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.services import r2_package_uploader, r2_storage_service
+from app.services.r2_manifest import MANIFEST_KEY
+from app.services.r2_storage_service import R2StorageService
+
+
+class FakePaginator:
+    def __init__(self, client):
+        self.client = client
+
+    def paginate(self, Bucket, Prefix, PaginationConfig):
+        self.client.record('list_objects_v2')
+        keys = sorted(key for key in self.client.objects if key.startswith(Prefix))
+        yield {'Contents': [
+            {'Key': key, 'Size': len(self.client.objects[key]), 'LastModified': self.client.modified[key]}
+            for key in keys
+        ]}
+
+
+class FakeS3Client:
+    """Bucket contents plus the name of the thread behind every call"""
+
+    def __init__(self):
+        self.objects = {}
+        self.modified = {}
+        self.threads = []
+
+    def record(self, method):
+        self.threads.append((method, threading.current_thread().name))
+
+    def put(self, key, body=b'x', age_days=0):
+        self.objects[key] = body
+        self.modified[key] = datetime.now(timezone.utc) - timedelta(days=age_days)
+
+    def head_bucket(self, Bucket):
+        self.record('head_bucket')
+
+    def get_paginator(self, name):
+        return FakePaginator(self)
+
+    def get_object(self, Bucket, Key):
+        self.record('get_object')
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey'}}, 'GetObject')
+        return {'Body': io.BytesIO(self.objects[Key]), 'ETag': '"v1"'}
+
+    def put_object(self, Bucket, Key, Body, ContentType, IfMatch=None, IfNoneMatch=None, Metadata=None):
+        self.record('put_object')
+        self.put(Key, Body)
+        return {'ETag': '"v2"'}
+
+    def delete_objects(self, Bucket, Delete):
+        self.record('delete_objects')
+        for item in Delete['Objects']:
+            self.objects.pop(item['Key'], None)
+        return {}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Fake client returned by boto3.client(), with R2 credentials configured"""
+    fake = FakeS3Client()
+    monkeypatch.setenv('R2_ENDPOINT_URL', 'https://r2.example.com')
+    monkeypatch.setenv('R2_ACCESS_KEY_ID', 'key')
+    monkeypatch.setenv('R2_SECRET_ACCESS_KEY', 'secret')
+    monkeypatch.setattr(r2_storage_service.boto3, 'client', lambda *args, **kwargs: fake)
+    r2_package_uploader.reset_bucket_cache()
+    yield fake
+    r2_package_uploader.reset_bucket_cache()
+
+
+def run_on_loop(coroutine):
+    """Run a coroutine and return its result with the event loop thread's name"""
+    async def main():
+        return await coroutine, threading.current_thread().name
+    return asyncio.run(main())
+
+
+def blocking_calls_on_loop(client, loop_thread):
+    return [method for method, thread in client.threads if thread == loop_thread]
+
+
+class TestR2StorageServiceOffTheLoop:
+    """S3 requests are made from worker threads, never the event loop"""
+
+    def test_list_documents(self, client):
+        client.put('documents/cvs/a.pdf')
+        client.put('jobs/a.json')
+
+        documents, loop_thread = run_on_loop(R2StorageService().list_documents('cvs'))
+
+        assert [document['key'] for document in documents] == ['documents/cvs/a.pdf']
+        assert client.threads and blocking_calls_on_loop(client, loop_thread) == []
+
+    def test_delete_documents_updates_the_manifest(self, client):
+        client.put('documents/cvs/a.pdf')
+        client.put('documents/cvs/b.pdf')
+
+        deleted, loop_thread = run_on_loop(R2StorageService().delete_documents(['documents/cvs/a.pdf']))
+
+        assert deleted == 1
+        assert set(client.objects) == {'documents/cvs/b.pdf', MANIFEST_KEY}
+        assert blocking_calls_on_loop(client, loop_thread) == []
+
+    def test_cleanup_old_documents(self, client):
+        client.put('documents/cvs/old.pdf', age_days=60)
+        client.put('documents/cvs/new.pdf')
+
+        deleted, loop_thread = run_on_loop(R2StorageService().cleanup_old_documents(days_old=30))
+
+        assert deleted == 1
+        assert 'documents/cvs/new.pdf' in client.objects
+        assert blocking_calls_on_loop(client, loop_thread) == []
+
+    def test_first_upload_loads_the_manifest_in_a_thread(self, client):
+        """Recording an upload loads and saves the manifest without blocking the loop"""
+        url, loop_thread = run_on_loop(R2StorageService().store_job_metadata({'title': 'Engineer', 'company': 'Volvo'}))
+
+        assert url
+        assert 'get_object' in [method for method, _ in client.threads]
+        assert blocking_calls_on_loop(client, loop_thread) == []
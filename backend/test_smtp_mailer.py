@@ -0,0 +1,179 @@
+"""
+Tests for the shared SMTP mailer
+Uses an in-memory stand-in for smtplib.SMTP
+"""
+
+import asyncio
+import smtplib
+from email.mime.text import MIMEText
+
+import pytest
+
+from app.services import smtp_mailer
+from app.services.email_automation_service import EmailAutomationService
+from app.services.smtp_mailer import SmtpMailer, get_smtp_mailer
+
+
+class FakeSMTP:
+    """Records the SMTP conversation; ``fail_next`` errors are raised by send_message in order"""
+
+    instances = []
+
+    def __init__(self, fail_next=(), reject_login=False):
+        self.fail_next = list(fail_next)
+        self.reject_login = reject_login
+        self.log = []
+        self.closed = False
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        self.log.append('starttls')
+
+    def login(self, user, password):
+        self.log.append('login')
+        if self.reject_login:
+            raise smtplib.SMTPAuthenticationError(535, b'bad credentials')
+
+    def send_message(self, msg, from_addr=None, to_addrs=None):
+        if self.fail_next:
+            raise self.fail_next.pop(0)
+        self.log.append(('send', msg['Subject']))
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+def message(subject, to='me@example.com'):
+    msg = MIMEText('body')
+    msg['Subject'] = subject
+    msg['From'] = 'bot@example.com'
+    msg['To'] = to
+    return msg
+
+
+@pytest.fixture(autouse=True)
+def reset_fakes():
+    FakeSMTP.instances = []
+    yield
+    smtp_mailer._shared_mailers.clear()
+
+
+def make_mailer(*connections, **kwargs):
+    """Mailer whose connections are handed out from ``connections`` (then fresh FakeSMTPs)"""
+    pending = list(connections)
+    return SmtpMailer('bot@example.com', 'secret', connection_factory=lambda: pending.pop(0) if pending else FakeSMTP(),
+                      **kwargs)
+
+
+class TestSmtpMailer:
+    """Tests for SmtpMailer"""
+
+    def test_session_is_reused_across_sends(self):
+        """Many sends cost one STARTTLS and one login"""
+        mailer = make_mailer()
+
+        for i in range(5):
+            asyncio.run(mailer.send(message(f'job {i}')))
+
+        assert len(FakeSMTP.instances) == 1
+        assert FakeSMTP.instances[0].log.count('starttls') == 1
+        assert FakeSMTP.instances[0].log.count('login') == 1
+        assert mailer.get_stats()['sent'] == 5
+
+    def test_dropped_session_is_reopened_and_send_retried(self):
+        """A disconnect mid-send reconnects once and delivers the message"""
+        mailer = make_mailer(FakeSMTP(fail_next=[smtplib.SMTPServerDisconnected('gone')]))
+
+        asyncio.run(mailer.send(message('job')))
+
+        assert len(FakeSMTP.instances) == 2
+        assert FakeSMTP.instances[0].closed
+        assert ('send', 'job') in FakeSMTP.instances[1].log
+        assert mailer.get_stats()['reconnects'] == 1
+
+    def test_rejected_recipient_keeps_the_session(self):
+        """Message-level errors propagate without reconnecting"""
+        refused = smtplib.SMTPRecipientsRefused({'x@example.com': (550, b'no such user')})
+        mailer = make_mailer(FakeSMTP(fail_next=[refused]))
+
+        with pytest.raises(smtplib.SMTPRecipientsRefused):
+            mailer.send_blocking(message('job'))
+        mailer.send_blocking(message('next'))
+
+        assert len(FakeSMTP.instances) == 1
+        assert mailer.get_stats()['failed'] == 1
+
+    def test_idle_session_is_replaced(self):
+        """A session unused for longer than idle_timeout is not reused"""
+        mailer = make_mailer(idle_timeout=0)
+
+        mailer.send_blocking(message('first'))
+        mailer.send_blocking(message('second'))
+
+        assert len(FakeSMTP.instances) == 2
+        assert FakeSMTP.instances[0].closed
+
+    def test_send_many_reports_each_message(self):
+        """A batch uses one session and continues past a rejected message"""
+        refused = smtplib.SMTPDataError(554, b'rejected')
+        connection = FakeSMTP()
+        mailer = make_mailer(connection)
+        original = connection.send_message
+
+        def send_message(msg, from_addr=None, to_addrs=None):
+            if msg['Subject'] == 'job 1':
+                raise refused
+            original(msg, from_addr, to_addrs)
+
+        connection.send_message = send_message
+
+        results = asyncio.run(mailer.send_many([message(f'job {i}') for i in range(3)]))
+
+        assert results == [True, False, True]
+        assert len(FakeSMTP.instances) == 1
+
+    def test_send_many_stops_on_bad_credentials(self):
+        """A failed login fails the whole batch without retrying per message"""
+        mailer = make_mailer(FakeSMTP(reject_login=True))
+
+        assert mailer.send_many_blocking([message('a'), message('b')]) == [False, False]
+        assert len(FakeSMTP.instances) == 1
+        assert mailer.get_stats()['failed'] == 2
+
+    def test_shared_mailer_per_account(self):
+        """get_smtp_mailer returns one instance per account and password"""
+        first = get_smtp_mailer('bot@example.com', 'secret')
+
+        assert get_smtp_mailer('bot@example.com', 'secret') is first
+        assert get_smtp_mailer('bot@example.com', 'rotated') is not first
+
+
+class TestEmailAutomationBatch:
+    """Tests for EmailAutomationService.send_application_emails"""
+
+    def test_applications_share_one_session(self):
+        """Every application email of a batch goes over the same session"""
+        service = EmailAutomationService()
+        service.mailer = make_mailer()
+        applications = [
+            {
+                'to_email': 'me@example.com',
+                'subject': f'Application {i}',
+                'body': 'Hello',
+                'cv_content': b'%PDF cv',
+                'cover_letter_content': b'%PDF cl',
+                'job_data': {'title': 'Engineer', 'company': 'Volvo Cars'}
+            }
+            for i in range(3)
+        ]
+
+        results = asyncio.run(service.send_application_emails(applications))
+
+        assert results == [True, True, True]
+        assert len(FakeSMTP.instances) == 1
+        assert [entry for entry in FakeSMTP.instances[0].log if entry[0] == 'send'] == [
+            ('send', f'Application {i}') for i in range(3)
+        ]
@@ -0,0 +1,394 @@
+"""
+Tests for the SQL collection wrappers (bulk upsert, processed-job lookups, scoped sessions and schema migrations)
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import sessionmaker
+
+from app.core import sql_database
+from app.core.sql_database import (
+    SCHEMA_VERSION, Base, JobCollection, JobPosting, ProcessedJob, ProcessedJobCollection, User, check_schema_version,
+    database_session, job_dedup_hash, migrate_schema, schema_version
+)
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine with all tables created"""
+    sqlite_engine = create_engine('sqlite://')
+    Base.metadata.create_all(sqlite_engine)
+    yield sqlite_engine
+    sqlite_engine.dispose()
+
+
+@pytest.fixture
+def session(engine):
+    """Session bound to the in-memory database"""
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+
+
+def make_job(index, **overrides):
+    """Job document shaped like JobAggregationService._save_search_results output"""
+    job = {
+        'user_id': 'user-1',
+        'source': 'linkedin',
+        'title': f'Engineer {index}',
+        'company': 'Volvo',
+        'url': f'https://example.com/jobs/{index}',
+        'keywords': ['python'],
+        'match_score': 0.5
+    }
+    job.update(overrides)
+    return job
+
+
+class TestJobUpsertMany:
+    """Tests for JobCollection.upsert_many"""
+
+    def test_inserts_then_updates_without_duplicates(self, session):
+        """Re-saving the same postings updates rows instead of duplicating them"""
+        jobs = JobCollection(session)
+
+        asyncio.run(jobs.upsert_many([make_job(i) for i in range(20)]))
+        asyncio.run(jobs.upsert_many([make_job(i, match_score=0.9) for i in range(10, 30)]))
+
+        assert session.query(JobPosting).count() == 30
+        updated = session.query(JobPosting).filter(JobPosting.title == 'Engineer 15').one()
+        assert updated.match_score == 0.9
+        assert updated.dedup_hash == job_dedup_hash('Engineer 15', 'Volvo', 'https://example.com/jobs/15')
+
+    def test_single_statement_per_batch(self, session):
+        """A batch is written with one INSERT statement and one commit"""
+        statements = []
+        event.listen(session.get_bind(), 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        asyncio.run(JobCollection(session).upsert_many([make_job(i) for i in range(20)]))
+
+        inserts = [statement for statement in statements if statement.startswith('INSERT')]
+        assert len(inserts) == 1
+        assert 'ON CONFLICT' in inserts[0]
+
+    def test_duplicates_within_batch_keep_last(self, session):
+        """Duplicate postings in one batch collapse to the last occurrence"""
+        written = asyncio.run(JobCollection(session).upsert_many([
+            make_job(1, match_score=0.1),
+            make_job(1, match_score=0.7)
+        ]))
+
+        assert written == 1
+        assert session.query(JobPosting).one().match_score == 0.7
+
+    def test_created_at_is_preserved_on_update(self, session):
+        """Updating a posting keeps its original creation time"""
+        jobs = JobCollection(session)
+        asyncio.run(jobs.upsert_many([make_job(1)]))
+        created_at = session.query(JobPosting).one().created_at
+
+        asyncio.run(jobs.upsert_many([make_job(1, match_score=0.8)]))
+        session.expire_all()
+
+        assert session.query(JobPosting).one().created_at == created_at
+
+    def test_empty_batch_is_a_no_op(self, session):
+        """Nothing is written for an empty batch"""
+        assert asyncio.run(JobCollection(session).upsert_many([])) == 0
+
+
+class TestJobQueries:
+    """Tests for the dedup key and the indexed job_postings queries"""
+
+    def test_dedup_hash_ignores_case_and_whitespace_but_not_url_case(self):
+        """Title and company are normalized, the url is only trimmed"""
+        url = 'https://example.com/jobs/AbC'
+
+        assert job_dedup_hash(' Senior  Engineer', 'VOLVO ', url) == job_dedup_hash('senior engineer', 'Volvo', url)
+        assert job_dedup_hash('Engineer', 'Volvo', url) != job_dedup_hash('Engineer', 'Volvo', url.lower())
+
+    def test_update_one_matches_normalized_duplicate(self, session):
+        """update_one finds the existing posting through the dedup key"""
+        jobs = JobCollection(session)
+        asyncio.run(jobs.upsert_many([make_job(1)]))
+
+        asyncio.run(jobs.update_one(
+            {'title': 'ENGINEER 1', 'company': 'volvo', 'url': 'https://example.com/jobs/1'},
+            {'$set': {'match_score': 0.9}},
+            upsert=True
+        ))
+
+        assert [job.match_score for job in session.query(JobPosting)] == [0.9]
+
+    def test_find_saved_jobs_newest_first(self, session):
+        """find() filters on user and is_saved and sorts on updated_at"""
+        jobs = JobCollection(session)
+        asyncio.run(jobs.upsert_many([make_job(i, is_saved=i % 2 == 0) for i in range(6)]))
+        asyncio.run(jobs.upsert_many([make_job(2, is_saved=True), make_job(7, user_id='user-2', is_saved=True)]))
+
+        saved = asyncio.run(jobs.find({'user_id': 'user-1', 'is_saved': True}).sort('updated_at', -1).limit(10).to_list(10))
+
+        assert saved[0]['title'] == 'Engineer 2'
+        assert sorted(job['title'] for job in saved) == ['Engineer 0', 'Engineer 2', 'Engineer 4']
+
+    @pytest.mark.parametrize('sql, index', [
+        ("SELECT * FROM job_postings WHERE user_id = 'u' AND is_saved = 1 ORDER BY updated_at DESC",
+         'ix_job_postings_user_saved_updated'),
+        ("SELECT * FROM job_postings WHERE user_id = 'u' ORDER BY match_score DESC, posting_date DESC",
+         'ix_job_postings_user_match'),
+        ("SELECT * FROM processed_jobs WHERE user_id = 'u' AND processed_at >= '2025-01-01'",
+         'ix_processed_jobs_user_processed_at'),
+    ])
+    def test_queries_use_composite_indexes_without_sorting(self, session, sql, index):
+        """SQLite serves the dashboard queries from an index, with no temp sort"""
+        plan = ' '.join(str(row) for row in session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+        assert index in plan
+        assert 'TEMP B-TREE' not in plan
+
+
+class TestSchemaMigration:
+    """Tests for migrate_schema on databases created before the dedup key and indexes"""
+
+    @pytest.fixture
+    def legacy_engine(self):
+        """job_postings and processed_jobs as they were created before dedup_hash/is_saved existed"""
+        sqlite_engine = create_engine('sqlite://')
+        with sqlite_engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE TABLE job_postings (id INTEGER PRIMARY KEY, user_id VARCHAR(50) NOT NULL, "
+                "title VARCHAR(500) NOT NULL, company VARCHAR(300) NOT NULL, location VARCHAR(200), "
+                "description TEXT, url VARCHAR(1000) NOT NULL, source VARCHAR(100) NOT NULL, "
+                "posting_date DATETIME, application_deadline DATETIME, job_type VARCHAR(100), "
+                "experience_level VARCHAR(100), remote_option BOOLEAN, salary JSON, requirements JSON, "
+                "benefits JSON, keywords JSON, match_score FLOAT, confidence_score FLOAT, ats_score FLOAT, "
+                "category VARCHAR(100), application_difficulty VARCHAR(50), created_at DATETIME, "
+                "updated_at DATETIME, original_data JSON)"
+            )
+            conn.exec_driver_sql(
+                "CREATE TABLE processed_jobs (id INTEGER PRIMARY KEY, user_id VARCHAR(50) NOT NULL, "
+                "job_title VARCHAR(500) NOT NULL, company VARCHAR(300) NOT NULL, url VARCHAR(1000) NOT NULL UNIQUE, "
+                "source VARCHAR(100), location VARCHAR(200), processed_at DATETIME, email_sent BOOLEAN, "
+                "cv_generated BOOLEAN, cover_letter_generated BOOLEAN, application_status VARCHAR(100), "
+                "email_subject VARCHAR(500), job_data JSON)"
+            )
+            rows = [
+                (1, 'Engineer', 'Volvo', 'https://example.com/1', '2025-01-01 00:00:00'),
+                (2, 'engineer ', 'VOLVO', 'https://example.com/1', '2025-02-01 00:00:00'),
+                (3, 'Designer', 'SKF', 'https://example.com/2', '2025-01-15 00:00:00'),
+            ]
+            for row in rows:
+                conn.exec_driver_sql(
+                    "INSERT INTO job_postings (id, user_id, title, company, url, source, updated_at) "
+                    "VALUES (?, 'user-1', ?, ?, ?, 'linkedin', ?)", row
+                )
+        yield sqlite_engine
+        sqlite_engine.dispose()
+
+    def test_adds_columns_backfills_and_creates_indexes(self, legacy_engine):
+        """Missing columns are added and filled, duplicates merged, indexes created"""
+        applied = migrate_schema(legacy_engine)
+
+        inspector = inspect(legacy_engine)
+        assert {'dedup_hash', 'is_saved'} <= {column['name'] for column in inspector.get_columns('job_postings')}
+        assert {index['name'] for index in inspector.get_indexes('job_postings')} >= {
+            'uq_job_postings_dedup_hash', 'ix_job_postings_user_saved_updated', 'ix_job_postings_user_match'
+        }
+        assert 'ix_processed_jobs_user_processed_at' in {index['name'] for index in inspector.get_indexes('processed_jobs')}
+        assert 'merge job postings [1] into 2' in applied
+        assert 'rehash 2 job posting(s)' in applied
+        assert schema_version(legacy_engine) == SCHEMA_VERSION
+
+        with legacy_engine.connect() as conn:
+            rows = conn.exec_driver_sql("SELECT id, title, dedup_hash, is_saved FROM job_postings ORDER BY id").fetchall()
+        # The most recently updated duplicate is kept
+        assert [(row[0], row[3]) for row in rows] == [(2, 0), (3, 0)]
+        assert rows[0][2] == job_dedup_hash('Engineer', 'Volvo', 'https://example.com/1')
+
+    def test_saved_duplicate_is_kept(self, legacy_engine):
+        """A saved posting wins over a more recently updated duplicate"""
+        migrate_schema(legacy_engine)
+        with legacy_engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX uq_job_postings_dedup_hash")
+            conn.exec_driver_sql(
+                "INSERT INTO job_postings (id, user_id, title, company, url, source, is_saved, updated_at) "
+                "VALUES (4, 'user-1', 'DESIGNER', 'skf', 'https://example.com/2', 'linkedin', 1, '2024-12-01 00:00:00')"
+            )
+            conn.exec_driver_sql("DELETE FROM schema_migrations WHERE version = 2")
+
+        applied = migrate_schema(legacy_engine)
+
+        assert 'merge job postings [3] into 4' in applied
+        with legacy_engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT id FROM job_postings ORDER BY id").fetchall() == [(2,), (4,)]
+
+    def test_dry_run_reports_without_changing_anything(self, legacy_engine):
+        """A dry run lists the columns, merges and indexes but writes nothing"""
+        applied = migrate_schema(legacy_engine, dry_run=True)
+
+        assert 'added column job_postings.dedup_hash' in applied
+        assert 'merge job postings [1] into 2' in applied
+        assert 'created index uq_job_postings_dedup_hash' in applied
+        inspector = inspect(legacy_engine)
+        assert 'dedup_hash' not in {column['name'] for column in inspector.get_columns('job_postings')}
+        assert not inspector.has_table('schema_migrations')
+        with legacy_engine.connect() as conn:
+            assert conn.exec_driver_sql("SELECT COUNT(*) FROM job_postings").scalar() == 3
+
+    def test_runs_once(self, legacy_engine):
+        """A second run finds nothing to do and the upsert works on the migrated table"""
+        migrate_schema(legacy_engine)
+
+        assert migrate_schema(legacy_engine) == []
+
+        db = sessionmaker(bind=legacy_engine)()
+        jobs = JobCollection(db)
+        asyncio.run(jobs.upsert_many([make_job(1, title='ENGINEER', url='https://example.com/1', is_saved=True)]))
+        assert db.query(JobPosting).count() == 2
+        assert [job.title for job in db.query(JobPosting).filter(JobPosting.is_saved)] == ['ENGINEER']
+        db.close()
+
+    def test_search_results_save_only_after_migration(self, legacy_engine, monkeypatch):
+        """_save_search_results cannot upsert into a pre-dedup_hash table until it is migrated"""
+        from app.services.job_aggregation_service import JobAggregationService, JobSearchRequest
+
+        monkeypatch.setattr(sql_database, 'SessionLocal', sessionmaker(bind=legacy_engine))
+        service = JobAggregationService()
+        results = [make_job(i, url=f'https://example.com/new/{i}') for i in range(3)]
+
+        def save():
+            asyncio.run(service._save_search_results(results, JobSearchRequest(query='engineer'), 'user-1'))
+            with legacy_engine.connect() as conn:
+                return conn.exec_driver_sql("SELECT COUNT(*) FROM job_postings").scalar()
+
+        assert save() == 3
+        migrate_schema(legacy_engine)
+        assert save() == 5
+        assert save() == 5
+
+    def test_new_database_is_created_and_stamped(self):
+        """An empty database gets every table and is recorded at the current version"""
+        sqlite_engine = create_engine('sqlite://')
+
+        applied = migrate_schema(sqlite_engine)
+
+        assert 'created table job_postings' in applied
+        assert schema_version(sqlite_engine) == SCHEMA_VERSION
+        assert migrate_schema(sqlite_engine) == []
+        sqlite_engine.dispose()
+
+    def test_version_check_only_reads(self, legacy_engine):
+        """check_schema_version (run by init_database) issues no DDL and no table scans"""
+        statements = []
+        event.listen(legacy_engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        assert check_schema_version(legacy_engine) == 0
+        migrate_schema(legacy_engine)
+        statements.clear()
+
+        assert check_schema_version(legacy_engine) == SCHEMA_VERSION
+        assert len(statements) == 1
+        assert 'schema_migrations' in statements[0] and 'job_postings' not in statements[0]
+
+
+class TestProcessedJobMembership:
+    """Tests for ProcessedJobCollection.find_processed_urls"""
+
+    @pytest.fixture
+    def processed(self, session):
+        """Collection with 1200 processed jobs for user-1 and one for user-2"""
+        session.add_all(
+            ProcessedJob(user_id='user-1', job_title=f'Job {i}', company='Volvo', url=f'https://example.com/jobs/{i}')
+            for i in range(1200)
+        )
+        session.add(ProcessedJob(user_id='user-2', job_title='Other', company='SKF', url='https://example.com/other'))
+        session.commit()
+        return ProcessedJobCollection(session)
+
+    def test_returns_only_processed_candidates_of_the_user(self, processed):
+        """Only candidate URLs the user already processed are returned"""
+        candidates = ['https://example.com/jobs/5', 'https://example.com/new', 'https://example.com/other', None]
+
+        assert asyncio.run(processed.find_processed_urls('user-1', candidates)) == {'https://example.com/jobs/5'}
+
+    def test_large_batches_are_chunked_and_select_only_urls(self, processed, session):
+        """Membership is answered by chunked IN queries over the url column"""
+        statements = []
+        event.listen(session.get_bind(), 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+        candidates = [f'https://example.com/jobs/{i}' for i in range(0, 2400, 2)]
+
+        found = asyncio.run(processed.find_processed_urls('user-1', candidates))
+
+        assert len(found) == 600
+        assert len(statements) == 3
+        assert all(' IN (' in statement and 'job_data' not in statement for statement in statements)
+
+    def test_lookup_uses_user_url_index(self, processed, session):
+        """SQLite plans the lookup on the (user_id, url) index"""
+        plan = session.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN SELECT url FROM processed_jobs WHERE user_id = 'user-1' AND url IN ('a', 'b')"
+        ).fetchall()
+
+        assert any('ix_processed_jobs_user_url' in str(row) for row in plan)
+
+
+class TestDatabaseSession:
+    """Tests for the scoped DatabaseWrapper session"""
+
+    @pytest.fixture(autouse=True)
+    def session_factory(self, engine, monkeypatch):
+        """Route get_database() to the in-memory engine and track open sessions"""
+        self.open_sessions = 0
+        factory = sessionmaker(bind=engine)
+        test = self
+
+        def tracking_factory():
+            db = factory()
+            test.open_sessions += 1
+            original_close = db.close
+
+            def close():
+                test.open_sessions -= 1
+                original_close()
+
+            db.close = close
+            return db
+
+        monkeypatch.setattr(sql_database, 'SessionLocal', tracking_factory)
+
+    def test_session_is_closed_after_use(self):
+        """database_session() returns its connection to the pool"""
+        async def lookup():
+            async with database_session() as db:
+                db.db.add(User(id='u1', email='a@b.c', username='a', hashed_password='x'))
+                db.db.commit()
+                user = await db.users.find_one({'_id': 'u1'})
+                assert self.open_sessions == 1
+                return user
+
+        assert asyncio.run(lookup())['email'] == 'a@b.c'
+        assert self.open_sessions == 0
+
+    def test_session_is_rolled_back_and_closed_on_error(self):
+        """Errors inside the scope roll back pending changes and still close the session"""
+        async def failing_write():
+            async with database_session() as db:
+                db.db.add(User(id='u2', email='b@b.c', username='b', hashed_password='x'))
+                db.db.flush()
+                raise RuntimeError('boom')
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(failing_write())
+
+        assert self.open_sessions == 0
+
+        async def lookup():
+            async with database_session() as db:
+                return await db.users.find_one({'_id': 'u2'})
+
+        assert asyncio.run(lookup()) is None
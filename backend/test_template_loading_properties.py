@@ -3,10 +3,12 @@ Property-Based Tests for Template Loading
 Tests universal properties of template loading functionality
 """
 
+import os
 import pytest
 from hypothesis import given, settings, strategies as st
 from pathlib import Path
 from cv_templates import CVTemplateManager
+from template_store import TemplateStore
 
 
 # Test generators
@@ -278,6 +280,66 @@ class TestTemplateLoadingProperties:
                         f"{error_msg} (found {len(matches)} instances) in {role_category} ({template_type}) template"
 
 
+
+VALID_TEX = "\\documentclass{article}\n\\begin{document}\nHello\n\\end{document}\n"
+
+
+class TestTemplateStore:
+    """Tests for the preloaded template registry"""
+    
+    def make_store(self, tmp_path, recheck_interval=0.0):
+        """Store over a single temporary role with CV and CL templates"""
+        (tmp_path / 'cv.tex').write_text(VALID_TEX, encoding='utf-8')
+        (tmp_path / 'cl.tex').write_text(VALID_TEX, encoding='utf-8')
+        role_categories = {'demo_role': {'cv_template': 'cv.tex', 'cl_template': 'cl.tex', 'keywords': [], 'priority': 1}}
+        return TemplateStore(
+            role_categories, tmp_path, lambda content: '\\begin{document}' in content,
+            recheck_interval=recheck_interval
+        )
+    
+    def test_preload_validates_every_template(self, tmp_path):
+        """All configured CV and CL templates are loaded up front"""
+        store = self.make_store(tmp_path)
+        
+        assert store.preload() == {'loaded': 2, 'invalid': 0, 'missing': 0}
+        assert store.get('demo_role', 'cv').content == VALID_TEX
+        assert store.get('unknown_role', 'cv') is None
+    
+    def test_lookups_within_interval_do_not_touch_disk(self, tmp_path):
+        """Between mtime checks, lookups return the cached entry"""
+        store = self.make_store(tmp_path, recheck_interval=3600)
+        store.preload()
+        (tmp_path / 'cv.tex').unlink()
+        
+        assert store.get('demo_role', 'cv').is_usable
+        assert store.get_stats()['loads'] == 2
+    
+    def test_modified_template_is_reloaded(self, tmp_path):
+        """A changed mtime triggers a reload and re-validation"""
+        store = self.make_store(tmp_path)
+        store.preload()
+        
+        cv_path = tmp_path / 'cv.tex'
+        cv_path.write_text("not latex", encoding='utf-8')
+        stat = cv_path.stat()
+        os.utime(cv_path, (stat.st_atime, stat.st_mtime + 10))
+        
+        entry = store.get('demo_role', 'cv')
+        assert entry.content == "not latex"
+        assert not entry.is_usable
+        assert store.get_stats()['reloads'] == 1
+    
+    def test_missing_template_is_picked_up_when_created(self, tmp_path):
+        """A template added after startup becomes available"""
+        store = self.make_store(tmp_path)
+        store.role_categories['demo_role']['cl_template'] = 'later.tex'
+        store.preload()
+        assert store.get('demo_role', 'cl').path is None
+        
+        (tmp_path / 'later.tex').write_text(VALID_TEX, encoding='utf-8')
+        assert store.get('demo_role', 'cl').is_usable
+
+
 if __name__ == '__main__':
     # Run the tests
     pytest.main([__file__, '-v'])
\ No newline at end of file
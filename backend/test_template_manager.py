@@ -0,0 +1,97 @@
+"""
+Tests for TemplateManager's template performance updates
+Uses an in-memory stand-in for the Supabase client that records which thread ran each query
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+from app.services.template_manager import TemplateManager
+
+
+class FakeQuery:
+    """Chainable table query; execute() blocks for ``delay`` seconds like a network call"""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.action = 'select'
+        self.payload = None
+
+    def insert(self, payload):
+        self.action, self.payload = 'insert', payload
+        return self
+
+    def update(self, payload):
+        self.action, self.payload = 'update', payload
+        return self
+
+    def select(self, *columns):
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def execute(self):
+        self.client.calls.append((self.table, self.action, threading.current_thread().name))
+        time.sleep(self.client.delay)
+        if self.action == 'insert':
+            self.client.rows.append(self.payload)
+        rows = self.client.rows if self.action == 'select' else [self.payload]
+        return SimpleNamespace(data=list(rows))
+
+
+class FakeSupabase:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.rows = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+def make_manager(delay=0.0):
+    manager = TemplateManager.__new__(TemplateManager)
+    manager.supabase = FakeSupabase(delay)
+    manager.cache = {}
+    return manager
+
+
+class TestUpdateTemplatePerformance:
+    """Tests for update_template_performance"""
+
+    def test_queries_run_off_the_event_loop(self):
+        """Insert, aggregate read and template update all run in worker threads"""
+        manager = make_manager()
+
+        async def main():
+            await manager.update_template_performance('cv-1', 'Engineer', 'Volvo', 88.0, 0.7, 0.9, True)
+            return threading.current_thread().name
+
+        loop_thread = asyncio.run(main())
+
+        assert [(table, action) for table, action, _ in manager.supabase.calls] == [
+            ('template_performance', 'insert'),
+            ('template_performance', 'select'),
+            ('document_templates', 'update'),
+        ]
+        assert all(thread != loop_thread for _, _, thread in manager.supabase.calls)
+
+    def test_updates_overlap_with_other_work(self):
+        """Two updates and a concurrent coroutine take about as long as one update"""
+        manager = make_manager(delay=0.05)
+
+        async def main():
+            start = time.perf_counter()
+            await asyncio.gather(
+                manager.update_template_performance('cv-1', 'Engineer', 'Volvo', 88.0, 0.7, 0.9, True),
+                manager.update_template_performance('cl-1', 'Engineer', 'Volvo', 84.0, 0.6, 0.9, True),
+                asyncio.sleep(0.15),
+            )
+            return time.perf_counter() - start
+
+        # Serialized on the loop this would be 2 x 3 x 0.05 + 0.15 = 0.45 s
+        assert asyncio.run(main()) < 0.3